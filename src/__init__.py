@@ -1,7 +1,21 @@
 # src/__init__.py
 """绝区零属性计算器"""
-from src.data.manager import data_manager
-from src.services.calculation_service import calculation_service
+import importlib
 
 __version__ = "1.0.0"
-__all__ = ['data_manager', 'calculation_service']
\ No newline at end of file
+__all__ = ['data_manager', 'calculation_service']
+
+# 全局实例按需导入：导入 src 下任意子模块时不触发数据加载
+_LAZY_ATTRIBUTES = {
+    'data_manager': 'src.data.manager',
+    'calculation_service': 'src.services.calculation_service',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,5 +1,6 @@
 from src.models.character_attributes import CharacterAttributesModel
 from src.parsers.character_parser import load_character_data
+from src.services.metrics import metrics_registry
 
 
 class CharacterAttributeCalculator:
@@ -16,7 +17,8 @@ class CharacterAttributeCalculator:
             core_passive_level: int
     ) -> CharacterAttributesModel:
         """计算角色属性"""
-        parsed_data = load_character_data(json_file_path)
+        with metrics_registry.timer("calc.parse"):
+            parsed_data = load_character_data(json_file_path)
         if not parsed_data:
             raise ValueError(f"无法加载角色数据: {json_file_path}")
 
@@ -27,11 +29,12 @@ class CharacterAttributeCalculator:
         attributes.weapon_type = parsed_data.weapon_type
         attributes.element_type = parsed_data.element_type
 
-        # 计算基础属性
-        self._calculate_base_attributes(attributes, parsed_data, character_level, breakthrough_level)
+        with metrics_registry.timer("calc.base_stats"):
+            # 计算基础属性
+            self._calculate_base_attributes(attributes, parsed_data, character_level, breakthrough_level)
 
-        # 应用额外属性
-        self._apply_extra_attributes(attributes, parsed_data, core_passive_level)
+            # 应用额外属性
+            self._apply_extra_attributes(attributes, parsed_data, core_passive_level)
 
         return attributes
 
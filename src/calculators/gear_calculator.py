@@ -6,6 +6,7 @@ from src.models.attributes import GearAttributeValueType
 from src.models.character_attributes import CharacterAttributes
 from src.models.base_stats import BaseStats, FinalCharacterStats
 from src.models.gear_models import GearPiece, GearSetSelection, GearSetEffect
+from src.services.metrics import metrics_registry
 
 
 class GearCalculator:
@@ -36,15 +37,17 @@ class GearCalculator:
                     f"副属性{j + 1}: {sub_attr.name}, 强化等级: {sub_attr.enhancement_level}, 计算值: {sub_attr.calculate_value_at_enhancement_level()}")
 
         # 计算单个驱动盘加成
-        for gear_piece in gear_pieces:
-            print(f'驱动盘槽位：{gear_piece.slot_index}')
-            self._add_gear_piece_bonus(total_bonus, gear_piece, base_stats, character_level)
+        with metrics_registry.timer("calc.gear_bonuses"):
+            for gear_piece in gear_pieces:
+                print(f'驱动盘槽位：{gear_piece.slot_index}')
+                self._add_gear_piece_bonus(total_bonus, gear_piece, base_stats, character_level)
 
         # 计算套装效果
         if self.gear_set_manager:
-            set_bonus = self.gear_set_manager.get_set_bonuses(set_selection)
-            # 套装效果需要正确分类
-            self._apply_set_bonuses(total_bonus, set_bonus, base_stats)
+            with metrics_registry.timer("calc.set_bonuses"):
+                set_bonus = self.gear_set_manager.get_set_bonuses(set_selection)
+                # 套装效果需要正确分类
+                self._apply_set_bonuses(total_bonus, set_bonus, base_stats)
 
         return total_bonus
 
@@ -228,7 +231,8 @@ class GearCalculator:
         gear_bonuses = self.calculate_gear_bonuses(gear_pieces, set_selection, base_stats, level)
 
         # 2. 计算最终属性
-        final_stats = self.calculate_final_stats(base_stats, gear_bonuses)
+        with metrics_registry.timer("calc.final_merge"):
+            final_stats = self.calculate_final_stats(base_stats, gear_bonuses)
         return final_stats
 
 
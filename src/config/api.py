@@ -0,0 +1,11 @@
+"""API配置"""
+
+API_BASE_URL = "https://api.hakush.in/zzz/data"
+
+API_ENDPOINTS = {
+    "character_list": "/character.json",
+    "character_data": "/zh/character/{character_id}.json",
+    "equipment_data": "/equipment.json",
+    "weapon_list": "/weapon.json",
+    "weapon_data": "/zh/weapon/{weapon_id}.json"
+}
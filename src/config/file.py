@@ -3,14 +3,16 @@ from pathlib import Path
 
 
 class FileConfig:
-    """文件路径配置"""
+    """文件路径配置
+
+    构造时只计算路径，不访问文件系统；需要写入数据的组件调用 ensure_directories() 创建目录。
+    """
 
     def __init__(self, base_dir: str = "./data"):
         project_root = Path(__file__).parent.parent.parent
         self.base_dir = project_root / base_dir
-        self._ensure_directories()
 
-    def _ensure_directories(self):
+    def ensure_directories(self):
         """确保所有必要的目录存在"""
         directories = [
             self.base_dir,
@@ -22,6 +24,20 @@ class FileConfig:
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
 
+    def validate_data_structure(self) -> dict:
+        """检查数据目录结构，missing_dirs 为缺失目录对应的属性名"""
+        details = {}
+        missing_dirs = []
+
+        for dir_name in ("base_dir", "characters_dir", "weapons_dir", "equipment_dir"):
+            path = getattr(self, dir_name)
+            exists = path.is_dir()
+            details[dir_name] = {"path": str(path), "exists": exists}
+            if not exists:
+                missing_dirs.append(dir_name)
+
+        return {"valid": not missing_dirs, "missing_dirs": missing_dirs, "details": details}
+
     @property
     def characters_dir(self) -> Path:
         return self.base_dir / "characters"
@@ -64,11 +80,45 @@ class FileConfig:
         """装备数据文件"""
         return self.equipment_dir / "equipment.json"
 
+    @property
+    def inventory_file(self) -> Path:
+        """驱动盘库存文件（列式二进制格式）"""
+        return self.base_dir / "inventory.bin"
+
     @property
     def failed_downloads_file(self) -> Path:
         """失败下载记录文件"""
         return self.base_dir / "failed_downloads.json"
 
+    @property
+    def download_manifest_file(self) -> Path:
+        """下载清单文件（ETag、Last-Modified、内容哈希）"""
+        return self.base_dir / "download_manifest.json"
+
+    @property
+    def status_cache_file(self) -> Path:
+        """网络探测结果缓存文件"""
+        return self.base_dir / "status_cache.json"
+
+    @property
+    def backup_dir(self) -> Path:
+        """备份目录（内容寻址存储）"""
+        return self.base_dir / "backups"
+
+    @property
+    def backup_objects_dir(self) -> Path:
+        """备份内容块目录，文件以内容哈希命名"""
+        return self.backup_dir / "objects"
+
+    @property
+    def backup_manifests_dir(self) -> Path:
+        """备份清单目录，每个备份一个清单文件"""
+        return self.backup_dir / "manifests"
+
+    def get_backup_path(self, backup_name: str) -> Path:
+        """备份清单文件路径"""
+        return self.backup_manifests_dir / f"{backup_name}.json"
+
     def get_character_file_path(self, character_id: str) -> Path:
         return self.characters_dir / f"{character_id}.json"
 
@@ -79,6 +129,10 @@ class FileConfig:
         """列出所有角色数据文件"""
         return list(self.characters_dir.glob("*.json"))
 
+    def list_weapon_files(self) -> list[Path]:
+        """列出所有音擎数据文件"""
+        return list(self.weapons_dir.glob("*.json"))
+
     def character_file_exists(self, character_id: str) -> bool:
         """检查角色文件是否存在"""
         return self.get_character_file_path(character_id).exists()
\ No newline at end of file
@@ -5,7 +5,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import json
 
+from src.config.file import FileConfig
 from src.config.manager import config_manager
+from src.services.metrics import metrics_registry
 
 
 @dataclass
@@ -40,7 +42,8 @@ class GearSetInfo:
 class DataManager:
     """统一的数据管理器"""
 
-    def __init__(self):
+    def __init__(self, file_config: Optional[FileConfig] = None):
+        self.file_config = file_config or config_manager.file
         self._characters: Dict[int, CharacterInfo] = {}
         self._weapons: Dict[int, WeaponInfo] = {}
         self._gear_sets: Dict[int, GearSetInfo] = {}
@@ -51,9 +54,16 @@ class DataManager:
     def load_all_data(self):
         """加载所有数据"""
         try:
-            self.load_characters()
-            self.load_weapons()
-            self.load_gear_sets()
+            with metrics_registry.timer("load.all"):
+                with metrics_registry.timer("load.characters"):
+                    self.load_characters()
+                with metrics_registry.timer("load.weapons"):
+                    self.load_weapons()
+                with metrics_registry.timer("load.gear_sets"):
+                    self.load_gear_sets()
+            metrics_registry.inc("load.characters.count", len(self._characters))
+            metrics_registry.inc("load.weapons.count", len(self._weapons))
+            metrics_registry.inc("load.gear_sets.count", len(self._gear_sets))
             print(
                 f"数据加载完成: {len(self._characters)}个角色, {len(self._weapons)}个音擎, {len(self._gear_sets)}个套装")
         except Exception as e:
@@ -61,7 +71,7 @@ class DataManager:
 
     def load_characters(self):
         """加载角色信息"""
-        mapping_file = config_manager.file.character_id_name_mapping_file
+        mapping_file = self.file_config.character_id_name_mapping_file
         if not mapping_file.exists():
             return
 
@@ -71,7 +81,7 @@ class DataManager:
         for char_id_str, char_name in mappings.items():
             try:
                 char_id = int(char_id_str)
-                file_path = config_manager.file.get_character_file_path(str(char_id))
+                file_path = self.file_config.get_character_file_path(str(char_id))
                 if file_path.exists():
                     # 从角色文件读取详细信息
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -98,7 +108,7 @@ class DataManager:
 
     def load_weapons(self):
         """加载音擎信息"""
-        mapping_file = config_manager.file.weapon_id_name_mapping_file
+        mapping_file = self.file_config.weapon_id_name_mapping_file
         if not mapping_file.exists():
             return
 
@@ -108,7 +118,7 @@ class DataManager:
         for weapon_id_str, weapon_name in mappings.items():
             try:
                 weapon_id = int(weapon_id_str)
-                file_path = config_manager.file.get_weapon_file_path(str(weapon_id))
+                file_path = self.file_config.get_weapon_file_path(str(weapon_id))
                 if file_path.exists():
                     # 从音擎文件读取详细信息
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -125,7 +135,7 @@ class DataManager:
 
     def load_gear_sets(self):
         """加载装备套装信息"""
-        equipment_file = config_manager.file.equipment_file
+        equipment_file = self.file_config.equipment_file
         if not equipment_file.exists():
             return
 
@@ -190,5 +200,9 @@ class DataManager:
         return self._gear_sets.get(set_id)
 
 
-# 创建全局数据管理器实例
-data_manager = DataManager()
\ No newline at end of file
+def __getattr__(name):
+    # 全局数据管理器实例在首次访问时创建，导入本模块不读取数据文件
+    if name == "data_manager":
+        instance = globals()["data_manager"] = DataManager()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
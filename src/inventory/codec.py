@@ -0,0 +1,198 @@
+# src/inventory/codec.py
+"""驱动盘 64 位打包编码
+
+一个驱动盘编码为一个 uint64（低位在前）：
+
+    位 0-2    槽位索引（0-based，驱动盘只用 0-5，与 GearPiece.slot_index 一致）
+    位 3-6    主属性等级（0-15）
+    位 7-11   主属性编码（0 表示无，见 MAIN_STAT_CODES）
+    位 12-27  套装ID（0-65535，0 表示未知）
+    位 28-55  4 个副属性，每个 7 位：低 4 位副属性编码（0 表示空，见 SUB_STAT_CODES），高 3 位强化次数（0-7）
+    位 56-63  保留，恒为 0
+
+编码值可直接用于哈希、去重、排序和跨进程传输。
+主/副属性编码表只允许在末尾追加，否则已保存的编码会失效。
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.models.gear_attributes import Attribute, GearMainAttributes, GearSubAttributes, SubAttribute
+from src.models.gear_models import GearPiece
+
+SUB_STAT_COUNT = 4
+SLOT_COUNT = 6
+
+SLOT_SHIFT, SLOT_BITS = 0, 3
+LEVEL_SHIFT, LEVEL_BITS = 3, 4
+MAIN_SHIFT, MAIN_BITS = 7, 5
+SET_SHIFT, SET_BITS = 12, 16
+SUB_SHIFT, SUB_STAT_BITS, SUB_ROLL_BITS = 28, 4, 3
+SUB_FIELD_BITS = SUB_STAT_BITS + SUB_ROLL_BITS
+
+# 主属性编码表：编码 = 下标 + 1
+MAIN_STAT_CODES = (
+    GearMainAttributes.hp_numeric,
+    GearMainAttributes.hp_percentage,
+    GearMainAttributes.attack_numeric,
+    GearMainAttributes.attack_percentage,
+    GearMainAttributes.defence_numeric,
+    GearMainAttributes.defence_percentage,
+    GearMainAttributes.anomaly_proficiency,
+    GearMainAttributes.impact,
+    GearMainAttributes.crit_rate,
+    GearMainAttributes.crit_dmg,
+    GearMainAttributes.pen_ratio,
+    GearMainAttributes.anomaly_mastery,
+    GearMainAttributes.energy_regen,
+    GearMainAttributes.physical_dmg_bonus,
+    GearMainAttributes.fire_dmg_bonus,
+    GearMainAttributes.ice_dmg_bonus,
+    GearMainAttributes.electric_dmg_bonus,
+    GearMainAttributes.ether_dmg_bonus,
+)
+
+# 副属性编码表：编码 = 下标 + 1
+SUB_STAT_CODES = GearSubAttributes.definitions()
+
+_MAIN_CODE_BY_DEFINITION: Dict[Attribute, int] = {attr: code for code, attr in enumerate(MAIN_STAT_CODES, start=1)}
+_SUB_CODE_BY_DEFINITION: Dict[Attribute, int] = {attr: code for code, attr in enumerate(SUB_STAT_CODES, start=1)}
+
+
+@dataclass
+class UnpackedDiscs:
+    """解包后的列数据（每个字段一个数组，长度为驱动盘数量）"""
+    slot_index: np.ndarray  # uint8
+    level: np.ndarray       # uint8
+    main_stat: np.ndarray   # uint8，主属性编码
+    set_id: np.ndarray      # uint16
+    sub_stats: np.ndarray   # uint8，形状 (n, 4)，副属性编码
+    sub_rolls: np.ndarray   # uint8，形状 (n, 4)，强化次数
+
+    def __len__(self) -> int:
+        return len(self.slot_index)
+
+
+def main_stat_code(attribute: Optional[Attribute]) -> int:
+    """主属性定义 -> 编码（None 为 0）"""
+    if attribute is None:
+        return 0
+    try:
+        return _MAIN_CODE_BY_DEFINITION[attribute]
+    except KeyError:
+        raise ValueError(f"未知的主属性: {attribute}") from None
+
+
+def sub_stat_code(attribute: Optional[Attribute]) -> int:
+    """副属性定义 -> 编码（None 为 0）"""
+    if attribute is None:
+        return 0
+    try:
+        return _SUB_CODE_BY_DEFINITION[attribute]
+    except KeyError:
+        raise ValueError(f"未知的副属性: {attribute}") from None
+
+
+def _field(values, dtype, bits: int, name: str) -> np.ndarray:
+    """转换为无符号数组并检查取值范围"""
+    array = np.asarray(values)
+    if array.size and (array.min() < 0 or array.max() >= 1 << bits):
+        raise ValueError(f"{name} 超出编码范围 0-{(1 << bits) - 1}")
+    return array.astype(dtype, copy=False)
+
+
+def pack(slot_index, level, main_stat, set_id, sub_stats, sub_rolls) -> np.ndarray:
+    """按列打包为 uint64 数组（sub_stats/sub_rolls 形状为 (n, 4)）"""
+    codes = _field(slot_index, np.uint64, SLOT_BITS, "槽位索引") << np.uint64(SLOT_SHIFT)
+    codes |= _field(level, np.uint64, LEVEL_BITS, "主属性等级") << np.uint64(LEVEL_SHIFT)
+    codes |= _field(main_stat, np.uint64, MAIN_BITS, "主属性编码") << np.uint64(MAIN_SHIFT)
+    codes |= _field(set_id, np.uint64, SET_BITS, "套装ID") << np.uint64(SET_SHIFT)
+
+    stats = _field(sub_stats, np.uint64, SUB_STAT_BITS, "副属性编码").reshape(-1, SUB_STAT_COUNT)
+    rolls = _field(sub_rolls, np.uint64, SUB_ROLL_BITS, "强化次数").reshape(-1, SUB_STAT_COUNT)
+    for index in range(SUB_STAT_COUNT):
+        shift = SUB_SHIFT + index * SUB_FIELD_BITS
+        codes |= stats[:, index] << np.uint64(shift)
+        codes |= rolls[:, index] << np.uint64(shift + SUB_STAT_BITS)
+    return codes
+
+
+def _bits(codes: np.ndarray, shift: int, bits: int) -> np.ndarray:
+    return (codes >> np.uint64(shift)) & np.uint64((1 << bits) - 1)
+
+
+def unpack(codes) -> UnpackedDiscs:
+    """把 uint64 数组拆回各列"""
+    codes = np.asarray(codes, dtype=np.uint64)
+    shifts = SUB_SHIFT + np.arange(SUB_STAT_COUNT, dtype=np.uint64) * np.uint64(SUB_FIELD_BITS)
+    sub_fields = codes[:, None] >> shifts
+    return UnpackedDiscs(
+        slot_index=_bits(codes, SLOT_SHIFT, SLOT_BITS).astype(np.uint8),
+        level=_bits(codes, LEVEL_SHIFT, LEVEL_BITS).astype(np.uint8),
+        main_stat=_bits(codes, MAIN_SHIFT, MAIN_BITS).astype(np.uint8),
+        set_id=_bits(codes, SET_SHIFT, SET_BITS).astype(np.uint16),
+        sub_stats=(sub_fields & np.uint64((1 << SUB_STAT_BITS) - 1)).astype(np.uint8),
+        sub_rolls=((sub_fields >> np.uint64(SUB_STAT_BITS)) & np.uint64((1 << SUB_ROLL_BITS) - 1)).astype(np.uint8)
+    )
+
+
+def encode_pieces(pieces: Sequence[GearPiece]) -> np.ndarray:
+    """GearPiece 列表 -> uint64 数组（槽位不在 0-5 或副属性超过4个时报错）"""
+    count = len(pieces)
+    slot_index = np.zeros(count, dtype=np.int64)
+    level = np.zeros(count, dtype=np.int64)
+    main_stat = np.zeros(count, dtype=np.int64)
+    set_id = np.zeros(count, dtype=np.int64)
+    sub_stats = np.zeros((count, SUB_STAT_COUNT), dtype=np.int64)
+    sub_rolls = np.zeros((count, SUB_STAT_COUNT), dtype=np.int64)
+
+    for row, piece in enumerate(pieces):
+        rolls = piece.sub_rolls()
+        if len(rolls) > SUB_STAT_COUNT:
+            raise ValueError(f"驱动盘副属性超过{SUB_STAT_COUNT}个: {piece}")
+        if not 0 <= piece.slot_index < SLOT_COUNT:
+            raise ValueError(f"驱动盘槽位应为 0-{SLOT_COUNT - 1}: {piece}")
+        slot_index[row] = piece.slot_index
+        level[row] = piece.level
+        main_stat[row] = main_stat_code(piece.main_attribute)
+        set_id[row] = piece.set_id
+        for column, (definition, enhancement_level) in enumerate(rolls):
+            sub_stats[row, column] = sub_stat_code(definition)
+            sub_rolls[row, column] = enhancement_level
+
+    return pack(slot_index, level, main_stat, set_id, sub_stats, sub_rolls)
+
+
+def decode_pieces(codes) -> List[GearPiece]:
+    """uint64 数组 -> GearPiece 列表"""
+    columns = unpack(codes)
+    pieces = []
+    for row in range(len(columns)):
+        main = int(columns.main_stat[row])
+        sub_attributes = [SubAttribute(SUB_STAT_CODES[stat - 1], roll)
+                          for stat, roll in zip(columns.sub_stats[row].tolist(), columns.sub_rolls[row].tolist())
+                          if stat]
+        pieces.append(GearPiece(
+            slot_index=int(columns.slot_index[row]),
+            level=int(columns.level[row]),
+            main_attribute=MAIN_STAT_CODES[main - 1] if main else None,
+            sub_attributes=sub_attributes,
+            set_id=int(columns.set_id[row])
+        ))
+    return pieces
+
+
+def encode_piece(piece: GearPiece) -> int:
+    """单个 GearPiece -> 64 位整数"""
+    return int(encode_pieces([piece])[0])
+
+
+def decode_piece(code: int) -> GearPiece:
+    """64 位整数 -> GearPiece"""
+    return decode_pieces(np.array([code], dtype=np.uint64))[0]
+
+
+def deduplicate(codes) -> np.ndarray:
+    """去重并排序（相同编码即为完全相同的驱动盘）"""
+    return np.unique(np.asarray(codes, dtype=np.uint64))
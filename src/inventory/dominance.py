@@ -0,0 +1,181 @@
+# src/inventory/dominance.py
+"""驱动盘支配索引 - 按 (槽位, 套装, 主属性) 分桶维护不被支配的驱动盘（天际线）
+
+同一桶内驱动盘 A 的主属性等级和每个副属性的命中次数都不低于 B、且至少一项更高时，A 支配 B：
+对任何随属性单调不减的目标，把 B 换成 A 不会变差（套装件数和主属性不变），搜索只需考虑天际线。
+完全相同的驱动盘只保留行号最小的一个。
+
+- add_rows / remove_rows 增量维护：新驱动盘只和所在桶的天际线比较；移除天际线成员时，
+  只把被它支配过的驱动盘重新插入。
+- skyline(sub_mask=..., main_mask=...) 只比较目标相关的主属性和副属性：同槽位同套装的驱动盘一起比较，
+  主属性无用的驱动盘会被副属性不差的任何驱动盘支配（投影后的天际线是完整天际线的子集，更小）。
+- skyline(available=...) 在可用驱动盘中求天际线：桶内天际线成员都可用时直接取交集，否则重算该桶。
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.inventory.store import DiscInventory
+
+BucketKey = Tuple[int, int, int]
+
+
+def skyline_mask(keys: np.ndarray) -> np.ndarray:
+    """keys (k, d) 每行一个驱动盘 -> 不被其他行支配的行（相同的行保留第一个）"""
+    count = len(keys)
+    if count <= 1:
+        return np.ones(count, dtype=bool)
+    keys = keys.astype(np.int16)
+    at_least = np.all(keys[:, None, :] >= keys[None, :, :], axis=-1)          # [i, j]: i 各项不低于 j
+    equal = at_least & at_least.T
+    earlier = np.tri(count, k=-1, dtype=bool).T                                # [i, j]: i < j
+    dominated = (at_least & ~equal) | (equal & earlier)
+    return ~dominated.any(axis=0)
+
+
+class DominanceIndex:
+    """驱动盘支配索引"""
+
+    def __init__(self, inventory: DiscInventory, rows: Optional[Iterable[int]] = None):
+        self.inventory = inventory
+        self._buckets: Dict[BucketKey, np.ndarray] = {}        # 桶 -> 桶内全部行号（升序）
+        self._skylines: Dict[BucketKey, np.ndarray] = {}       # 桶 -> 天际线行号（升序）
+        self._bucket_of: Dict[int, BucketKey] = {}
+        self._projected: Dict[bytes, Dict[Tuple[int, int], np.ndarray]] = {}   # 投影天际线缓存
+        self.add_rows(np.arange(len(inventory)) if rows is None else rows)
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    @property
+    def skyline_size(self) -> int:
+        return sum(len(rows) for rows in self._skylines.values())
+
+    def _keys(self, rows: np.ndarray) -> np.ndarray:
+        columns = self.inventory.columns
+        return np.column_stack([np.asarray(columns["level"][rows]), np.asarray(columns["sub_rolls"][rows])])
+
+    def bucket(self, row: int) -> BucketKey:
+        columns = self.inventory.columns
+        return int(columns["slot"][row]), int(columns["set_id"][row]), int(columns["main_stat"][row])
+
+    def add_rows(self, rows: Iterable[int]):
+        """加入驱动盘（库存追加后调用）"""
+        rows = np.asarray(list(rows) if not isinstance(rows, np.ndarray) else rows, dtype=np.intp)
+        rows = rows[[int(row) not in self._bucket_of for row in rows.tolist()]] if self._bucket_of else rows
+        if not len(rows):
+            return
+        columns = self.inventory.columns
+        keys = np.column_stack([np.asarray(columns[name][rows]).astype(np.int64)
+                                for name in ("slot", "set_id", "main_stat")])
+        order = np.lexsort(keys.T[::-1])
+        rows, keys = rows[order], keys[order]
+        starts = np.r_[0, np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1, len(rows)]
+        for start, stop in zip(starts[:-1], starts[1:]):
+            key = tuple(int(value) for value in keys[start])
+            new_rows = rows[start:stop]
+            for row in new_rows.tolist():
+                self._bucket_of[row] = key
+            members = np.union1d(self._buckets.get(key, np.empty(0, dtype=np.intp)), new_rows)
+            self._buckets[key] = members
+            # 新的天际线只可能来自原天际线和新加入的驱动盘
+            candidates = np.union1d(self._skylines.get(key, np.empty(0, dtype=np.intp)), new_rows)
+            self._skylines[key] = candidates[skyline_mask(self._keys(candidates))]
+        self._projected.clear()
+
+    def remove_rows(self, rows: Iterable[int]):
+        """移除驱动盘（已分配给其他角色、已删除等）"""
+        affected: Dict[BucketKey, Set[int]] = {}
+        for row in rows:
+            key = self._bucket_of.pop(int(row), None)
+            if key is not None:
+                affected.setdefault(key, set()).add(int(row))
+        for key, removed in affected.items():
+            removed_rows = np.array(sorted(removed), dtype=np.intp)
+            members = np.setdiff1d(self._buckets[key], removed_rows)
+            skyline = self._skylines[key]
+            lost = np.intersect1d(skyline, removed_rows)
+            kept = np.setdiff1d(skyline, removed_rows)
+            if not len(members):
+                del self._buckets[key], self._skylines[key]
+                continue
+            self._buckets[key] = members
+            if len(lost):
+                # 只有被移除的天际线成员支配过的驱动盘可能进入天际线
+                others = np.setdiff1d(members, kept)
+                lost_keys, other_keys = self._keys(lost), self._keys(others)
+                freed = others[np.any(np.all(lost_keys[:, None, :] >= other_keys[None, :, :], axis=-1), axis=0)]
+                candidates = np.union1d(kept, freed)
+                kept = candidates[skyline_mask(self._keys(candidates))]
+            self._skylines[key] = kept
+        if affected:
+            self._projected.clear()
+
+    def is_skyline(self, row: int) -> bool:
+        key = self._bucket_of.get(int(row))
+        return key is not None and bool(np.isin(row, self._skylines[key]))
+
+    def buckets(self, slot: Optional[int] = None) -> List[BucketKey]:
+        return [key for key in self._buckets if slot is None or key[0] == slot]
+
+    def skyline(self, slot: Optional[int] = None, set_id: Optional[int] = None, main_stat: Optional[int] = None,
+                sub_mask: Optional[np.ndarray] = None, main_mask: Optional[np.ndarray] = None,
+                available: Optional[np.ndarray] = None) -> np.ndarray:
+        """符合筛选条件的天际线行号（升序）
+
+        sub_mask:  只比较这些副属性（按 codec.SUB_STAT_CODES 排列的布尔数组）；
+        main_mask: 只有这些主属性有用（按主属性编码排列，下标 0 对应“无主属性”）。主属性无用的驱动盘
+                   相当于没有主属性，会和同槽位同套装其他主属性的驱动盘比较；
+        两者都为 None 时按 (槽位, 套装, 主属性) 分桶比较完整的副属性。
+        available: 库存行的布尔掩码，只在可用驱动盘中求天际线。
+        """
+        groups: Dict[tuple, List[BucketKey]] = {}
+        projected = sub_mask is not None or main_mask is not None
+        for key in self._buckets:
+            if (slot is not None and key[0] != slot) or (set_id is not None and key[1] != set_id) \
+                    or (main_stat is not None and key[2] != main_stat):
+                continue
+            groups.setdefault(key[:2] if projected else key, []).append(key)
+        if not projected:
+            result = [self._available_skyline(key, available) for key in groups]
+        else:
+            cache = None
+            if available is None and main_stat is None:
+                cache_key = np.asarray(sub_mask if sub_mask is not None else [], dtype=bool).tobytes() + b"|" \
+                    + np.asarray(main_mask if main_mask is not None else [], dtype=bool).tobytes()
+                cache = self._projected.setdefault(cache_key, {})
+            result = []
+            for group, keys in groups.items():
+                if cache is not None and group in cache:
+                    result.append(cache[group])
+                    continue
+                rows = np.concatenate([self._available_skyline(key, available) for key in keys])
+                rows = rows[skyline_mask(self._projected_keys(rows, sub_mask, main_mask))]
+                if cache is not None:
+                    cache[group] = rows
+                result.append(rows)
+        return np.sort(np.concatenate(result)) if result else np.empty(0, dtype=np.intp)
+
+    def _available_skyline(self, key: BucketKey, available: Optional[np.ndarray]) -> np.ndarray:
+        """桶在可用驱动盘中的天际线：天际线成员都可用时就是天际线本身（被支配的驱动盘仍被支配）"""
+        skyline = self._skylines[key]
+        if available is None or available[skyline].all():
+            return skyline
+        members = self._buckets[key]
+        members = members[available[members]]
+        return members[skyline_mask(self._keys(members))]
+
+    def _projected_keys(self, rows: np.ndarray, sub_mask: Optional[np.ndarray],
+                        main_mask: Optional[np.ndarray]) -> np.ndarray:
+        """投影比较用的键：每种有用的主属性一列（等级 + 1，其他主属性为 0），加上有用的副属性命中次数"""
+        columns = self.inventory.columns
+        main_stats = np.asarray(columns["main_stat"][rows]).astype(np.intp)
+        codes = np.unique(main_stats)
+        if main_mask is not None:
+            codes = codes[np.asarray(main_mask, dtype=bool)[codes]]
+        levels = np.asarray(columns["level"][rows]).astype(np.int16) + 1
+        main_keys = np.where(main_stats[:, None] == codes[None, :], levels[:, None], 0)
+        sub_rolls = np.asarray(columns["sub_rolls"][rows])
+        if sub_mask is not None:
+            sub_rolls = sub_rolls[:, np.asarray(sub_mask, dtype=bool)]
+        return np.column_stack([main_keys, sub_rolls])
@@ -0,0 +1,384 @@
+# src/inventory/importer.py
+"""驱动盘库存导入 - 流式读取第三方扫描器导出的 JSON/JSON Lines/CSV
+
+逐行读取并转换，每 chunk_size 行打包写入库存文件，内存占用与文件大小无关。
+不合法的行不会中断导入，而是记录行号和原因（前 max_rejections 条保留在报告中，
+指定 rejects_path 时全部写入 CSV）。
+
+支持的行格式（字段名见 FIELD_ALIASES）：
+    JSON: {"slot": 1, "set": "啄木鸟电音", "main": "攻击力", "level": 15, "lock": true,
+           "substats": [{"key": "暴击率", "upgrades": 2}, ...]}
+    CSV:  slot,set,main,level,lock,sub1,sub1_upgrades,sub2,sub2_upgrades,...
+JSON 顶层可以是驱动盘数组，也可以是包含驱动盘数组（键名见 JSON_ARRAY_KEYS）的对象。
+槽位按游戏内编号 1-6，副属性的 upgrades 为强化次数。
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.config.slot_config import SlotConfig
+from src.inventory import codec
+from src.inventory.store import InventoryWriter
+from src.models.gear_attributes import GearSubAttributes
+
+# 属性名映射：扫描器使用的名称 -> 驱动盘属性名（Attribute.name）
+ATTR_NAME_MAP = {
+    "生命值": "生命值", "hp": "生命值",
+    "生命值百分比": "生命值百分比", "生命值%": "生命值百分比", "hp_": "生命值百分比",
+    "攻击力": "攻击力", "atk": "攻击力",
+    "攻击力百分比": "攻击力百分比", "攻击力%": "攻击力百分比", "atk_": "攻击力百分比",
+    "防御力": "防御力", "def": "防御力",
+    "防御力百分比": "防御力百分比", "防御力%": "防御力百分比", "def_": "防御力百分比",
+    "暴击率": "暴击率", "crit_": "暴击率",
+    "暴击伤害": "暴击伤害", "crit_dmg_": "暴击伤害",
+    "异常精通": "异常精通", "anomprof": "异常精通",
+    "异常掌控": "异常掌控", "anommas_": "异常掌控",
+    "穿透率": "穿透率", "penratio_": "穿透率",
+    "穿透值": "穿透力", "穿透力": "穿透力", "pen": "穿透力",
+    "冲击力": "冲击力", "impact_": "冲击力",
+    "能量自动回复": "能量自动回复", "enerregen_": "能量自动回复",
+    "物理伤害加成": "物理伤害加成", "physical_dmg_": "物理伤害加成",
+    "火属性伤害加成": "火属性伤害加成", "fire_dmg_": "火属性伤害加成",
+    "冰属性伤害加成": "冰属性伤害加成", "ice_dmg_": "冰属性伤害加成",
+    "电属性伤害加成": "电属性伤害加成", "electric_dmg_": "电属性伤害加成",
+    "以太伤害加成": "以太伤害加成", "ether_dmg_": "以太伤害加成",
+}
+
+# 字段别名：规范名 -> 可接受的字段名
+FIELD_ALIASES = {
+    "slot": ("slot", "slotKey", "槽位"),
+    "set": ("set", "set_id", "setKey", "套装"),
+    "main": ("main", "main_stat", "mainStatKey", "主属性"),
+    "level": ("level", "等级"),
+    "lock": ("lock", "locked", "锁定"),
+    "substats": ("substats", "subs", "副属性"),
+}
+SUB_NAME_KEYS = ("key", "name", "属性")
+SUB_UPGRADE_KEYS = ("upgrades", "rolls", "强化次数")
+
+JSON_ARRAY_KEYS = ("discs", "driveDiscs", "items", "data", "驱动盘")
+# 单个 JSON 元素的最大长度（字符），超过时视为格式错误，避免把整个文件读入内存
+MAX_ELEMENT_SIZE = 1 << 20
+
+MAX_LEVEL = 15
+MAX_TOTAL_UPGRADES = 5
+
+
+class RowError(ValueError):
+    """单行数据不合法"""
+
+
+@dataclass
+class ImportReport:
+    """导入结果"""
+    total_rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    rejections: List[Tuple[int, str]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def format_summary(self) -> str:
+        return (f"共 {self.total_rows} 行，导入 {self.imported}，拒绝 {self.rejected}，"
+                f"耗时 {self.elapsed_seconds:.2f}s")
+
+
+def _field(row: Dict[str, Any], name: str, default=None):
+    for alias in FIELD_ALIASES[name]:
+        if alias in row and row[alias] not in (None, ""):
+            return row[alias]
+    return default
+
+
+def _normalize_name(name: Any) -> str:
+    return str(name).strip().replace(" ", "")
+
+
+def _to_int(value: Any, what: str) -> int:
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise RowError(f"{what}不是整数: {value!r}") from None
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y", "是")
+
+
+class DiscRowConverter:
+    """把一行原始数据转换为编码所需的各字段，并按 SlotConfig 校验"""
+
+    def __init__(self, set_names: Optional[Dict[str, int]] = None, known_set_ids=None,
+                 slot_config: Optional[SlotConfig] = None):
+        slot_config = slot_config or SlotConfig()
+        self.set_names = {_normalize_name(name): set_id for name, set_id in (set_names or {}).items()}
+        self.known_set_ids = set(known_set_ids) if known_set_ids is not None else None
+        self.main_by_slot = {slot: {attr.name: codec.main_stat_code(attr) for attr in attributes}
+                             for slot, attributes in slot_config.slot_main_attributes.items()}
+        self.sub_codes = {attr.name: codec.sub_stat_code(attr) for attr in GearSubAttributes.definitions()}
+        self._alias = {_normalize_name(key).lower(): value for key, value in ATTR_NAME_MAP.items()}
+
+    def attribute_name(self, raw: Any) -> str:
+        name = self._alias.get(_normalize_name(raw).lower())
+        if name is None:
+            raise RowError(f"未知属性名: {raw!r}")
+        return name
+
+    def set_id(self, raw: Any) -> int:
+        text = _normalize_name(raw)
+        if text.isdigit():
+            set_id = int(text)
+        elif text in self.set_names:
+            set_id = self.set_names[text]
+        else:
+            raise RowError(f"未知套装: {raw!r}")
+        if self.known_set_ids is not None and set_id not in self.known_set_ids:
+            raise RowError(f"未知套装ID: {set_id}")
+        if not 0 < set_id < 1 << codec.SET_BITS:
+            raise RowError(f"套装ID超出范围: {set_id}")
+        return set_id
+
+    def convert(self, row: Dict[str, Any], substats: List[Tuple[Any, Any]]) -> Tuple[int, ...]:
+        """返回 (槽位索引, 等级, 主属性编码, 套装ID, 锁定, 副属性编码列表, 强化次数列表)"""
+        slot = _to_int(_field(row, "slot", ""), "槽位")
+        if not 1 <= slot <= len(self.main_by_slot):
+            raise RowError(f"槽位超出范围 1-{len(self.main_by_slot)}: {slot}")
+        slot_index = slot - 1
+
+        main_raw = _field(row, "main")
+        if main_raw is None:
+            raise RowError("缺少主属性")
+        main_name = self.attribute_name(main_raw)
+        main_code = self.main_by_slot[slot_index].get(main_name)
+        if main_code is None:
+            raise RowError(f"槽位{slot}不能使用主属性 {main_name}")
+
+        level = _to_int(_field(row, "level", MAX_LEVEL), "等级")
+        if not 0 <= level <= MAX_LEVEL:
+            raise RowError(f"等级超出范围 0-{MAX_LEVEL}: {level}")
+
+        set_raw = _field(row, "set")
+        if set_raw is None:
+            raise RowError("缺少套装")
+        set_id = self.set_id(set_raw)
+
+        if len(substats) > codec.SUB_STAT_COUNT:
+            raise RowError(f"副属性超过{codec.SUB_STAT_COUNT}个")
+        sub_codes, sub_upgrades = [], []
+        for raw_name, raw_upgrades in substats:
+            name = self.attribute_name(raw_name)
+            code = self.sub_codes.get(name)
+            if code is None:
+                raise RowError(f"{name} 不是副属性")
+            if name == main_name:
+                raise RowError(f"副属性与主属性重复: {name}")
+            if code in sub_codes:
+                raise RowError(f"副属性重复: {name}")
+            upgrades = _to_int(raw_upgrades if raw_upgrades not in (None, "") else 0, "强化次数")
+            if not 0 <= upgrades <= MAX_TOTAL_UPGRADES:
+                raise RowError(f"强化次数超出范围 0-{MAX_TOTAL_UPGRADES}: {upgrades}")
+            sub_codes.append(code)
+            sub_upgrades.append(upgrades)
+        if sum(sub_upgrades) > MAX_TOTAL_UPGRADES:
+            raise RowError(f"副属性强化次数合计超过{MAX_TOTAL_UPGRADES}")
+
+        locked = _to_bool(_field(row, "lock", False))
+        return slot_index, level, main_code, set_id, locked, sub_codes, sub_upgrades
+
+
+def _json_substats(row: Dict[str, Any]) -> List[Tuple[Any, Any]]:
+    substats = _field(row, "substats", [])
+    if not isinstance(substats, list):
+        raise RowError("副属性字段不是数组")
+    result = []
+    for item in substats:
+        if not isinstance(item, dict):
+            raise RowError(f"副属性格式错误: {item!r}")
+        name = next((item[key] for key in SUB_NAME_KEYS if item.get(key) not in (None, "")), None)
+        if name is None:
+            continue
+        result.append((name, next((item[key] for key in SUB_UPGRADE_KEYS if key in item), 0)))
+    return result
+
+
+def _csv_substats(row: Dict[str, Any]) -> List[Tuple[Any, Any]]:
+    result = []
+    for index in range(1, codec.SUB_STAT_COUNT + 2):
+        name = row.get(f"sub{index}") or row.get(f"副属性{index}")
+        if name:
+            result.append((name, row.get(f"sub{index}_upgrades") or row.get(f"副属性{index}强化次数") or 0))
+    return result
+
+
+def iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """流式解析 JSON 数组中的元素（顶层为数组，或为包含数组的对象）"""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
+
+    def decode_value() -> Any:
+        nonlocal position
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # 值恰好结束在缓冲区末尾时可能是被截断的数字，读入更多内容后重新解析
+                if end < len(buffer) or eof:
+                    position = end
+                    return value
+            except json.JSONDecodeError:
+                if eof or len(buffer) - position > MAX_ELEMENT_SIZE:
+                    raise
+            if not fill():
+                value, position = decoder.raw_decode(buffer, position)
+                return value
+
+    def expect(char: str):
+        nonlocal position
+        if skip_whitespace() != char:
+            raise ValueError(f"JSON格式错误: 需要 {char!r}，位置附近内容 {buffer[position:position + 20]!r}")
+        position += 1
+
+    first = skip_whitespace()
+    if first == "{":
+        position += 1
+        while True:
+            if skip_whitespace() == "}":
+                raise ValueError(f"JSON对象中没有驱动盘数组（支持的键: {', '.join(JSON_ARRAY_KEYS)}）")
+            key = decode_value()
+            expect(":")
+            if key in JSON_ARRAY_KEYS and skip_whitespace() == "[":
+                break
+            decode_value()
+            if skip_whitespace() == ",":
+                position += 1
+    expect("[")
+
+    if skip_whitespace() == "]":
+        return
+    while True:
+        yield decode_value()
+        separator = skip_whitespace()
+        position += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON格式错误: 数组元素之间需要 ','，实际为 {separator!r}")
+
+
+def iter_rows(path: Path) -> Iterator[Tuple[int, Any, List[Tuple[Any, Any]]]]:
+    """按文件类型逐行读取，产出 (行号, 原始行, 副属性读取函数)
+
+    JSON 的行号为数组下标（从1开始），CSV 的行号为文件行号（表头为第1行）；
+    JSON Lines 产出未解析的文本行（读取函数为 None），解析失败按单行拒绝处理。
+    """
+    suffix = path.suffix.lower()
+    with open(path, "r", encoding="utf-8-sig", newline="" if suffix == ".csv" else None) as f:
+        if suffix == ".csv":
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row, _csv_substats
+        elif suffix in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, line, None
+        else:
+            for index, row in enumerate(iter_json_array(f), start=1):
+                yield index, row, _json_substats
+
+
+def load_set_names(equipment_file: Path) -> Dict[str, int]:
+    """从驱动盘数据文件读取 套装名 -> 套装ID"""
+    if not equipment_file.exists():
+        return {}
+    with open(equipment_file, "r", encoding="utf-8") as f:
+        equipment = json.load(f)
+    return {info.get("name", ""): int(set_id) for set_id, info in equipment.items() if info.get("name")}
+
+
+class InventoryImporter:
+    """流式导入驱动盘库存"""
+
+    def __init__(self, converter: Optional[DiscRowConverter] = None, chunk_size: int = 10000,
+                 max_rejections: int = 100):
+        self.converter = converter or DiscRowConverter()
+        self.chunk_size = chunk_size
+        self.max_rejections = max_rejections
+
+    def import_file(self, source: Union[str, Path], inventory_path: Union[str, Path], append: bool = False,
+                    rejects_path: Optional[Union[str, Path]] = None) -> ImportReport:
+        """导入 source 到库存文件 inventory_path（append 为真时追加到已有库存）"""
+        source = Path(source)
+        report = ImportReport()
+        start = time.perf_counter()
+        rejects_file = open(rejects_path, "w", encoding="utf-8", newline="") if rejects_path else None
+        rejects_writer = csv.writer(rejects_file) if rejects_file else None
+        if rejects_writer:
+            rejects_writer.writerow(["row", "reason"])
+
+        try:
+            with InventoryWriter(inventory_path, append=append) as writer:
+                chunk: List[Tuple[int, ...]] = []
+                for row_number, row, substats_reader in iter_rows(source):
+                    report.total_rows += 1
+                    try:
+                        if substats_reader is None:
+                            try:
+                                row = json.loads(row)
+                            except json.JSONDecodeError as e:
+                                raise RowError(f"JSON格式错误: {e.msg}") from None
+                            substats_reader = _json_substats
+                        if not isinstance(row, dict):
+                            raise RowError("不是对象")
+                        chunk.append(self.converter.convert(row, substats_reader(row)))
+                    except RowError as e:
+                        report.rejected += 1
+                        if len(report.rejections) < self.max_rejections:
+                            report.rejections.append((row_number, str(e)))
+                        if rejects_writer:
+                            rejects_writer.writerow([row_number, str(e)])
+                        continue
+
+                    if len(chunk) >= self.chunk_size:
+                        self._flush(writer, chunk, report)
+                self._flush(writer, chunk, report)
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    def _flush(writer: InventoryWriter, chunk: List[Tuple[int, ...]], report: ImportReport):
+        if not chunk:
+            return
+        slot_index, level, main_stat, set_id, locked, sub_codes, sub_upgrades = zip(*chunk)
+        padding = codec.SUB_STAT_COUNT
+        sub_stats = [list(codes) + [0] * (padding - len(codes)) for codes in sub_codes]
+        sub_rolls = [list(rolls) + [0] * (padding - len(rolls)) for rolls in sub_upgrades]
+        writer.append_codes(codec.pack(slot_index, level, main_stat, set_id, sub_stats, sub_rolls), locked)
+        report.imported += len(chunk)
+        chunk.clear()
@@ -0,0 +1,331 @@
+# src/inventory/store.py
+"""驱动盘库存 - 列式存储 + 内存映射持久化
+
+每列一个定长数组：
+    slot       uint8   槽位索引
+    set_id     uint16  套装ID
+    main_stat  uint8   主属性编码（见 codec.MAIN_STAT_CODES）
+    level      uint8   主属性等级
+    sub_rolls  uint8   形状 (n, 10)，按副属性编码排列的命中次数：0 表示没有该副属性，
+                       k 表示有该副属性且强化了 k-1 次（副属性值 = 成长值 × k）
+    locked     uint8   锁定标记
+
+文件格式：64 字节文件头，之后各列依次存放，每列按 64 字节对齐。
+保存时按 (槽位, 套装, 主属性) 排序。在已排序的库存上按槽位、槽位+套装、槽位+套装+主属性筛选
+得到的是内存映射上的连续切片，不复制数据；其余组合（只按套装/主属性、锁定状态）会生成行号数组，
+访问列时按行号取值（复制）。
+"""
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.inventory import codec
+from src.models.gear_models import GearPiece
+
+INVENTORY_MAGIC = b"ZZZINV\x00\x00"
+INVENTORY_FORMAT_VERSION = 1
+
+# 文件头：魔数、格式版本、标志位、驱动盘数量、副属性列数
+_HEADER = struct.Struct("<8sIIQI")
+_HEADER_SIZE = 64
+_ALIGNMENT = 64
+FLAG_SORTED = 1
+_CHUNK_ROWS = 65536
+
+SUB_STAT_TYPES = len(codec.SUB_STAT_CODES)
+
+# 列名 -> (数据类型, 每行形状)
+COLUMNS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    "slot": ("u1", ()),
+    "set_id": ("<u2", ()),
+    "main_stat": ("u1", ()),
+    "level": ("u1", ()),
+    "sub_rolls": ("u1", (SUB_STAT_TYPES,)),
+    "locked": ("u1", ()),
+}
+
+Rows = Union[slice, np.ndarray]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _column_layout(count: int) -> List[Tuple[str, np.dtype, Tuple[int, ...], int]]:
+    """各列在文件中的 (列名, 数据类型, 形状, 偏移)"""
+    layout, offset = [], _HEADER_SIZE
+    for name, (dtype, row_shape) in COLUMNS.items():
+        dtype = np.dtype(dtype)
+        shape = (count,) + row_shape
+        layout.append((name, dtype, shape, offset))
+        offset = _aligned(offset + dtype.itemsize * int(np.prod(shape)))
+    return layout
+
+
+def _header_bytes(count: int, flags: int = 0) -> bytes:
+    return _HEADER.pack(INVENTORY_MAGIC, INVENTORY_FORMAT_VERSION, flags, count, SUB_STAT_TYPES).ljust(_HEADER_SIZE, b"\x00")
+
+
+def empty_columns(count: int = 0) -> Dict[str, np.ndarray]:
+    """创建全零的列"""
+    return {name: np.zeros((count,) + row_shape, dtype=dtype) for name, (dtype, row_shape) in COLUMNS.items()}
+
+
+def columns_from_codes(codes, locked=None) -> Dict[str, np.ndarray]:
+    """64 位编码 -> 列"""
+    unpacked = codec.unpack(codes)
+    count = len(unpacked)
+    columns = empty_columns(count)
+    columns["slot"][:] = unpacked.slot_index
+    columns["set_id"][:] = unpacked.set_id
+    columns["main_stat"][:] = unpacked.main_stat
+    columns["level"][:] = unpacked.level
+    if locked is not None:
+        columns["locked"][:] = np.asarray(locked, dtype=np.uint8)
+
+    present = unpacked.sub_stats > 0
+    rows = np.broadcast_to(np.arange(count)[:, None], present.shape)[present]
+    columns["sub_rolls"][rows, unpacked.sub_stats[present].astype(np.intp) - 1] = unpacked.sub_rolls[present] + 1
+    return columns
+
+
+def codes_from_columns(columns: Dict[str, np.ndarray], rows: Rows = slice(None)) -> np.ndarray:
+    """列 -> 64 位编码（副属性按编码升序排列）"""
+    sub_rolls = np.asarray(columns["sub_rolls"][rows])
+    present = sub_rolls > 0
+    # 每行前4个存在的副属性编码（稳定排序保持编码升序）
+    order = np.argsort(~present, axis=1, kind="stable")[:, :codec.SUB_STAT_COUNT]
+    taken = np.take_along_axis(present, order, axis=1)
+    sub_stats = np.where(taken, order + 1, 0)
+    rolls = np.where(taken, np.take_along_axis(sub_rolls, order, axis=1).astype(np.int64) - 1, 0)
+    return codec.pack(columns["slot"][rows], columns["level"][rows], columns["main_stat"][rows],
+                      columns["set_id"][rows], sub_stats, rolls)
+
+
+def _sort_order(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """按 (槽位, 套装, 主属性) 排序的行序"""
+    return np.lexsort((columns["main_stat"], columns["set_id"], columns["slot"]))
+
+
+class InventoryView:
+    """库存的筛选视图
+
+    rows 为切片时列访问直接返回内存映射上的切片；为下标数组时在访问列时才按下标取值。
+    """
+
+    def __init__(self, inventory: "DiscInventory", rows: Rows):
+        self.inventory = inventory
+        self.rows = rows
+
+    def __len__(self) -> int:
+        if isinstance(self.rows, slice):
+            return len(range(*self.rows.indices(len(self.inventory))))
+        return len(self.rows)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.inventory.columns[name][self.rows]
+
+    def row_indices(self) -> np.ndarray:
+        """视图对应的库存行号"""
+        if isinstance(self.rows, slice):
+            return np.arange(len(self.inventory))[self.rows]
+        return self.rows
+
+    def filter(self, set_id: Optional[int] = None, main_stat: Optional[int] = None,
+               locked: Optional[bool] = None) -> "InventoryView":
+        """在当前视图上继续按套装/主属性编码/锁定状态筛选"""
+        mask = np.ones(len(self), dtype=bool)
+        if set_id is not None:
+            mask &= self.column("set_id") == set_id
+        if main_stat is not None:
+            mask &= self.column("main_stat") == main_stat
+        if locked is not None:
+            mask &= self.column("locked").astype(bool) == locked
+        if mask.all():
+            return self
+        return InventoryView(self.inventory, self.row_indices()[mask])
+
+    def codes(self) -> np.ndarray:
+        return codes_from_columns(self.inventory.columns, self.rows)
+
+    def to_pieces(self) -> List[GearPiece]:
+        """转换为 GearPiece 列表（供现有计算器批量评估）"""
+        return codec.decode_pieces(self.codes())
+
+
+class DiscInventory:
+    """驱动盘库存（列式）"""
+
+    def __init__(self, columns: Optional[Dict[str, np.ndarray]] = None, sorted_by_slot: bool = False,
+                 path: Optional[Path] = None):
+        self.columns = columns if columns is not None else empty_columns()
+        self.sorted_by_slot = sorted_by_slot
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.columns["slot"])
+
+    @classmethod
+    def from_codes(cls, codes, locked=None) -> "DiscInventory":
+        return cls(columns_from_codes(codes, locked))
+
+    @classmethod
+    def from_pieces(cls, pieces: Sequence[GearPiece], locked=None) -> "DiscInventory":
+        return cls.from_codes(codec.encode_pieces(pieces), locked)
+
+    def append_codes(self, codes, locked=None):
+        """追加驱动盘（内存中的库存；大文件导入请使用 InventoryWriter）"""
+        new_columns = columns_from_codes(codes, locked)
+        self.columns = {name: np.concatenate([self.columns[name], new_columns[name]]) for name in COLUMNS}
+        self.sorted_by_slot = False
+
+    def all(self) -> InventoryView:
+        return InventoryView(self, slice(0, len(self)))
+
+    def view(self, slot: Optional[int] = None, set_id: Optional[int] = None, main_stat: Optional[int] = None,
+             locked: Optional[bool] = None) -> InventoryView:
+        """按槽位/套装/主属性编码/锁定状态筛选（已排序时槽位及其后的套装、主属性筛选为切片）"""
+        if slot is None:
+            base = self.all()
+        elif self.sorted_by_slot:
+            # 槽位内套装有序、同套装内主属性有序，逐级二分得到连续区间
+            keys = [("slot", slot), ("set_id", set_id)]
+            if set_id is not None:
+                keys.append(("main_stat", main_stat))
+                set_id = main_stat = None
+            start, stop = 0, len(self)
+            for name, value in keys:
+                if value is None:
+                    break
+                column = self.columns[name][start:stop]
+                start, stop = (start + int(np.searchsorted(column, value, "left")),
+                               start + int(np.searchsorted(column, value, "right")))
+            base = InventoryView(self, slice(start, stop))
+        else:
+            base = InventoryView(self, np.flatnonzero(self.columns["slot"] == slot))
+        return base.filter(set_id, main_stat, locked)
+
+    def set_locked(self, rows: Rows, locked: bool = True):
+        """修改锁定标记（以可写方式打开的文件会直接写回）"""
+        self.columns["locked"][rows] = 1 if locked else 0
+
+    def flush(self):
+        for column in self.columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def save(self, path: Union[str, Path], sort: bool = True):
+        """写入二进制文件（先写临时文件再替换，sort 为真时按槽位/套装/主属性排序）"""
+        path = Path(path)
+        order = _sort_order(self.columns) if sort else None
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            write_inventory(f, self.columns, len(self), FLAG_SORTED if sort else 0, order)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def open(cls, path: Union[str, Path], writable: bool = False) -> "DiscInventory":
+        """以内存映射方式打开（writable 为真时可修改锁定标记并写回）"""
+        path = Path(path)
+        with open(path, "rb") as f:
+            magic, version, flags, count, sub_types = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != INVENTORY_MAGIC:
+            raise ValueError(f"不是驱动盘库存文件: {path}")
+        if version != INVENTORY_FORMAT_VERSION:
+            raise ValueError(f"不支持的库存文件版本: {version}")
+        if sub_types != SUB_STAT_TYPES:
+            raise ValueError(f"副属性列数不匹配: 文件 {sub_types}，当前 {SUB_STAT_TYPES}")
+
+        mode = "r+" if writable else "r"
+        if count == 0:
+            return cls(empty_columns(), bool(flags & FLAG_SORTED), path)
+        columns = {name: np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+                   for name, dtype, shape, offset in _column_layout(count)}
+        return cls(columns, bool(flags & FLAG_SORTED), path)
+
+
+def write_inventory(f, columns: Dict[str, np.ndarray], count: int, flags: int = 0,
+                    order: Optional[np.ndarray] = None):
+    """按文件格式写出文件头和各列（给出 order 时按该行序分块写出，不复制整列）"""
+    f.write(_header_bytes(count, flags))
+    for name, dtype, shape, offset in _column_layout(count):
+        f.write(b"\x00" * (offset - f.tell()))
+        if order is None:
+            f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            continue
+        for start in range(0, count, _CHUNK_ROWS):
+            f.write(np.ascontiguousarray(columns[name][order[start:start + _CHUNK_ROWS]], dtype=dtype).tobytes())
+
+
+class InventoryWriter:
+    """分块写入库存文件，内存占用与总行数无关
+
+    各列的分块先写入临时文件，close() 时按 (槽位, 套装, 主属性) 排序写出最终格式并标记为已排序；
+    排序只在内存中保留一份行序数组，各列从临时文件内存映射后分块写出。
+    append=True 时先复制已有文件中的驱动盘。
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = False):
+        self.path = Path(path)
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._spool_dir = tempfile.mkdtemp(prefix="zzz_inventory_", dir=self.path.parent)
+        self._spools = {name: open(os.path.join(self._spool_dir, name), "wb") for name in COLUMNS}
+
+        if append and self.path.exists():
+            existing = DiscInventory.open(self.path)
+            for start in range(0, len(existing), _CHUNK_ROWS):
+                self.append_columns({name: column[start:start + _CHUNK_ROWS]
+                                     for name, column in existing.columns.items()})
+            del existing
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        for name, (dtype, _) in COLUMNS.items():
+            self._spools[name].write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        self.count += len(columns["slot"])
+
+    def append_codes(self, codes, locked=None):
+        self.append_columns(columns_from_codes(codes, locked))
+
+    def close(self):
+        """排序后写出各列并替换目标文件"""
+        try:
+            for spool in self._spools.values():
+                spool.close()
+            columns = self._spooled_columns()
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(temp_path, "wb") as f:
+                write_inventory(f, columns, self.count, FLAG_SORTED, _sort_order(columns))
+            del columns
+            os.replace(temp_path, self.path)
+        finally:
+            self.discard()
+
+    def _spooled_columns(self) -> Dict[str, np.ndarray]:
+        """以内存映射方式读取已写入临时文件的各列"""
+        if self.count == 0:
+            return empty_columns()
+        return {name: np.memmap(os.path.join(self._spool_dir, name), dtype=dtype, mode="r",
+                                shape=(self.count,) + row_shape)
+                for name, (dtype, row_shape) in COLUMNS.items()}
+
+    def discard(self):
+        """丢弃临时文件（不修改目标文件）"""
+        for spool in self._spools.values():
+            spool.close()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
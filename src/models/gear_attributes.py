@@ -1,19 +1,54 @@
-from typing import Union, List
+from typing import Dict, List, Tuple, Union
 
 from src.models.attributes import GearAttributeValueType, AttributeType
 
+_PERCENTAGE_VALUE_TYPES = frozenset((
+    GearAttributeValueType.PERCENTAGE,
+    GearAttributeValueType.RATE_PERCENTAGE,
+    GearAttributeValueType.DMG_BONUS_PERCENTAGE
+))
+
+# 已注册的属性定义：参数 -> 定义，以及按 id 排列的列表
+_DEFINITIONS: Dict[tuple, "Attribute"] = {}
+_DEFINITIONS_BY_ID: List["Attribute"] = []
+
 
 class Attribute:
-    """驱动盘属性的基础类"""
+    """驱动盘属性定义（不可变，全进程共享）
+
+    相同参数只会创建一个实例，id 为注册顺序的小整数。
+    驱动盘只保存定义引用和强化次数，不再为每个驱动盘复制名称、类型等字段。
+    """
+
+    __slots__ = ("name", "attribute_type", "attribute_value_type", "base", "growth", "id")
+
+    def __new__(cls, name: str = "", attribute_type: AttributeType = None,
+                attribute_value_type: GearAttributeValueType = None,
+                base: float = 0.0, growth: Union[float, int] = 0):
+        key = (name, attribute_type, attribute_value_type, base, growth)
+        definition = _DEFINITIONS.get(key)
+        if definition is None:
+            definition = object.__new__(cls)
+            for slot, value in zip(cls.__slots__, key + (len(_DEFINITIONS_BY_ID),)):
+                object.__setattr__(definition, slot, value)
+            _DEFINITIONS[key] = definition
+            _DEFINITIONS_BY_ID.append(definition)
+        return definition
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"属性定义不可修改: {self.name}.{key}")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"属性定义不可修改: {self.name}.{key}")
 
-    def __init__(self, name: str = "", attribute_type: AttributeType = None,
-                 attribute_value_type: GearAttributeValueType = None,
-                 base: float = 0.0, growth: Union[float, int] = 0):
-        self.name = name
-        self.attribute_type = attribute_type
-        self.attribute_value_type = attribute_value_type
-        self.base = base
-        self.growth = growth
+    def __reduce__(self):
+        # 反序列化时重新走注册表，保证同一进程内仍是同一个实例
+        return Attribute, (self.name, self.attribute_type, self.attribute_value_type, self.base, self.growth)
+
+    @staticmethod
+    def by_id(definition_id: int) -> "Attribute":
+        """按 id 取回属性定义"""
+        return _DEFINITIONS_BY_ID[definition_id]
 
     def calculate_value_at_level(self, level: int) -> float:
         """计算指定等级时的属性值"""
@@ -21,28 +56,55 @@ class Attribute:
 
     def is_percentage_type(self) -> bool:
         """判断是否为百分比类型"""
-        return self.attribute_value_type in [
-            GearAttributeValueType.PERCENTAGE,
-            GearAttributeValueType.RATE_PERCENTAGE,
-            GearAttributeValueType.DMG_BONUS_PERCENTAGE
-        ]
+        return self.attribute_value_type in _PERCENTAGE_VALUE_TYPES
 
     def __repr__(self):
         return f"Attribute(name={self.name}, type={self.attribute_type}, value_type={self.attribute_value_type})"
 
 
-class SubAttribute(Attribute):
-    """驱动盘的副属性类"""
+class SubAttribute:
+    """驱动盘的副属性：共享的属性定义 + 本驱动盘的强化次数"""
+
+    __slots__ = ("definition", "enhancement_level")
+
+    def __init__(self, definition: Attribute, enhancement_level: int = 0):
+        self.definition = definition
+        self.enhancement_level = enhancement_level
+
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    @property
+    def attribute_type(self) -> AttributeType:
+        return self.definition.attribute_type
+
+    @property
+    def attribute_value_type(self) -> GearAttributeValueType:
+        return self.definition.attribute_value_type
 
-    def __init__(self, name: str = "", attribute_type: AttributeType = None,
-                 attribute_value_type: GearAttributeValueType = None,
-                 base: float = 0.0, growth: Union[float, int] = 0):
-        super().__init__(name, attribute_type, attribute_value_type, base, growth)
-        self.enhancement_level: int = 0
+    @property
+    def base(self) -> float:
+        return self.definition.base
+
+    @property
+    def growth(self) -> Union[float, int]:
+        return self.definition.growth
+
+    def calculate_value_at_level(self, level: int) -> float:
+        """计算指定等级时的属性值"""
+        return self.definition.base + level * self.definition.growth
 
     def calculate_value_at_enhancement_level(self) -> float:
         """计算强化等级时的属性值"""
-        return self.base + self.enhancement_level * self.growth
+        return self.definition.base + self.enhancement_level * self.definition.growth
+
+    def is_percentage_type(self) -> bool:
+        """判断是否为百分比类型"""
+        return self.definition.attribute_value_type in _PERCENTAGE_VALUE_TYPES
+
+    def __repr__(self):
+        return f"SubAttribute(name={self.name}, enhancement_level={self.enhancement_level})"
 
 
 # 主属性工厂函数
@@ -89,37 +151,37 @@ def create_main_attribute_dmg_bonus_percentage(name: str, attribute_type: Attrib
 # 副属性工厂函数
 def create_sub_attribute_numeric(name: str, attribute_type: AttributeType, base: float, growth: float) -> SubAttribute:
     """创建数值型副属性"""
-    return SubAttribute(
+    return SubAttribute(Attribute(
         name=name,
         attribute_type=attribute_type,
         attribute_value_type=GearAttributeValueType.NUMERIC_VALUE,
         base=base,
         growth=growth
-    )
+    ))
 
 def create_sub_attribute_percentage(name: str, attribute_type: AttributeType, base: float, growth: float) -> SubAttribute:
     """创建百分比型副属性"""
-    return SubAttribute(
+    return SubAttribute(Attribute(
         name=name,
         attribute_type=attribute_type,
         attribute_value_type=GearAttributeValueType.PERCENTAGE,
         base=base,
         growth=growth
-    )
+    ))
 
 def create_sub_attribute_rate_percentage(name: str, attribute_type: AttributeType, base: float, growth: float) -> SubAttribute:
     """创建比率百分比型副属性"""
-    return SubAttribute(
+    return SubAttribute(Attribute(
         name=name,
         attribute_type=attribute_type,
         attribute_value_type=GearAttributeValueType.RATE_PERCENTAGE,
         base=base,
         growth=growth
-    )
+    ))
 
 
 class GearMainAttributes:
-    """驱动盘主属性集合，每个属性都是独立的实例"""
+    """驱动盘主属性集合（共享的属性定义）"""
 
     # 生命值（数值和百分比是分开的）
     hp_numeric = create_main_attribute_numeric("生命值", AttributeType.HP, 550, 110)
@@ -168,60 +230,80 @@ class GearMainAttributes:
 
 
 class GearSubAttributes:
-    """驱动盘副属性集合 - 提供工厂方法而不是共享实例"""
+    """驱动盘副属性集合 - 定义全进程共享，get_* 返回带独立强化次数的新副属性"""
+
+    hp_numeric = Attribute("生命值", AttributeType.HP, GearAttributeValueType.NUMERIC_VALUE, 112, 112)
+    hp_percentage = Attribute("生命值百分比", AttributeType.HP, GearAttributeValueType.PERCENTAGE, 0.03, 0.03)
+    attack_numeric = Attribute("攻击力", AttributeType.ATK, GearAttributeValueType.NUMERIC_VALUE, 19, 19)
+    attack_percentage = Attribute("攻击力百分比", AttributeType.ATK, GearAttributeValueType.PERCENTAGE, 0.03, 0.03)
+    defence_numeric = Attribute("防御力", AttributeType.DEF, GearAttributeValueType.NUMERIC_VALUE, 15, 15)
+    defence_percentage = Attribute("防御力百分比", AttributeType.DEF, GearAttributeValueType.PERCENTAGE, 0.048, 0.048)
+    crit_rate = Attribute("暴击率", AttributeType.CRIT_RATE, GearAttributeValueType.RATE_PERCENTAGE, 0.024, 0.024)
+    crit_dmg = Attribute("暴击伤害", AttributeType.CRIT_DMG, GearAttributeValueType.RATE_PERCENTAGE, 0.048, 0.048)
+    anomaly_proficiency = Attribute("异常精通", AttributeType.ANOMALY_PROFICIENCY,
+                                    GearAttributeValueType.NUMERIC_VALUE, 9, 9)
+    pen = Attribute("穿透力", AttributeType.PEN, GearAttributeValueType.NUMERIC_VALUE, 9, 9)
 
     @staticmethod
     def get_hp_numeric() -> SubAttribute:
-        return create_sub_attribute_numeric("生命值", AttributeType.HP, 112, 112)
+        return SubAttribute(GearSubAttributes.hp_numeric)
 
     @staticmethod
     def get_hp_percentage() -> SubAttribute:
-        return create_sub_attribute_percentage("生命值百分比", AttributeType.HP, 0.03, 0.03)
+        return SubAttribute(GearSubAttributes.hp_percentage)
 
     @staticmethod
     def get_attack_numeric() -> SubAttribute:
-        return create_sub_attribute_numeric("攻击力", AttributeType.ATK, 19, 19)
+        return SubAttribute(GearSubAttributes.attack_numeric)
 
     @staticmethod
     def get_attack_percentage() -> SubAttribute:
-        return create_sub_attribute_percentage("攻击力百分比", AttributeType.ATK, 0.03, 0.03)
+        return SubAttribute(GearSubAttributes.attack_percentage)
 
     @staticmethod
     def get_defence_numeric() -> SubAttribute:
-        return create_sub_attribute_numeric("防御力", AttributeType.DEF, 15, 15)
+        return SubAttribute(GearSubAttributes.defence_numeric)
 
     @staticmethod
     def get_defence_percentage() -> SubAttribute:
-        return create_sub_attribute_percentage("防御力百分比", AttributeType.DEF, 0.048, 0.048)
+        return SubAttribute(GearSubAttributes.defence_percentage)
 
     @staticmethod
     def get_crit_rate() -> SubAttribute:
-        return create_sub_attribute_rate_percentage("暴击率", AttributeType.CRIT_RATE, 0.024, 0.024)
+        return SubAttribute(GearSubAttributes.crit_rate)
 
     @staticmethod
     def get_crit_dmg() -> SubAttribute:
-        return create_sub_attribute_rate_percentage("暴击伤害", AttributeType.CRIT_DMG, 0.048, 0.048)
+        return SubAttribute(GearSubAttributes.crit_dmg)
 
     @staticmethod
     def get_anomaly_proficiency() -> SubAttribute:
-        return create_sub_attribute_numeric("异常精通", AttributeType.ANOMALY_PROFICIENCY, 9, 9)
+        return SubAttribute(GearSubAttributes.anomaly_proficiency)
 
     @staticmethod
     def get_pen() -> SubAttribute:
-        return create_sub_attribute_numeric("穿透力", AttributeType.PEN, 9, 9)
+        return SubAttribute(GearSubAttributes.pen)
+
+    @staticmethod
+    def definitions() -> Tuple[Attribute, ...]:
+        """所有副属性定义（共享实例）"""
+        return _SUB_ATTRIBUTE_DEFINITIONS
 
     @staticmethod
     def get_all_sub_attributes() -> List[SubAttribute]:
-        """获取所有副属性类型的新实例"""
-        return [
-            GearSubAttributes.get_hp_numeric(),
-            GearSubAttributes.get_hp_percentage(),
-            GearSubAttributes.get_attack_numeric(),
-            GearSubAttributes.get_attack_percentage(),
-            GearSubAttributes.get_defence_numeric(),
-            GearSubAttributes.get_defence_percentage(),
-            GearSubAttributes.get_crit_rate(),
-            GearSubAttributes.get_crit_dmg(),
-            GearSubAttributes.get_anomaly_proficiency(),
-            GearSubAttributes.get_pen()
-        ]
+        """获取所有副属性类型的新实例（强化次数为0）"""
+        return [SubAttribute(definition) for definition in _SUB_ATTRIBUTE_DEFINITIONS]
+
+
+_SUB_ATTRIBUTE_DEFINITIONS = (
+    GearSubAttributes.hp_numeric,
+    GearSubAttributes.hp_percentage,
+    GearSubAttributes.attack_numeric,
+    GearSubAttributes.attack_percentage,
+    GearSubAttributes.defence_numeric,
+    GearSubAttributes.defence_percentage,
+    GearSubAttributes.crit_rate,
+    GearSubAttributes.crit_dmg,
+    GearSubAttributes.anomaly_proficiency,
+    GearSubAttributes.pen
+)
@@ -1,24 +1,59 @@
 """驱动盘业务模型"""
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from src.models.gear_attributes import Attribute, SubAttribute
 from src.models.base_stats import BaseStats
 
 
-@dataclass
 class GearPiece:
-    """单个驱动盘"""
-    slot_index: int = 0
-    level: int = 0
-    main_attribute :Optional[Attribute] = None
-    sub_attributes: List[SubAttribute] = List[SubAttribute]
-
-    def __post_init__(self):
-        """确保列表不为空"""
-        if self.sub_attributes is None:
-            self.sub_attributes = []
+    """单个驱动盘
+
+    主属性保存共享的属性定义；副属性按 (定义id, 强化次数) 打包为 bytes，
+    访问 sub_attributes 时再组装成 SubAttribute，大量驱动盘常驻内存时开销很小。
+    set_id 为所属套装（0 表示未知，界面配置的驱动盘由 GearSetSelection 决定套装）。
+    slot_index 为 0-based 槽位（0-5，界面上的“驱动盘 1”对应 0），与库存文件的 slot 列一致。
+    """
+
+    __slots__ = ("slot_index", "level", "main_attribute", "_sub_rolls", "set_id")
+
+    def __init__(self, slot_index: int = 0, level: int = 0, main_attribute: Optional[Attribute] = None,
+                 sub_attributes: Optional[Iterable[SubAttribute]] = None, set_id: int = 0):
+        self.slot_index = slot_index
+        self.level = level
+        self.main_attribute = main_attribute
+        self.sub_attributes = sub_attributes or []
+        self.set_id = set_id
+
+    @property
+    def sub_attributes(self) -> List[SubAttribute]:
+        """副属性列表（每次返回新的 SubAttribute，修改它们不会影响驱动盘）"""
+        rolls = self._sub_rolls
+        return [SubAttribute(Attribute.by_id(rolls[i]), rolls[i + 1]) for i in range(0, len(rolls), 2)]
+
+    @sub_attributes.setter
+    def sub_attributes(self, sub_attributes: Iterable[SubAttribute]):
+        rolls = bytearray()
+        for sub_attribute in sub_attributes:
+            if sub_attribute:
+                rolls += bytes((sub_attribute.definition.id, sub_attribute.enhancement_level))
+        self._sub_rolls = bytes(rolls)
+
+    def sub_rolls(self) -> List[Tuple[Attribute, int]]:
+        """副属性 (定义, 强化次数) 列表，不创建 SubAttribute"""
+        rolls = self._sub_rolls
+        return [(Attribute.by_id(rolls[i]), rolls[i + 1]) for i in range(0, len(rolls), 2)]
+
+    def __eq__(self, other):
+        if not isinstance(other, GearPiece):
+            return NotImplemented
+        return (self.slot_index, self.level, self.main_attribute, self._sub_rolls, self.set_id) == \
+            (other.slot_index, other.level, other.main_attribute, other._sub_rolls, other.set_id)
+
+    def __repr__(self):
+        return (f"GearPiece(slot_index={self.slot_index}, level={self.level}, "
+                f"main_attribute={self.main_attribute}, sub_attributes={self.sub_attributes}, set_id={self.set_id})")
 
 
 @dataclass
@@ -0,0 +1,153 @@
+# src/optimizers/anytime.py
+"""随时可停的搜索 - 边搜索边给出更好的解（incumbent），汇报进度，支持协作式取消和时间预算
+
+搜索本身写成生成器，每一步产出一个 SearchStep（新探索的节点数、找到的解、当前上界、已完成比例），
+产出之间就是检查取消和超时的时机。AnytimeRunner 把这些步骤转换为事件流：
+- incumbent: 找到了更好的解
+- progress:  进度（按 progress_interval 节流）
+- done:      结束（complete 搜索完毕 / cancelled 已取消 / timeout 超出时间预算），附带最好的解
+界面在后台线程运行 start()，通过回调把事件放入队列再在主线程中刷新；命令行逐条输出 JSON。
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+class CancelToken:
+    """协作式取消标记：搜索在两步之间检查，可从其他线程（界面、信号处理函数）调用 cancel()"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class SearchStep:
+    """搜索的一步"""
+    nodes: int = 0                      # 本步新探索的节点数
+    score: Optional[float] = None       # 本步找到的解的目标值（没有新解为 None）
+    solution: Any = None
+    bound: Optional[float] = None       # 尚未探索部分的目标值上界（未知为 None）
+    fraction: Optional[float] = None    # 已完成的搜索空间比例 0-1（未知为 None）
+
+
+@dataclass
+class SearchProgress:
+    nodes: int
+    elapsed: float
+    best_score: Optional[float]
+    bound: Optional[float]
+    fraction: Optional[float]
+
+    @property
+    def gap(self) -> Optional[float]:
+        """当前最优解与上界的相对差距"""
+        if self.best_score is None or self.bound is None:
+            return None
+        return max(0.0, self.bound - self.best_score) / max(abs(self.bound), 1e-12)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """按已完成比例估算的剩余秒数"""
+        if not self.fraction or self.fraction <= 0:
+            return None
+        return self.elapsed * (1.0 - self.fraction) / self.fraction
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "elapsed": round(self.elapsed, 3),
+            "best": self.best_score,
+            "bound": self.bound,
+            "gap": self.gap,
+            "fraction": self.fraction,
+            "eta": None if self.eta is None else round(self.eta, 1),
+        }
+
+
+@dataclass
+class SearchEvent:
+    kind: str                           # incumbent | progress | done
+    progress: SearchProgress
+    solution: Any = None                # incumbent / done 时为当前最好的解
+    status: str = ""                    # done 时为 complete | cancelled | timeout
+
+    def to_dict(self, encode_solution: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+        result = {"event": self.kind, **self.progress.to_dict()}
+        if self.status:
+            result["status"] = self.status
+        if self.solution is not None and self.kind != "progress":
+            result["solution"] = encode_solution(self.solution) if encode_solution else self.solution
+        return result
+
+
+class AnytimeRunner:
+    """运行随时可停的搜索（目标值越大越好）"""
+
+    def __init__(self, steps: Iterable[SearchStep], time_budget: Optional[float] = None,
+                 token: Optional[CancelToken] = None, progress_interval: float = 0.5):
+        self.steps = steps
+        self.time_budget = time_budget
+        self.token = token or CancelToken()
+        self.progress_interval = progress_interval
+
+    def cancel(self):
+        self.token.cancel()
+
+    def events(self) -> Iterator[SearchEvent]:
+        started = time.perf_counter()
+        last_report = started
+        nodes, best_score, best, bound, fraction = 0, None, None, None, None
+        status = "complete"
+
+        def progress() -> SearchProgress:
+            return SearchProgress(nodes, time.perf_counter() - started, best_score, bound, fraction)
+
+        iterator = iter(self.steps)
+        try:
+            for step in iterator:
+                nodes += step.nodes
+                if step.bound is not None:
+                    bound = step.bound
+                if step.fraction is not None:
+                    fraction = step.fraction
+                now = time.perf_counter()
+                if step.score is not None and (best_score is None or step.score > best_score):
+                    best_score, best = step.score, step.solution
+                    last_report = now
+                    yield SearchEvent("incumbent", progress(), best)
+                elif now - last_report >= self.progress_interval:
+                    last_report = now
+                    yield SearchEvent("progress", progress())
+                if self.token.cancelled:
+                    status = "cancelled"
+                    break
+                if self.time_budget is not None and now - started >= self.time_budget:
+                    status = "timeout"
+                    break
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+        yield SearchEvent("done", progress(), best, status)
+
+    def run(self, on_event: Optional[Callable[[SearchEvent], None]] = None) -> SearchEvent:
+        """运行到结束，返回 done 事件"""
+        event = None
+        for event in self.events():
+            if on_event:
+                on_event(event)
+        return event
+
+    def start(self, on_event: Callable[[SearchEvent], None]) -> threading.Thread:
+        """在后台线程运行，事件通过回调在后台线程中送出"""
+        thread = threading.Thread(target=self.run, args=(on_event,), name="anytime-search", daemon=True)
+        thread.start()
+        return thread
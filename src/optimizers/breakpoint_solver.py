@@ -0,0 +1,233 @@
+# src/optimizers/breakpoint_solver.py
+"""属性阈值求解 - 找出满足全部阈值（如暴击率 ≥ 70%、异常精通 ≥ 400）所需强化次数最少的
+套装组合、主属性和副属性分配，无法满足时给出最接近的方案
+
+候选为 套装组合 × 槽位4-6主属性，每个候选的副属性由 SubStatAllocator.minimize_rolls 精确求解。
+逐个求解全部候选太慢，按以下方式剪枝：
+1. 只看阈值（和择优目标）涉及的属性：套装/主属性在这些属性上贡献相同的只留一个，被全面压过的直接丢弃
+   （主属性还要区分是否占用了相关副属性）。
+2. 每个候选先算强化次数下界：阈值 j 的副属性贡献 ≤ 各盘系数最大的 4 类副属性各出现一次 + 最大系数 × 强化次数。
+   按下界从小到大求解，下界超过当前最优时停止。
+3. 都无法满足时，按乐观缺口（30 次强化全部给系数最大的副属性）从小到大求解，乐观缺口不小于当前最优时停止。
+   阈值远超可达范围时乐观缺口很松，这一步至多再求解 fallback_limit 个候选，截断时结果标记为非精确。
+"""
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.slot_config import SlotConfig
+from src.models.gear_attributes import Attribute
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.main_stat_solver import FREE_SLOTS
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import STAT_INDEX, StatModel
+from src.optimizers.sub_stat_allocator import SUB_STATS_PER_PIECE, UPGRADES_PER_PIECE, SubStatAllocation, \
+    SubStatAllocator
+
+COMBINATION_TYPES = ("4+2", "2+2+2")
+FALLBACK_LIMIT = 200
+
+
+@dataclass
+class BreakpointResult:
+    """阈值求解结果"""
+    main_attributes: Tuple[Attribute, ...]     # 槽位1-6主属性
+    selection: GearSetSelection
+    allocation: SubStatAllocation
+    thresholds: Dict[str, float]
+    evaluated: int                             # 实际求解副属性的候选数
+    candidates: int                            # 剪枝前的候选数
+    exact: bool = True                         # 无法满足时是否求解完了所有可能更接近的候选
+
+    @property
+    def feasible(self) -> bool:
+        return self.allocation.feasible
+
+    @property
+    def rolls_used(self) -> int:
+        return self.allocation.rolls_used
+
+    @property
+    def final_stats(self) -> Dict[str, float]:
+        return self.allocation.final_stats
+
+    @property
+    def misses(self) -> Dict[str, float]:
+        """未达到的阈值 -> 缺口"""
+        return {name: threshold - self.final_stats[name] for name, threshold in self.thresholds.items()
+                if self.final_stats[name] < threshold - 1e-9}
+
+    def to_pieces(self, level: int = 15) -> List[GearPiece]:
+        return self.allocation.to_pieces(self.main_attributes, level)
+
+    def format_summary(self, set_names: Optional[Mapping[int, str]] = None) -> str:
+        set_names = set_names or {}
+        if self.feasible:
+            head = f"✅ 满足全部阈值，副属性需要强化 {self.rolls_used} 次"
+        else:
+            head = "❌ 无法满足全部阈值，最接近的方案" if self.exact else "❌ 无法满足全部阈值，已求解候选中最接近的方案"
+        lines = [f"{head}（求解 {self.evaluated}/{self.candidates} 个候选）",
+                 f"套装: {self.selection.combination_type} "
+                 + " + ".join(set_names.get(set_id, str(set_id)) for set_id in self.selection.set_ids)]
+        for slot, (main, rolls) in enumerate(zip(self.main_attributes, self.allocation.sub_rolls)):
+            subs = ", ".join(f"{definition.name}+{level}" for definition, level in rolls)
+            lines.append(f"  槽位{slot + 1}: {main.name if main else '-'} | {subs}")
+        for name, threshold in self.thresholds.items():
+            value = self.final_stats[name]
+            lines.append(f"  {name}: {value:.4g} / {threshold:.4g} {'✅' if value >= threshold - 1e-9 else '❌'}")
+        return "\n".join(lines)
+
+
+class BreakpointSolver:
+    """属性阈值求解器"""
+
+    def __init__(self, model: StatModel, slot_config: Optional[SlotConfig] = None,
+                 allocator: Optional[SubStatAllocator] = None):
+        self.model = model
+        self.slot_config = slot_config or SlotConfig()
+        self.allocator = allocator or SubStatAllocator(model)
+
+    def set_candidates(self, set_ids: Optional[Sequence[int]] = None,
+                       combination_types: Sequence[str] = COMBINATION_TYPES) -> List[GearSetSelection]:
+        """全部套装组合：4+2 为有序的两套，2+2+2 为无序的三套"""
+        set_manager = self.model.set_manager
+        if set_ids is None:
+            set_ids = sorted(set_manager.set_effects) if set_manager else []
+        selections = []
+        if "4+2" in combination_types:
+            selections += [GearSetSelection("4+2", list(pair)) for pair in itertools.permutations(set_ids, 2)]
+        if "2+2+2" in combination_types:
+            selections += [GearSetSelection("2+2+2", list(group)) for group in itertools.combinations(set_ids, 3)]
+        return selections or [GearSetSelection("4+2", [])]
+
+    def solve(self, thresholds: Mapping[str, float], objective: Optional[Objective] = None, level: int = 15,
+              set_ids: Optional[Sequence[int]] = None,
+              combination_types: Sequence[str] = COMBINATION_TYPES,
+              fallback_limit: Optional[int] = FALLBACK_LIMIT) -> BreakpointResult:
+        """求强化次数最少的方案，强化次数相同时取 objective 更高的；无法满足时只保证相对缺口之和最小
+
+        fallback_limit 为无法满足时按乐观缺口补充求解的候选数上限（None 表示不限）。
+        """
+        if not thresholds:
+            raise ValueError("至少需要一个属性阈值")
+        for name in thresholds:
+            if name not in STAT_INDEX:
+                raise ValueError(f"未知属性: {name}")
+        thresholds = dict(thresholds)
+        model, allocator = self.model, self.allocator
+
+        field_names = list(dict.fromkeys(list(thresholds) + list(objective.fields if objective else ())))
+        fields = np.array([STAT_INDEX[name] for name in field_names])
+        threshold_fields = np.array([STAT_INDEX[name] for name in thresholds])
+        targets = np.array(list(thresholds.values()), dtype=float)
+        scale = np.where(np.abs(targets) > 1e-9, np.abs(targets), 1.0)
+        relevant_names = {allocator.definitions[index].name for index in allocator._relevant_types(field_names)}
+
+        selections = self.set_candidates(set_ids, combination_types)
+        set_vectors = np.array([model.set_vector(selection) for selection in selections])
+        kept_sets = _pareto(set_vectors[:, fields])
+
+        slot_mains = [self.slot_config.get_slot_main_attribute(slot) for slot in range(6)]
+        fixed_mains = [mains[0] if mains else None for mains in slot_mains]
+        free_choices = []
+        for slot in FREE_SLOTS:
+            vectors = np.array([model.main_vector(attr, level) for attr in slot_mains[slot]])
+            groups: Dict[Optional[str], List[int]] = {}
+            for index, attr in enumerate(slot_mains[slot]):
+                groups.setdefault(attr.name if attr.name in relevant_names else None, []).append(index)
+            kept = [members[position] for members in groups.values()
+                    for position in _pareto(vectors[members][:, fields])]
+            free_choices.append(sorted(kept))
+
+        # 每个 (槽位, 主属性) 的主属性向量和“副属性出现一次”能带来的阈值属性上限
+        coefficients = np.maximum(allocator.hit_vectors[:, threshold_fields], 0)     # (T, C)
+        best_coefficient = coefficients.max(axis=0)
+
+        def presence_bound(main: Optional[Attribute]) -> np.ndarray:
+            usable = [index for index, definition in enumerate(allocator.definitions)
+                      if not (main and definition.name == main.name)]
+            top = -np.sort(-coefficients[usable], axis=0)[:SUB_STATS_PER_PIECE]
+            return top.sum(axis=0)
+
+        fixed_vector = model.base_vector + sum(model.main_vector(attr, level) for attr in fixed_mains[:3] if attr)
+        fixed_presence = sum(presence_bound(attr) for attr in fixed_mains[:3])
+        slot_vectors = [np.array([model.main_vector(slot_mains[slot][index], level) for index in choices])
+                        for slot, choices in zip(FREE_SLOTS, free_choices)]
+        slot_presence = [np.array([presence_bound(slot_mains[slot][index]) for index in choices])
+                         for slot, choices in zip(FREE_SLOTS, free_choices)]
+
+        # 全部候选的下界：(套装, 槽位4, 槽位5, 槽位6) 广播
+        first, second, third = slot_vectors
+        totals = (fixed_vector + set_vectors[kept_sets][:, None, None, None, :] + first[None, :, None, None, :]
+                  + second[None, None, :, None, :] + third[None, None, None, :, :])[..., threshold_fields]
+        presence = (fixed_presence + slot_presence[0][:, None, None, :] + slot_presence[1][None, :, None, :]
+                    + slot_presence[2][None, None, :, :])[None]
+        gap = targets - totals - presence
+        budget = UPGRADES_PER_PIECE * 6
+        with np.errstate(divide="ignore", invalid="ignore"):
+            needed = np.where(gap > 1e-9, np.where(best_coefficient > 0, np.ceil(gap / best_coefficient - 1e-9), np.inf), 0)
+        lower_bounds = needed.max(axis=-1).reshape(-1)
+        optimistic_miss = (np.maximum(gap - best_coefficient * budget, 0) / scale).sum(axis=-1).reshape(-1)
+        shape = totals.shape[:-1]
+
+        best_key, best, evaluated = None, None, set()
+
+        def evaluate(flat_index: int):
+            nonlocal best_key, best
+            evaluated.add(flat_index)
+            set_position, *positions = np.unravel_index(flat_index, shape)
+            selection = selections[kept_sets[set_position]]
+            mains = list(fixed_mains)
+            for slot, choices, position in zip(FREE_SLOTS, free_choices, positions):
+                mains[slot] = slot_mains[slot][choices[position]]
+            allocation = allocator.minimize_rolls(mains, selection, level, thresholds, objective)
+            if allocation.feasible:
+                key = (0, allocation.rolls_used, -allocation.score)
+            else:
+                final = np.array([allocation.final_stats[name] for name in thresholds])
+                key = (1, float((np.maximum(targets - final, 0) / scale).sum()), -allocation.score)
+            if best_key is None or key < best_key:
+                best_key, best = key, (tuple(mains), selection, allocation)
+
+        for flat_index in np.lexsort((optimistic_miss, lower_bounds)):
+            bound = lower_bounds[flat_index]
+            if bound > budget or (best_key and best_key[0] == 0 and bound > best_key[1]):
+                break
+            evaluate(int(flat_index))
+
+        exact = True
+        if best_key is None or best_key[0] == 1:
+            swept = 0
+            for flat_index in np.argsort(optimistic_miss, kind="stable"):
+                if best_key is not None and optimistic_miss[flat_index] >= best_key[1] - 1e-12:
+                    break
+                if int(flat_index) in evaluated:
+                    continue
+                if best_key is not None and fallback_limit is not None and swept >= fallback_limit:
+                    exact = False
+                    break
+                evaluate(int(flat_index))
+                swept += 1
+
+        mains, selection, allocation = best
+        return BreakpointResult(
+            main_attributes=mains,
+            selection=selection,
+            allocation=allocation,
+            thresholds=thresholds,
+            evaluated=len(evaluated),
+            candidates=len(selections) * int(np.prod([len(slot_mains[slot]) for slot in FREE_SLOTS])),
+            exact=exact
+        )
+
+
+def _pareto(vectors: np.ndarray) -> List[int]:
+    """去掉重复和被全面压过的行，返回保留行的下标（相同的行保留第一个）"""
+    rounded = np.round(vectors, 9)
+    _, first = np.unique(rounded, axis=0, return_index=True)
+    first = np.sort(first)
+    unique = rounded[first]
+    dominated = [bool(np.any(np.all(unique >= row, axis=1) & np.any(unique > row, axis=1))) for row in unique]
+    return [int(index) for index, is_dominated in zip(first, dominated) if not is_dominated]
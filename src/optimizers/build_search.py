@@ -0,0 +1,326 @@
+# src/optimizers/build_search.py
+"""库存配装搜索 - 从驱动盘库存中为一个角色挑选六个驱动盘（每槽位一个）使目标最大
+
+库存中每个驱动盘换算为属性向量（主属性按驱动盘自身等级），套装效果按所选驱动盘的套装件数计算：
+满 2 件加二件套效果，满 4 件再加四件套效果，与 GearSetManager 对 4+2 / 2+2+2 组合的处理一致。
+搜索分两步：
+1. 按目标在参考点的梯度给驱动盘线性打分，每个槽位保留总分最高的和各套装分数最高的几个，逐槽位做束搜索；
+2. 坐标上升：逐槽位换成该槽位全部可用驱动盘中最好的一个，直到没有改进。
+传入 DominanceIndex 时各槽位只考虑目标相关副属性上的天际线驱动盘（结果不变，搜索空间小得多）。
+anytime() 以上述结果为初始解做分支定界，逐步给出更好的解和剩余空间的上界（需要目标对各属性单调：
+线性目标按权重符号，非线性目标视为单调不减）。
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.inventory.codec import MAIN_STAT_CODES, SUB_STAT_CODES
+from src.inventory.dominance import DominanceIndex
+from src.models.gear_models import GearSetSelection
+from src.optimizers.anytime import SearchStep
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import STAT_FIELDS, STAT_INDEX, StatModel
+
+SLOT_COUNT = 6
+
+
+def disc_vectors(model: StatModel, columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """库存各驱动盘的属性向量 (N, F)，等价于逐个 StatModel.piece_vector(piece, piece.level)"""
+    zero = np.zeros(len(STAT_FIELDS))
+    main_units = np.array([zero] + [model.unit_vector(attr) for attr in MAIN_STAT_CODES])      # 编码 0 表示无主属性
+    main_base = np.array([0.0] + [attr.base for attr in MAIN_STAT_CODES])
+    main_growth = np.array([0.0] + [attr.growth for attr in MAIN_STAT_CODES])
+    sub_hits = np.array([model.unit_vector(attr) * attr.growth for attr in SUB_STAT_CODES])
+
+    codes = np.asarray(columns["main_stat"], dtype=np.intp)
+    values = main_base[codes] + np.asarray(columns["level"], dtype=float) * main_growth[codes]
+    return main_units[codes] * values[:, None] + np.asarray(columns["sub_rolls"], dtype=float) @ sub_hits
+
+
+def relevance_masks(model: StatModel, objective: Objective) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """影响目标的 (主属性, 副属性) 掩码，分别按主属性编码（0 为无主属性）和 SUB_STAT_CODES 排列
+
+    有属性会降低线性目标（负权重）时返回 None，不能按支配关系剪枝；非线性目标视为对其 fields 单调不减。
+    """
+    main_units = np.array([np.zeros(len(STAT_FIELDS))] + [model.unit_vector(attr) for attr in MAIN_STAT_CODES])
+    sub_units = np.array([model.unit_vector(attr) for attr in SUB_STAT_CODES])
+    if objective.weights is not None:
+        main_gains, sub_gains = main_units @ objective.weights, sub_units @ objective.weights
+        if np.any(main_gains < -1e-12) or np.any(sub_gains < -1e-12):
+            return None
+        return main_gains > 1e-12, sub_gains > 1e-12
+    fields = [STAT_INDEX[name] for name in objective.fields]
+    return np.any(main_units[:, fields] != 0, axis=1), np.any(sub_units[:, fields] != 0, axis=1)
+
+
+class SetBonusTable:
+    """按套装件数计算套装效果向量"""
+
+    def __init__(self, model: StatModel, set_ids: np.ndarray):
+        self.set_ids = np.unique(np.asarray(set_ids))
+        two_piece, four_piece = [], []
+        for set_id in self.set_ids.tolist():
+            two = model.set_vector(GearSetSelection("2+2+2", [set_id]))
+            two_piece.append(two)
+            four_piece.append(model.set_vector(GearSetSelection("4+2", [set_id])) - two)
+        self.two_piece = np.array(two_piece).reshape(-1, len(STAT_FIELDS))
+        self.four_piece = np.array(four_piece).reshape(-1, len(STAT_FIELDS))
+
+    def __len__(self) -> int:
+        return len(self.set_ids)
+
+    def index(self, set_ids: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.set_ids, set_ids)
+
+    def bonus(self, counts: np.ndarray) -> np.ndarray:
+        """counts (..., S) 各套装件数 -> (..., F) 套装效果"""
+        return (counts >= 2) @ self.two_piece + (counts >= 4) @ self.four_piece
+
+    def upper_bound(self, direction: np.ndarray) -> np.ndarray:
+        """六件驱动盘能得到的套装效果在 direction 方向上的逐属性上界（三个二件套或一个四件套加一个二件套）"""
+        if not len(self):
+            return np.zeros(len(direction))
+        two = np.maximum(self.two_piece * direction, 0)
+        four = (self.two_piece + self.four_piece) * direction
+        three_twos = -np.sort(-two, axis=0)[:3].sum(axis=0)
+        return np.maximum(np.maximum(three_twos, four.max(axis=0) + two.max(axis=0)), 0)
+
+
+@dataclass
+class Build:
+    """一套配装：各槽位选用的库存行号（没有可用驱动盘的槽位为 -1）"""
+    rows: np.ndarray            # (6,)
+    raw: np.ndarray             # 不含套装效果的属性向量
+    counts: np.ndarray          # 各套装件数
+    stats: np.ndarray           # 最终属性向量
+    score: float
+
+    def selection(self, table: SetBonusTable) -> GearSetSelection:
+        """对应的套装组合（满 4 件为 4+2，否则为 2+2+2）"""
+        four = [int(table.set_ids[index]) for index in np.flatnonzero(self.counts >= 4)]
+        two = [int(table.set_ids[index]) for index in np.flatnonzero((self.counts >= 2) & (self.counts < 4))]
+        return GearSetSelection("4+2", four + two) if four else GearSetSelection("2+2+2", two)
+
+
+class BuildSearch:
+    """单个角色的库存配装搜索"""
+
+    def __init__(self, model: StatModel, objective: Objective, columns: Dict[str, np.ndarray],
+                 vectors: Optional[np.ndarray] = None, beam_width: int = 128, candidates_per_slot: int = 16,
+                 candidates_per_set: int = 2, dominance: Optional[DominanceIndex] = None):
+        self.model = model
+        self.objective = objective
+        self.vectors = disc_vectors(model, columns) if vectors is None else vectors
+        self.slots = np.asarray(columns["slot"])
+        self.sets = SetBonusTable(model, columns["set_id"])
+        self.set_index = self.sets.index(np.asarray(columns["set_id"]))
+        self.beam_width = beam_width
+        self.candidates_per_slot = candidates_per_slot
+        self.candidates_per_set = candidates_per_set
+        self.masks = relevance_masks(model, objective) if dominance is not None else None
+        self.dominance = dominance if self.masks is not None else None
+        self._available: Optional[np.ndarray] = None      # 上次查询的可用掩码和对应的各槽位天际线
+        self._available_rows: Dict[int, np.ndarray] = {}
+        if self.dominance is not None:
+            self._slot_rows = [self._skyline(slot) for slot in range(SLOT_COUNT)]
+        else:
+            self._slot_rows = [np.flatnonzero(self.slots == slot) for slot in range(SLOT_COUNT)]
+
+    def slot_rows(self, slot: int, available: Optional[np.ndarray] = None) -> np.ndarray:
+        """槽位的候选驱动盘（有支配索引时为可用驱动盘中的天际线）"""
+        rows = self._slot_rows[slot]
+        if available is None or available[rows].all():
+            return rows
+        if self.dominance is None:
+            return rows[available[rows]]
+        if self._available is None or not np.array_equal(self._available, available):
+            self._available, self._available_rows = available.copy(), {}
+        if slot not in self._available_rows:
+            self._available_rows[slot] = self._skyline(slot, available)
+        return self._available_rows[slot]
+
+    def _skyline(self, slot: int, available: Optional[np.ndarray] = None) -> np.ndarray:
+        main_mask, sub_mask = self.masks
+        return self.dominance.skyline(slot, sub_mask=sub_mask, main_mask=main_mask, available=available)
+
+    def evaluate(self, rows: np.ndarray) -> Build:
+        """按行号计算一套配装"""
+        rows = np.asarray(rows, dtype=np.intp)
+        chosen = rows[rows >= 0]
+        raw = self.model.base_vector + self.vectors[chosen].sum(axis=0)
+        counts = np.bincount(self.set_index[chosen], minlength=len(self.sets))
+        stats = raw + self.sets.bonus(counts)
+        return Build(rows, raw, counts, stats, float(self.objective.score(stats)))
+
+    def search(self, available: Optional[np.ndarray] = None) -> Build:
+        """在可用驱动盘（布尔掩码，None 为全部）中搜索"""
+        return self.improve(self._beam(available), available)
+
+    def swap_scores(self, build: Build, slot: int, candidates: np.ndarray) -> np.ndarray:
+        """把 build 的 slot 槽位换成各候选驱动盘后的目标值"""
+        raw, counts = build.raw, build.counts.copy()
+        old = build.rows[slot]
+        if old >= 0:
+            raw = raw - self.vectors[old]
+            counts[self.set_index[old]] -= 1
+        bonus_by_set = self.sets.bonus(counts[None, :] + np.eye(len(self.sets), dtype=counts.dtype))
+        stats = raw + self.vectors[candidates] + bonus_by_set[self.set_index[candidates]]
+        return self.objective.score(stats)
+
+    def improve(self, build: Build, available: Optional[np.ndarray] = None, max_rounds: int = 10) -> Build:
+        """坐标上升：逐槽位换成可用驱动盘中最好的一个（build 自己的驱动盘始终可用）"""
+        for _ in range(max_rounds):
+            improved = False
+            for slot in range(SLOT_COUNT):
+                candidates = self.slot_rows(slot, available)
+                if build.rows[slot] >= 0:
+                    candidates = np.union1d(candidates, build.rows[slot:slot + 1])
+                if not len(candidates):
+                    continue
+                scores = self.swap_scores(build, slot, candidates)
+                best = int(np.argmax(scores))
+                if scores[best] > build.score + 1e-9 * max(1.0, abs(build.score)):
+                    rows = build.rows.copy()
+                    rows[slot] = candidates[best]
+                    build = self.evaluate(rows)
+                    improved = True
+            if not improved:
+                break
+        return build
+
+    def anytime(self, available: Optional[np.ndarray] = None) -> Iterator[SearchStep]:
+        """分支定界：先给出 search() 的结果，再按上界从高到低深度优先枚举，每枚举完一批最后槽位产出一步
+
+        线性目标下同槽位同套装只有得分最高的驱动盘可能入选，上界按各槽位最高得分累加；
+        非线性目标按各槽位逐属性最大值累加，上界较松。
+        """
+        build = self.search(available)
+        linear = self.objective.weights is not None
+        direction = np.where(self.objective.weights < 0, -1.0, 1.0) if linear else np.ones(len(STAT_FIELDS))
+        slots = [slot for slot in range(SLOT_COUNT) if len(self.slot_rows(slot, available))]
+        if not slots:
+            yield SearchStep(nodes=1, score=build.score, solution=build, bound=build.score, fraction=1.0)
+            return
+
+        # 各槽位候选按单独换上后的目标值排序，先枚举有希望的
+        candidates: List[np.ndarray] = []
+        for slot in slots:
+            rows = self.slot_rows(slot, available)
+            rows = rows[np.argsort(-self.swap_scores(build, slot, rows), kind="stable")]
+            if linear:
+                _, first = np.unique(self.set_index[rows], return_index=True)
+                rows = rows[np.sort(first)]
+            candidates.append(rows)
+        set_bound = self.sets.upper_bound(direction)
+        if linear:
+            slot_best = np.array([(self.vectors[rows] @ self.objective.weights).max() for rows in candidates])
+            tails = np.append(np.cumsum(slot_best[::-1])[::-1], 0.0) + float(direction * set_bound @ self.objective.weights)
+        else:
+            directed = self.vectors * direction
+            slot_best = np.array([directed[rows].max(axis=0) for rows in candidates])
+            tails = direction * (np.vstack([np.cumsum(slot_best[::-1], axis=0)[::-1], np.zeros(len(STAT_FIELDS))])
+                                 + set_bound)
+
+        def upper_bounds(raw: np.ndarray, depth: int) -> np.ndarray:
+            """已选前 depth 个槽位、属性为 raw 时的目标值上界"""
+            if linear:
+                return self.objective.score(raw) + tails[depth]
+            return self.objective.score(raw + tails[depth])
+
+        leaves = np.append(np.cumprod([len(rows) for rows in candidates][::-1])[::-1].astype(float), 1.0)
+        best = build
+        covered = 0.0
+        pending: List[float] = [-np.inf] * len(slots)     # 各层尚未展开的兄弟节点的最大上界
+        one_hot = np.eye(len(self.sets), dtype=np.int8)
+        tolerance = 1e-9
+
+        def remaining_bound() -> float:
+            return max(best.score, max(pending))
+
+        def expand(depth: int, rows: np.ndarray, raw: np.ndarray, counts: np.ndarray) -> Iterator[SearchStep]:
+            nonlocal best, covered
+            children = candidates[depth]
+            child_raw = raw + self.vectors[children]
+            child_counts = counts + one_hot[self.set_index[children]]
+            if depth == len(slots) - 1:
+                scores = self.objective.score(child_raw + self.sets.bonus(child_counts))
+                covered += len(children)
+                index = int(np.argmax(scores))
+                if scores[index] > best.score + tolerance * max(1.0, abs(best.score)):
+                    found = rows.copy()
+                    found[slots[depth]] = children[index]
+                    best = self.improve(self.evaluate(found), available)
+                    yield SearchStep(len(children), best.score, best, remaining_bound(), covered / leaves[0])
+                else:
+                    yield SearchStep(len(children), bound=remaining_bound(), fraction=covered / leaves[0])
+                return
+
+            bounds = upper_bounds(child_raw, depth + 1)
+            order = np.argsort(-bounds, kind="stable")
+            for position, index in enumerate(order):
+                if bounds[index] <= best.score + tolerance * max(1.0, abs(best.score)):
+                    covered += (len(order) - position) * leaves[depth + 1]
+                    break
+                pending[depth] = bounds[order[position + 1]] if position + 1 < len(order) else -np.inf
+                child_rows = rows.copy()
+                child_rows[slots[depth]] = children[index]
+                yield from expand(depth + 1, child_rows, child_raw[index], child_counts[index])
+            pending[depth] = -np.inf
+
+        root_bound = float(upper_bounds(self.model.base_vector, 0))
+        yield SearchStep(nodes=1, score=build.score, solution=build, bound=max(root_bound, build.score), fraction=0.0)
+        yield from expand(0, np.full(SLOT_COUNT, -1, dtype=np.intp), self.model.base_vector,
+                          np.zeros(len(self.sets), dtype=np.int8))
+        yield SearchStep(bound=best.score, fraction=1.0)
+
+    def _gradient(self, available: Optional[np.ndarray]) -> np.ndarray:
+        """目标在“基础属性 + 各槽位平均驱动盘”处的数值梯度"""
+        reference = self.model.base_vector.copy()
+        for slot in range(SLOT_COUNT):
+            rows = self.slot_rows(slot, available)
+            if len(rows):
+                reference += self.vectors[rows].mean(axis=0)
+        steps = np.maximum(np.abs(reference), 1.0) * 1e-4
+        shifted = reference + np.diag(steps)
+        return (self.objective.score(shifted) - self.objective.score(reference)) / steps
+
+    def _candidates(self, slot: int, available: Optional[np.ndarray], gradient: np.ndarray) -> np.ndarray:
+        """槽位候选：线性分最高的若干个，加上每个套装线性分最高的若干个"""
+        rows = self.slot_rows(slot, available)
+        if len(rows) <= self.candidates_per_slot:
+            return rows
+        linear = self.vectors[rows] @ gradient
+        top = rows[np.argpartition(-linear, self.candidates_per_slot - 1)[:self.candidates_per_slot]]
+
+        sets = self.set_index[rows]
+        order = np.lexsort((-linear, sets))
+        group_start = np.r_[0, np.flatnonzero(np.diff(sets[order])) + 1]
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        per_set = rows[order[rank < self.candidates_per_set]]
+        return np.union1d(top, per_set)
+
+    def _beam(self, available: Optional[np.ndarray]) -> Build:
+        gradient = self._gradient(available)
+        set_count = len(self.sets)
+        raw = self.model.base_vector[None, :]
+        counts = np.zeros((1, set_count), dtype=np.int8)
+        rows = np.full((1, SLOT_COUNT), -1, dtype=np.intp)
+
+        for slot in range(SLOT_COUNT):
+            candidates = self._candidates(slot, available, gradient)
+            if not len(candidates):
+                continue
+            new_raw = (raw[:, None, :] + self.vectors[candidates][None, :, :]).reshape(-1, raw.shape[1])
+            one_hot = np.eye(set_count, dtype=np.int8)[self.set_index[candidates]]
+            new_counts = (counts[:, None, :] + one_hot[None, :, :]).reshape(-1, set_count)
+            scores = self.objective.score(new_raw + self.sets.bonus(new_counts))
+
+            keep = np.argsort(-scores, kind="stable")[:self.beam_width]
+            parents, choices = np.divmod(keep, len(candidates))
+            raw, counts = new_raw[keep], new_counts[keep]
+            rows = rows[parents]
+            rows[:, slot] = candidates[choices]
+
+        return self.evaluate(rows[0])
+
@@ -0,0 +1,108 @@
+# src/optimizers/main_stat_solver.py
+"""槽位4-6主属性求解 - 一次向量化计算全部组合并按目标排序
+
+槽位1-3主属性固定，槽位4/5/6分别有 6/9/6 种主属性，共 324 种组合。
+副属性、套装和角色属性不变时，每种组合的最终属性 = 固定部分 + 三个槽位主属性向量之和，
+用广播一次算出 (6, 9, 6, 属性数) 的结果。主属性与该驱动盘已有副属性重复的组合在游戏中不存在，会被排除。
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.slot_config import SlotConfig
+from src.models.gear_attributes import Attribute
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import STAT_FIELDS, StatModel
+
+# 可选主属性的槽位（0-based，对应游戏内槽位4-6）
+FREE_SLOTS = (3, 4, 5)
+
+
+@dataclass
+class MainStatCombination:
+    """一种主属性组合的结果"""
+    main_attributes: Tuple[Attribute, ...]
+    score: float
+    delta: float                    # 相对参考组合的目标差（正数为更好）
+    stat_deltas: Dict[str, float]   # 相对参考组合变化的属性
+    final_stats: Dict[str, float]
+
+    @property
+    def label(self) -> str:
+        return " / ".join(attr.name for attr in self.main_attributes)
+
+
+class MainStatSolver:
+    """主属性组合求解器"""
+
+    def __init__(self, model: StatModel, slot_config: Optional[SlotConfig] = None):
+        self.model = model
+        self.slot_config = slot_config or SlotConfig()
+
+    def evaluate_all(self, pieces: Sequence[GearPiece], selection: Optional[GearSetSelection],
+                     level: int) -> Tuple[np.ndarray, np.ndarray, List[List[Attribute]]]:
+        """返回 (各组合最终属性 (6, 9, 6, F), 有效组合掩码 (6, 9, 6), 各槽位候选主属性)
+
+        pieces 按槽位顺序排列（下标即槽位索引），槽位4-6的主属性会被候选主属性替换。
+        """
+        model = self.model
+        fixed = model.base_vector + model.set_vector(selection)
+        for slot, piece in enumerate(pieces):
+            fixed = fixed + model.piece_vector(piece, level, include_main=slot not in FREE_SLOTS)
+
+        candidates, vectors, valid = [], [], []
+        for slot in FREE_SLOTS:
+            attributes = self.slot_config.get_slot_main_attribute(slot)
+            sub_names = {definition.name for definition, _ in pieces[slot].sub_rolls()} if slot < len(pieces) else set()
+            candidates.append(attributes)
+            vectors.append(np.array([model.main_vector(attr, level) for attr in attributes]))
+            valid.append(np.array([attr.name not in sub_names for attr in attributes]))
+
+        first, second, third = vectors
+        totals = (fixed + first[:, None, None, :] + second[None, :, None, :] + third[None, None, :, :])
+        mask = valid[0][:, None, None] & valid[1][None, :, None] & valid[2][None, None, :]
+        return totals, mask, candidates
+
+    def solve(self, pieces: Sequence[GearPiece], selection: Optional[GearSetSelection], level: int,
+              objective: Objective, top: Optional[int] = None) -> List[MainStatCombination]:
+        """按目标从高到低返回组合；参考组合为当前主属性（无效时取最优组合）"""
+        totals, mask, candidates = self.evaluate_all(pieces, selection, level)
+        scores = np.where(mask, objective.score(totals), -np.inf)
+
+        flat_order = np.argsort(-scores, axis=None, kind="stable")
+        flat_order = flat_order[:int(mask.sum())]
+        if top is not None:
+            flat_order = flat_order[:top]
+
+        reference = self._current_index(pieces, candidates)
+        if reference is None or not mask[reference]:
+            reference = np.unravel_index(flat_order[0], scores.shape) if len(flat_order) else None
+        if reference is None:
+            return []
+        reference_stats, reference_score = totals[reference], scores[reference]
+
+        results = []
+        for flat_index in flat_order:
+            index = np.unravel_index(flat_index, scores.shape)
+            stats = totals[index]
+            difference = stats - reference_stats
+            results.append(MainStatCombination(
+                main_attributes=tuple(candidates[slot_position][choice] for slot_position, choice in enumerate(index)),
+                score=float(scores[index]),
+                delta=float(scores[index] - reference_score),
+                stat_deltas={name: float(value) for name, value in zip(STAT_FIELDS, difference) if abs(value) > 1e-9},
+                final_stats=StatModel.to_dict(stats)
+            ))
+        return results
+
+    @staticmethod
+    def _current_index(pieces: Sequence[GearPiece], candidates: List[List[Attribute]]) -> Optional[tuple]:
+        index = []
+        for slot_position, slot in enumerate(FREE_SLOTS):
+            main = pieces[slot].main_attribute if slot < len(pieces) else None
+            if main not in candidates[slot_position]:
+                return None
+            index.append(candidates[slot_position].index(main))
+        return tuple(index)
@@ -0,0 +1,108 @@
+# src/optimizers/objectives.py
+"""优化目标 - 对属性向量（最后一维为 STAT_FIELDS）批量打分，分数越高越好"""
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.optimizers.stat_model import STAT_FIELDS, STAT_INDEX
+
+# 角色元素 -> 对应的伤害加成属性
+ELEMENT_DMG_BONUS = {
+    "物理": "physical_dmg_bonus",
+    "火": "fire_dmg_bonus",
+    "冰": "ice_dmg_bonus",
+    "电": "electric_dmg_bonus",
+    "以太": "ether_dmg_bonus",
+}
+
+
+class Objective(ABC):
+    """优化目标基类
+
+    fields 为目标依赖的属性；线性目标的 weights 为各属性的权重向量（非线性目标为 None），
+    求解器据此判断哪些副属性有意义、能否按驱动盘独立求解。子类必须实现 score。
+    """
+
+    name = ""
+    fields: Tuple[str, ...] = ()
+    weights: Optional[np.ndarray] = None
+
+    @abstractmethod
+    def score(self, stats: np.ndarray) -> np.ndarray:
+        """stats (..., 属性数) -> 分数 (...)"""
+
+
+class StatObjective(Objective):
+    """最大化单项属性"""
+
+    def __init__(self, field_name: str):
+        if field_name not in STAT_INDEX:
+            raise ValueError(f"未知属性: {field_name}")
+        self.name = field_name
+        self.index = STAT_INDEX[field_name]
+        self.fields = (field_name,)
+        self.weights = np.zeros(len(STAT_FIELDS))
+        self.weights[self.index] = 1.0
+
+    def score(self, stats: np.ndarray) -> np.ndarray:
+        return stats[..., self.index]
+
+
+class WeightedObjective(Objective):
+    """属性加权和"""
+
+    def __init__(self, weights: Dict[str, float], name: str = "weighted"):
+        self.name = name
+        self.weights = np.zeros(len(STAT_FIELDS))
+        for field_name, weight in weights.items():
+            if field_name not in STAT_INDEX:
+                raise ValueError(f"未知属性: {field_name}")
+            self.weights[STAT_INDEX[field_name]] = weight
+        self.fields = tuple(field_name for field_name, weight in weights.items() if weight)
+
+    def score(self, stats: np.ndarray) -> np.ndarray:
+        return stats @ self.weights
+
+
+class DamageObjective(Objective):
+    """伤害期望近似：攻击力 × (1 + 暴击率 × 暴击伤害) × (1 + 元素伤害加成)，暴击率截断到 100%"""
+
+    name = "damage"
+
+    def __init__(self, element_type: str = ""):
+        dmg_field = ELEMENT_DMG_BONUS.get(element_type)
+        self.dmg_index: Optional[int] = STAT_INDEX[dmg_field] if dmg_field else None
+        self.fields = ("attack", "crit_rate", "crit_dmg") + ((dmg_field,) if dmg_field else ())
+
+    def score(self, stats: np.ndarray) -> np.ndarray:
+        attack = stats[..., STAT_INDEX["attack"]]
+        crit_rate = np.clip(stats[..., STAT_INDEX["crit_rate"]], 0.0, 1.0)
+        crit_dmg = stats[..., STAT_INDEX["crit_dmg"]]
+        result = attack * (1 + crit_rate * crit_dmg)
+        if self.dmg_index is not None:
+            result = result * (1 + stats[..., self.dmg_index])
+        return result
+
+
+# 界面和命令行可选的目标：名称 -> 工厂函数(元素类型)
+OBJECTIVES: Dict[str, Callable[[str], Objective]] = {
+    "damage": DamageObjective,
+    "attack": lambda element: StatObjective("attack"),
+    "hp": lambda element: StatObjective("hp"),
+    "defence": lambda element: StatObjective("defence"),
+    "crit_rate": lambda element: StatObjective("crit_rate"),
+    "crit_dmg": lambda element: StatObjective("crit_dmg"),
+    "anomaly_proficiency": lambda element: StatObjective("anomaly_proficiency"),
+    "anomaly_mastery": lambda element: StatObjective("anomaly_mastery"),
+    "impact": lambda element: StatObjective("impact"),
+    "energy_regen": lambda element: StatObjective("energy_regen"),
+    "pen_ratio": lambda element: StatObjective("pen_ratio"),
+}
+
+
+def get_objective(name: str, element_type: str = "") -> Objective:
+    """按名称创建优化目标"""
+    if name not in OBJECTIVES:
+        raise ValueError(f"未知优化目标: {name}，可选: {', '.join(OBJECTIVES)}")
+    return OBJECTIVES[name](element_type)
@@ -0,0 +1,181 @@
+# src/optimizers/roster.py
+"""多角色驱动盘分配 - 同一份库存按优先级分给多个角色，保证每个驱动盘只被一个角色使用
+
+各角色单独优化会重复占用同一批驱动盘。分配分三步：
+1. 各角色在全部库存上的最优配装作为参照（不受其他角色影响的上限）；
+2. 按优先级依次在剩余驱动盘中搜索并占用（贪心）；
+3. 改进：每个角色在“未分配 + 自己的”驱动盘上做坐标上升；再尝试两个角色互换同槽位的驱动盘，
+   按 Σ 权重 × (得分 / 参照得分) 增加就接受。重复到没有改进或达到轮数上限。
+报告每个角色相对参照的损失比例。参照本身是启发式搜索（束搜索）的结果，
+分配后的坐标上升可能找到比参照更好的配装，此时损失为负，如实报告而不截断为 0。
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.inventory.dominance import DominanceIndex
+from src.inventory.store import DiscInventory, InventoryView
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.build_search import SLOT_COUNT, Build, BuildSearch
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import StatModel
+
+
+@dataclass
+class RosterEntry:
+    """参与分配的角色（列表顺序即优先级，weight 为 None 时按优先级递减取 n, n-1, ..., 1）"""
+    name: str
+    model: StatModel
+    objective: Objective
+    weight: Optional[float] = None
+
+
+@dataclass
+class RosterAssignment:
+    """单个角色的分配结果"""
+    name: str
+    rows: np.ndarray                # 各槽位库存行号（-1 为没有可用驱动盘）
+    score: float
+    reference_score: float          # 不与其他角色竞争时的得分
+    selection: GearSetSelection
+    final_stats: Dict[str, float]
+
+    @property
+    def loss(self) -> float:
+        """相对参照得分的损失比例（带符号，负数表示比独占时的启发式搜索结果还好）"""
+        if self.reference_score <= 0:
+            return 0.0
+        return 1.0 - self.score / self.reference_score
+
+
+@dataclass
+class RosterResult:
+    assignments: List[RosterAssignment]
+    passes: int                     # 实际执行的改进轮数
+    swaps: int                      # 接受的互换次数
+    elapsed: float
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def pieces(self, inventory: DiscInventory, index: int) -> List[GearPiece]:
+        rows = self.assignments[index].rows
+        return InventoryView(inventory, rows[rows >= 0]).to_pieces()
+
+    def format_table(self) -> str:
+        lines = [f"{'优先级':<6}{'角色':<16}{'得分':>12}{'独占得分':>12}{'损失':>8}"]
+        for rank, assignment in enumerate(self.assignments, start=1):
+            lines.append(f"{rank:<8}{assignment.name:<16}{assignment.score:>12.4g}"
+                         f"{assignment.reference_score:>14.4g}{assignment.loss:>+9.1%}")
+        lines.append("独占得分为单独在全部库存上启发式搜索的结果，损失为负表示分配后反而更好")
+        lines.append(f"改进 {self.passes} 轮，互换 {self.swaps} 次，耗时 {self.elapsed:.1f}s")
+        return "\n".join(lines)
+
+
+class RosterAssigner:
+    """多角色驱动盘分配器"""
+
+    def __init__(self, inventory: DiscInventory, entries: Sequence[RosterEntry], max_passes: int = 3,
+                 beam_width: int = 128, candidates_per_slot: int = 16):
+        if not entries:
+            raise ValueError("至少需要一个角色")
+        self.inventory = inventory
+        self.entries = list(entries)
+        self.max_passes = max_passes
+        columns = {name: np.asarray(inventory.columns[name]) for name in ("slot", "set_id", "main_stat", "level",
+                                                                             "sub_rolls")}
+        dominance = DominanceIndex(inventory)
+        self.searches = [BuildSearch(entry.model, entry.objective, columns, beam_width=beam_width,
+                                     candidates_per_slot=candidates_per_slot, dominance=dominance)
+                         for entry in self.entries]
+        count = len(self.entries)
+        self.weights = np.array([entry.weight if entry.weight is not None else count - rank
+                                 for rank, entry in enumerate(self.entries)], dtype=float)
+
+    def run(self) -> RosterResult:
+        started = time.perf_counter()
+        timings = {}
+
+        # 1) 参照：各角色独占全部库存
+        references = [search.search() for search in self.searches]
+        reference_scores = np.array([max(build.score, 1e-12) for build in references])
+        timings["reference"] = time.perf_counter() - started
+
+        # 2) 按优先级贪心占用
+        owner = np.full(len(self.inventory), -1, dtype=np.intp)
+        builds: List[Build] = []
+        for index, search in enumerate(self.searches):
+            build = search.search(owner < 0)
+            self._claim(owner, build, index)
+            builds.append(build)
+        timings["greedy"] = time.perf_counter() - started - timings["reference"]
+
+        # 3) 改进
+        passes = swaps = 0
+        for _ in range(self.max_passes):
+            passes += 1
+            changed = False
+            for index, search in enumerate(self.searches):
+                improved = search.improve(builds[index], (owner < 0) | (owner == index))
+                if improved.score > builds[index].score:
+                    self._release(owner, builds[index])
+                    self._claim(owner, improved, index)
+                    builds[index] = improved
+                    changed = True
+            accepted = self._swap_pass(builds, owner, reference_scores)
+            swaps += accepted
+            if not changed and not accepted:
+                break
+        timings["improve"] = time.perf_counter() - started - timings["reference"] - timings["greedy"]
+
+        assignments = [
+            RosterAssignment(
+                name=entry.name,
+                rows=build.rows,
+                score=build.score,
+                reference_score=reference.score,
+                selection=build.selection(search.sets),
+                final_stats=StatModel.to_dict(build.stats)
+            )
+            for entry, search, build, reference in zip(self.entries, self.searches, builds, references)
+        ]
+        return RosterResult(assignments, passes, swaps, time.perf_counter() - started, timings)
+
+    @staticmethod
+    def _claim(owner: np.ndarray, build: Build, index: int):
+        rows = build.rows[build.rows >= 0]
+        if np.any((owner[rows] >= 0) & (owner[rows] != index)):
+            raise RuntimeError("驱动盘被重复分配")
+        owner[rows] = index
+
+    @staticmethod
+    def _release(owner: np.ndarray, build: Build):
+        owner[build.rows[build.rows >= 0]] = -1
+
+    def _swap_pass(self, builds: List[Build], owner: np.ndarray, reference_scores: np.ndarray) -> int:
+        """逐槽位尝试两个角色互换驱动盘，每次接受收益最大的一对，直到该槽位没有正收益"""
+        count = len(builds)
+        accepted = 0
+        for slot in range(SLOT_COUNT):
+            for _ in range(count * count):
+                rows = np.array([build.rows[slot] for build in builds])
+                if np.sum(rows >= 0) < 2:
+                    break
+                current = np.array([build.score for build in builds]) / reference_scores
+                # gains[a, b]：角色 a 换上角色 b 的驱动盘后归一化得分的变化
+                gains = np.full((count, count), -np.inf)
+                for a, (search, build) in enumerate(zip(self.searches, builds)):
+                    if rows[a] < 0:
+                        continue
+                    others = np.flatnonzero((rows >= 0) & (np.arange(count) != a))
+                    gains[a, others] = search.swap_scores(build, slot, rows[others]) / reference_scores[a] - current[a]
+                benefit = self.weights[:, None] * gains + (self.weights[:, None] * gains).T
+                a, b = np.unravel_index(np.argmax(benefit), benefit.shape)
+                if not np.isfinite(benefit[a, b]) or benefit[a, b] <= 1e-12:
+                    break
+                rows_a, rows_b = builds[a].rows.copy(), builds[b].rows.copy()
+                rows_a[slot], rows_b[slot] = rows_b[slot], rows_a[slot]
+                builds[a], builds[b] = self.searches[a].evaluate(rows_a), self.searches[b].evaluate(rows_b)
+                owner[rows_a[slot]], owner[rows_b[slot]] = a, b
+                accepted += 1
+        return accepted
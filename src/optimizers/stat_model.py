@@ -0,0 +1,149 @@
+# src/optimizers/stat_model.py
+"""线性属性模型 - 把驱动盘主/副属性和套装效果换算为属性向量
+
+GearCalculator 的几种加成方式（直接相加、乘以基础属性、固定值、伤害加成）都与属性值成正比，
+最终属性又是基础属性与加成逐项相加，因此每个属性定义可以预先换算成“属性值为1时”的加成向量，
+任意驱动盘组合的最终属性 = 基础向量 + Σ 属性值 × 单位向量 + 套装向量。
+单位向量又可拆成固定部分和“基础属性 × 比例”部分（HP%、ATK% 等），gear_components 据此把驱动盘加成
+表示为 固定向量 + 比例向量 ⊙ 基础向量，基础属性（如更换音擎）变化时不必重算驱动盘。
+分类规则直接调用 GearCalculator 的判断方法，与逐件计算的结果保持一致。
+"""
+from dataclasses import fields
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from src.calculators.gear_calculator import GearCalculator, GearSetManager
+from src.models.base_stats import BaseStats
+from src.models.character_attributes import CharacterAttributes
+from src.models.gear_attributes import Attribute
+from src.models.gear_models import GearPiece, GearSetSelection
+
+STAT_FIELDS = tuple(f.name for f in fields(BaseStats))
+STAT_INDEX: Dict[str, int] = {name: index for index, name in enumerate(STAT_FIELDS)}
+
+
+class StatModel:
+    """某个角色（已应用音擎）的线性属性模型"""
+
+    def __init__(self, base_stats: CharacterAttributes, calculator: Optional[GearCalculator] = None,
+                 set_manager: Optional[GearSetManager] = None):
+        self.base_stats = base_stats
+        self.calculator = calculator or GearCalculator()
+        self.set_manager = set_manager or self.calculator.gear_set_manager
+        self.base_vector = np.array([float(getattr(base_stats, name, 0) or 0) for name in STAT_FIELDS])
+        self._unit_vectors: Dict[Attribute, np.ndarray] = {}
+        self._unit_components: Dict[Attribute, Tuple[np.ndarray, np.ndarray]] = {}
+        self._set_vectors: Dict[tuple, np.ndarray] = {}
+
+    def unit_vector(self, attribute: Attribute) -> np.ndarray:
+        """属性值为1时的加成向量（分类同 GearCalculator._add_attribute_bonus）"""
+        vector = self._unit_vectors.get(attribute)
+        if vector is not None:
+            return vector
+
+        direct, scale = self.unit_components(attribute)
+        vector = direct + scale * self.base_vector
+        vector.flags.writeable = False
+        self._unit_vectors[attribute] = vector
+        return vector
+
+    def unit_components(self, attribute: Attribute) -> Tuple[np.ndarray, np.ndarray]:
+        """单位加成拆成 (固定部分, 基础属性比例)：unit_vector = 固定部分 + 比例 × base_vector"""
+        components = self._unit_components.get(attribute)
+        if components is not None:
+            return components
+
+        direct, scale = np.zeros(len(STAT_FIELDS)), np.zeros(len(STAT_FIELDS))
+        attr_type = attribute.attribute_type.value
+        value_type = attribute.attribute_value_type
+        index = STAT_INDEX.get(attr_type)
+        calculator = self.calculator
+        if index is not None:
+            if calculator._is_direct_percentage_attr(attr_type, value_type):
+                direct[index] = 1.0
+            elif calculator._is_base_percentage_attr(attr_type, value_type):
+                scale[index] = 1.0
+            elif calculator._is_fixed_value_attr(value_type) or calculator._is_damage_bonus_attr(value_type):
+                direct[index] = 1.0
+
+        direct.flags.writeable = scale.flags.writeable = False
+        self._unit_components[attribute] = direct, scale
+        return direct, scale
+
+    def main_vector(self, attribute: Attribute, level: int) -> np.ndarray:
+        """主属性在指定强化等级时的加成向量"""
+        return self.unit_vector(attribute) * attribute.calculate_value_at_level(level)
+
+    def sub_vector(self, attribute: Attribute, enhancement_level: int) -> np.ndarray:
+        """副属性在指定强化次数时的加成向量"""
+        return self.unit_vector(attribute) * (attribute.base + enhancement_level * attribute.growth)
+
+    def piece_vector(self, piece: GearPiece, level: int, include_main: bool = True) -> np.ndarray:
+        """单个驱动盘的加成向量（level 为主属性强化等级，同 calculate_complete_stats）"""
+        vector = np.zeros(len(STAT_FIELDS))
+        if include_main and piece.main_attribute:
+            vector += self.main_vector(piece.main_attribute, level)
+        for definition, enhancement_level in piece.sub_rolls():
+            vector += self.sub_vector(definition, enhancement_level)
+        return vector
+
+    def set_vector(self, selection: Optional[GearSetSelection]) -> np.ndarray:
+        """套装效果的加成向量（分类同 GearCalculator._apply_set_bonuses）"""
+        if not self.set_manager or not selection or not selection.set_ids:
+            return np.zeros(len(STAT_FIELDS))
+
+        key = (selection.combination_type, tuple(selection.set_ids))
+        vector = self._set_vectors.get(key)
+        if vector is not None:
+            return vector
+
+        direct, scale = self.set_components(selection)
+        vector = direct + scale * self.base_vector
+        vector.flags.writeable = False
+        self._set_vectors[key] = vector
+        return vector
+
+    def set_components(self, selection: Optional[GearSetSelection]) -> Tuple[np.ndarray, np.ndarray]:
+        """套装效果拆成 (固定部分, 基础属性比例)"""
+        direct, scale = np.zeros(len(STAT_FIELDS)), np.zeros(len(STAT_FIELDS))
+        if not self.set_manager or not selection or not selection.set_ids:
+            return direct, scale
+
+        set_bonus = self.set_manager.get_set_bonuses(selection)
+        for index, name in enumerate(STAT_FIELDS):
+            value = getattr(set_bonus, name, 0)
+            if not value:
+                continue
+            if self.calculator._is_set_base_percentage_attr(name):
+                scale[index] = value
+            else:
+                direct[index] = value
+        return direct, scale
+
+    def gear_components(self, pieces: Iterable[GearPiece], selection: Optional[GearSetSelection],
+                        level: int) -> Tuple[np.ndarray, np.ndarray]:
+        """驱动盘和套装的总加成拆成 (固定部分, 基础属性比例)：最终属性 = 基础 + 固定部分 + 比例 ⊙ 基础"""
+        direct, scale = self.set_components(selection)
+        for piece in pieces:
+            attributes = [(definition, definition.base + enhancement_level * definition.growth)
+                          for definition, enhancement_level in piece.sub_rolls()]
+            if piece.main_attribute:
+                attributes.append((piece.main_attribute, piece.main_attribute.calculate_value_at_level(level)))
+            for attribute, value in attributes:
+                unit_direct, unit_scale = self.unit_components(attribute)
+                direct = direct + value * unit_direct
+                scale = scale + value * unit_scale
+        return direct, scale
+
+    def final_vector(self, pieces: Iterable[GearPiece], selection: Optional[GearSetSelection],
+                     level: int) -> np.ndarray:
+        """最终属性向量（等价于 GearCalculator.calculate_complete_stats）"""
+        vector = self.base_vector + self.set_vector(selection)
+        for piece in pieces:
+            vector += self.piece_vector(piece, level)
+        return vector
+
+    @staticmethod
+    def to_dict(vector: np.ndarray) -> Dict[str, float]:
+        return {name: float(value) for name, value in zip(STAT_FIELDS, vector)}
@@ -0,0 +1,634 @@
+# src/optimizers/sub_stat_allocator.py
+"""副属性分配求解 - 给定各槽位主属性，精确求出六个驱动盘副属性的最优词条与强化分配
+
+每个驱动盘有 4 条副属性（不能与该盘主属性同名），+15 时共强化 5 次。副属性初始值与每次强化增量相同，
+因此某类副属性的总值只取决于它在六个盘上的“命中数”之和（出现一次算 1，每次强化再加 1）。
+
+- 线性目标（单项属性、加权和）各盘互不影响：每个盘取收益最高的 4 类副属性，5 次强化全部给收益最高的一类。
+- 非线性目标和属性阈值只与少数几类“相关”副属性有关，且对它们单调不减，所以每个盘都尽量放入相关副属性
+  （出现不消耗强化）。出现方式确定后，只剩各类副属性的强化总次数 u 需要决定：
+  u 能分到各盘（每盘至多 5 次、只能给盘上已有的副属性）当且仅当对任意一组类型 T，
+  Σ_{t∈T} u_t ≤ 5 × 含有 T 中任一类型的盘数（二分图分配的 Hall 条件）。
+  求目标最大时对所有 Σu ≤ 30 的强化向量一次性向量化打分；求满足阈值的最少强化次数时只需看“极小覆盖向量”
+  （任一类少强化一次就不满足阈值），它们按阈值涉及的副属性分组枚举，数量很少（见 _RollSearch）。结果都是精确最优。
+- 出现方式按各类型组合覆盖的盘数去重，逐盘 DP 向量化求出，6 类相关副属性时也只有上万种。
+"""
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.gear_attributes import Attribute, GearSubAttributes, SubAttribute
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import STAT_INDEX, StatModel
+
+SUB_STATS_PER_PIECE = 4
+UPGRADES_PER_PIECE = 5          # 同 GearSlotWidget.total_enhancement_limit
+LAYOUT_CACHE_SIZE = 32          # 6 类相关副属性时一份出现方式表约 3MB
+GRID_CACHE_SIZE = 64
+
+
+@dataclass
+class SubStatAllocation:
+    """一种副属性分配方案"""
+    sub_rolls: List[List[Tuple[Attribute, int]]]   # 各槽位的 (副属性定义, 强化次数)
+    score: float
+    rolls_used: int                 # 用在相关副属性上的强化次数
+    final_stats: Dict[str, float]
+    feasible: bool = True
+
+    def to_pieces(self, main_attributes: Sequence[Optional[Attribute]], level: int = 15) -> List[GearPiece]:
+        """按分配结果生成驱动盘，便于交给 GearCalculator 复核"""
+        pieces = []
+        for slot, (main, rolls) in enumerate(zip(main_attributes, self.sub_rolls)):
+            subs = [SubAttribute(definition, enhancement_level) for definition, enhancement_level in rolls]
+            pieces.append(GearPiece(slot, level, main, subs))
+        return pieces
+
+
+@dataclass
+class _Layout:
+    """相关副属性在各盘上的一种出现方式"""
+    choices: Tuple[Tuple[int, ...], ...]    # 各盘放入的相关副属性（relevant 中的位置）
+    presence: np.ndarray                    # (k,) 各类出现的盘数
+    capacity: np.ndarray                    # (2^k - 1,) 各类型组合可获得的强化次数上限
+
+
+@dataclass
+class _LayoutTable:
+    """全部出现方式（按列存放，取单个出现方式时再组装 _Layout）"""
+    options: List[List[Tuple[int, ...]]]    # 各盘可选的相关副属性组合
+    picks: np.ndarray                       # (n, 盘数) 各出现方式在各盘所选组合的下标
+    presence: np.ndarray                    # (n, k)
+    capacity: np.ndarray                    # (n, 2^k - 1) int8，至多 30
+    _groups: Optional[Tuple[np.ndarray, List[np.ndarray], np.ndarray]] = None
+
+    def groups(self) -> Tuple[np.ndarray, List[np.ndarray], np.ndarray]:
+        """按出现次数分组：(各组的 presence, 各组包含的出现方式下标, 各出现方式所在的组)"""
+        if self._groups is None:
+            groups, group_of = np.unique(self.presence, axis=0, return_inverse=True)
+            group_of = group_of.reshape(-1)
+            order = np.argsort(group_of, kind="stable")
+            members = np.split(order, np.cumsum(np.bincount(group_of, minlength=len(groups)))[:-1])
+            self._groups = (groups, members, group_of)
+        return self._groups
+
+    def __len__(self) -> int:
+        return len(self.picks)
+
+    def __getitem__(self, index: int) -> _Layout:
+        choices = tuple(options[pick] for options, pick in zip(self.options, self.picks[index]))
+        return _Layout(choices, self.presence[index], self.capacity[index])
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+class SubStatAllocator:
+    """副属性分配求解器"""
+
+    def __init__(self, model: StatModel, sub_definitions: Optional[Sequence[Attribute]] = None):
+        self.model = model
+        self.definitions: Tuple[Attribute, ...] = tuple(sub_definitions or GearSubAttributes.definitions())
+        for definition in self.definitions:
+            if definition.base != definition.growth:
+                raise ValueError(f"副属性 {definition.name} 的初始值与强化增量不同，无法按命中数求解")
+        # 每命中一次的属性向量 (T, F)
+        self.hit_vectors = np.array([model.unit_vector(definition) * definition.growth
+                                     for definition in self.definitions])
+        # 阈值求解会对大量候选反复求解，各槽位可用的相关副属性和强化上限往往相同
+        self._layout_cache: Dict[tuple, _LayoutTable] = {}
+        self._grid_cache: Dict[tuple, _UpgradeGrid] = {}
+
+    # ---------- 公共接口 ----------
+
+    def maximize(self, main_attributes: Sequence[Optional[Attribute]], selection: Optional[GearSetSelection],
+                 level: int, objective: Objective,
+                 available: Optional[Sequence[Optional[Sequence[Attribute]]]] = None) -> SubStatAllocation:
+        """求目标最大的副属性分配
+
+        available 为各槽位允许出现的副属性（None 表示全部），与主属性同名的副属性总会被排除。
+        """
+        fixed = self._fixed_vector(main_attributes, selection, level)
+        allowed = self._allowed_types(main_attributes, available)
+
+        if objective.weights is not None:
+            hits = self._maximize_linear(allowed, objective.weights)
+            return self._build(hits, fixed, objective, rolls_used=UPGRADES_PER_PIECE * len(allowed))
+
+        relevant = self._relevant_types(objective.fields)
+        hit_vectors = self.hit_vectors[relevant]
+        budget = UPGRADES_PER_PIECE * len(allowed)
+        grid = self._grid(np.full(len(relevant), budget), budget)
+
+        # 目标单调不减，只需看每种出现方式下的极大强化向量（总次数等于秩）
+        best = (-np.inf, None, None)
+        for layout in self._layouts(allowed, relevant):
+            upgrades = grid.rows(layout, grid.rank(layout))
+            scores = objective.score(fixed + (layout.presence + upgrades) @ hit_vectors)
+            index = int(np.argmax(scores))
+            if scores[index] > best[0]:
+                best = (float(scores[index]), layout, upgrades[index])
+
+        _, layout, upgrades = best
+        hits = self._layout_hits(layout, upgrades, allowed, relevant)
+        return self._build(hits, fixed, objective, rolls_used=int(upgrades.sum()))
+
+    def minimize_rolls(self, main_attributes: Sequence[Optional[Attribute]], selection: Optional[GearSetSelection],
+                       level: int, thresholds: Mapping[str, float], objective: Optional[Objective] = None,
+                       available: Optional[Sequence[Optional[Sequence[Attribute]]]] = None) -> SubStatAllocation:
+        """求满足全部属性阈值（最终属性 ≥ 阈值）所需强化次数最少的分配
+
+        无法满足时返回 feasible=False、各阈值相对缺口（缺口 / 阈值）之和最小的方案。
+        objective 用于在强化次数相同的方案间择优并给出 score。
+        """
+        for name in thresholds:
+            if name not in STAT_INDEX:
+                raise ValueError(f"未知属性: {name}")
+        fixed = self._fixed_vector(main_attributes, selection, level)
+        allowed = self._allowed_types(main_attributes, available)
+
+        indices = np.array([STAT_INDEX[name] for name in thresholds], dtype=int)
+        targets = np.array(list(thresholds.values()), dtype=float)
+        required = targets - fixed[indices]
+        scale = np.where(np.abs(targets) > 1e-9, np.abs(targets), 1.0)
+        relevant = self._relevant_types(tuple(thresholds))
+        hit_vectors = self.hit_vectors[relevant]
+        coefficients = hit_vectors[:, indices]          # (k, C)
+
+        # 某类副属性单独满足它参与的全部阈值所需的命中数，更多的强化没有意义
+        budget = UPGRADES_PER_PIECE * len(allowed)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            needed = np.where(coefficients > 0, np.ceil(np.maximum(required, 0) / coefficients - 1e-9), 0)
+        limits = np.minimum(needed.max(axis=1, initial=0), budget).astype(np.int64)
+        layouts = self._layouts(allowed, relevant)
+        search = _RollSearch(layouts, limits, budget, required, coefficients, scale, self._grid)
+
+        def score_of(hits: np.ndarray) -> np.ndarray:
+            if objective is None:
+                return np.zeros(len(hits))
+            return np.atleast_1d(objective.score(fixed + hits @ hit_vectors))
+
+        found = search.fewest_rolls(score_of)
+        if found is not None:
+            layout, upgrades = found
+            hits = self._layout_hits(layout, upgrades, allowed, relevant)
+            return self._build(hits, fixed, objective, rolls_used=int(upgrades.sum()))
+
+        layout, upgrades = search.closest(self._grid(limits, budget), score_of)
+        hits = self._layout_hits(layout, upgrades, allowed, relevant)
+        return self._build(hits, fixed, objective, rolls_used=int(upgrades.sum()), feasible=False)
+
+    # ---------- 内部实现 ----------
+
+    def _fixed_vector(self, main_attributes, selection, level) -> np.ndarray:
+        model = self.model
+        fixed = model.base_vector + model.set_vector(selection)
+        for attribute in main_attributes:
+            if attribute:
+                fixed = fixed + model.main_vector(attribute, level)
+        return fixed
+
+    def _allowed_types(self, main_attributes, available) -> List[List[int]]:
+        """各槽位允许的副属性下标（排除与主属性同名的）"""
+        allowed = []
+        for slot, main in enumerate(main_attributes):
+            pool = available[slot] if available and slot < len(available) and available[slot] else None
+            names = {attribute.name for attribute in pool} if pool else None
+            types = [index for index, definition in enumerate(self.definitions)
+                     if (names is None or definition.name in names) and not (main and definition.name == main.name)]
+            if len(types) < SUB_STATS_PER_PIECE:
+                raise ValueError(f"槽位{slot + 1}可用副属性不足 {SUB_STATS_PER_PIECE} 种")
+            allowed.append(types)
+        return allowed
+
+    def _relevant_types(self, field_names: Sequence[str]) -> List[int]:
+        """会影响指定属性的副属性下标"""
+        indices = [STAT_INDEX[name] for name in field_names]
+        return [index for index in range(len(self.definitions)) if np.any(self.hit_vectors[index, indices] != 0)]
+
+    def _maximize_linear(self, allowed: List[List[int]], weights: np.ndarray) -> np.ndarray:
+        """线性目标：各盘独立取收益最高的 4 类，强化全部给第一类。返回 (槽位数, T) 命中数"""
+        gains = self.hit_vectors @ weights
+        hits = np.zeros((len(allowed), len(self.definitions)), dtype=np.int64)
+        for slot, types in enumerate(allowed):
+            ranked = sorted(types, key=lambda index: -gains[index])[:SUB_STATS_PER_PIECE]
+            hits[slot, ranked] = 1
+            hits[slot, ranked[0]] += UPGRADES_PER_PIECE
+        return hits
+
+    def _layouts(self, allowed: List[List[int]], relevant: List[int]) -> "_LayoutTable":
+        """各槽位可用的相关副属性相同时共用出现方式表"""
+        key = (tuple(relevant), tuple(tuple(index for index in relevant if index in types) for types in allowed))
+        layouts = self._layout_cache.get(key)
+        if layouts is None:
+            layouts = _cache_put(self._layout_cache, key, self._layout_table(allowed, relevant), LAYOUT_CACHE_SIZE)
+        return layouts
+
+    def _grid(self, limits: np.ndarray, budget: int) -> "_UpgradeGrid":
+        """按 (各类强化上限, 总强化次数) 共用强化向量网格"""
+        key = (tuple(int(limit) for limit in limits), int(budget))
+        grid = self._grid_cache.get(key)
+        if grid is None:
+            grid = _cache_put(self._grid_cache, key, _UpgradeGrid(limits, budget), GRID_CACHE_SIZE)
+        return grid
+
+    @staticmethod
+    def _layout_table(allowed: List[List[int]], relevant: List[int]) -> "_LayoutTable":
+        """枚举相关副属性的出现方式（每盘放满 min(4, 可用相关类型数)），按各类型组合覆盖的盘数去重
+
+        覆盖向量（单个类型的覆盖数即出现次数）决定了可行的强化向量，它等于各盘所选组合的覆盖向量之和，
+        所以逐盘做 DP：已有的覆盖向量与本盘各选项整体相加后按行去重，每个覆盖向量只保留一种选法。
+        """
+        k = len(relevant)
+        masks = np.arange(1, 1 << k)
+        disc_options = []
+        for types in allowed:
+            present = [position for position, index in enumerate(relevant) if index in types]
+            disc_options.append(list(itertools.combinations(present, min(SUB_STATS_PER_PIECE, len(present)))))
+
+        coverage = np.zeros((1, len(masks)), dtype=np.int8)
+        parents = []
+        for options in disc_options:
+            option_masks = np.array([sum(1 << position for position in option) for option in options])
+            option_coverage = ((option_masks[:, None] & masks[None, :]) != 0).astype(np.int8)
+            extended = (coverage[:, None, :] + option_coverage[None, :, :]).reshape(len(coverage) * len(options), -1)
+            first = _unique_rows(extended)
+            coverage = extended[first]
+            parents.append(np.divmod(first, len(options)))
+
+        # 回溯每个覆盖向量的各盘选项
+        rows = np.arange(len(coverage))
+        picks = []
+        for previous, option in reversed(parents):
+            picks.append(option[rows])
+            rows = previous[rows]
+        picks.reverse()
+
+        return _LayoutTable(disc_options, np.stack(picks, axis=1).reshape(len(coverage), len(disc_options)),
+                            coverage[:, (1 << np.arange(k)) - 1].astype(np.int64), UPGRADES_PER_PIECE * coverage)
+
+    def _layout_hits(self, layout: _Layout, upgrades: np.ndarray, allowed: List[List[int]],
+                     relevant: List[int]) -> np.ndarray:
+        """把相关副属性的强化分到各盘，并补齐为完整的 4 条副属性。返回 (槽位数, T) 命中数
+
+        剩余强化放在补位副属性上，没有补位时放回盘上的相关副属性。
+        """
+        split = _split_upgrades(layout.choices, upgrades)
+        hits = np.zeros((len(allowed), len(self.definitions)), dtype=np.int64)
+        relevant_set = set(relevant)
+        for slot, (option, types) in enumerate(zip(layout.choices, allowed)):
+            chosen = [relevant[position] for position in option]
+            hits[slot, chosen] = 1 + split[slot][list(option)]
+            fillers = [index for index in types if index not in relevant_set][:SUB_STATS_PER_PIECE - len(chosen)]
+            hits[slot, fillers] = 1
+            leftover = UPGRADES_PER_PIECE - int(split[slot].sum())
+            if leftover:
+                hits[slot, fillers[0] if fillers else chosen[0]] += leftover
+        return hits
+
+    def _build(self, hits: np.ndarray, fixed: np.ndarray, objective: Optional[Objective], rolls_used: int,
+               feasible: bool = True) -> SubStatAllocation:
+        final = fixed + hits.sum(axis=0) @ self.hit_vectors
+        sub_rolls = [[(self.definitions[index], int(hits[slot, index]) - 1) for index in np.flatnonzero(hits[slot])]
+                     for slot in range(len(hits))]
+        return SubStatAllocation(
+            sub_rolls=sub_rolls,
+            score=float(objective.score(final)) if objective else 0.0,
+            rolls_used=rolls_used,
+            final_stats=StatModel.to_dict(final),
+            feasible=feasible
+        )
+
+
+class _RollSearch:
+    """在全部出现方式上求强化次数最少（或缺口最小）的强化向量
+
+    出现方式按出现次数 presence 分组：阈值缺口只取决于 presence + 强化向量，同组只是 Hall 条件的容量不同。
+    阈值之间只通过共同涉及的副属性相关联（一类副属性只加一项属性，通常每个阈值只涉及 1-2 类），
+    按连通分量分别在小网格上枚举，各组共用。
+    """
+
+    def __init__(self, layouts: _LayoutTable, limits: np.ndarray, budget: int, required: np.ndarray,
+                 coefficients: np.ndarray, scale: np.ndarray, grid_of=None):
+        k = len(limits)
+        self.layouts = layouts
+        self.limits, self.budget = limits, budget
+        self.required, self.coefficients, self.scale = required, coefficients, scale
+        self.capacity = layouts.capacity
+        self.groups, self.members, group_of = layouts.groups()
+        self.membership = ((np.arange(1, 1 << k)[:, None] >> np.arange(k)[None, :]) & 1).T    # (k, 2^k - 1)
+
+        # 各组扣除出现次数后的缺口和每类强化上限（出现在 p 个盘上的副属性至多强化 5p 次）
+        self.deficits = required - self.groups @ coefficients
+        self.bounds = np.minimum(limits, UPGRADES_PER_PIECE * self.groups)
+        # 各出现方式的秩（可用强化总次数的最大值）= min_T (T 的容量 + T 之外各类的上限)
+        total = self.bounds.sum(axis=1)
+        outside = total[:, None] - self.bounds @ self.membership
+        self.ranks = np.minimum(np.minimum(total, budget)[group_of],
+                                np.min(self.capacity + outside[group_of], axis=1, initial=budget))
+        self.group_ranks = np.zeros(len(self.groups), dtype=np.int64)
+        np.maximum.at(self.group_ranks, group_of, self.ranks)
+        grid_of = grid_of or _UpgradeGrid
+        self.components = [(types, thresholds, *grid_of(limits[types], budget).all_rows())
+                           for types, thresholds in _components(coefficients)]
+        linked = np.zeros(len(required), dtype=bool)
+        for _, thresholds, _, _ in self.components:
+            linked[thresholds] = True
+        self.unlinked = ~linked     # 没有副属性能提供的阈值，只能靠固定部分满足
+        self.constant = (np.maximum(required[self.unlinked], 0) / scale[self.unlinked]).sum()
+        self.shortfalls: List[np.ndarray] = []      # 各分量 (组数, 网格行数) 的缺口，_shortfall_bounds 填入
+
+    def _covered(self, types: np.ndarray, thresholds: np.ndarray, upgrades: np.ndarray) -> np.ndarray:
+        """(组数, 网格行数)：分量内的强化向量在各组的上限内且满足该分量的全部阈值"""
+        gains = upgrades @ self.coefficients[np.ix_(types, thresholds)]
+        tolerance = 1e-9 * self.scale[thresholds]
+        covered = np.all(gains[None] >= self.deficits[:, None, thresholds] - tolerance, axis=2)
+        covered &= np.all(upgrades[None] <= self.bounds[:, None, types], axis=2)
+        return covered
+
+    @staticmethod
+    def _minimal(covered: np.ndarray, upgrades: np.ndarray) -> np.ndarray:
+        """覆盖向量中任一类少强化一次就不再覆盖的（极小覆盖向量）"""
+        lookup = np.full(tuple(upgrades.max(axis=0, initial=0) + 1), -1, dtype=np.int64)
+        lookup[tuple(upgrades.T)] = np.arange(len(upgrades))
+        minimal = covered.copy()
+        for column in range(upgrades.shape[1]):
+            reducible = np.flatnonzero(upgrades[:, column] > 0)
+            lowered = upgrades[reducible].copy()
+            lowered[:, column] -= 1
+            minimal[:, reducible] &= ~covered[:, lookup[tuple(lowered.T)]]
+        return minimal
+
+    def fewest_rolls(self, score_of) -> Optional[Tuple[_Layout, np.ndarray]]:
+        """强化次数最少、次数相同时 score_of(命中数) 最高的 (出现方式, 强化向量)，不可行时返回 None
+
+        强化次数最少的解一定是极小覆盖向量：少强化一次仍满足 Hall 条件，若仍覆盖阈值就与“最少”矛盾。
+        各组的候选是各分量极小覆盖向量的组合，按组的强化次数下界从小到大检查 Hall 条件，下界超过当前最优时停止。
+        """
+        if np.any(self.required[self.unlinked] > 1e-9 * self.scale[self.unlinked]):
+            return None
+        minimal, lower = [], np.zeros(len(self.groups))
+        for types, thresholds, upgrades, totals in self.components:
+            covered = self._covered(types, thresholds, upgrades)
+            lower += np.where(covered, totals, np.inf).min(axis=1, initial=np.inf)
+            minimal.append(self._minimal(covered, upgrades))
+        lower[lower > self.group_ranks] = np.inf      # 组内任何出现方式都放不下这么多强化
+
+        best = None     # (强化次数, 分数, 出现方式下标, 强化向量)
+        for group in np.argsort(lower, kind="stable"):
+            if not np.isfinite(lower[group]) or (best is not None and lower[group] > best[0]):
+                break
+            choices = [np.flatnonzero(rows[group]) for rows in minimal]
+            candidates = np.zeros((int(np.prod([len(rows) for rows in choices])), len(self.limits)), dtype=np.int64)
+            for (types, _, upgrades, _), rows in zip(self.components, np.meshgrid(*choices, indexing="ij")):
+                candidates[:, types] = upgrades[rows.reshape(-1)]
+            totals = candidates.sum(axis=1)
+            if best is not None:
+                candidates, totals = candidates[totals <= best[0]], totals[totals <= best[0]]
+
+            members = self.members[group]
+            fits = np.all((candidates @ self.membership)[:, None, :] <= self.capacity[members][None, :, :], axis=2)
+            feasible = fits.any(axis=1)
+            if not feasible.any():
+                continue
+            least = int(totals[feasible].min())
+            chosen = np.flatnonzero(feasible & (totals == least))
+            scores = score_of(self.groups[group] + candidates[chosen])
+            index = int(np.argmax(scores))
+            if best is None or least < best[0] or scores[index] > best[1]:
+                row = chosen[index]
+                best = (least, float(scores[index]), int(members[np.argmax(fits[row])]), candidates[row])
+
+        if best is None:
+            return None
+        return self.layouts[best[2]], best[3]
+
+    def _shortfall_bounds(self) -> np.ndarray:
+        """各组缺口的下界：只保留每类上限和强化总次数（不超过组内最大的秩），各分量按总次数做 min-plus 合并"""
+        budget = self.budget
+        bound = np.zeros((len(self.groups), budget + 1))
+        for types, thresholds, upgrades, totals in self.components:
+            gains = upgrades @ self.coefficients[np.ix_(types, thresholds)]
+            shortfall = (np.maximum(self.deficits[:, None, thresholds] - gains[None], 0)
+                         / self.scale[thresholds]).sum(axis=2)
+            shortfall = np.where(np.all(upgrades[None] <= self.bounds[:, None, types], axis=2), shortfall, np.inf)
+            self.shortfalls.append(shortfall)
+            by_total = np.full_like(bound, np.inf)
+            for total in range(budget + 1):
+                start, stop = np.searchsorted(totals, [total, total + 1])
+                if start < stop:
+                    by_total[:, total] = shortfall[:, start:stop].min(axis=1)
+            by_total = np.minimum.accumulate(by_total, axis=1)
+            bound = np.array([np.min(bound[:, :total + 1] + by_total[:, total::-1], axis=1)
+                              for total in range(budget + 1)]).T
+        return bound[np.arange(len(self.groups)), self.group_ranks] + self.constant
+
+    def closest(self, grid: "_UpgradeGrid", score_of) -> Tuple[_Layout, np.ndarray]:
+        """都不可行时相对缺口之和最小的 (出现方式, 强化向量)，缺口相同时取 score_of 最高的
+
+        缺口随强化单调减小，每种出现方式只看极大强化向量（总次数等于秩）；按组的缺口下界从小到大求解，
+        下界不小于当前最优时停止。同组同秩的出现方式一起求解：强化向量按缺口排序后分块检查 Hall 条件，
+        找到第一个放得下的就停止。
+        """
+        lower = self._shortfall_bounds()
+        closest = None      # (缺口, 分数, 出现方式下标, 强化向量)
+        for group in np.argsort(lower, kind="stable"):
+            if closest is not None and lower[group] > closest[0] + 1e-12:
+                break
+            members = self.members[group]
+            for rank in np.unique(self.ranks[members]):
+                cutoff = np.inf if closest is None else closest[0] + 1e-12
+                found = self._closest_at(grid, group, members[self.ranks[members] == rank], int(rank), cutoff, score_of)
+                if found is not None and (closest is None or found[0] < closest[0] - 1e-12 or found[1] > closest[1]):
+                    closest = found
+        return self.layouts[closest[2]], closest[3]
+
+    def _closest_at(self, grid: "_UpgradeGrid", group: int, members: np.ndarray, total: int, cutoff: float,
+                    score_of) -> Optional[Tuple[float, float, int, np.ndarray]]:
+        """组内秩同为 total 的出现方式中缺口最小（相同时分数最高）的 (缺口, 分数, 出现方式下标, 强化向量)，
+        缺口都超过 cutoff 时返回 None"""
+        # 缺口按分量可加：查各分量的缺口表（超出该组上限的为 inf），不必对整块重新计算
+        upgrades, loads = grid.block(total)
+        shortfall = np.full(len(upgrades), self.constant)
+        for (types, _, rows, _), table in zip(self.components, self.shortfalls):
+            shape = tuple(self.limits[types] + 1)
+            dense = np.full(int(np.prod(shape)), np.inf)
+            dense[np.ravel_multi_index(tuple(rows.T), shape)] = table[group]
+            shortfall += dense[grid.flat_index(total, types)]
+        order = np.flatnonzero(np.isfinite(shortfall) & (shortfall <= cutoff))
+        order = order[np.argsort(shortfall[order], kind="stable")]
+        capacity = self.capacity[members]
+        step = max(1, (1 << 22) // max(1, capacity.size))
+        least, rows, owners = None, [], []
+        for start in range(0, len(order), step):
+            chunk = order[start:start + step]
+            if least is not None and shortfall[chunk[0]] > least + 1e-12:
+                break
+            fits = np.all(loads[chunk][:, None, :] <= capacity[None], axis=2)
+            fitting = fits.any(axis=1)
+            if least is None:
+                if not fitting.any():
+                    continue
+                least = shortfall[chunk[np.argmax(fitting)]]
+            tied = fitting & (shortfall[chunk] <= least + 1e-12)
+            rows.append(chunk[tied])
+            owners.append(members[np.argmax(fits[tied], axis=1)])
+        if least is None:
+            return None
+        rows, owners = np.concatenate(rows), np.concatenate(owners)
+        scores = score_of(self.groups[group] + upgrades[rows])
+        chosen = int(np.argmax(scores))
+        return float(least), float(scores[chosen]), int(owners[chosen]), upgrades[rows[chosen]]
+
+
+def _cache_put(cache: dict, key, value, size: int):
+    """写入缓存，超出容量时丢弃最早写入的"""
+    if len(cache) >= size:
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+
+def _unique_rows(values: np.ndarray) -> np.ndarray:
+    """各不相同的行首次出现的下标（按行排序）：非负小整数按位打包成若干 uint64 后排序，比按行比较快得多"""
+    count, width = values.shape
+    if count == 0 or width == 0:
+        return np.arange(min(count, 1))
+    bits = max(1, int(values.max()).bit_length())
+    per_word = 64 // bits
+    keys = []
+    for start in range(0, width, per_word):
+        block = values[:, start:start + per_word].astype(np.uint64)
+        keys.append((block << (np.arange(block.shape[1], dtype=np.uint64) * np.uint64(bits))).sum(axis=1))
+    order = np.lexsort(keys[::-1])
+    ordered = np.stack(keys)[:, order]
+    first = np.ones(count, dtype=bool)
+    first[1:] = np.any(ordered[:, 1:] != ordered[:, :-1], axis=0)
+    return order[first]
+
+
+def _components(coefficients: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """按共同涉及的阈值把相关副属性分成互不相关的组，返回各组的 (副属性位置, 阈值位置)"""
+    linked = coefficients > 0
+    components, assigned = [], np.zeros(len(coefficients), dtype=bool)
+    for start in range(len(coefficients)):
+        if assigned[start]:
+            continue
+        types = np.zeros(len(coefficients), dtype=bool)
+        types[start] = True
+        while True:
+            thresholds = linked[types].any(axis=0)
+            grown = types | linked[:, thresholds].any(axis=1)
+            if (grown == types).all():
+                break
+            types = grown
+        assigned |= types
+        components.append((np.flatnonzero(types), np.flatnonzero(thresholds)))
+    return components
+
+
+class _UpgradeGrid:
+    """全部 0 ≤ u_t ≤ limits[t] 且 Σu ≤ budget 的强化向量，按强化总次数分块，用到哪块才生成哪块"""
+
+    def __init__(self, limits: np.ndarray, budget: int):
+        self.limits = np.asarray(limits, dtype=np.int64)
+        self.budget = int(budget)
+        k = len(self.limits)
+        self.membership = ((np.arange(1, 1 << k)[:, None] >> np.arange(k)[None, :]) & 1).T     # (k, 2^k - 1)
+        self._blocks: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._all_rows: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._flat_indices: Dict[tuple, np.ndarray] = {}
+
+    def block(self, total: int) -> Tuple[np.ndarray, np.ndarray]:
+        """总次数为 total 的强化向量，以及它们在各类型组合上占用的强化次数（各出现方式共用；
+        总数不超过 30，用 int8 加快计算和比较）"""
+        cached = self._blocks.get(total)
+        if cached is not None:
+            return cached
+        limits = self.limits
+        if len(limits) == 0:
+            upgrades = np.zeros((1 if total == 0 else 0, 0), dtype=np.int64)
+        else:
+            upgrades = np.zeros((1, 0), dtype=np.int64)
+            for limit in limits[:-1]:
+                values = np.arange(int(limit) + 1, dtype=np.int64)
+                upgrades = np.hstack([np.repeat(upgrades, len(values), axis=0),
+                                      np.tile(values, len(upgrades))[:, None]])
+                upgrades = upgrades[upgrades.sum(axis=1) <= total]
+            last = total - upgrades.sum(axis=1)
+            keep = last <= limits[-1]
+            upgrades = np.hstack([upgrades[keep], last[keep][:, None]])
+        cached = self._blocks[total] = (upgrades, upgrades.astype(np.int8) @ self.membership.astype(np.int8))
+        return cached
+
+    def flat_index(self, total: int, types: np.ndarray) -> np.ndarray:
+        """总次数为 total 的强化向量在 types 这几类上的部分，按 limits[types] + 1 的形状展平后的下标"""
+        key = (total, tuple(int(index) for index in types))
+        cached = self._flat_indices.get(key)
+        if cached is None:
+            upgrades = self.block(total)[0]
+            cached = self._flat_indices[key] = np.ravel_multi_index(tuple(upgrades[:, types].T),
+                                                                    tuple(self.limits[types] + 1))
+        return cached
+
+    def all_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """全部强化向量及其总次数（按总次数升序）"""
+        if self._all_rows is None:
+            blocks = [self.block(total)[0] for total in range(min(self.budget, int(self.limits.sum())) + 1)]
+            self._all_rows = (np.concatenate(blocks),
+                              np.repeat(np.arange(len(blocks)), [len(block) for block in blocks]))
+        return self._all_rows
+
+    def _bounds(self, layout: _Layout) -> np.ndarray:
+        return np.minimum(self.limits, UPGRADES_PER_PIECE * layout.presence)
+
+    def rank(self, layout: _Layout) -> int:
+        """该出现方式下强化总次数的最大值 = min_T (T 的容量 + T 之外各类的上限)"""
+        bounds = self._bounds(layout)
+        outside = bounds.sum() - bounds @ self.membership
+        return int(min(bounds.sum(), self.budget, np.min(layout.capacity + outside, initial=bounds.sum())))
+
+    def rows(self, layout: _Layout, total: int) -> np.ndarray:
+        """总次数为 total、能分到各盘的强化向量"""
+        upgrades, loads = self.block(total)
+        mask = np.all(upgrades <= self._bounds(layout), axis=1)
+        mask &= np.all(loads <= layout.capacity, axis=1)
+        return upgrades[mask]
+
+
+def _split_upgrades(choices: Sequence[Tuple[int, ...]], upgrades: np.ndarray) -> np.ndarray:
+    """把各类副属性的强化次数逐次分到各盘（增广路），返回 (盘数, k)"""
+    k = len(upgrades)
+    split = np.zeros((len(choices), k), dtype=np.int64)
+    remaining = [UPGRADES_PER_PIECE] * len(choices)
+    holders = [[slot for slot, option in enumerate(choices) if position in option] for position in range(k)]
+
+    for position, amount in enumerate(upgrades):
+        for _ in range(int(amount)):
+            # 广度优先：position 放到有空余的盘，或挤掉某盘上另一类的一次强化再为它找位置
+            parents = {position: None}
+            queue, target = [position], None
+            while queue and target is None:
+                current = queue.pop(0)
+                for slot in holders[current]:
+                    if remaining[slot]:
+                        target = (current, slot)
+                        break
+                    for other in choices[slot]:
+                        if other not in parents and split[slot, other]:
+                            parents[other] = (current, slot)
+                            queue.append(other)
+            if target is None:
+                raise ValueError("强化次数无法分配到驱动盘")
+            current, slot = target
+            split[slot, current] += 1
+            remaining[slot] -= 1
+            while parents[current] is not None:
+                previous, moved_slot = parents[current]
+                split[moved_slot, current] -= 1
+                split[moved_slot, previous] += 1
+                current = previous
+    return split
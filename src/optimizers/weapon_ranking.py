@@ -0,0 +1,159 @@
+# src/optimizers/weapon_ranking.py
+"""音擎批量评估 - 固定驱动盘配置，一次评估全部（或已拥有的）音擎并按目标排序
+
+音擎只改变基础属性：基础攻击力加到 attack，随机属性加到对应属性（同 WeaponSchema.apply_to_character）。
+驱动盘加成 = 固定部分 + 比例 ⊙ 基础属性（StatModel.gear_components），因此
+最终属性 = W ⊙ (1 + 比例) + 固定部分，W = 角色基础属性 + 音擎项：驱动盘只计算一次，全部音擎一次矩阵运算。
+目标值按 无音擎 → 加基础攻击力 → 再加随机属性 的顺序拆出两项贡献，两项之和等于相对无音擎的提升。
+攻击力% 这类按基础属性计算的百分比随机属性，apply_to_character 也是按数值直接相加的，
+算出的随机属性贡献没有意义，这类音擎在结果中标出且不报告随机属性贡献。
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.data.manager import DataManager
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.objectives import Objective
+from src.optimizers.stat_model import STAT_FIELDS, STAT_INDEX, StatModel
+from src.parsers.weapon_parsers import WeaponConverter
+
+# 百分比值按基础属性计算的属性（同 GearCalculator._is_base_percentage_attr）
+BASE_PERCENTAGE_FIELDS = ("hp", "attack", "defence", "impact", "anomaly_mastery", "pen")
+
+
+@dataclass
+class WeaponTerm:
+    """音擎在指定等级时对基础属性的加成"""
+    weapon_id: int
+    name: str
+    rarity: int
+    level: int
+    base_attack: float
+    random_field: str               # 随机属性对应的属性名
+    random_value: float
+    random_is_percentage: bool
+
+    def vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(基础攻击力向量, 随机属性向量)"""
+        base, random = np.zeros(len(STAT_FIELDS)), np.zeros(len(STAT_FIELDS))
+        base[STAT_INDEX["attack"]] = self.base_attack
+        if self.random_field in STAT_INDEX:
+            random[STAT_INDEX[self.random_field]] = self.random_value
+        return base, random
+
+    @property
+    def random_added_as_value(self) -> bool:
+        """随机属性是按基础属性计算的百分比，却和 apply_to_character 一样按数值直接相加"""
+        return self.random_is_percentage and self.random_field in BASE_PERCENTAGE_FIELDS
+
+    @property
+    def random_label(self) -> str:
+        value = f"{self.random_value:.1%}" if self.random_is_percentage else f"{self.random_value:g}"
+        return f"{self.random_field} +{value}{' *' if self.random_added_as_value else ''}"
+
+
+@dataclass
+class WeaponEvaluation:
+    weapon: WeaponTerm
+    score: float
+    base_contribution: float        # 基础攻击力带来的目标值提升
+    random_contribution: Optional[float]    # 在基础攻击力之上，随机属性带来的目标值提升（按数值相加的百分比属性为 None）
+    final_stats: Dict[str, float]
+
+
+@dataclass
+class WeaponRanking:
+    """按目标值从高到低排列的评估结果"""
+    objective_name: str
+    baseline_score: float           # 不装备音擎时的目标值
+    evaluations: List[WeaponEvaluation]
+    failures: List[Tuple[int, str]] = field(default_factory=list)     # 无法加载的音擎 (ID, 原因)
+
+    def format_table(self, top: Optional[int] = None) -> str:
+        lines = [f"目标: {self.objective_name}，无音擎 {self.baseline_score:.4g}",
+                 f"{'排名':<4}{'音擎':<18}{'等级':>4}{'基础攻击':>8}  {'随机属性':<26}{'目标值':>10}"
+                 f"{'基础攻击贡献':>12}{'随机属性贡献':>12}"]
+        for rank, evaluation in enumerate(self.evaluations[:top], start=1):
+            weapon = evaluation.weapon
+            random = "—" if evaluation.random_contribution is None else f"{evaluation.random_contribution:+.4g}"
+            lines.append(f"{rank:<6}{weapon.name:<18}{weapon.level:>6}{weapon.base_attack:>10g}  "
+                         f"{weapon.random_label:<28}{evaluation.score:>12.4g}"
+                         f"{evaluation.base_contribution:>+16.4g}{random:>16}")
+        if any(evaluation.weapon.random_added_as_value for evaluation in self.evaluations[:top]):
+            lines.append("* 百分比随机属性与 WeaponSchema.apply_to_character 一致按数值直接相加，不报告其贡献")
+        for weapon_id, reason in self.failures:
+            lines.append(f"⚠️ 音擎 {weapon_id}: {reason}")
+        return "\n".join(lines)
+
+
+def load_weapon_terms(data_manager: DataManager, weapon_levels: Optional[Mapping[int, int]] = None,
+                      level: int = 60) -> Tuple[List[WeaponTerm], List[Tuple[int, str]]]:
+    """读取音擎加成：weapon_levels 为 {音擎ID: 等级}（已拥有的音擎），None 为全部音擎按 level 计算"""
+    if weapon_levels is None:
+        weapon_levels = {weapon.id: level for weapon in data_manager.get_all_weapons()}
+    terms, failures = [], []
+    for weapon_id, weapon_level in weapon_levels.items():
+        weapon = data_manager.get_weapon(int(weapon_id))
+        if not weapon or not weapon.file_path.exists():
+            failures.append((int(weapon_id), "找不到音擎数据"))
+            continue
+        try:
+            schema = WeaponConverter.load_from_file(weapon.file_path)
+        except ValueError as e:
+            failures.append((int(weapon_id), str(e)))
+            continue
+        base_attack, random_value = schema.calculate_final_values(int(weapon_level))
+        terms.append(WeaponTerm(
+            weapon_id=int(weapon_id),
+            name=schema.name or weapon.name,
+            rarity=schema.rarity,
+            level=int(weapon_level),
+            base_attack=base_attack,
+            random_field=schema.random_attr_type.value,
+            random_value=random_value,
+            random_is_percentage=schema.random_attr_is_percentage
+        ))
+    return terms, failures
+
+
+def selection_from_pieces(pieces: Iterable[GearPiece]) -> GearSetSelection:
+    """按驱动盘套装件数得到套装组合（满 4 件为 4+2，否则为 2+2+2，同 Build.selection）"""
+    counts = Counter(piece.set_id for piece in pieces if piece.set_id)
+    four = [set_id for set_id, count in counts.items() if count >= 4]
+    two = [set_id for set_id, count in counts.items() if 2 <= count < 4]
+    return GearSetSelection("4+2", four + two) if four else GearSetSelection("2+2+2", two)
+
+
+def rank_weapons(model: StatModel, pieces: Iterable[GearPiece], selection: Optional[GearSetSelection],
+                 gear_level: int, objective: Objective, terms: List[WeaponTerm]) -> WeaponRanking:
+    """model 为未装备音擎的角色属性模型，返回按目标值排序的结果"""
+    direct, scale = model.gear_components(pieces, selection, gear_level)
+
+    def final(base_vectors: np.ndarray) -> np.ndarray:
+        return base_vectors * (1 + scale) + direct
+
+    baseline = float(objective.score(final(model.base_vector)))
+    if not terms:
+        return WeaponRanking(objective.name, baseline, [])
+
+    base_terms, random_terms = (np.array(vectors) for vectors in zip(*(term.vectors() for term in terms)))
+    with_base = model.base_vector + base_terms
+    stats = final(with_base + random_terms)
+    scores = objective.score(stats)
+    base_scores = objective.score(final(with_base))
+
+    evaluations = [
+        WeaponEvaluation(
+            weapon=term,
+            score=float(scores[index]),
+            base_contribution=float(base_scores[index] - baseline),
+            random_contribution=None if term.random_added_as_value else float(scores[index] - base_scores[index]),
+            final_stats=StatModel.to_dict(stats[index])
+        )
+        for index, term in enumerate(terms)
+    ]
+    evaluations.sort(key=lambda evaluation: -evaluation.score)
+    return WeaponRanking(objective.name, baseline, evaluations)
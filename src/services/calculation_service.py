@@ -1,5 +1,6 @@
-from typing import List, Optional
-from src.data.manager import data_manager
+from typing import Dict, List, Optional
+from src.data.manager import DataManager
+from src.services.metrics import metrics_registry
 from src.models.character_attributes import CharacterAttributesModel
 from src.models.gear_models import GearPiece, GearSetSelection
 from src.calculators.character_calculator import CharacterAttributeCalculator
@@ -10,7 +11,10 @@ from src.parsers.weapon_parsers import WeaponConverter
 class CalculationService:
     """计算服务 - 负责所有计算逻辑"""
 
-    def __init__(self):
+    def __init__(self, manager: Optional[DataManager] = None):
+        if manager is None:
+            from src.data.manager import data_manager as manager
+        self.data_manager = manager
         self.character_calculator = CharacterAttributeCalculator()
         self.gear_calculator = GearCalculator()
         self.gear_set_manager: Optional[GearSetManager] = None
@@ -21,10 +25,9 @@ class CalculationService:
     def _init_gear_set_manager(self):
         """初始化装备套装管理器"""
         try:
-            from src.config.manager import config_manager
             import json
 
-            equipment_file = config_manager.file.equipment_file
+            equipment_file = self.data_manager.file_config.equipment_file
             if equipment_file.exists():
                 with open(equipment_file, 'r', encoding='utf-8') as f:
                     equipment_data = json.load(f)
@@ -42,16 +45,19 @@ class CalculationService:
             core_passive_level: int
     ) -> Optional[CharacterAttributesModel]:
         """计算角色基础属性"""
-        character = data_manager.get_character(character_id)
-        if not character or not character.file_path.exists():
-            return None
-
-        return self.character_calculator.calculate_character_attributes(
-            str(character.file_path),
-            level,
-            breakthrough_level,
-            core_passive_level
-        )
+        metrics_registry.inc("calc.character_base_stats.calls")
+        with metrics_registry.timer("calc.character_base_stats"):
+            character = self.data_manager.get_character(character_id)
+            if not character or not character.file_path.exists():
+                metrics_registry.inc("calc.character_base_stats.missing")
+                return None
+
+            return self.character_calculator.calculate_character_attributes(
+                str(character.file_path),
+                level,
+                breakthrough_level,
+                core_passive_level
+            )
 
     def calculate_character_with_weapon(
             self,
@@ -63,26 +69,32 @@ class CalculationService:
             weapon_level: int
     ) -> Optional[CharacterAttributesModel]:
         """计算带音擎的角色属性"""
-        # 计算基础属性
-        base_stats = self.calculate_character_base_stats(
-            character_id, character_level, breakthrough_level, core_passive_level
-        )
-
-        if not base_stats:
-            return None
-
-        # 应用音擎加成
-        weapon = data_manager.get_weapon(weapon_id)
-        if not weapon or not weapon.file_path.exists():
-            return base_stats
-
-        try:
-            weapon_schema = WeaponConverter.load_from_file(weapon.file_path)
-            weapon_schema.apply_to_character(base_stats, weapon_level)
-            return base_stats
-        except Exception as e:
-            print(f"应用音擎失败: {e}")
-            return base_stats
+        metrics_registry.inc("calc.character_with_weapon.calls")
+        with metrics_registry.timer("calc.character_with_weapon"):
+            # 计算基础属性
+            base_stats = self.calculate_character_base_stats(
+                character_id, character_level, breakthrough_level, core_passive_level
+            )
+
+            if not base_stats:
+                return None
+
+            # 应用音擎加成
+            weapon = self.data_manager.get_weapon(weapon_id)
+            if not weapon or not weapon.file_path.exists():
+                metrics_registry.inc("calc.character_with_weapon.missing_weapon")
+                return base_stats
+
+            try:
+                with metrics_registry.timer("calc.weapon_parse"):
+                    weapon_schema = WeaponConverter.load_from_file(weapon.file_path)
+                with metrics_registry.timer("calc.weapon_apply"):
+                    weapon_schema.apply_to_character(base_stats, weapon_level)
+                return base_stats
+            except Exception as e:
+                metrics_registry.inc("calc.character_with_weapon.errors")
+                print(f"应用音擎失败: {e}")
+                return base_stats
 
     def calculate_final_stats(
             self,
@@ -92,12 +104,52 @@ class CalculationService:
             gear_enhance_level: int
     ):
         """计算最终属性（包含驱动盘）"""
-        return self.gear_calculator.calculate_complete_stats(
-            base_stats,
-            gear_pieces,
-            gear_set_selection,
-            gear_enhance_level
-        )
+        metrics_registry.inc("calc.final_stats.calls")
+        with metrics_registry.timer("calc.final_stats"):
+            return self.gear_calculator.calculate_complete_stats(
+                base_stats,
+                gear_pieces,
+                gear_set_selection,
+                gear_enhance_level
+            )
+
+    def evaluate_weapons(
+            self,
+            character_id: int,
+            character_level: int,
+            breakthrough_level: int,
+            core_passive_level: int,
+            gear_pieces: List[GearPiece],
+            gear_set_selection: Optional[GearSetSelection],
+            gear_enhance_level: int,
+            objective=None,
+            weapon_levels: Optional[Dict[int, int]] = None,
+            weapon_level: int = 60
+    ):
+        """固定驱动盘配置，一次评估全部音擎（weapon_levels 为 {音擎ID: 等级} 时只评估这些），返回 WeaponRanking
+
+        角色基础属性和驱动盘加成只计算一次，各音擎只有音擎项不同；objective 为 Objective 或目标名称
+        （名称按角色元素解析，默认 damage）。
+        """
+        from src.optimizers.objectives import get_objective
+        from src.optimizers.stat_model import StatModel
+        from src.optimizers.weapon_ranking import load_weapon_terms, rank_weapons
+
+        metrics_registry.inc("calc.weapon_ranking.calls")
+        with metrics_registry.timer("calc.weapon_ranking"):
+            base_stats = self.calculate_character_base_stats(
+                character_id, character_level, breakthrough_level, core_passive_level
+            )
+            if not base_stats:
+                return None
+
+            if objective is None or isinstance(objective, str):
+                objective = get_objective(objective or "damage", getattr(base_stats, "element_type", ""))
+            terms, failures = load_weapon_terms(self.data_manager, weapon_levels, weapon_level)
+            model = StatModel(base_stats, self.gear_calculator, self.gear_set_manager)
+            ranking = rank_weapons(model, gear_pieces, gear_set_selection, gear_enhance_level, objective, terms)
+            ranking.failures = failures
+            return ranking
 
     def get_breakthrough_level(self, character_level: int) -> int:
         """根据等级计算突破阶段"""
@@ -115,5 +167,9 @@ class CalculationService:
             return 6
 
 
-# 创建全局计算服务实例
-calculation_service = CalculationService()
\ No newline at end of file
+def __getattr__(name):
+    # 全局计算服务实例在首次访问时创建
+    if name == "calculation_service":
+        instance = globals()["calculation_service"] = CalculationService()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,249 @@
+# src/services/metrics.py
+"""指标注册表 - 计数器和固定分桶直方图
+
+用于统计计算各阶段耗时、数据加载耗时和各缓存层的命中率。
+默认关闭：关闭时 timer() 返回共享的空上下文，inc()/observe() 直接返回，
+热路径上只多一次属性判断。设置环境变量 ZZZ_METRICS=1 或调用 enable() 开启。
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# 直方图默认分桶上界（毫秒），最后还有一个溢出桶
+DEFAULT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+
+class Counter:
+    """单调递增计数器"""
+
+    __slots__ = ("name", "value", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """固定分桶直方图（观测值单位：毫秒）"""
+
+    __slots__ = ("name", "buckets", "counts", "count", "total", "min", "max", "_lock")
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, fraction: float) -> float:
+        """按分桶估计分位数（返回所在桶的上界，溢出桶返回最大值）"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 4),
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+            "min_ms": round(self.min, 4) if self.count else 0.0,
+            "max_ms": round(self.max, 4),
+            "p50_ms": round(self.quantile(0.5), 4),
+            "p90_ms": round(self.quantile(0.9), 4),
+            "buckets": {("+Inf" if index == len(self.buckets) else str(self.buckets[index])): bucket_count
+                        for index, bucket_count in enumerate(self.counts) if bucket_count}
+        }
+
+
+class _Timer:
+    """计时上下文，退出时把耗时写入直方图"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._histogram.observe((time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class _NullTimer:
+    """指标关闭时使用的空计时上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """指标注册表
+
+    名称用点号分层，例如 calc.parse、load.characters；
+    缓存命中记录为 cache.<缓存名>.hits / cache.<缓存名>.misses 两个计数器。
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._counters: Dict[str, Counter] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counter(self, name: str) -> Counter:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, Counter(name))
+        return counter
+
+    def histogram(self, name: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name, buckets or DEFAULT_BUCKETS_MS))
+        return histogram
+
+    def inc(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counter(name).inc(amount)
+
+    def observe(self, name: str, value_ms: float):
+        if self.enabled:
+            self.histogram(name).observe(value_ms)
+
+    def timer(self, name: str):
+        """计时上下文：with metrics_registry.timer("calc.parse"): ..."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name))
+
+    def timed(self, name: str) -> Callable:
+        """计时装饰器（是否记录在每次调用时判断）"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self.histogram(name)):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_cache(self, cache_name: str, hit: bool):
+        """记录一次缓存查询结果"""
+        if self.enabled:
+            self.counter(f"cache.{cache_name}.{'hits' if hit else 'misses'}").inc()
+
+    def cache_hit_rates(self) -> Dict[str, Dict[str, Any]]:
+        """各缓存层的命中统计"""
+        caches: Dict[str, Dict[str, Any]] = {}
+        for name, counter in list(self._counters.items()):
+            if not name.startswith("cache."):
+                continue
+            cache_name, _, kind = name[len("cache."):].rpartition(".")
+            entry = caches.setdefault(cache_name, {"hits": 0, "misses": 0})
+            entry[kind] = counter.value
+
+        for entry in caches.values():
+            total = entry["hits"] + entry["misses"]
+            entry["hit_rate"] = round(entry["hits"] / total, 4) if total else 0.0
+        return caches
+
+    def dump(self) -> Dict[str, Any]:
+        """导出全部指标（可序列化为JSON）"""
+        return {
+            "enabled": self.enabled,
+            "counters": {name: counter.value for name, counter in sorted(self._counters.items())
+                         if not name.startswith("cache.")},
+            "histograms": {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())},
+            "caches": self.cache_hit_rates()
+        }
+
+    def format_report(self) -> str:
+        """多行文本报告（命令行使用）"""
+        lines = [f"{'指标':<32}{'次数':>8}{'平均(ms)':>12}{'p50(ms)':>10}{'p90(ms)':>10}{'最大(ms)':>12}"]
+        for name, histogram in sorted(self._histograms.items()):
+            data = histogram.to_dict()
+            lines.append(f"{name:<32}{data['count']:>8}{data['mean_ms']:>12.3f}{data['p50_ms']:>10.3f}"
+                         f"{data['p90_ms']:>10.3f}{data['max_ms']:>12.3f}")
+
+        counters = self.dump()["counters"]
+        if counters:
+            lines.append("")
+            lines.extend(f"{name:<32}{value:>8}" for name, value in counters.items())
+
+        caches = self.cache_hit_rates()
+        if caches:
+            lines.append("")
+            lines.extend(f"缓存 {name:<27}{entry['hits'] + entry['misses']:>8}  命中率 {entry['hit_rate']:.1%}"
+                         for name, entry in sorted(caches.items()))
+        return "\n".join(lines)
+
+    def format_summary(self) -> str:
+        """单行摘要（界面状态栏使用）"""
+        if not self.enabled:
+            return ""
+        parts = []
+        for name in ("calc.character_base_stats", "calc.character_with_weapon", "calc.final_stats"):
+            histogram = self._histograms.get(name)
+            if histogram and histogram.count:
+                parts.append(f"{name.split('.', 1)[1]} {histogram.total / histogram.count:.1f}ms")
+        for name, entry in sorted(self.cache_hit_rates().items()):
+            parts.append(f"{name}命中 {entry['hit_rate']:.0%}")
+        return " | ".join(parts)
+
+
+# 创建全局指标注册表实例
+metrics_registry = MetricsRegistry(enabled=os.environ.get("ZZZ_METRICS") == "1")
@@ -130,6 +130,7 @@ class GearSlotWidget(ttk.LabelFrame):
 
         # 2. 更新副属性下拉框的可选列表
         self.update_sub_attributes_availability()
+        self.notify_gear_changed()
 
     def on_sub_attr_changed(self, sub_index: int):
         """副属性改变事件处理"""
@@ -168,6 +169,13 @@ class GearSlotWidget(ttk.LabelFrame):
 
             # 更新其他副属性的可选列表（因为当前副属性已选择）
             self.update_sub_attributes_availability()
+            self.notify_gear_changed()
+
+    def notify_gear_changed(self):
+        """通知驱动盘配置选项卡（选项卡创建完成前忽略）"""
+        gear_tab = getattr(self.main_window, 'gear_tab', None)
+        if gear_tab is not None:
+            gear_tab.on_gear_changed()
 
     def calculate_total_enhancement(self) -> int:
         """计算当前总强化次数"""
@@ -301,7 +309,7 @@ class GearSlotWidget(ttk.LabelFrame):
         for i, widget in enumerate(self.sub_widgets):
             sub_attr = widget["combo"].get_selected_attribute()
             if sub_attr:
-                # 这里sub_attr已经是独立的实例，可以直接修改
+                # 下拉框中的副属性是独立的实例（定义共享），强化次数在创建GearPiece时打包
                 sub_attr.enhancement_level = widget["spin_var"].get()
                 sub_attributes.append(sub_attr)
 
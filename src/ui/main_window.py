@@ -4,6 +4,7 @@ from tkinter import ttk
 from typing import Optional
 
 from src.services.calculation_service import calculation_service
+from src.services.metrics import metrics_registry
 from src.models.character_attributes import CharacterAttributesModel
 from src.models.gear_models import GearSetSelection
 from .character_panel import CharacterPanel
@@ -113,6 +114,7 @@ class MainWindow:
 
         # 更新UI
         self.character_panel.update_with_character_data(base_stats)
+        self.gear_tab.on_gear_changed()
 
         self.update_status(f"已加载角色: {character.name}", "green")
 
@@ -144,6 +146,7 @@ class MainWindow:
             self.current_base_stats = final_stats
             self.character_panel.update_with_character_data(final_stats)
             # self.recalculate_final_stats()
+            self.gear_tab.on_gear_changed()
 
             self.update_status(f"已应用音擎: {weapon.name}", "green")
 
@@ -165,6 +168,7 @@ class MainWindow:
 
         if final_stats:
             self.character_panel.update_final_stats_display(final_stats)
+        self.gear_tab.on_gear_changed()
 
     def get_current_gear_pieces(self):
         """获取当前驱动盘配置"""
@@ -173,5 +177,8 @@ class MainWindow:
         return []
 
     def update_status(self, message: str, color: str = "black"):
-        """更新状态信息"""
+        """更新状态信息（开启指标时附带计算耗时和缓存命中率摘要）"""
+        summary = metrics_registry.format_summary()
+        if summary:
+            message = f"{message}    [{summary}]"
         self.status_label.config(text=message, foreground=color)
\ No newline at end of file
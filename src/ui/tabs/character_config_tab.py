@@ -5,6 +5,7 @@ from tkinter import ttk
 from src.data.manager import data_manager
 from src.ui.widget.weapon_combo import WeaponComboBox
 from src.ui.widget.weapon_info_display import WeaponInfoDisplay
+from src.ui.widget.weapon_ranking_panel import WeaponRankingPanel
 
 
 class CharacterConfigTab(ttk.Frame):
@@ -95,6 +96,10 @@ class CharacterConfigTab(ttk.Frame):
         self.weapon_info_display = WeaponInfoDisplay(weapon_frame)
         self.weapon_info_display.pack(fill='x', pady=(15, 0))
 
+        # 音擎对比（当前驱动盘配置下全部音擎的排名）
+        self.weapon_ranking_panel = WeaponRankingPanel(weapon_frame, self.main_window, on_apply=self.apply_weapon)
+        self.weapon_ranking_panel.pack(fill='both', expand=True, pady=(15, 0))
+
     def setup_level_settings(self, parent):
         """设置等级配置区域"""
         level_frame = ttk.LabelFrame(parent, text="等级配置", padding="15")
@@ -157,6 +162,11 @@ class CharacterConfigTab(ttk.Frame):
             if weapon_data:
                 self.main_window.update_status(f"已选择音擎: {weapon_data['name']}", "green")
 
+    def apply_weapon(self, weapon_id: int):
+        """装备音擎对比中选中的音擎"""
+        self.weapon_combo.set_selected_weapon_id(weapon_id)
+        self.on_weapon_selected(self.weapon_combo, None, weapon_id)
+
     def on_weapon_level_changed(self, event):
         """音擎等级改变事件"""
         selected_id = self.weapon_combo.get_selected_weapon_id()
@@ -4,6 +4,8 @@ from tkinter import ttk
 
 from src.ui.gear_slot import GearSlotManager, GearSlotWidget
 from src.ui.widget.gear_set_combo import GearSetComboBox
+from src.ui.widget.inventory_search_panel import InventorySearchPanel
+from src.ui.widget.main_stat_advisor import MainStatAdvisor
 
 
 class GearConfigTab(ttk.Frame):
@@ -39,6 +41,14 @@ class GearConfigTab(ttk.Frame):
         # 设置右侧内容
         self.setup_gear_slots(main_frame)
 
+        # 主属性推荐
+        self.main_stat_advisor = MainStatAdvisor(main_frame, self.main_window)
+        self.main_stat_advisor.pack(fill='x', pady=(0, 10))
+
+        # 库存配装搜索
+        self.inventory_search_panel = InventorySearchPanel(main_frame, self.main_window)
+        self.inventory_search_panel.pack(fill='x', pady=(0, 10))
+
         # 底部：计算按钮
         self.setup_calculation_button(main_frame)
 
@@ -290,6 +300,7 @@ class GearConfigTab(ttk.Frame):
             combination_type=combination_type,
             set_ids=set_ids
         )
+        self.on_gear_changed()
 
     def update_set_preview(self):
         """更新套装效果预览"""
@@ -412,6 +423,7 @@ class GearConfigTab(ttk.Frame):
                 # 更新显示
                 self.main_window.character_panel.update_final_stats_display(final_stats)
                 self.main_window.update_status("计算完成", "green")
+                self.on_gear_changed()
             else:
                 self.main_window.update_status("计算失败", "red")
 
@@ -419,6 +431,11 @@ class GearConfigTab(ttk.Frame):
             self.main_window.update_status(f"计算错误: {str(e)}", "red")
             print(f"[GearConfigTab] 计算错误: {e}")
 
+    def on_gear_changed(self):
+        """驱动盘、套装或角色属性变化后刷新主属性推荐"""
+        if hasattr(self, 'main_stat_advisor'):
+            self.main_stat_advisor.schedule_refresh()
+
     def reset_all_gears(self):
         """重置所有驱动盘"""
         if hasattr(self.gear_slot_manager, 'slot_widgets'):
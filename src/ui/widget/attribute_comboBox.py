@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 from typing import List, Optional, Callable
 
-from src.models.gear_attributes import Attribute
+from src.models.gear_attributes import Attribute, SubAttribute
 
 
 class AttributeComboBox(ttk.Combobox):
@@ -86,7 +86,7 @@ class AttributeComboBox(ttk.Combobox):
             values = kwargs.pop('values')
             if isinstance(values, list):
                 # 检查是否是 Attribute 列表
-                if all(isinstance(v, Attribute) for v in values):
+                if all(isinstance(v, (Attribute, SubAttribute)) for v in values):
                     self.attributes = values
                 else:
                     # 普通文本列表
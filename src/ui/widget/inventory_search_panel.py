@@ -0,0 +1,136 @@
+"""库存配装搜索面板 - 在后台线程搜索库存中的最佳配装，实时显示当前最好的解和搜索进度"""
+import queue
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from src.config.file import FileConfig
+from src.inventory.dominance import DominanceIndex
+from src.inventory.store import DiscInventory, InventoryView
+from src.optimizers.anytime import AnytimeRunner, SearchEvent
+from src.optimizers.build_search import SLOT_COUNT, BuildSearch
+from src.optimizers.objectives import OBJECTIVES, get_objective
+from src.optimizers.stat_model import StatModel
+
+STATUS_TEXT = {"complete": "搜索完毕", "cancelled": "已取消", "timeout": "已到时间上限"}
+
+
+class InventorySearchPanel(ttk.LabelFrame):
+    """库存配装搜索面板"""
+
+    def __init__(self, parent, main_window, poll_interval: int = 100):
+        super().__init__(parent, text="库存配装搜索", padding="10")
+        self.main_window = main_window
+        self.poll_interval = poll_interval
+        self.objective_var = tk.StringVar(value="damage")
+        self.time_budget_var = tk.IntVar(value=30)
+        self.status_var = tk.StringVar(value="")
+        self._runner: Optional[AnytimeRunner] = None
+        self._search: Optional[BuildSearch] = None
+        self._inventory: Optional[DiscInventory] = None
+        self._events: "queue.Queue[SearchEvent]" = queue.Queue()
+        self.setup_ui()
+
+    def setup_ui(self):
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill='x')
+        ttk.Label(toolbar, text="优化目标:").pack(side='left')
+        ttk.Combobox(toolbar, textvariable=self.objective_var, values=list(OBJECTIVES),
+                     state="readonly", width=22).pack(side='left', padx=(5, 15))
+        ttk.Label(toolbar, text="时间上限(秒):").pack(side='left')
+        ttk.Spinbox(toolbar, from_=1, to=3600, textvariable=self.time_budget_var, width=6).pack(side='left',
+                                                                                                padx=(5, 15))
+        self.start_button = ttk.Button(toolbar, text="开始搜索", command=self.start)
+        self.start_button.pack(side='left')
+        self.cancel_button = ttk.Button(toolbar, text="取消", command=self.cancel, state='disabled')
+        self.cancel_button.pack(side='left', padx=(5, 0))
+
+        self.progress_bar = ttk.Progressbar(self, maximum=100, mode='determinate')
+        self.progress_bar.pack(fill='x', pady=(8, 0))
+        ttk.Label(self, textvariable=self.status_var).pack(anchor='w', pady=(4, 0))
+
+        columns = ("slot", "set", "main", "subs")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=SLOT_COUNT)
+        for column, text, width in (("slot", "槽位", 50), ("set", "套装", 140), ("main", "主属性", 110),
+                                    ("subs", "副属性", 360)):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width)
+        self.tree.pack(fill='both', expand=True, pady=(8, 0))
+
+    def start(self):
+        """在后台线程开始搜索（已有搜索先取消）"""
+        self.cancel()
+        base_stats = self.main_window.current_base_stats
+        if not base_stats:
+            self.status_var.set("请先选择角色")
+            return
+        inventory_file = FileConfig().inventory_file
+        if not inventory_file.exists():
+            self.status_var.set(f"没有驱动盘库存，请先导入: {inventory_file}")
+            return
+
+        service = self.main_window.calculation_service
+        self._inventory = DiscInventory.open(inventory_file)
+        objective = get_objective(self.objective_var.get(), getattr(base_stats, "element_type", ""))
+        self._search = BuildSearch(StatModel(base_stats, service.gear_calculator, service.gear_set_manager),
+                                   objective, self._inventory.columns, dominance=DominanceIndex(self._inventory))
+        self._runner = AnytimeRunner(self._search.anytime(), time_budget=self.time_budget_var.get(),
+                                     progress_interval=0.2)
+        self._events = queue.Queue()
+        self.tree.delete(*self.tree.get_children())
+        self.progress_bar['value'] = 0
+        self.status_var.set("搜索中...")
+        self.start_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self._runner.start(self._events.put)
+        self.after(self.poll_interval, self._poll, self._events)
+
+    def cancel(self):
+        if self._runner:
+            self._runner.cancel()
+
+    def _poll(self, events: "queue.Queue[SearchEvent]"):
+        """在界面线程中处理后台线程送来的事件（队列已被新的搜索替换时停止）"""
+        if events is not self._events:
+            return
+        finished = False
+        while not events.empty():
+            event = events.get_nowait()
+            self._show_progress(event)
+            if event.kind != "progress" and event.solution is not None:
+                self._show_build(event.solution)
+            if event.kind == "done":
+                finished = True
+        if finished:
+            self.start_button.config(state='normal')
+            self.cancel_button.config(state='disabled')
+            self._runner = None
+        else:
+            self.after(self.poll_interval, self._poll, events)
+
+    def _show_progress(self, event: SearchEvent):
+        progress = event.progress
+        if progress.fraction is not None:
+            self.progress_bar['value'] = progress.fraction * 100
+        parts = [f"节点 {progress.nodes:,}", f"最优 {progress.best_score:.4g}" if progress.best_score is not None else ""]
+        if progress.gap is not None:
+            parts.append(f"上界差距 {progress.gap:.1%}")
+        if event.kind == "done":
+            parts.append(STATUS_TEXT.get(event.status, event.status))
+        elif progress.eta is not None:
+            parts.append(f"预计剩余 {progress.eta:.0f}s" if progress.eta < 86400 else "预计剩余 >1天")
+        parts.append(f"用时 {progress.elapsed:.1f}s")
+        self.status_var.set(" | ".join(part for part in parts if part))
+
+    def _show_build(self, build):
+        set_manager = self.main_window.calculation_service.gear_set_manager
+        set_names = {set_id: effect.name for set_id, effect in set_manager.set_effects.items()} if set_manager else {}
+        self.tree.delete(*self.tree.get_children())
+        for slot, row in enumerate(build.rows.tolist()):
+            if row < 0:
+                self.tree.insert("", "end", values=(slot + 1, "-", "-", "没有可用驱动盘"))
+                continue
+            piece = InventoryView(self._inventory, [row]).to_pieces()[0]
+            subs = ", ".join(f"{definition.name}+{level}" for definition, level in piece.sub_rolls())
+            self.tree.insert("", "end", values=(slot + 1, set_names.get(piece.set_id, str(piece.set_id)),
+                                                piece.main_attribute.name if piece.main_attribute else "-", subs))
@@ -0,0 +1,84 @@
+"""主属性推荐面板 - 显示槽位4-6主属性组合的排名，配置变化时自动刷新"""
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional
+
+from src.optimizers.main_stat_solver import FREE_SLOTS, MainStatCombination, MainStatSolver
+from src.optimizers.objectives import OBJECTIVES, get_objective
+from src.optimizers.stat_model import StatModel
+
+
+class MainStatAdvisor(ttk.LabelFrame):
+    """主属性推荐面板"""
+
+    def __init__(self, parent, main_window, top: int = 8):
+        super().__init__(parent, text="主属性推荐 (槽位4-6)", padding="10")
+        self.main_window = main_window
+        self.top = top
+        self.objective_var = tk.StringVar(value="damage")
+        self.results: List[MainStatCombination] = []
+        self._model: Optional[StatModel] = None
+        self._refresh_pending = False
+        self.setup_ui()
+
+    def setup_ui(self):
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill='x')
+        ttk.Label(toolbar, text="优化目标:").pack(side='left')
+        objective_combo = ttk.Combobox(toolbar, textvariable=self.objective_var, values=list(OBJECTIVES),
+                                       state="readonly", width=22)
+        objective_combo.pack(side='left', padx=(5, 15))
+        objective_combo.bind('<<ComboboxSelected>>', lambda e: self.schedule_refresh())
+        ttk.Button(toolbar, text="应用所选组合", command=self.apply_selected).pack(side='left')
+
+        columns = ("combination", "score", "delta")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=self.top)
+        self.tree.heading("combination", text="槽位4 / 5 / 6")
+        self.tree.heading("score", text="目标值")
+        self.tree.heading("delta", text="相对当前")
+        self.tree.column("combination", width=320)
+        self.tree.column("score", width=100, anchor='e')
+        self.tree.column("delta", width=100, anchor='e')
+        self.tree.pack(fill='both', expand=True, pady=(8, 0))
+
+    def schedule_refresh(self):
+        """合并同一轮事件中的多次刷新请求"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self.refresh)
+
+    def refresh(self):
+        """重新求解并更新表格"""
+        self._refresh_pending = False
+        base_stats = self.main_window.current_base_stats
+        self.tree.delete(*self.tree.get_children())
+        if not base_stats:
+            return
+
+        service = self.main_window.calculation_service
+        if self._model is None or self._model.base_stats is not base_stats \
+                or self._model.set_manager is not service.gear_set_manager:
+            self._model = StatModel(base_stats, service.gear_calculator, service.gear_set_manager)
+
+        objective = get_objective(self.objective_var.get(), getattr(base_stats, "element_type", ""))
+        self.results = MainStatSolver(self._model).solve(
+            self.main_window.get_current_gear_pieces(),
+            self.main_window.gear_set_selection,
+            self.main_window.main_enhance_level.get(),
+            objective,
+            top=self.top
+        )
+        for index, result in enumerate(self.results):
+            self.tree.insert("", "end", iid=str(index),
+                             values=(result.label, f"{result.score:.4g}", f"{result.delta:+.4g}"))
+
+    def apply_selected(self):
+        """把选中的组合设置到槽位4-6的主属性下拉框"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        result = self.results[int(selection[0])]
+        slot_widgets = self.main_window.gear_tab.gear_slot_manager.slot_widgets
+        for slot, attribute in zip(FREE_SLOTS, result.main_attributes):
+            slot_widgets[slot].main_attr_combo.set_selected_attribute(attribute)
+            slot_widgets[slot].on_main_attr_changed()
@@ -0,0 +1,87 @@
+"""音擎对比面板 - 用当前驱动盘配置一次评估全部音擎，按目标值排序并拆分基础攻击力和随机属性的贡献"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+from src.optimizers.objectives import OBJECTIVES
+from src.optimizers.weapon_ranking import WeaponEvaluation
+
+
+class WeaponRankingPanel(ttk.LabelFrame):
+    """音擎对比面板"""
+
+    def __init__(self, parent, main_window, on_apply: Optional[Callable[[int], None]] = None, height: int = 8):
+        super().__init__(parent, text="音擎对比 (当前驱动盘)", padding="10")
+        self.main_window = main_window
+        self.on_apply = on_apply
+        self.height = height
+        self.objective_var = tk.StringVar(value="damage")
+        self.status_var = tk.StringVar(value="")
+        self.results: List[WeaponEvaluation] = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill='x')
+        ttk.Label(toolbar, text="优化目标:").pack(side='left')
+        ttk.Combobox(toolbar, textvariable=self.objective_var, values=list(OBJECTIVES),
+                     state="readonly", width=22).pack(side='left', padx=(5, 15))
+        ttk.Button(toolbar, text="对比全部音擎", command=self.refresh).pack(side='left')
+        ttk.Button(toolbar, text="装备所选音擎", command=self.apply_selected).pack(side='left', padx=(5, 0))
+        ttk.Label(self, textvariable=self.status_var).pack(anchor='w', pady=(4, 0))
+
+        columns = ("weapon", "base", "random", "score", "base_delta", "random_delta")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=self.height)
+        for column, text, width in (("weapon", "音擎", 160), ("base", "基础攻击", 70),
+                                    ("random", "随机属性", 180), ("score", "目标值", 80),
+                                    ("base_delta", "基础攻击贡献", 90), ("random_delta", "随机属性贡献", 90)):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width, anchor='w' if column in ("weapon", "random") else 'e')
+        self.tree.pack(fill='both', expand=True, pady=(8, 0))
+
+    def refresh(self):
+        """按当前角色、等级和驱动盘配置重新评估全部音擎"""
+        main_window = self.main_window
+        self.tree.delete(*self.tree.get_children())
+        self.results = []
+        if not main_window.current_character_id:
+            self.status_var.set("请先选择角色")
+            return
+
+        service = main_window.calculation_service
+        level = main_window.character_level.get()
+        ranking = service.evaluate_weapons(
+            main_window.current_character_id,
+            level,
+            service.get_breakthrough_level(level),
+            main_window.extra_level.get(),
+            main_window.get_current_gear_pieces(),
+            main_window.gear_set_selection,
+            main_window.main_enhance_level.get(),
+            self.objective_var.get(),
+            weapon_level=main_window.weapon_level.get()
+        )
+        if not ranking:
+            self.status_var.set("计算角色属性失败")
+            return
+
+        self.results = ranking.evaluations
+        for index, evaluation in enumerate(self.results):
+            weapon = evaluation.weapon
+            self.tree.insert("", "end", iid=str(index), values=(
+                f"{weapon.name} ({'★' * weapon.rarity})", f"{weapon.base_attack:g}", weapon.random_label,
+                f"{evaluation.score:.4g}", f"{evaluation.base_contribution:+.4g}",
+                "—" if evaluation.random_contribution is None else f"{evaluation.random_contribution:+.4g}"))
+        status = f"无音擎 {ranking.baseline_score:.4g}，共 {len(self.results)} 个音擎"
+        if any(evaluation.weapon.random_added_as_value for evaluation in self.results):
+            status += "，* 为按数值相加的百分比随机属性，不报告其贡献"
+        if ranking.failures:
+            status += f"，{len(ranking.failures)} 个无法加载"
+        self.status_var.set(status)
+
+    def apply_selected(self):
+        """装备选中的音擎"""
+        selection = self.tree.selection()
+        if not selection or not self.on_apply:
+            return
+        self.on_apply(self.results[int(selection[0])].weapon.weapon_id)
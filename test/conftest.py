@@ -0,0 +1,53 @@
+# test/conftest.py
+"""测试公共夹具 - 本地API替身服务器和指向临时目录的下载器"""
+import pytest
+
+from src.config.file import FileConfig
+from utils.stub_server import StubApiServer
+
+CHARACTER_IDS = ["1011", "1021", "1031"]
+WEAPON_IDS = ["12001", "12002"]
+
+
+def character_detail(character_id: str, version: int = 1) -> dict:
+    return {"Id": int(character_id), "Name": f"角色{character_id}", "Desc": f"<b>第{version}版</b>"}
+
+
+def weapon_detail(weapon_id: str, version: int = 1) -> dict:
+    return {"Id": int(weapon_id), "Name": f"音擎{weapon_id}", "Rarity": 4, "Talents": {"1": {"Desc": f"第{version}版"}}}
+
+
+def api_routes() -> dict:
+    """与 API_ENDPOINTS 对应的替身路由"""
+    routes = {
+        "/character.json": {item_id: {"CHS": f"角色{item_id}"} for item_id in CHARACTER_IDS},
+        "/weapon.json": {item_id: {"CHS": f"音擎{item_id}"} for item_id in WEAPON_IDS},
+        "/equipment.json": {"31000": {"CHS": {"name": "啄木鸟电音"}}},
+    }
+    for item_id in CHARACTER_IDS:
+        routes[f"/zh/character/{item_id}.json"] = character_detail(item_id)
+    for item_id in WEAPON_IDS:
+        routes[f"/zh/weapon/{item_id}.json"] = weapon_detail(item_id)
+    return routes
+
+
+@pytest.fixture
+def stub_server():
+    with StubApiServer(api_routes()) as server:
+        yield server
+
+
+@pytest.fixture
+def make_downloader(tmp_path, stub_server):
+    """创建指向替身服务器和临时数据目录的下载器（不限速，退避极短）"""
+    from utils.data_downloader import DataDownloader
+    from utils.retry_policy import RetryPolicy
+
+    def make(**api_config):
+        downloader = DataDownloader(base_url=stub_server.base_url, file_config=FileConfig(str(tmp_path / "data")))
+        downloader.api_config.update({"requests_per_second": 10000, **api_config})
+        downloader.retry_policy = RetryPolicy(max_attempts=downloader.api_config["max_attempts"],
+                                              base_delay=0.001, max_delay=0.01)
+        return downloader
+
+    return make
@@ -0,0 +1,105 @@
+# test/test_anytime_search.py
+"""随时可停的搜索：incumbent 严格递增，可取消 / 超时，分支定界的上界不低于最优解且结果与穷举一致"""
+import itertools
+
+import numpy as np
+import pytest
+
+from src.calculators.gear_calculator import GearCalculator, GearSetManager
+from src.inventory import codec
+from src.inventory.dominance import DominanceIndex
+from src.inventory.store import DiscInventory
+from src.optimizers.anytime import AnytimeRunner, CancelToken, SearchStep
+from src.optimizers.build_search import SLOT_COUNT, BuildSearch
+from src.optimizers.objectives import get_objective
+from src.optimizers.stat_model import StatModel
+from test.test_main_stat_solver import EQUIPMENT
+from test.test_roster import SLOT_MAINS
+from test.test_sub_stat_allocator import BASE
+
+
+def _steps(scores):
+    for position, score in enumerate(scores):
+        yield SearchStep(nodes=1, score=score, solution=position, bound=10.0, fraction=(position + 1) / len(scores))
+
+
+def test_incumbents_strictly_improve():
+    events = list(AnytimeRunner(_steps([1.0, 3.0, 2.0, 3.0, None, 5.0]), progress_interval=0).events())
+
+    incumbents = [event for event in events if event.kind == "incumbent"]
+    assert [event.progress.best_score for event in incumbents] == [1.0, 3.0, 5.0]
+    assert [event.solution for event in incumbents] == [0, 1, 5]
+    assert events[-1].kind == "done" and events[-1].status == "complete"
+    assert events[-1].solution == 5 and events[-1].progress.nodes == 6
+
+
+def test_cancel_mid_run_stops_with_best_so_far():
+    token = CancelToken()
+    closed = []
+
+    def steps():
+        try:
+            yield from _steps([1.0, 2.0, 3.0, 4.0])
+        finally:
+            closed.append(True)
+
+    def on_event(event):
+        if event.kind == "incumbent" and event.progress.best_score == 2.0:
+            token.cancel()
+
+    done = AnytimeRunner(steps(), token=token).run(on_event)
+
+    assert done.kind == "done" and done.status == "cancelled"
+    assert done.progress.best_score == 2.0 and done.solution == 1
+    assert closed == [True]
+
+
+def test_zero_time_budget_times_out():
+    done = AnytimeRunner(_steps([1.0, 2.0, 3.0]), time_budget=0).run()
+
+    assert done.status == "timeout"
+    assert done.progress.best_score == 1.0
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    calculator = GearCalculator()
+    calculator.set_gear_set_manager(GearSetManager(EQUIPMENT))
+    return calculator
+
+
+def _inventory(seed, per_slot=4):
+    """每个槽位几个驱动盘，穷举全部组合仍很快"""
+    rng = np.random.default_rng(seed)
+    slots = np.repeat(np.arange(SLOT_COUNT), per_slot)
+    count = len(slots)
+    sub_stats = np.stack([rng.choice(np.arange(1, 11), 4, replace=False) for _ in range(count)])
+    rolls = np.stack([np.bincount(rng.integers(0, 4, rng.integers(3, 6)), minlength=4) for _ in range(count)])
+    return DiscInventory.from_codes(codec.pack(slots, rng.choice([12, 15], count),
+                                               [rng.choice(SLOT_MAINS[slot]) for slot in slots],
+                                               rng.choice([31000, 31100, 31200], count), sub_stats, rolls))
+
+
+@pytest.mark.parametrize("objective_name", ["attack", "damage"])
+@pytest.mark.parametrize("use_dominance", [False, True])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_branch_and_bound_matches_exhaustive_search(calculator, objective_name, use_dominance, seed):
+    inventory = _inventory(seed)
+    columns = {name: np.asarray(inventory.columns[name]) for name in ("slot", "set_id", "main_stat", "level",
+                                                                       "sub_rolls")}
+    search = BuildSearch(StatModel(BASE, calculator), get_objective(objective_name, "物理"), columns,
+                         beam_width=2, candidates_per_slot=1,
+                         dominance=DominanceIndex(inventory) if use_dominance else None)
+    per_slot = [np.flatnonzero(columns["slot"] == slot) for slot in range(SLOT_COUNT)]
+    optimum = max(search.evaluate(np.array(rows)).score for rows in itertools.product(*per_slot))
+
+    events = list(AnytimeRunner(search.anytime(), progress_interval=0).events())
+
+    incumbents = [event.progress.best_score for event in events if event.kind == "incumbent"]
+    assert all(later > earlier for earlier, later in zip(incumbents, incumbents[1:]))
+    bounds = [event.progress.bound for event in events if event.progress.bound is not None]
+    assert bounds and all(bound >= optimum - 1e-9 * abs(optimum) for bound in bounds)
+    done = events[-1]
+    assert done.status == "complete" and done.progress.fraction == 1.0
+    assert done.solution.score == pytest.approx(optimum)
+    assert done.solution.score == pytest.approx(search.evaluate(done.solution.rows).score)
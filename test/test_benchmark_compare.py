@@ -0,0 +1,29 @@
+# test/test_benchmark_compare.py
+"""性能回归门禁：基线夹具可读取，只有热路径的中位数超出容差才判定为回归"""
+import copy
+from pathlib import Path
+
+from utils.benchmark.compare import HOT_PATHS, compare, load_baseline
+
+BASELINE = Path(__file__).parent / "benchmark" / "baseline.json"
+
+
+def test_baseline_fixture_compares_equal_to_itself():
+    baseline = load_baseline(BASELINE)
+
+    comparisons = compare(baseline, baseline)
+
+    assert {item.name for item in comparisons} == set(baseline["results"])
+    assert not any(item.regressed or item.improved for item in comparisons)
+
+
+def test_slower_hot_path_is_a_gated_regression():
+    baseline = load_baseline(BASELINE)
+    current = copy.deepcopy(baseline)
+    for result in current["results"].values():
+        result["p50_ms"] *= 2
+
+    comparisons = compare(baseline, current)
+
+    assert all(item.regressed for item in comparisons)
+    assert {item.name for item in comparisons if item.gated} == set(HOT_PATHS) & set(baseline["results"])
@@ -0,0 +1,39 @@
+# test/test_breakpoint_solver.py
+"""属性阈值求解：无法满足时的补充求解有上限，截断的结果标记为非精确；出现方式和强化网格按键复用"""
+from src.optimizers.breakpoint_solver import BreakpointSolver
+from src.optimizers.stat_model import StatModel
+from test.test_sub_stat_allocator import BASE
+
+UNREACHABLE = {"crit_rate": 2.0, "crit_dmg": 4.0, "anomaly_proficiency": 600}
+
+
+def test_feasible_thresholds_are_solved_exactly():
+    result = BreakpointSolver(StatModel(BASE)).solve({"crit_rate": 0.5, "crit_dmg": 1.0})
+
+    assert result.feasible and result.exact
+    assert result.final_stats["crit_rate"] >= 0.5 - 1e-9 and result.final_stats["crit_dmg"] >= 1.0 - 1e-9
+
+
+def test_fallback_sweep_is_capped():
+    solver = BreakpointSolver(StatModel(BASE))
+
+    full = solver.solve(UNREACHABLE, fallback_limit=None)
+    capped = solver.solve(UNREACHABLE, fallback_limit=1)
+
+    assert not full.feasible and full.exact and full.evaluated > 1
+    assert not capped.feasible and not capped.exact and capped.evaluated == 1
+    assert "已求解候选中最接近" in capped.format_summary()
+
+
+def test_layouts_and_grids_are_reused_between_solves():
+    solver = BreakpointSolver(StatModel(BASE))
+    first = solver.solve(UNREACHABLE, fallback_limit=None)
+    allocator = solver.allocator
+    layouts, grids = dict(allocator._layout_cache), dict(allocator._grid_cache)
+
+    second = solver.solve(UNREACHABLE, fallback_limit=None)
+
+    assert layouts and grids
+    assert allocator._layout_cache.keys() == layouts.keys() and allocator._grid_cache.keys() == grids.keys()
+    assert all(allocator._layout_cache[key] is table for key, table in layouts.items())
+    assert second.allocation.final_stats == first.allocation.final_stats
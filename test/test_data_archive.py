@@ -0,0 +1,41 @@
+# test/test_data_archive.py
+"""数据归档：导出后可校验、可还原，内容被篡改时拒绝导入"""
+import pytest
+
+from utils.data_archive import ArchiveError, export_archive, import_archive
+
+FILES = {"character_ids.json": b'["1011"]', "characters/1011.json": b'{"Name": "x"}', "equipment/equipment.json": b"{}"}
+
+
+def _write_tree(base_dir):
+    for relative, content in FILES.items():
+        path = base_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+@pytest.mark.parametrize("compression", ["gz", "xz"])
+def test_export_then_import_round_trip(tmp_path, compression):
+    source, target = tmp_path / "source", tmp_path / "target"
+    _write_tree(source)
+    exported = export_archive(source, tmp_path / f"data.tar.{compression}", compression)
+
+    verified = import_archive(exported.path, target, verify_only=True)
+    assert verified.data_version == exported.data_version and not target.exists()
+
+    imported = import_archive(exported.path, target)
+    assert imported.file_count == len(FILES)
+    for relative, content in FILES.items():
+        assert (target / relative).read_bytes() == content
+
+
+def test_truncated_archive_leaves_data_untouched(tmp_path):
+    source, target = tmp_path / "source", tmp_path / "target"
+    _write_tree(source)
+    exported = export_archive(source, tmp_path / "data.tar.gz")
+    truncated = tmp_path / "truncated.tar.gz"
+    truncated.write_bytes(exported.path.read_bytes()[:-200])
+
+    with pytest.raises(ArchiveError):
+        import_archive(truncated, target)
+    assert not target.exists() or not any(path.is_file() for path in target.rglob("*"))
@@ -0,0 +1,79 @@
+# test/test_download_engine.py
+"""并发下载引擎：结果统计、在途上限和令牌桶限速"""
+import json
+import threading
+import time
+
+import pytest
+
+from test.conftest import CHARACTER_IDS
+from utils.download_engine import ConcurrentDownloadEngine, TokenBucket
+
+
+def test_report_keeps_input_order_and_counts_exceptions_as_failures():
+    completed = []
+
+    def download(item_id: str) -> bool:
+        if item_id == "boom":
+            raise RuntimeError("连接中断")
+        return item_id != "bad"
+
+    engine = ConcurrentDownloadEngine(max_workers=4, requests_per_second=1000)
+    report = engine.run(["a", "bad", "b", "boom", "c"], download,
+                        lambda item_id, success, count: completed.append(count))
+
+    assert report.total == 5
+    assert report.success_ids == ["a", "b", "c"]
+    assert report.failed_ids == ["bad", "boom"]
+    assert sorted(completed) == [1, 2, 3, 4, 5]
+
+
+def test_in_flight_bound_is_honoured_below_worker_count():
+    lock = threading.Lock()
+    active = peak = 0
+
+    def download(item_id: str) -> bool:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return True
+
+    engine = ConcurrentDownloadEngine(max_workers=8, requests_per_second=1000, max_in_flight=3)
+    assert engine.max_workers == 3
+    assert engine.run([str(index) for index in range(30)], download).success_count == 30
+    assert peak <= 3
+
+
+def test_invalid_in_flight_bound_raises():
+    with pytest.raises(ValueError):
+        ConcurrentDownloadEngine(max_in_flight=0)
+
+
+def test_token_bucket_limits_request_rate():
+    engine = ConcurrentDownloadEngine(max_workers=8, requests_per_second=40, burst=1)
+    report = engine.run([str(index) for index in range(21)], lambda item_id: True)
+    # 桶容量为1：首个请求立即放行，其余20个按 40/s 放行
+    assert report.elapsed >= 0.45
+    assert report.requests_per_second <= 45
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_batch_download_against_stub_server(make_downloader, stub_server):
+    downloader = make_downloader()
+    success_count, failed_ids = downloader.batch_download_characters(list(CHARACTER_IDS))
+
+    assert (success_count, failed_ids) == (len(CHARACTER_IDS), [])
+    assert stub_server.request_count == len(CHARACTER_IDS)
+    for item_id in CHARACTER_IDS:
+        with open(downloader.file_config.get_character_file_path(item_id), encoding="utf-8") as f:
+            data = json.load(f)
+        # 流水线去除了HTML标签
+        assert data["Name"] == f"角色{item_id}" and data["Desc"] == "第1版"
@@ -0,0 +1,72 @@
+# test/test_download_manifest.py
+"""条件请求与下载清单：未变化时收到304、不重写文件，内容变化或本地缺失时重新下载"""
+import json
+
+from test.conftest import CHARACTER_IDS, character_detail
+from utils.download_manifest import DownloadManifest
+
+
+def _mtimes(downloader):
+    return {item_id: downloader.file_config.get_character_file_path(item_id).stat().st_mtime_ns
+            for item_id in CHARACTER_IDS}
+
+
+def test_second_download_is_not_modified_and_skips_writes(make_downloader, stub_server):
+    downloader = make_downloader()
+    downloader.batch_download_characters(list(CHARACTER_IDS))
+    before = _mtimes(downloader)
+
+    success_count, failed_ids = make_downloader().batch_download_characters(list(CHARACTER_IDS))
+
+    assert (success_count, failed_ids) == (len(CHARACTER_IDS), [])
+    assert stub_server.not_modified_count == len(CHARACTER_IDS)
+    assert _mtimes(downloader) == before
+
+
+def test_upstream_change_is_downloaded(make_downloader, stub_server):
+    downloader = make_downloader()
+    downloader.batch_download_characters(list(CHARACTER_IDS))
+    changed = CHARACTER_IDS[0]
+    stub_server.set_route(f"/zh/character/{changed}.json", character_detail(changed, version=2))
+
+    downloader.batch_download_characters(list(CHARACTER_IDS))
+
+    assert stub_server.not_modified_count == len(CHARACTER_IDS) - 1
+    with open(downloader.file_config.get_character_file_path(changed), encoding="utf-8") as f:
+        assert json.load(f)["Desc"] == "第2版"
+
+
+def test_missing_local_file_is_fetched_without_validators(make_downloader, stub_server):
+    downloader = make_downloader()
+    downloader.batch_download_characters(list(CHARACTER_IDS))
+    missing = downloader.file_config.get_character_file_path(CHARACTER_IDS[1])
+    missing.unlink()
+
+    downloader.batch_download_characters(list(CHARACTER_IDS))
+
+    assert missing.exists()
+    assert stub_server.not_modified_count == len(CHARACTER_IDS) - 1
+
+
+def test_list_not_modified_restores_cached_list(make_downloader, stub_server):
+    downloader = make_downloader()
+    first = downloader.download_character_list()
+    second = make_downloader().download_character_list()
+
+    assert stub_server.not_modified_count == 1
+    assert set(second) == set(first)
+
+
+def test_manifest_persists_only_when_dirty(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest = DownloadManifest(manifest_path)
+    manifest.save()
+    assert not manifest_path.exists()
+
+    manifest.record("/a.json", {"ETag": '"x"'}, b"{}")
+    manifest.save()
+    reloaded = DownloadManifest(manifest_path)
+
+    assert reloaded.conditional_headers("/a.json") == {"If-None-Match": '"x"'}
+    assert not reloaded.is_changed("/a.json", b"{}")
+    assert reloaded.is_changed("/a.json", b"{ }")
@@ -0,0 +1,68 @@
+# test/test_gear_models.py
+"""驱动盘模型：属性定义按参数共享同一实例且不可修改，副属性打包为 bytes 后往返不失真"""
+import pickle
+
+import pytest
+
+from src.models.attributes import AttributeType, GearAttributeValueType
+from src.models.gear_attributes import Attribute, GearMainAttributes, GearSubAttributes, SubAttribute
+from src.models.gear_models import GearPiece
+
+ARGS = ("测试攻击力", AttributeType.ATK, GearAttributeValueType.NUMERIC_VALUE, 19, 19)
+
+
+def test_same_parameters_intern_to_one_definition():
+    definition = Attribute(*ARGS)
+
+    assert Attribute(*ARGS) is definition
+    assert Attribute(name=ARGS[0], attribute_type=ARGS[1], attribute_value_type=ARGS[2], base=19, growth=19) \
+        is definition
+    assert Attribute.by_id(definition.id) is definition
+    assert pickle.loads(pickle.dumps(definition)) is definition
+
+
+@pytest.mark.parametrize("changed", [
+    (ARGS[0], AttributeType.HP) + ARGS[2:],
+    ARGS[:2] + (GearAttributeValueType.PERCENTAGE,) + ARGS[3:],
+    ARGS[:3] + (20, 19),
+    ARGS[:4] + (20,),
+])
+def test_distinct_definitions_do_not_collide(changed):
+    definition, other = Attribute(*ARGS), Attribute(*changed)
+
+    assert other is not definition and other.id != definition.id
+    assert (other.attribute_type, other.attribute_value_type, other.base, other.growth) == changed[1:]
+
+
+def test_definitions_and_pieces_reject_new_attributes():
+    definition = GearSubAttributes.get_crit_rate().definition
+    with pytest.raises(AttributeError):
+        definition.base = 1.0
+    with pytest.raises(AttributeError):
+        definition.extra = 1
+    with pytest.raises(AttributeError):
+        SubAttribute(definition).extra = 1
+    with pytest.raises(AttributeError):
+        GearPiece().extra = 1
+
+
+def test_sub_attributes_round_trip_through_packed_rolls():
+    subs = [SubAttribute(GearSubAttributes.get_crit_rate().definition, 3),
+            SubAttribute(GearSubAttributes.get_crit_dmg().definition, 0),
+            SubAttribute(GearSubAttributes.get_attack_percentage().definition, 5),
+            SubAttribute(GearSubAttributes.get_pen().definition, 1)]
+    piece = GearPiece(slot_index=3, level=15, main_attribute=GearMainAttributes.anomaly_proficiency,
+                      sub_attributes=subs)
+
+    restored = piece.sub_attributes
+
+    assert [(sub.definition, sub.enhancement_level) for sub in restored] == \
+        [(sub.definition, sub.enhancement_level) for sub in subs]
+    assert all(restored_sub.definition is sub.definition for restored_sub, sub in zip(restored, subs))
+    assert piece.sub_rolls() == [(sub.definition, sub.enhancement_level) for sub in subs]
+
+    # 返回的是新的 SubAttribute：修改它们不影响驱动盘，需要重新赋值
+    restored[0].enhancement_level = 4
+    assert piece.sub_attributes[0].enhancement_level == 3
+    piece.sub_attributes = restored
+    assert piece.sub_attributes[0].enhancement_level == 4
@@ -0,0 +1,32 @@
+# test/test_import_budget.py
+"""导入耗时预算：在沙盒中真实运行每个 cli.py 子命令，导入耗时不得超出预算
+
+较慢的机器可设置环境变量 IMPORT_BUDGET_SCALE 按比例放宽预算。
+"""
+import inspect
+import os
+import re
+
+import pytest
+
+from utils import cli_tools
+from utils.import_budget import COMMAND_ARGS, IMPORT_BUDGETS_MS, check_import_budgets
+
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1.0"))
+
+
+@pytest.fixture(scope="module")
+def measurements():
+    return {item.command: item for item in check_import_budgets(repeats=3, scale=SCALE)}
+
+
+@pytest.mark.parametrize("command", list(COMMAND_ARGS))
+def test_command_imports_within_budget(measurements, command):
+    item = measurements[command]
+    assert item.passed, f"{command}: {item.import_ms:.1f}ms > {item.budget_ms:.1f}ms ({', '.join(item.slowest)})"
+
+
+def test_every_subcommand_is_measured():
+    dispatched = set(re.findall(r'command == "(\w+)"', inspect.getsource(cli_tools.main)))
+    assert dispatched - {"importtime"} <= set(COMMAND_ARGS)
+    assert set(COMMAND_ARGS) == set(IMPORT_BUDGETS_MS)
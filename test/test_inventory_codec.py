@@ -0,0 +1,47 @@
+# test/test_inventory_codec.py
+"""驱动盘编码：GearPiece 往返不失真，槽位与库存 slot 列同为 0-5"""
+import numpy as np
+import pytest
+
+from src.inventory import codec
+from src.inventory.store import DiscInventory
+from src.models.gear_attributes import GearMainAttributes, GearSubAttributes
+from src.models.gear_models import GearPiece
+from utils.benchmark.runner import build_sample_gear
+
+
+def test_pieces_round_trip():
+    pieces = build_sample_gear()
+    for piece, set_id in zip(pieces, range(31000, 31600, 100)):
+        piece.set_id = set_id
+
+    codes = codec.encode_pieces(pieces)
+
+    assert codes.dtype == np.uint64
+    assert codec.decode_pieces(codes) == pieces
+    assert codec.decode_piece(codec.encode_piece(pieces[3])) == pieces[3]
+
+
+def test_empty_main_and_partial_subs_round_trip():
+    piece = GearPiece(slot_index=5, level=9, sub_attributes=[GearSubAttributes.get_crit_dmg()])
+    assert codec.decode_piece(codec.encode_piece(piece)) == piece
+
+
+def test_sample_gear_lands_in_inventory_slots_zero_to_five():
+    inventory = DiscInventory.from_pieces(build_sample_gear())
+
+    assert sorted(inventory.columns["slot"].tolist()) == list(range(6))
+    for slot in range(6):
+        assert [piece.slot_index for piece in inventory.view(slot=slot).to_pieces()] == [slot]
+
+
+@pytest.mark.parametrize("slot_index", [-1, 6])
+def test_out_of_range_slot_is_rejected(slot_index):
+    piece = GearPiece(slot_index=slot_index, level=15, main_attribute=GearMainAttributes.hp_numeric)
+    with pytest.raises(ValueError):
+        codec.encode_pieces([piece])
+
+
+def test_deduplicate_sorts_and_removes_duplicates():
+    codes = codec.encode_pieces(build_sample_gear())
+    assert codec.deduplicate(np.concatenate([codes[::-1], codes])).tolist() == sorted(codes.tolist())
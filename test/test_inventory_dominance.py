@@ -0,0 +1,68 @@
+# test/test_inventory_dominance.py
+"""驱动盘支配索引：增量加入 / 移除后的天际线与从头逐对比较的结果一致"""
+import numpy as np
+import pytest
+
+from src.inventory import codec
+from src.inventory.dominance import DominanceIndex
+from src.inventory.store import DiscInventory
+
+
+@pytest.fixture(scope="module")
+def inventory():
+    """少量桶、副属性种类相近的驱动盘，桶内有大量支配关系和完全相同的驱动盘"""
+    rng = np.random.default_rng(11)
+    count = 500
+    sub_stats = np.stack([np.r_[1, 2, rng.choice([3, 4, 5], 2, replace=False)] for _ in range(count)])
+    return DiscInventory.from_codes(codec.pack(rng.integers(0, 3, count), rng.choice([12, 15], count),
+                                               rng.choice([1, 3], count), np.full(count, 31000), sub_stats,
+                                               rng.integers(0, 3, (count, codec.SUB_STAT_COUNT))))
+
+
+def _naive_skyline(inventory, rows):
+    """逐对比较：同桶内没有其他驱动盘各项不低于它且（至少一项更高或行号更小）"""
+    columns = inventory.columns
+    bucket = {row: (int(columns["slot"][row]), int(columns["set_id"][row]), int(columns["main_stat"][row]))
+              for row in rows}
+    keys = {row: np.r_[columns["level"][row], columns["sub_rolls"][row]].astype(int) for row in rows}
+    return sorted(row for row in rows
+                  if not any(other != row and bucket[other] == bucket[row] and np.all(keys[other] >= keys[row])
+                             and (np.any(keys[other] > keys[row]) or other < row) for other in rows))
+
+
+def test_incremental_updates_match_recompute(inventory):
+    rng = np.random.default_rng(3)
+    rows = rng.permutation(len(inventory))
+    index = DominanceIndex(inventory, rows[:200])
+    index.add_rows(rows[200:350])
+    present = set(rows[:350].tolist())
+
+    # 一半移除的是天际线成员，覆盖“被它支配过的驱动盘重新进入天际线”
+    skyline = index.skyline()
+    removed = np.r_[rng.choice(skyline, 40, replace=False), rng.choice(sorted(present - set(skyline.tolist())), 40,
+                                                                       replace=False)]
+    index.remove_rows(removed)
+    present -= set(removed.tolist())
+    index.add_rows(rows[350:])
+    present |= set(rows[350:].tolist())
+
+    expected = _naive_skyline(inventory, sorted(present))
+    assert index.skyline().tolist() == expected
+    assert index.skyline().tolist() == DominanceIndex(inventory, sorted(present)).skyline().tolist()
+    assert len(index) == len(present) and index.skyline_size == len(expected)
+
+
+def test_projected_and_available_skylines_follow_removals(inventory):
+    index = DominanceIndex(inventory)
+    sub_mask = np.zeros(inventory.columns["sub_rolls"].shape[1], dtype=bool)
+    sub_mask[[0, 3, 5]] = True
+    index.skyline(sub_mask=sub_mask)        # 填充投影缓存
+
+    removed = index.skyline(slot=2)
+    index.remove_rows(removed)
+    fresh = DominanceIndex(inventory, np.setdiff1d(np.arange(len(inventory)), removed))
+
+    assert index.skyline(sub_mask=sub_mask).tolist() == fresh.skyline(sub_mask=sub_mask).tolist()
+    available = np.random.default_rng(5).random(len(inventory)) < 0.6
+    assert index.skyline(available=available).tolist() == \
+        _naive_skyline(inventory, sorted(set(np.flatnonzero(available).tolist()) - set(removed.tolist())))
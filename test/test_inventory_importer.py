@@ -0,0 +1,101 @@
+# test/test_inventory_importer.py
+"""驱动盘导入：不合法的行逐行拒绝并记录原因，导入结果按槽位排序写出"""
+import csv
+import json
+
+from src.inventory import codec
+from src.inventory.importer import DiscRowConverter, InventoryImporter
+from src.inventory.store import DiscInventory
+from src.models.gear_attributes import GearMainAttributes
+
+SUBS = [{"key": "暴击率", "upgrades": 2}, {"key": "暴击伤害", "upgrades": 1}, {"key": "攻击力百分比"}, {"key": "pen"}]
+
+
+def _disc(slot, main, set_id=31000, **overrides):
+    row = {"slot": slot, "set": set_id, "main": main, "level": 15, "substats": SUBS}
+    row.update(overrides)
+    return row
+
+
+VALID = [_disc(6, "冲击力"), _disc(1, "生命值", 31100), _disc(4, "暴击伤害", substats=SUBS[2:]), _disc(1, "hp")]
+REJECTED = {
+    "槽位超出范围": _disc(7, "生命值"),
+    "不能使用主属性": _disc(2, "暴击率"),
+    "未知套装": _disc(1, "生命值", "不存在的套装"),
+    "未知属性名": _disc(1, "生命值", substats=[{"key": "幸运值"}]),
+    "副属性与主属性重复": _disc(4, "暴击率"),
+    "副属性重复": _disc(1, "生命值", substats=[{"key": "暴击率"}, {"key": "crit_"}]),
+    "强化次数合计": _disc(1, "生命值", substats=[{"key": "暴击率", "upgrades": 3}, {"key": "pen", "upgrades": 3}]),
+    "等级超出范围": _disc(1, "生命值", level=16),
+    "不是对象": [1, 2],
+}
+
+
+def _write_jsonl(path, rows, extra_lines=()):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        for line in extra_lines:
+            f.write(line + "\n")
+
+
+def test_rejections_are_reported_and_valid_rows_imported(tmp_path):
+    source, inventory_path, rejects_path = tmp_path / "discs.jsonl", tmp_path / "inventory.bin", tmp_path / "rejects.csv"
+    _write_jsonl(source, VALID + list(REJECTED.values()), extra_lines=["{not json"])
+
+    report = InventoryImporter(max_rejections=3).import_file(source, inventory_path, rejects_path=rejects_path)
+
+    assert (report.total_rows, report.imported, report.rejected) == (len(VALID) + len(REJECTED) + 1, len(VALID),
+                                                                     len(REJECTED) + 1)
+    assert len(report.rejections) == 3
+    with open(rejects_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["row"]) for row in rows] == list(range(len(VALID) + 1, report.total_rows + 1))
+    for row, expected in zip(rows, list(REJECTED) + ["JSON格式错误"]):
+        assert expected in row["reason"]
+
+
+def test_imported_file_is_sorted_and_slot_views_are_slices(tmp_path):
+    source, inventory_path = tmp_path / "discs.json", tmp_path / "inventory.bin"
+    source.write_text(json.dumps({"discs": VALID}, ensure_ascii=False), encoding="utf-8")
+
+    InventoryImporter(chunk_size=1).import_file(source, inventory_path)
+    inventory = DiscInventory.open(inventory_path)
+
+    assert inventory.sorted_by_slot
+    assert inventory.columns["slot"].tolist() == [0, 0, 3, 5]
+    assert inventory.columns["set_id"][:2].tolist() == [31000, 31100]
+    slot_one = inventory.view(slot=0, set_id=31100)
+    assert isinstance(slot_one.rows, slice)
+    assert [piece.main_attribute for piece in slot_one.to_pieces()] == [GearMainAttributes.hp_numeric]
+    assert inventory.view(slot=3).to_pieces()[0].sub_rolls()[0][1] == 0
+
+
+def test_append_keeps_existing_discs_and_csv_rows(tmp_path):
+    inventory_path = tmp_path / "inventory.bin"
+    first = tmp_path / "first.jsonl"
+    _write_jsonl(first, VALID[:2])
+    InventoryImporter().import_file(first, inventory_path)
+
+    second = tmp_path / "second.csv"
+    second.write_text("slot,set,main,level,lock,sub1,sub1_upgrades,sub2,sub2_upgrades\n"
+                      "3,31200,防御力,12,true,暴击率,1,穿透值,0\n"
+                      "3,31200,攻击力,12,true,暴击率,1,,\n", encoding="utf-8")
+    report = InventoryImporter(DiscRowConverter(known_set_ids={31000, 31100, 31200})).import_file(
+        second, inventory_path, append=True)
+
+    assert (report.imported, report.rejections) == (1, [(3, "槽位3不能使用主属性 攻击力")])
+    inventory = DiscInventory.open(inventory_path)
+    assert len(inventory) == 3 and inventory.sorted_by_slot
+    locked = inventory.view(slot=2, locked=True)
+    assert len(locked) == 1 and locked.column("main_stat")[0] == codec.main_stat_code(GearMainAttributes.defence_numeric)
+
+
+def test_import_creates_missing_output_directory(tmp_path):
+    source, inventory_path = tmp_path / "discs.jsonl", tmp_path / "new" / "nested" / "inventory.bin"
+    _write_jsonl(source, VALID)
+
+    report = InventoryImporter().import_file(source, inventory_path)
+
+    assert report.imported == len(VALID) and len(DiscInventory.open(inventory_path)) == len(VALID)
+    assert [path.name for path in inventory_path.parent.iterdir()] == ["inventory.bin"]
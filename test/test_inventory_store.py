@@ -0,0 +1,74 @@
+# test/test_inventory_store.py
+"""驱动盘库存：排序文件上的筛选视图为连续切片，结果与逐行比较一致"""
+import itertools
+
+import numpy as np
+import pytest
+
+from src.inventory import codec
+from src.inventory.store import DiscInventory
+
+SET_IDS = (31000, 31100, 31200)
+MAIN_STATS = (1, 3, 9)
+
+
+def _random_codes(count: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    sub_stats = np.stack([rng.permutation(len(codec.SUB_STAT_CODES))[:codec.SUB_STAT_COUNT] + 1
+                          for _ in range(count)])
+    return codec.pack(rng.integers(0, 6, count), rng.integers(0, 16, count), rng.choice(MAIN_STATS, count),
+                      rng.choice(SET_IDS, count), sub_stats, rng.integers(0, 6, (count, codec.SUB_STAT_COUNT)))
+
+
+@pytest.fixture
+def inventories(tmp_path):
+    codes = _random_codes(600)
+    locked = np.arange(len(codes)) % 5 == 0
+    memory = DiscInventory.from_codes(codes, locked)
+    memory.save(tmp_path / "inventory.bin")
+    return memory, DiscInventory.open(tmp_path / "inventory.bin")
+
+
+def _expected(inventory, slot, set_id, main_stat, locked):
+    mask = np.ones(len(inventory), dtype=bool)
+    for name, value in (("slot", slot), ("set_id", set_id), ("main_stat", main_stat)):
+        if value is not None:
+            mask &= inventory.columns[name] == value
+    if locked is not None:
+        mask &= inventory.columns["locked"].astype(bool) == locked
+    return sorted(inventory.all().codes()[mask].tolist())
+
+
+@pytest.mark.parametrize("slot, set_id, main_stat, locked", list(itertools.product(
+    (None, 0, 5), (None, SET_IDS[1], 99), (None, MAIN_STATS[2]), (None, True))))
+def test_views_match_row_by_row_filter(inventories, slot, set_id, main_stat, locked):
+    memory, stored = inventories
+    expected = _expected(memory, slot, set_id, main_stat, locked)
+
+    for inventory in (memory, stored):
+        view = inventory.view(slot, set_id, main_stat, locked)
+        assert sorted(view.codes().tolist()) == expected
+
+
+def test_sorted_file_gives_contiguous_slices(inventories):
+    _, stored = inventories
+    assert stored.sorted_by_slot
+
+    for slot, set_id, main_stat in itertools.product(range(6), SET_IDS, MAIN_STATS):
+        for view in (stored.view(slot), stored.view(slot, set_id), stored.view(slot, set_id, main_stat)):
+            assert isinstance(view.rows, slice)
+            assert isinstance(view.column("sub_rolls"), np.memmap)
+        assert (stored.view(slot, set_id, main_stat).column("main_stat") == main_stat).all()
+
+
+def test_save_round_trips_codes_and_locks(tmp_path, inventories):
+    memory, stored = inventories
+    assert sorted(stored.all().codes().tolist()) == sorted(memory.all().codes().tolist())
+    assert int(stored.columns["locked"].sum()) == int(memory.columns["locked"].sum())
+
+    writable = DiscInventory.open(tmp_path / "inventory.bin", writable=True)
+    rows = writable.view(slot=2).rows
+    writable.set_locked(rows, True)
+    writable.flush()
+    del writable
+    assert len(DiscInventory.open(tmp_path / "inventory.bin").view(slot=2, locked=False)) == 0
@@ -0,0 +1,111 @@
+# test/test_main_stat_solver.py
+"""主属性求解：线性模型与逐件计算一致，组合排序与逐个枚举一致，与副属性重复的主属性被排除"""
+import itertools
+
+import pytest
+
+from src.calculators.gear_calculator import GearCalculator, GearSetManager
+from src.config.slot_config import SlotConfig
+from src.models.gear_attributes import GearMainAttributes
+from src.models.gear_models import GearPiece, GearSetSelection
+from src.optimizers.main_stat_solver import FREE_SLOTS, MainStatSolver
+from src.optimizers.objectives import Objective, get_objective
+from src.optimizers.stat_model import STAT_FIELDS, StatModel
+from test.test_sub_stat_allocator import BASE
+from utils.benchmark.runner import build_sample_gear
+
+EQUIPMENT = {"31000": {"name": "测试套装甲", "desc2": "攻击力+10%", "desc4": "四件套效果描述"},
+             "31100": {"name": "测试套装乙", "desc2": "暴击率+8%", "desc4": "四件套效果描述"}}
+SELECTION = GearSetSelection("4+2", [31000, 31100])
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    calculator = GearCalculator()
+    calculator.set_gear_set_manager(GearSetManager(EQUIPMENT))
+    return calculator
+
+
+def _with_mains(pieces, mains):
+    """替换槽位4-6的主属性（副属性不变）"""
+    replaced = list(pieces)
+    for slot, main in zip(FREE_SLOTS, mains):
+        piece = pieces[slot]
+        replaced[slot] = GearPiece(slot_index=slot, level=piece.level, main_attribute=main,
+                                   sub_attributes=piece.sub_attributes)
+    return replaced
+
+
+def _brute_force(model, pieces, selection, objective):
+    """逐个枚举 SlotConfig 的主属性组合，跳过与该驱动盘副属性重复的主属性"""
+    slot_config, scores = SlotConfig(), {}
+    for mains in itertools.product(*(slot_config.get_slot_main_attribute(slot) for slot in FREE_SLOTS)):
+        if any(main.name in {definition.name for definition, _ in pieces[slot].sub_rolls()}
+               for slot, main in zip(FREE_SLOTS, mains)):
+            continue
+        stats = model.final_vector(_with_mains(pieces, mains), selection, 15)
+        scores[mains] = float(objective.score(stats))
+    return scores
+
+
+@pytest.mark.parametrize("selection", [None, SELECTION])
+def test_final_vector_matches_calculator(calculator, capsys, selection):
+    pieces = build_sample_gear()
+
+    expected = calculator.calculate_complete_stats(BASE, pieces, selection or GearSetSelection("4+2", []), 15)
+    capsys.readouterr()
+    vector = StatModel(BASE, calculator).final_vector(pieces, selection, 15)
+
+    assert StatModel.to_dict(vector) == pytest.approx(
+        {name: float(getattr(expected, name, 0) or 0) for name in STAT_FIELDS})
+
+
+@pytest.mark.parametrize("objective_name", ["damage", "attack"])
+@pytest.mark.parametrize("selection", [None, SELECTION])
+def test_ranking_matches_brute_force(calculator, objective_name, selection):
+    model, pieces = StatModel(BASE, calculator), build_sample_gear()
+    objective = get_objective(objective_name, "物理")
+    expected = _brute_force(model, pieces, selection, objective)
+
+    results = MainStatSolver(model).solve(pieces, selection, 15, objective)
+
+    # 示例驱动盘的副属性含暴击率、暴击伤害、攻击力百分比，对应的主属性组合不存在
+    assert 0 < len(expected) < 6 * 9 * 6
+    assert {result.main_attributes for result in results} == set(expected)
+    assert [result.score for result in results] == sorted(expected.values(), reverse=True)
+    assert all(result.score == pytest.approx(expected[result.main_attributes]) for result in results)
+    assert all(main is not GearMainAttributes.crit_rate for result in results for main in result.main_attributes)
+
+
+def test_deltas_are_relative_to_current_mains(calculator):
+    model = StatModel(BASE, calculator)
+    current = (GearMainAttributes.anomaly_proficiency, GearMainAttributes.physical_dmg_bonus, GearMainAttributes.impact)
+    pieces = _with_mains(build_sample_gear(), current)
+    objective = get_objective("damage", "物理")
+
+    results = MainStatSolver(model).solve(pieces, SELECTION, 15, objective)
+
+    reference = next(result for result in results if result.main_attributes == current)
+    assert reference.delta == 0 and not reference.stat_deltas
+    for result in results:
+        assert result.delta == pytest.approx(result.score - reference.score)
+        changed = {name: value - reference.final_stats[name] for name, value in result.final_stats.items()
+                   if abs(value - reference.final_stats[name]) > 1e-9}
+        assert result.stat_deltas == pytest.approx(changed)
+
+
+def test_invalid_current_mains_fall_back_to_best_combination(calculator):
+    # 示例驱动盘槽位4主属性为暴击率，与其副属性重复
+    results = MainStatSolver(StatModel(BASE, calculator)).solve(build_sample_gear(), None, 15,
+                                                                get_objective("damage", "物理"), top=5)
+
+    assert len(results) == 5
+    assert results[0].delta == 0 and all(result.delta <= 0 for result in results)
+
+
+def test_objective_without_score_cannot_be_constructed():
+    class Incomplete(Objective):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,107 @@
+# test/test_retry_policy.py
+"""下载重试：退避时长、Retry-After、熔断器状态以及下载器的失败记录"""
+import json
+import time
+
+from test.conftest import CHARACTER_IDS
+from utils.retry_policy import CircuitBreaker, FailureRecord, RetryPolicy, parse_retry_after
+
+
+def test_backoff_is_bounded_and_respects_retry_after():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=4.0)
+    for attempt in range(1, 8):
+        assert 0 <= policy.compute_delay(attempt) <= min(4.0, 0.5 * 2 ** (attempt - 1))
+    assert policy.compute_delay(1, retry_after=3.0) >= 3.0
+    assert policy.compute_delay(1, retry_after=100.0) <= 4.0
+    assert RetryPolicy(base_delay=1.0, jitter=False).compute_delay(3) == 4.0
+
+
+def test_retryable_statuses_and_retry_after_parsing():
+    assert RetryPolicy.is_retryable(None) and RetryPolicy.is_retryable(503) and RetryPolicy.is_retryable(429)
+    assert not RetryPolicy.is_retryable(404)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+def test_circuit_breaker_opens_probes_once_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure("e")
+    assert breaker.allow("e")
+    breaker.record_failure("e")
+    assert breaker.is_open("e") and not breaker.allow("e")
+
+    time.sleep(0.06)
+    assert breaker.allow("e")            # 半开：放行一个试探请求
+    assert not breaker.allow("e")
+    breaker.record_success("e")
+    assert not breaker.is_open("e") and breaker.allow("e")
+
+
+def test_failure_record_reads_legacy_format():
+    assert FailureRecord.from_dict("1011") == FailureRecord(kind="character", item_id="1011")
+
+
+def test_retryable_failure_uses_all_attempts_and_is_persisted(make_downloader, stub_server):
+    downloader = make_downloader(max_attempts=3)
+    failing = CHARACTER_IDS[0]
+    stub_server.status_overrides[f"/zh/character/{failing}.json"] = 503
+
+    success_count, failed_ids = downloader.batch_download_characters([failing])
+
+    assert (success_count, failed_ids) == (0, [failing])
+    assert stub_server.request_count == 3
+    with open(downloader.file_config.failed_downloads_file, encoding="utf-8") as f:
+        records = [FailureRecord.from_dict(entry) for entry in json.load(f)]
+    assert [(record.item_id, record.status, record.attempts) for record in records] == [(failing, 503, 3)]
+
+
+def test_non_retryable_failure_is_not_retried(make_downloader, stub_server):
+    downloader = make_downloader(max_attempts=3)
+    stub_server.status_overrides[f"/zh/character/{CHARACTER_IDS[0]}.json"] = 404
+
+    downloader.batch_download_characters([CHARACTER_IDS[0]])
+
+    assert stub_server.request_count == 1
+
+
+def test_open_breaker_stops_requests_and_retry_clears_records(make_downloader, stub_server):
+    downloader = make_downloader(max_attempts=1, max_workers=1)
+    downloader.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    for item_id in CHARACTER_IDS:
+        stub_server.status_overrides[f"/zh/character/{item_id}.json"] = 500
+
+    _, failed_ids = downloader.batch_download_characters(list(CHARACTER_IDS))
+
+    assert failed_ids == list(CHARACTER_IDS)
+    assert stub_server.request_count == 2            # 第3个请求被熔断拦截
+
+    stub_server.status_overrides.clear()
+    downloader.circuit_breaker = CircuitBreaker()
+    assert downloader.retry_failed_downloads(max_retries=1) == (len(CHARACTER_IDS), [])
+    with open(downloader.file_config.failed_downloads_file, encoding="utf-8") as f:
+        assert json.load(f) == []
+
+
+def test_half_open_probe_answered_with_404_closes_breaker(make_downloader, stub_server):
+    downloader = make_downloader(max_attempts=1)
+    downloader.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    downloader.circuit_breaker.record_failure("character_data")
+    stub_server.status_overrides[f"/zh/character/{CHARACTER_IDS[0]}.json"] = 404
+    time.sleep(0.06)
+
+    downloader.batch_download_characters([CHARACTER_IDS[0]])
+
+    assert stub_server.request_count == 1
+    assert downloader.circuit_breaker.allow("character_data")
+    assert not downloader.circuit_breaker.is_open("character_data")
+
+
+def test_released_probe_lets_next_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure("e")
+    assert breaker.allow("e") and not breaker.allow("e")
+
+    breaker.release("e")
+
+    assert breaker.allow("e") and breaker.is_open("e")
@@ -0,0 +1,94 @@
+# test/test_roster.py
+"""多角色分配：每个驱动盘只分给一个角色（含互换之后），配置无效时给出提示而不是抛异常，损失比例带符号"""
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.inventory import codec
+from src.inventory.store import DiscInventory
+from src.models.gear_models import GearSetSelection
+from src.optimizers.objectives import get_objective
+from src.optimizers.roster import RosterAssigner, RosterAssignment, RosterEntry
+from src.optimizers.stat_model import StatModel
+from test.test_sub_stat_allocator import BASE
+from utils.cli_tools import roster_command
+
+# 各槽位可用的主属性编码（见 codec.MAIN_STAT_CODES）
+SLOT_MAINS = ([1], [3], [5], [2, 4, 6, 7, 9, 10], [2, 4, 6, 11, 14], [2, 4, 6, 8, 12, 13])
+OBJECTIVES = ("damage", "crit_rate", "damage", "attack")
+
+
+def _assignment(score, reference_score):
+    return RosterAssignment(name="x", rows=np.full(6, -1), score=score, reference_score=reference_score,
+                            selection=GearSetSelection("4+2", []), final_stats={})
+
+
+def _inventory(seed, per_slot=12):
+    """每个槽位少量驱动盘，多个角色争抢同一批高分驱动盘"""
+    rng = np.random.default_rng(seed)
+    slots = np.repeat(np.arange(6), per_slot)
+    count = len(slots)
+    sub_stats = np.stack([rng.choice(np.arange(1, 11), 4, replace=False) for _ in range(count)])
+    rolls = np.stack([np.bincount(rng.integers(0, 4, rng.integers(3, 6)), minlength=4) for _ in range(count)])
+    return DiscInventory.from_codes(codec.pack(slots, np.full(count, 15), [rng.choice(SLOT_MAINS[slot]) for slot in slots],
+                                               rng.choice([31000, 31100, 31200], count), sub_stats, rolls))
+
+
+@pytest.mark.parametrize("seed", [1, 3, 7])
+def test_run_assigns_each_disc_at_most_once(seed):
+    inventory = _inventory(seed)
+    entries = [RosterEntry(f"角色{index}", StatModel(BASE), get_objective(name, "物理"))
+               for index, name in enumerate(OBJECTIVES)]
+    assigner = RosterAssigner(inventory, entries, beam_width=16, candidates_per_slot=6)
+
+    result = assigner.run()
+
+    assert result.swaps > 0
+    used = np.concatenate([assignment.rows[assignment.rows >= 0] for assignment in result.assignments])
+    assert len(np.unique(used)) == len(used)
+    for search, assignment in zip(assigner.searches, result.assignments):
+        placed = assignment.rows >= 0
+        assert inventory.columns["slot"][assignment.rows[placed]].tolist() == np.flatnonzero(placed).tolist()
+        # 互换后的得分与按分到的驱动盘重新计算的一致
+        assert assignment.score == pytest.approx(search.evaluate(assignment.rows).score)
+        assert assignment.loss == pytest.approx(1 - assignment.score / assignment.reference_score)
+        assert (assignment.loss < 0) == (assignment.score > assignment.reference_score)
+
+
+def test_claim_rejects_only_discs_owned_by_others():
+    owner = np.array([-1, 0, -1, 1])
+
+    RosterAssigner._claim(owner, SimpleNamespace(rows=np.array([0, 1, 2, -1, -1, -1])), 0)
+    assert owner.tolist() == [0, 0, 0, 1]
+    with pytest.raises(RuntimeError):
+        RosterAssigner._claim(owner, SimpleNamespace(rows=np.array([2, 3, -1, -1, -1, -1])), 0)
+
+
+def test_loss_is_signed_against_heuristic_reference():
+    assert _assignment(90.0, 100.0).loss == pytest.approx(0.1)
+    assert _assignment(110.0, 100.0).loss == pytest.approx(-0.1)
+    assert _assignment(5.0, 0.0).loss == 0.0
+
+
+@pytest.mark.parametrize("config", [[], {}, [1011], [{"character_id": 1011}],
+                                    [{"character_id": 1011, "weapon_id": 14109, "weight": "high"}]])
+def test_invalid_roster_config_is_reported(tmp_path, capsys, config):
+    path = tmp_path / "roster.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+
+    with pytest.raises(SystemExit) as exited:
+        roster_command([str(path)])
+
+    assert exited.value.code == 1
+    assert "❌" in capsys.readouterr().out
+
+
+def test_unreadable_roster_config_is_reported(tmp_path, capsys):
+    path = tmp_path / "roster.json"
+    path.write_text("[{", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        roster_command([str(path)])
+    assert "❌ 无法读取配置" in capsys.readouterr().out
@@ -0,0 +1,116 @@
+# test/test_sub_stat_allocator.py
+"""副属性分配：最少强化次数与逐盘暴力枚举一致，5-6 类相关副属性时仍在秒级内求解"""
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from src.models.character_attributes import CharacterAttributes
+from src.models.gear_attributes import GearMainAttributes
+from src.optimizers.stat_model import STAT_INDEX, StatModel
+from src.optimizers.sub_stat_allocator import SubStatAllocator, UPGRADES_PER_PIECE
+
+BASE = CharacterAttributes(hp=7600, attack=880, defence=600, impact=90, crit_rate=0.05, crit_dmg=0.5,
+                           anomaly_mastery=90, anomaly_proficiency=90, energy_regen=1.2)
+MAINS = (GearMainAttributes.hp_numeric, GearMainAttributes.attack_numeric, GearMainAttributes.defence_numeric,
+         GearMainAttributes.crit_rate, GearMainAttributes.attack_percentage, GearMainAttributes.attack_percentage)
+
+
+@pytest.fixture(scope="module")
+def allocator():
+    return SubStatAllocator(StatModel(BASE))
+
+
+def _brute_force(allocator, thresholds):
+    """逐盘枚举放入哪些相关副属性及其强化（每盘至多 5 次），稠密 DP 求各命中数组合所需的最少强化次数。
+    返回 (最少强化次数, None)，不可行时返回 (None, 最小相对缺口之和)"""
+    fixed = allocator._fixed_vector(MAINS, None, 15)
+    allowed = allocator._allowed_types(MAINS, None)
+    relevant = allocator._relevant_types(tuple(thresholds))
+    size = len(allowed) * (1 + UPGRADES_PER_PIECE) + 1
+    rolls = np.full((size,) * len(relevant), np.inf)
+    rolls[(0,) * len(relevant)] = 0
+    for types in allowed:
+        present = [position for position, index in enumerate(relevant) if index in types]
+        fillers = len(set(types) - set(relevant))
+        updated = np.full_like(rolls, np.inf)
+        for count in range(min(4, len(present)) + 1):
+            if 4 - count > fillers:
+                continue
+            for subset, upgrades in itertools.product(itertools.combinations(present, count),
+                                                      itertools.product(range(UPGRADES_PER_PIECE + 1), repeat=count)):
+                if sum(upgrades) > UPGRADES_PER_PIECE:
+                    continue
+                hits = np.zeros(len(relevant), dtype=int)
+                hits[list(subset)] = 1 + np.array(upgrades, dtype=int)
+                target = tuple(slice(hit, None) for hit in hits)
+                source = tuple(slice(0, size - hit) for hit in hits)
+                updated[target] = np.minimum(updated[target], rolls[source] + sum(upgrades))
+        rolls = updated
+
+    hits = np.indices(rolls.shape).reshape(len(relevant), -1).T
+    indices = [STAT_INDEX[name] for name in thresholds]
+    targets = np.array(list(thresholds.values()))
+    stats = fixed[indices] + hits @ allocator.hit_vectors[np.ix_(relevant, indices)]
+    shortfall = (np.maximum(targets - stats, 0) / targets).sum(axis=1)
+    rolls = rolls.reshape(-1)
+    feasible = np.isfinite(rolls) & (shortfall <= 1e-9)
+    if feasible.any():
+        return int(rolls[feasible].min()), None
+    return None, float(shortfall[np.isfinite(rolls)].min())
+
+
+@pytest.mark.parametrize("thresholds", [
+    {"crit_rate": 0.45, "crit_dmg": 1.2},
+    {"crit_rate": 0.3, "attack": 2600},
+    {"crit_dmg": 1.4, "anomaly_proficiency": 150},
+    {"crit_rate": 0.6, "crit_dmg": 1.5, "anomaly_proficiency": 130},
+    {"crit_rate": 0.95, "crit_dmg": 2.5},
+    {"attack": 4200, "crit_rate": 0.5},
+])
+def test_fewest_rolls_matches_brute_force(allocator, thresholds):
+    least, shortfall = _brute_force(allocator, thresholds)
+
+    allocation = allocator.minimize_rolls(MAINS, None, 15, thresholds)
+
+    final = allocation.final_stats
+    assert allocation.feasible == (least is not None)
+    if least is not None:
+        assert allocation.rolls_used == least
+        assert all(final[name] >= value - 1e-9 * value for name, value in thresholds.items())
+    else:
+        assert sum(max(value - final[name], 0) / value for name, value in thresholds.items()) == \
+            pytest.approx(shortfall, abs=1e-9)
+    assert all(len(rolls) == 4 and sum(level for _, level in rolls) == UPGRADES_PER_PIECE
+               for rolls in allocation.sub_rolls)
+
+
+def test_layouts_are_deduplicated_by_coverage(allocator):
+    allowed = allocator._allowed_types(MAINS, None)
+    relevant = allocator._relevant_types(("crit_rate", "crit_dmg", "attack"))
+
+    layouts = allocator._layouts(allowed, relevant)
+
+    assert len({layout.capacity.tobytes() for layout in layouts}) == len(layouts)
+    for layout in layouts:
+        assert all(len(option) == min(4, sum(relevant[position] in types for position in range(len(relevant))))
+                   and all(relevant[position] in types for position in option)
+                   for option, types in zip(layout.choices, allowed))
+        assert layout.presence.tolist() == np.bincount(
+            [position for option in layout.choices for position in option], minlength=len(relevant)).tolist()
+
+
+@pytest.mark.parametrize("thresholds", [
+    {"crit_rate": 0.7, "crit_dmg": 1.5, "attack": 3000, "anomaly_proficiency": 200},
+    {"crit_rate": 0.7, "crit_dmg": 1.5, "attack": 3000, "anomaly_proficiency": 200, "pen": 100},
+    {"crit_rate": 0.5, "crit_dmg": 1.0, "attack": 2400, "anomaly_proficiency": 120, "pen": 30},
+])
+def test_many_relevant_types_solve_quickly(allocator, thresholds):
+    start = time.perf_counter()
+    allocation = allocator.minimize_rolls(MAINS, None, 15, thresholds)
+    elapsed = time.perf_counter() - start
+
+    assert len(allocator._relevant_types(tuple(thresholds))) >= 5
+    assert allocation.sub_rolls
+    assert elapsed < 5.0, f"{elapsed:.2f}s"
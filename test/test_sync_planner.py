@@ -0,0 +1,79 @@
+# test/test_sync_planner.py
+"""增量同步计划：新增 / 变化 / 删除 / 未变化的归类，以及列表不变时对详情的逐项校验"""
+from test.conftest import CHARACTER_IDS, WEAPON_IDS, character_detail, weapon_detail
+from utils.sync_planner import SyncPlanner
+
+
+def _synced_planner(make_downloader):
+    planner = SyncPlanner(make_downloader())
+    planner.execute(planner.build_plan())
+    return SyncPlanner(make_downloader())
+
+
+def test_first_plan_downloads_everything(make_downloader):
+    planner = SyncPlanner(make_downloader())
+    plan = planner.build_plan()
+
+    assert sorted(plan.entities["character"].new) == sorted(CHARACTER_IDS)
+    assert sorted(plan.entities["weapon"].new) == sorted(WEAPON_IDS)
+    assert plan.entities["equipment"].new == ["31000"]
+
+    planner.execute(plan)
+    for item_id in CHARACTER_IDS:
+        assert planner.file_config.get_character_file_path(item_id).exists()
+
+
+def test_synced_tree_has_no_work_and_lists_are_not_modified(make_downloader):
+    plan = _synced_planner(make_downloader).build_plan()
+
+    assert not plan.has_work and not plan.errors
+    assert all(entity.list_not_modified for entity in plan.entities.values())
+    assert plan.entities["character"].verified == len(CHARACTER_IDS)
+    assert sorted(plan.entities["character"].unchanged) == sorted(CHARACTER_IDS)
+
+
+def test_list_changes_are_classified(make_downloader, stub_server):
+    planner = _synced_planner(make_downloader)
+    routes = {item_id: {"CHS": f"角色{item_id}"} for item_id in CHARACTER_IDS}
+    routes[CHARACTER_IDS[0]] = {"CHS": "改名"}        # 变化
+    del routes[CHARACTER_IDS[1]]                      # 删除
+    routes["1041"] = {"CHS": "新角色"}                 # 新增
+    stub_server.set_route("/character.json", routes)
+    stub_server.set_route("/zh/character/1041.json", character_detail("1041"))
+
+    plan = planner.build_plan(["character"])
+    entity = plan.entities["character"]
+
+    assert (entity.new, entity.changed, entity.removed, entity.unchanged) == \
+        (["1041"], [CHARACTER_IDS[0]], [CHARACTER_IDS[1]], [CHARACTER_IDS[2]])
+
+    result = planner.execute(plan, prune=True)["character"]
+    assert result["downloaded"] == 2 and result["removed"] == 1
+    assert not planner.file_config.get_character_file_path(CHARACTER_IDS[1]).exists()
+
+
+def test_detail_change_behind_unchanged_list_entry_is_detected(make_downloader, stub_server):
+    planner = _synced_planner(make_downloader)
+    stub_server.set_route(f"/zh/weapon/{WEAPON_IDS[1]}.json", weapon_detail(WEAPON_IDS[1], version=2))
+
+    assert not planner.build_plan(["weapon"], verify=False).has_work
+
+    plan = planner.build_plan(["weapon"])
+    entity = plan.entities["weapon"]
+    assert entity.list_not_modified
+    assert (entity.changed, entity.unchanged) == ([WEAPON_IDS[1]], [WEAPON_IDS[0]])
+
+    planner.execute(plan)
+    assert not SyncPlanner(make_downloader()).build_plan(["weapon"]).has_work
+
+
+def test_failed_items_are_planned_again(make_downloader, stub_server):
+    failing = f"/zh/character/{CHARACTER_IDS[2]}.json"
+    stub_server.status_overrides[failing] = 404
+    planner = SyncPlanner(make_downloader())
+    result = planner.execute(planner.build_plan(["character"]))
+    assert result["character"]["failed"] == [CHARACTER_IDS[2]]
+
+    del stub_server.status_overrides[failing]
+    plan = SyncPlanner(make_downloader()).build_plan(["character"])
+    assert plan.entities["character"].to_download == [CHARACTER_IDS[2]]
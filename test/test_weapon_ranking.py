@@ -0,0 +1,32 @@
+# test/test_weapon_ranking.py
+"""音擎批量评估：贡献拆分之和等于总提升，按数值相加的百分比随机属性不报告随机属性贡献"""
+import pytest
+
+from src.optimizers.objectives import get_objective
+from src.optimizers.stat_model import StatModel
+from src.optimizers.weapon_ranking import WeaponTerm, rank_weapons
+from test.test_sub_stat_allocator import BASE
+
+
+def _term(weapon_id, random_field, random_value, random_is_percentage):
+    return WeaponTerm(weapon_id=weapon_id, name=f"音擎{weapon_id}", rarity=4, level=60, base_attack=600,
+                      random_field=random_field, random_value=random_value, random_is_percentage=random_is_percentage)
+
+
+def test_percentage_random_stats_added_as_values_are_flagged():
+    terms = [_term(1, "crit_rate", 0.2, True), _term(2, "attack", 0.25, True),
+             _term(3, "anomaly_proficiency", 75, False)]
+
+    ranking = rank_weapons(StatModel(BASE), [], None, 15, get_objective("damage"), terms)
+    evaluations = {evaluation.weapon.weapon_id: evaluation for evaluation in ranking.evaluations}
+
+    assert [term.random_added_as_value for term in terms] == [False, True, False]
+    assert evaluations[2].random_contribution is None
+    for weapon_id in (1, 3):
+        evaluation = evaluations[weapon_id]
+        assert evaluation.base_contribution + evaluation.random_contribution == \
+            pytest.approx(evaluation.score - ranking.baseline_score)
+    assert evaluations[1].random_contribution > 0
+
+    table = ranking.format_table()
+    assert "attack +25.0% *" in table and "—" in table and "不报告其贡献" in table
@@ -0,0 +1,161 @@
+# src/utils/backup_store.py
+"""内容寻址备份存储 - 以内容哈希命名的数据块 + 每个备份一个清单
+
+目录结构:
+    backups/objects/ab/abcdef...   文件内容（同一内容只保存一份）
+    backups/manifests/<名称>.json  备份清单：文件名 → 内容哈希、大小
+
+备份时每个文件只读取并计算一次哈希，内容块已存在则只在清单中引用，
+未变化的目录再次备份不会产生任何文件复制。
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.download_manifest import content_hash
+from utils.pipeline import atomic_write_bytes
+
+
+@dataclass
+class BackupResult:
+    """单次备份的结果"""
+    name: str
+    manifest_path: Path
+    file_count: int = 0
+    new_objects: int = 0
+    reused_objects: int = 0
+    bytes_written: int = 0
+
+
+@dataclass
+class RestoreResult:
+    """单次恢复的结果"""
+    restored: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+class BackupStore:
+    """内容寻址的备份存储"""
+
+    def __init__(self, objects_dir: Path, manifests_dir: Path):
+        self.objects_dir = Path(objects_dir)
+        self.manifests_dir = Path(manifests_dir)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def manifest_path(self, name: str) -> Path:
+        return self.manifests_dir / f"{name}.json"
+
+    def create(self, name: str, files: List[Path], source: str = "") -> BackupResult:
+        """备份一组文件，已存在的内容块只引用不复制"""
+        result = BackupResult(name=name, manifest_path=self.manifest_path(name))
+        entries: Dict[str, Dict[str, Any]] = {}
+
+        for file_path in sorted(files, key=lambda p: p.name):
+            content = file_path.read_bytes()
+            digest = content_hash(content)
+            object_path = self.object_path(digest)
+
+            if object_path.exists():
+                result.reused_objects += 1
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(object_path, content)
+                result.new_objects += 1
+                result.bytes_written += len(content)
+
+            entries[file_path.name] = {"sha256": digest, "size": len(content)}
+
+        result.file_count = len(entries)
+        manifest = {
+            "name": name,
+            "source": source,
+            "created_time": datetime.now().isoformat(timespec="seconds"),
+            "files": entries
+        }
+
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(result.manifest_path,
+                           json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+        return result
+
+    def load_manifest(self, name: str) -> Optional[Dict[str, Any]]:
+        """读取备份清单，不存在时返回 None"""
+        try:
+            with open(self.manifest_path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def restore(self, name: str, target_dir: Path, pattern: str = "*.json") -> RestoreResult:
+        """把目标目录恢复为备份时的状态
+
+        内容与备份一致的文件不重写；目标目录中备份里没有的文件会被删除。
+        """
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"备份不存在: {name}")
+
+        files: Dict[str, Dict[str, Any]] = manifest["files"]
+        result = RestoreResult()
+
+        # 先校验所有内容块，避免恢复到一半才发现备份损坏
+        for file_name, entry in files.items():
+            object_path = self.object_path(entry["sha256"])
+            if not object_path.exists() or object_path.stat().st_size != entry["size"]:
+                raise FileNotFoundError(f"备份内容缺失或损坏: {file_name}")
+
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        for file_path in target_dir.glob(pattern):
+            if file_path.name not in files:
+                file_path.unlink()
+                result.removed.append(file_path.name)
+
+        for file_name, entry in files.items():
+            target_path = target_dir / file_name
+            if target_path.exists() and target_path.stat().st_size == entry["size"] \
+                    and content_hash(target_path.read_bytes()) == entry["sha256"]:
+                result.unchanged.append(file_name)
+                continue
+
+            atomic_write_bytes(target_path, self.object_path(entry["sha256"]).read_bytes())
+            result.restored.append(file_name)
+
+        return result
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """列出所有备份（按创建时间倒序）"""
+        backups = []
+        try:
+            manifest_files = [entry.path for entry in os.scandir(self.manifests_dir)
+                              if entry.name.endswith(".json") and entry.is_file()]
+        except FileNotFoundError:
+            return backups
+
+        for manifest_file in manifest_files:
+            try:
+                with open(manifest_file, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 备份清单损坏，已跳过 {manifest_file}: {e}")
+                continue
+
+            files = manifest.get("files", {})
+            backups.append({
+                "name": manifest.get("name", Path(manifest_file).stem),
+                "path": manifest_file,
+                "source": manifest.get("source", ""),
+                "file_count": len(files),
+                "created_time": datetime.fromisoformat(manifest["created_time"]),
+                "size_mb": sum(entry["size"] for entry in files.values()) / 1024 / 1024
+            })
+
+        backups.sort(key=lambda x: x["created_time"], reverse=True)
+        return backups
@@ -0,0 +1,6 @@
+# utils/benchmark/__init__.py
+"""基准测试 - 合成数据集 + 热路径计时"""
+from utils.benchmark.runner import BenchmarkSuite, measure
+from utils.benchmark.synthetic_data import SCALES, SyntheticDataGenerator
+
+__all__ = ['BenchmarkSuite', 'measure', 'SCALES', 'SyntheticDataGenerator']
@@ -0,0 +1,153 @@
+# utils/benchmark/compare.py
+"""性能回归门禁 - 以相同参数重跑基准，并与基线的中位数比较"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.benchmark.runner import BENCHMARK_FORMAT_VERSION, BenchmarkSuite
+
+# 回归时导致门禁失败的热路径，其他用例只报告不拦截
+HOT_PATHS = ("character_stats", "gear_evaluation", "data_load", "set_resolution")
+
+
+@dataclass
+class Comparison:
+    """单个用例的对比结果"""
+    name: str
+    baseline_ms: float
+    current_ms: float
+    tolerance_ms: float
+    gated: bool
+    speed_factor: float = 1.0
+
+    @property
+    def change(self) -> float:
+        """相对基线的变化比例（正数为变慢）"""
+        return self.current_ms / self.baseline_ms - 1 if self.baseline_ms > 0 else 0.0
+
+    @property
+    def regressed(self) -> bool:
+        return self.current_ms - self.baseline_ms > self.tolerance_ms
+
+    @property
+    def improved(self) -> bool:
+        return self.baseline_ms - self.current_ms > self.tolerance_ms
+
+    @property
+    def verdict(self) -> str:
+        if self.regressed:
+            return "回归" if self.gated else "变慢"
+        if self.improved:
+            return "提升"
+        return "持平"
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    """读取基线文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("format_version") != BENCHMARK_FORMAT_VERSION:
+        raise ValueError(f"不支持的基线格式版本: {baseline.get('format_version')}")
+    return baseline
+
+
+def rerun_like(baseline: Dict[str, Any], repeats: Optional[int] = None,
+               only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """以基线记录的规模、迭代次数和测量轮数重跑，返回完整报告"""
+    meta = baseline["meta"]
+    suite = BenchmarkSuite(
+        characters=meta["characters"],
+        iterations=meta["iterations"],
+        load_iterations=meta["load_iterations"],
+        seed=meta.get("seed", 0),
+        repeats=repeats or meta.get("repeats", 3)
+    )
+    return suite.run(only=only or list(baseline["results"]), progress=False)
+
+
+def machine_speed_factor(base: Dict[str, float], current: Dict[str, float]) -> float:
+    """基线与本次测量时校准负载的耗时比，用于抵消机器整体快慢的差异"""
+    base_calibration = base.get("calibration_ms")
+    current_calibration = current.get("calibration_ms")
+    if not base_calibration or not current_calibration:
+        return 1.0
+    return base_calibration / current_calibration
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.10, noise_factor: float = 1.5,
+            hot_paths: Optional[List[str]] = None) -> List[Comparison]:
+    """比较中位数
+
+    本次结果先按同一轮测量的校准负载换算到基线测量时的机器速度；
+    容差取 max(threshold × 基线中位数, noise_factor × 基线四分位距)，
+    中位数增量超过容差才判定为回归，避免把正常抖动误报为回归。
+    """
+    hot_paths = HOT_PATHS if hot_paths is None else hot_paths
+    comparisons = []
+
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        raw = current["results"][name]
+        factor = machine_speed_factor(base, raw)
+        noise = base["p75_ms"] - base["p25_ms"]
+        comparisons.append(Comparison(
+            name=name,
+            baseline_ms=base["p50_ms"],
+            current_ms=raw["p50_ms"] * factor,
+            tolerance_ms=max(threshold * base["p50_ms"], noise_factor * noise),
+            gated=name in hot_paths,
+            speed_factor=factor
+        ))
+
+    return comparisons
+
+
+def format_table(comparisons: List[Comparison]) -> str:
+    """生成对比表格"""
+    header = (f"{'用例':<18}{'基线p50(ms)':>14}{'当前p50(ms)':>14}{'速度系数':>10}"
+              f"{'变化':>10}{'容差(ms)':>12}  结论")
+    lines = [header, "-" * len(header)]
+    for item in comparisons:
+        mark = "❌" if item.regressed and item.gated else ("⚠️" if item.regressed else "✅")
+        lines.append(f"{item.name:<18}{item.baseline_ms:>14.4f}{item.current_ms:>14.4f}{item.speed_factor:>10.3f}"
+                     f"{item.change:>+10.1%}{item.tolerance_ms:>12.4f}  {mark} {item.verdict}")
+    return "\n".join(lines)
+
+
+def run_regression_gate(baseline_path: Path, threshold: float = 0.10, repeats: Optional[int] = None,
+                        confirm_runs: int = 2) -> bool:
+    """执行回归门禁，返回是否通过
+
+    疑似回归的热路径会单独重跑 confirm_runs 次，每次都回归才判定失败，
+    其余情况保留最快的一次结果，避免偶发的系统抖动导致门禁误报。
+    """
+    baseline = load_baseline(baseline_path)
+    current = rerun_like(baseline, repeats)
+    comparisons = {item.name: item for item in compare(baseline, current, threshold)}
+
+    for _ in range(confirm_runs):
+        suspects = [name for name, item in comparisons.items() if item.regressed and item.gated]
+        if not suspects:
+            break
+        print(f"🔁 复测疑似回归: {', '.join(suspects)}")
+        rerun = compare(baseline, rerun_like(baseline, repeats, only=suspects), threshold)
+        for item in rerun:
+            if item.current_ms < comparisons[item.name].current_ms:
+                comparisons[item.name] = item
+
+    comparisons = list(comparisons.values())
+
+    print("🖥️ 当前p50已按校准负载换算到基线测量时的机器速度")
+    print(format_table(comparisons))
+
+    regressions = [item for item in comparisons if item.regressed and item.gated]
+    if regressions:
+        print(f"\n❌ {len(regressions)} 个热路径性能回归超过阈值 {threshold:.0%}: "
+              f"{', '.join(item.name for item in regressions)}")
+        return False
+
+    print(f"\n✅ 未发现超过阈值 {threshold:.0%} 的热路径回归")
+    return True
@@ -0,0 +1,241 @@
+# utils/benchmark/runner.py
+"""基准测试运行器 - 计时、分位数统计和峰值内存"""
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.benchmark.synthetic_data import DatasetInfo, SyntheticDataGenerator
+
+BENCHMARK_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """单个基准用例的结果（时间单位：毫秒）"""
+    name: str
+    iterations: int
+    ops_per_sec: float
+    mean_ms: float
+    stdev_ms: float
+    min_ms: float
+    p25_ms: float
+    p50_ms: float
+    p75_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_memory_kb: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: round(value, 4) if isinstance(value, float) else value
+                for key, value in asdict(self).items()}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """线性插值分位数（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """屏蔽被测代码的控制台输出"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(name: str, func: Callable[[int], Any], iterations: int, warmup: int = 1) -> BenchmarkResult:
+    """执行 func(i) iterations 次并统计耗时，另外单独执行一次测量峰值内存
+
+    峰值内存使用 tracemalloc 单独测量，避免其开销影响计时。
+    """
+    with _quiet():
+        for index in range(warmup):
+            func(index)
+
+        samples = []
+        for index in range(iterations):
+            start = time.perf_counter_ns()
+            func(index)
+            samples.append((time.perf_counter_ns() - start) / 1e6)
+
+        tracemalloc.start()
+        try:
+            func(0)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    ordered = sorted(samples)
+    total_ms = sum(samples)
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        ops_per_sec=iterations / (total_ms / 1000) if total_ms > 0 else 0.0,
+        mean_ms=total_ms / iterations,
+        stdev_ms=statistics.stdev(samples) if iterations > 1 else 0.0,
+        min_ms=ordered[0],
+        p25_ms=percentile(ordered, 0.25),
+        p50_ms=percentile(ordered, 0.50),
+        p75_ms=percentile(ordered, 0.75),
+        p90_ms=percentile(ordered, 0.90),
+        p99_ms=percentile(ordered, 0.99),
+        max_ms=ordered[-1],
+        peak_memory_kb=peak / 1024
+    )
+
+
+def _calibration_workload(i: int):
+    """固定的纯Python负载（字典、属性访问、字符串格式化），用于估计机器当前速度"""
+    table = {f"k{n}": n for n in range(200)}
+    return sum(table[f"k{n % 200}"] * (n & 7) for n in range(2000))
+
+
+def calibrate(iterations: int = 30) -> float:
+    """测量校准负载的中位耗时（毫秒）"""
+    return measure("calibration", _calibration_workload, iterations).p50_ms
+
+
+class BenchmarkSuite:
+    """计算与加载热路径的基准测试集
+
+    在临时目录生成合成数据集，依次测量：
+    - data_load: DataManager 加载全部数据
+    - character_stats: CharacterAttributeCalculator.calculate_character_attributes
+    - weapon_convert: WeaponConverter.convert_from_json
+    - gear_evaluation: GearCalculator.calculate_complete_stats（6个驱动盘 + 4+2套装）
+    - set_manager_init: GearSetManager 构建
+    - set_resolution: GearSetManager.get_set_bonuses（每次解析全部套装组合，单次调用过短无法稳定计时）
+    """
+
+    def __init__(self, characters: int = 10, iterations: int = 200, load_iterations: int = 20,
+                 seed: int = 0, repeats: int = 3):
+        self.characters = characters
+        self.iterations = iterations
+        self.load_iterations = load_iterations
+        self.seed = seed
+        self.repeats = max(1, repeats)
+
+    def cases(self, dataset: DatasetInfo) -> Dict[str, Callable[[], BenchmarkResult]]:
+        """构建各基准用例（延迟导入被测模块，使数据集生成不受影响）"""
+        from src.calculators.character_calculator import CharacterAttributeCalculator
+        from src.calculators.gear_calculator import GearCalculator, GearSetManager
+        from src.data.manager import DataManager
+        from src.models.gear_models import GearSetSelection
+        from src.parsers.weapon_parsers import WeaponConverter
+
+        file_config = dataset.file_config
+        character_paths = [str(file_config.get_character_file_path(cid)) for cid in dataset.character_ids]
+        weapon_data = [json.loads(file_config.get_weapon_file_path(wid).read_text(encoding="utf-8"))
+                       for wid in dataset.weapon_ids]
+        equipment_data = json.loads(file_config.equipment_file.read_text(encoding="utf-8"))
+
+        with _quiet():
+            character_calculator = CharacterAttributeCalculator()
+            base_stats = character_calculator.calculate_character_attributes(character_paths[0], 60, 6, 7)
+            set_manager = GearSetManager(equipment_data)
+            gear_calculator = GearCalculator()
+            gear_calculator.set_gear_set_manager(set_manager)
+
+        set_ids = [int(set_id) for set_id in dataset.equipment_ids]
+        selections = [GearSetSelection("4+2", [set_ids[i % len(set_ids)], set_ids[(i + 1) % len(set_ids)]])
+                      for i in range(len(set_ids))]
+        gear_pieces = build_sample_gear()
+
+        def character_stats(i: int):
+            character_calculator.calculate_character_attributes(character_paths[i % len(character_paths)], 60, 6, 7)
+
+        def weapon_convert(i: int):
+            WeaponConverter.convert_from_json(weapon_data[i % len(weapon_data)])
+
+        def gear_evaluation(i: int):
+            gear_calculator.calculate_complete_stats(base_stats, gear_pieces, selections[i % len(selections)], 15)
+
+        def set_resolution(i: int):
+            for selection in selections:
+                set_manager.get_set_bonuses(selection)
+
+        n, load_n = self.iterations, self.load_iterations
+        return {
+            "data_load": lambda: measure("data_load", lambda i: DataManager(file_config), load_n),
+            "character_stats": lambda: measure("character_stats", character_stats, n),
+            "weapon_convert": lambda: measure("weapon_convert", weapon_convert, n),
+            "gear_evaluation": lambda: measure("gear_evaluation", gear_evaluation, n),
+            "set_manager_init": lambda: measure("set_manager_init", lambda i: GearSetManager(equipment_data), n),
+            "set_resolution": lambda: measure("set_resolution", set_resolution, n),
+        }
+
+    def run(self, only: Optional[List[str]] = None, progress: bool = True) -> Dict[str, Any]:
+        """生成数据集并执行基准测试，返回可序列化为JSON的报告"""
+        with tempfile.TemporaryDirectory(prefix="zzz_bench_") as temp_dir:
+            generate_start = time.perf_counter()
+            dataset = SyntheticDataGenerator(self.seed).write_dataset(Path(temp_dir), self.characters)
+            generate_seconds = time.perf_counter() - generate_start
+
+            results = {}
+            for name, run_case in self.cases(dataset).items():
+                if only and name not in only:
+                    continue
+                # 多轮测量取中位数最小的一轮，降低其他进程干扰造成的偏差；
+                # 每轮紧挨着测量一次校准负载，记录机器当时的速度
+                rounds = [(run_case(), calibrate()) for _ in range(self.repeats)]
+                result, calibration_ms = min(rounds, key=lambda r: r[0].p50_ms / r[1])
+                results[name] = dict(result.to_dict(), calibration_ms=round(calibration_ms, 4))
+                if progress:
+                    print(f"⏱️ {name}: p50 {result.p50_ms:.3f}ms, {result.ops_per_sec:.1f} ops/s, "
+                          f"峰值内存 {result.peak_memory_kb:.1f}KB", file=sys.stderr)
+
+        return {
+            "format_version": BENCHMARK_FORMAT_VERSION,
+            "meta": {
+                "created_time": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "characters": self.characters,
+                "weapons": self.characters,
+                "iterations": self.iterations,
+                "load_iterations": self.load_iterations,
+                "seed": self.seed,
+                "repeats": self.repeats,
+                "generate_seconds": round(generate_seconds, 3)
+            },
+            "results": results
+        }
+
+
+def build_sample_gear():
+    """构造一套6个满级驱动盘（槽位4-6使用常见主属性，副属性共强化5次）"""
+    from src.models.gear_attributes import GearMainAttributes, GearSubAttributes
+    from src.models.gear_models import GearPiece
+
+    main_attributes = [
+        GearMainAttributes.hp_numeric, GearMainAttributes.attack_numeric, GearMainAttributes.defence_numeric,
+        GearMainAttributes.crit_rate, GearMainAttributes.physical_dmg_bonus, GearMainAttributes.attack_percentage
+    ]
+    sub_factories = [
+        GearSubAttributes.get_crit_rate, GearSubAttributes.get_crit_dmg,
+        GearSubAttributes.get_attack_percentage, GearSubAttributes.get_pen
+    ]
+
+    pieces = []
+    for slot, main_attribute in enumerate(main_attributes):
+        sub_attributes = [factory() for factory in sub_factories]
+        for roll in range(5):
+            sub_attributes[(slot + 1 + roll) % len(sub_attributes)].enhancement_level += 1
+        pieces.append(GearPiece(slot_index=slot, level=15, main_attribute=main_attribute,
+                                sub_attributes=sub_attributes))
+    return pieces
@@ -0,0 +1,163 @@
+# utils/benchmark/synthetic_data.py
+"""合成数据生成器 - 按API数据结构生成角色、音擎、驱动盘JSON，用于离线基准测试"""
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.config.file import FileConfig
+
+WEAPON_TYPES = {"1": "强攻", "2": "击破", "3": "异常", "4": "支援", "5": "防护"}
+ELEMENT_TYPES = {"200": "物理", "201": "火", "202": "冰", "203": "电", "205": "以太"}
+
+# ExtraLevel 中的属性ID（ID // 100 对应 character_parser 的属性类型映射）
+EXTRA_PROPERTY_IDS = ["12101", "20101", "21101", "23101", "30501", "31201", "31401"]
+
+WEAPON_RAND_PROPERTIES = [
+    ("暴击率", "{0:0.#%}", 800),
+    ("暴击伤害", "{0:0.#%}", 1600),
+    ("攻击力", "{0:0.#%}", 1000),
+    ("穿透率", "{0:0.#%}", 800),
+    ("异常精通", "{0:0}", 30),
+    ("能量自动回复", "{0:0.#%}", 2000),
+]
+
+SET_BONUS_TEMPLATES = [
+    "攻击力+{v}%", "生命值+{v}%", "防御力+{v}%", "暴击率+{v}%", "暴击伤害+{v}%",
+    "物理伤害+{v}%", "火属性伤害+{v}%", "冰属性伤害+{v}%", "电属性伤害+{v}%", "以太伤害+{v}%",
+    "异常精通+{v}点", "异常掌控+{v}%", "穿透率+{v}%", "能量自动回复+{v}%", "冲击力+{v}%",
+]
+
+# 预设规模
+SCALES = {"small": 10, "medium": 1000, "large": 10000}
+
+
+@dataclass
+class DatasetInfo:
+    """生成的数据集信息"""
+    file_config: FileConfig
+    character_ids: List[str]
+    weapon_ids: List[str]
+    equipment_ids: List[str]
+
+
+class SyntheticDataGenerator:
+    """合成数据生成器（固定种子，结果可复现）"""
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+
+    def character(self, character_id: int) -> Dict[str, Any]:
+        rng = self.rng
+        weapon_key = rng.choice(list(WEAPON_TYPES))
+        element_key = rng.choice(list(ELEMENT_TYPES))
+
+        return {
+            "Id": character_id,
+            "Name": f"合成角色{character_id}",
+            "Rarity": rng.choice([3, 4]),
+            "WeaponType": {weapon_key: WEAPON_TYPES[weapon_key]},
+            "ElementType": {element_key: ELEMENT_TYPES[element_key]},
+            "Stats": {
+                "HpMax": rng.randint(550, 700), "HpGrowth": rng.randint(80000, 110000),
+                "Attack": rng.randint(90, 130), "AttackGrowth": rng.randint(10000, 14000),
+                "Defence": rng.randint(45, 100), "DefenceGrowth": rng.randint(7000, 12000),
+                "BreakStun": rng.randint(80, 130), "Crit": 500, "CritDamage": 5000,
+                "ElementAbnormalPower": rng.randint(80, 120), "ElementMystery": rng.randint(80, 120),
+                "PenRate": 0, "SpRecover": 120, "PenDelta": 0, "SpBarPoint": 120,
+                "RpMax": 0, "RpRecover": 0
+            },
+            "Level": {
+                str(stage): {
+                    "HpMax": stage * rng.randint(300, 400),
+                    "Attack": stage * rng.randint(40, 60),
+                    "Defence": stage * rng.randint(30, 50),
+                    "LevelMax": stage * 10,
+                    "LevelMin": (stage - 1) * 10
+                }
+                for stage in range(1, 7)
+            },
+            "ExtraLevel": {
+                str(stage): {
+                    "MaxLevel": stage * 10,
+                    "Extra": {
+                        extra_id: {"Value": stage * rng.randint(5, 25), "Format": "{0:0.#}"}
+                        for extra_id in rng.sample(EXTRA_PROPERTY_IDS, 2)
+                    }
+                }
+                for stage in range(1, 7)
+            },
+            "Passive": {"Level": {str(level): {"Level": level} for level in range(1, 8)}}
+        }
+
+    def weapon(self, weapon_id: int) -> Dict[str, Any]:
+        rng = self.rng
+        rand_name, rand_format, rand_value = rng.choice(WEAPON_RAND_PROPERTIES)
+
+        return {
+            "Id": weapon_id,
+            "Name": f"合成音擎{weapon_id}",
+            "Rarity": rng.choice([2, 3, 4]),
+            "WeaponType": {"1": WEAPON_TYPES["1"]},
+            "BaseProperty": {"Name": "基础攻击力", "Value": rng.choice([32, 40, 48])},
+            "RandProperty": {"Name": rand_name, "Format": rand_format, "Value": rand_value},
+            "Level": {str(level): {"Rate": level * 1500, "Rate2": 10000} for level in range(0, 61)},
+            "Stars": {
+                str(star): {"StarRate": star * 8900, "RandRate": star * 3000}
+                for star in range(0, 6)
+            },
+            "Talents": {
+                str(star): {"Name": f"天赋{star}", "Desc": f"攻击力提升{star * 3}%"}
+                for star in range(1, 6)
+            }
+        }
+
+    def equipment(self, count: int) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            str(31000 + index * 100): {
+                "name": f"合成套装{index}",
+                "desc2": rng.choice(SET_BONUS_TEMPLATES).format(v=rng.choice([6, 8, 10, 12, 30])),
+                "desc4": "四件套效果描述"
+            }
+            for index in range(count)
+        }
+
+    def write_dataset(self, base_dir: Path, characters: int, weapons: int = None,
+                      equipment_sets: int = 30) -> DatasetInfo:
+        """在 base_dir 下写入完整的数据目录（角色/音擎文件、ID列表、名称映射、驱动盘）"""
+        weapons = characters if weapons is None else weapons
+        file_config = FileConfig(str(Path(base_dir).resolve()))
+        file_config.ensure_directories()
+
+        character_ids = [str(1000 + index) for index in range(characters)]
+        weapon_ids = [str(12000 + index) for index in range(weapons)]
+
+        character_names = {}
+        for character_id in character_ids:
+            data = self.character(int(character_id))
+            character_names[character_id] = data["Name"]
+            _write_json(file_config.get_character_file_path(character_id), data)
+
+        weapon_names = {}
+        for weapon_id in weapon_ids:
+            data = self.weapon(int(weapon_id))
+            weapon_names[weapon_id] = data["Name"]
+            _write_json(file_config.get_weapon_file_path(weapon_id), data)
+
+        equipment = self.equipment(equipment_sets)
+        _write_json(file_config.equipment_file, equipment)
+
+        _write_json(file_config.character_ids_file, character_ids)
+        _write_json(file_config.weapon_ids_file, weapon_ids)
+        _write_json(file_config.equipment_ids_file, list(equipment))
+        _write_json(file_config.character_id_name_mapping_file, character_names)
+        _write_json(file_config.weapon_id_name_mapping_file, weapon_names)
+
+        return DatasetInfo(file_config, character_ids, weapon_ids, list(equipment))
+
+
+def _write_json(file_path: Path, data: Any):
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -1,16 +1,22 @@
 # src/utils/cli_tools.py
 """命令行工具"""
+import json
 import sys
-from typing import List
+from typing import List, Optional
 
-from utils.file_processor import FileManagementService
+
+def _file_service():
+    """创建文件管理服务（子命令按需导入各自的依赖，保持命令行启动轻量）"""
+    from utils.file_processor import FileManagementService
+
+    return FileManagementService()
 
 
 def init_command():
     """初始化命令"""
     print("🚀 初始化应用程序...")
 
-    file_service = FileManagementService()
+    file_service = _file_service()
     result = file_service.initialize_data_directory()
 
     if result["success"]:
@@ -31,16 +37,24 @@ def init_command():
         print("❌ 初始化失败")
 
 
-def status_command():
-    """状态检查命令"""
-    file_service = FileManagementService()
-    status = file_service.get_system_status()
+def status_command(args: List[str] = None):
+    """状态检查命令（--probe 探测网络，--json 输出机器可读结果）"""
+    args = args or []
+    file_service = _file_service()
+    status = file_service.get_system_status(probe_network="--probe" in args)
+
+    if "--json" in args:
+        print(json.dumps(status, ensure_ascii=False, default=str))
+        return
 
+    data_status = status["data_status"]
     print("📊 系统状态报告:")
     print(f"✅ 文件系统: {'正常' if status['file_system']['valid'] else '异常'}")
-    print(f"📁 数据完整度: {status['data_status']['completion_rate']:.1f}%")
-    print(f"📋 角色文件: {status['data_status']['existing_count']}/{status['data_status']['total_characters']}")
-    print(f"🌐 网络状态: {status['network_status']}")
+    print(f"📁 数据完整度: {data_status['completion_rate']:.1f}%")
+    print(f"📋 角色文件: {data_status['characters']['existing']}/{data_status['characters']['total']}")
+    print(f"🗡️ 音擎文件: {data_status['weapons']['existing']}/{data_status['weapons']['total']}")
+    print(f"🌐 网络状态: {status['network_status']}"
+          + (" (缓存)" if status["network"] and status["network"].get("cached") else ""))
 
     if status["recommendations"]:
         print("\n💡 建议操作:")
@@ -50,7 +64,7 @@ def status_command():
 
 def download_command(args: List[str]):
     """下载命令"""
-    file_service = FileManagementService()
+    file_service = _file_service()
 
     if len(args) == 0 or args[0] == "all":
         # 下载所有数据
@@ -65,29 +79,474 @@ def download_command(args: List[str]):
         # 重试失败的下载
         max_retries = int(args[1]) if len(args) > 1 else 3
         file_service.retry_failed_downloads(max_retries)
+    elif args[0] == "sync":
+        # 增量同步（--dry-run 只打印计划）
+        file_service.sync_data(dry_run="--dry-run" in args, prune="--prune" in args)
     else:
-        print("未知下载命令，可用命令: all, list, missing, retry")
+        print("未知下载命令，可用命令: all, list, missing, retry, sync")
 
 
 def maintenance_command():
     """维护命令"""
-    file_service = FileManagementService()
+    file_service = _file_service()
     result = file_service.perform_maintenance()
     print("✅ 维护任务完成")
 
 def export_command(args: List[str]):
-    """导出命令"""
-    file_service = FileManagementService()
-    export_path = args[0] if args else None
-    export_dir = file_service.export_data(export_path)
-    print(f"✅ 数据已导出到: {export_dir}")
+    """导出命令（--xz 使用 xz 压缩）"""
+    file_service = _file_service()
+    paths = [arg for arg in args if not arg.startswith("--")]
+    export_path = paths[0] if paths else None
+    file_service.export_data(export_path, compression="xz" if "--xz" in args else "gz")
+
+
+def import_command(args: List[str]):
+    """导入命令（--verify-only 只校验不写入）"""
+    paths = [arg for arg in args if not arg.startswith("--")]
+    if not paths:
+        print("用法: python cli.py import <归档路径> [--verify-only]")
+        return
+
+    file_service = _file_service()
+    if not file_service.import_data(paths[0], verify_only="--verify-only" in args):
+        sys.exit(1)
+
+
+def _option_value(args: List[str], name: str, default=None):
+    """读取 --name value 形式的参数"""
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+
+def bench_command(args: List[str]):
+    """基准测试命令：在合成数据集上测量加载和计算热路径，输出JSON
+
+    --compare 基线文件：以基线的参数重跑并比较中位数，热路径回归时以非零状态退出。
+    """
+    from utils.benchmark import SCALES, BenchmarkSuite
+
+    baseline_path = _option_value(args, "--compare")
+    if baseline_path:
+        from utils.benchmark.compare import run_regression_gate
+
+        passed = run_regression_gate(
+            baseline_path,
+            threshold=float(_option_value(args, "--threshold", 0.10)),
+            repeats=int(_option_value(args, "--repeat", 0)) or None
+        )
+        if not passed:
+            sys.exit(1)
+        return
+
+    scale = _option_value(args, "--scale", "small")
+    characters = SCALES[scale] if scale in SCALES else int(scale)
+    only = _option_value(args, "--only")
+
+    suite = BenchmarkSuite(
+        characters=characters,
+        iterations=int(_option_value(args, "--iterations", 200)),
+        load_iterations=int(_option_value(args, "--load-iterations", 20)),
+        repeats=int(_option_value(args, "--repeat", 3))
+    )
+    report = suite.run(only=only.split(",") if only else None)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    output_path = _option_value(args, "--output")
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ 基准结果已保存到: {output_path}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def metrics_command(args: List[str]):
+    """指标命令：开启指标后加载数据并对本地角色各计算一次，输出各阶段耗时和缓存命中率"""
+    import contextlib
+    import os
+
+    from src.services.metrics import metrics_registry
+
+    metrics_registry.enable()
+    limit = int(_option_value(args, "--limit", 20))
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        # 全局实例在首次访问时创建并加载数据，此时指标已开启，加载阶段耗时会被记录
+        from src.data.manager import data_manager as manager
+        from src.models.gear_models import GearSetSelection
+        from src.services.calculation_service import calculation_service
+
+        weapons = manager.get_all_weapons()
+        set_ids = [gear_set.id for gear_set in manager.get_all_gear_sets()][:2]
+
+        for character in manager.get_all_characters()[:limit]:
+            for level in (1, 60):
+                breakthrough = calculation_service.get_breakthrough_level(level)
+                if weapons:
+                    stats = calculation_service.calculate_character_with_weapon(
+                        character.id, level, breakthrough, 7, weapons[character.id % len(weapons)].id, level)
+                else:
+                    stats = calculation_service.calculate_character_base_stats(character.id, level, breakthrough, 7)
+                if stats:
+                    calculation_service.calculate_final_stats(stats, [], GearSetSelection("4+2", set_ids), 15)
+
+    if "--json" in args:
+        print(json.dumps(metrics_registry.dump(), ensure_ascii=False, indent=2))
+    else:
+        print(metrics_registry.format_report())
+
+
+def profile_command(args: List[str]):
+    """剖析命令：在 cProfile 和 tracemalloc 下运行命名场景，输出排序报告和折叠栈文件
+
+    默认使用本地数据目录；本地没有角色数据或指定 --synthetic N 时，在临时目录生成 N 个角色的合成数据。
+    """
+    import tempfile
+    from pathlib import Path
+
+    from src.config.manager import config_manager
+    from utils.profiler import SCENARIOS, ProfileContext, ScenarioProfiler
+
+    scenario = args[0] if args and not args[0].startswith("--") else None
+    if scenario not in SCENARIOS:
+        print(f"用法: python cli_tools.py profile <{'|'.join(SCENARIOS)}> "
+              f"[--synthetic N] [--builds N] [--top N] [--output-dir 目录]")
+        return
+
+    synthetic = _option_value(args, "--synthetic")
+    file_config = config_manager.file
+    if synthetic is None and not any(file_config.characters_dir.glob("*.json")):
+        synthetic = 100
+
+    with tempfile.TemporaryDirectory(prefix="zzz_profile_") as temp_dir:
+        if synthetic is not None:
+            from utils.benchmark import SyntheticDataGenerator
+
+            file_config = SyntheticDataGenerator().write_dataset(Path(temp_dir), int(synthetic)).file_config
+            print(f"🧪 使用合成数据: {synthetic} 个角色")
+
+        profiler = ScenarioProfiler(
+            ProfileContext(file_config, builds=int(_option_value(args, "--builds", 1000))),
+            output_dir=Path(_option_value(args, "--output-dir", "profiles")),
+            top=int(_option_value(args, "--top", 40))
+        )
+        print(f"🔬 剖析场景: {scenario}")
+        result = profiler.profile(scenario)
+
+    print(f"⏱️ 耗时(cProfile下): {result.wall_seconds:.3f}s, 峰值内存: {result.peak_memory_kb:.1f}KB")
+    print("🔥 累计耗时前10:")
+    for name, seconds in result.top_functions:
+        print(f"  {seconds * 1000:>10.2f}ms  {name}")
+    print(f"📄 报告: {result.report_path}")
+    print(f"📄 折叠栈: {result.collapsed_path}")
+    print(f"📄 pstats: {result.stats_path}")
+
+
+def importtime_command(args: List[str]):
+    """导入耗时检查：在独立解释器中测量各子命令的导入开销，超出预算时以非零状态退出"""
+    from utils.import_budget import check_import_budgets
+
+    only = _option_value(args, "--only")
+    measurements = check_import_budgets(
+        commands=only.split(",") if only else None,
+        repeats=int(_option_value(args, "--repeat", 5)),
+        scale=float(_option_value(args, "--scale", 1.0))
+    )
+
+    print(f"{'子命令':<14}{'导入(ms)':>10}{'预算(ms)':>10}  最慢的模块")
+    for item in measurements:
+        mark = "✅" if item.passed else "❌"
+        print(f"{item.command:<14}{item.import_ms:>10.1f}{item.budget_ms:>10.1f}  {mark} {', '.join(item.slowest)}")
+
+    over_budget = [item.command for item in measurements if not item.passed]
+    if over_budget:
+        print(f"\n❌ 导入耗时超出预算: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("\n✅ 所有子命令的导入耗时都在预算内")
+
+
+def inventory_command(args: List[str]):
+    """驱动盘库存：import 流式导入扫描器导出文件，info 查看库存概况"""
+    from src.config.file import FileConfig
+    from src.inventory.importer import DiscRowConverter, InventoryImporter, load_set_names
+    from src.inventory.store import DiscInventory
+
+    file_config = FileConfig()
+    subcommand = args[0] if args else ""
+    inventory_path = _option_value(args, "--output", str(file_config.inventory_file))
+
+    if subcommand == "import" and len(args) > 1 and not args[1].startswith("--"):
+        set_names = load_set_names(file_config.equipment_file)
+        converter = DiscRowConverter(set_names, known_set_ids=set(set_names.values()) or None)
+        file_config.ensure_directories()
+        report = InventoryImporter(converter).import_file(
+            args[1], inventory_path, append="--append" in args, rejects_path=_option_value(args, "--rejects")
+        )
+        print(f"📦 {report.format_summary()}")
+        for row_number, reason in report.rejections[:20]:
+            print(f"  ⚠️ 第 {row_number} 行: {reason}")
+        if report.rejected > 20:
+            print(f"  ... 其余 {report.rejected - 20} 条拒绝记录" + ("见拒绝文件" if "--rejects" in args else ""))
+        print(f"💾 库存文件: {inventory_path}")
+        if report.imported == 0 and report.total_rows:
+            sys.exit(1)
+    elif subcommand == "info":
+        inventory = DiscInventory.open(inventory_path)
+        print(f"📦 {inventory_path}: {len(inventory)} 个驱动盘，锁定 {len(inventory.view(locked=True))}")
+        for slot in range(6):
+            print(f"  槽位{slot + 1}: {len(inventory.view(slot=slot))}")
+    else:
+        print("用法: python cli_tools.py inventory import <文件.json|.jsonl|.csv> [--append] [--rejects 文件] "
+              "[--output 库存文件] | inventory info [--output 库存文件]")
+
+
+def _character_stats(character_id: int, weapon_id: int, level: int):
+    """静默加载数据并计算角色 + 音擎的基础属性，返回 (计算服务, 属性)，找不到角色时属性为 None"""
+    import contextlib
+    import os
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        from src.services.calculation_service import calculation_service
+        base_stats = calculation_service.calculate_character_with_weapon(
+            character_id, level, calculation_service.get_breakthrough_level(level), 7, weapon_id, level)
+    return calculation_service, base_stats
+
+
+def _set_names(service) -> dict:
+    if not service.gear_set_manager:
+        return {}
+    return {set_id: effect.name for set_id, effect in service.gear_set_manager.set_effects.items()}
+
+
+def breakpoints_command(args: List[str]):
+    """属性阈值求解：求满足阈值所需强化次数最少的套装、主属性和副属性，无法满足时给出最接近的方案"""
+    positional = [arg for index, arg in enumerate(args)
+                  if not arg.startswith("--") and (index == 0 or not args[index - 1].startswith("--"))]
+    ids = [arg for arg in positional if "=" not in arg]
+    thresholds = {}
+    for arg in positional:
+        if "=" in arg:
+            name, value = arg.split("=", 1)
+            thresholds[name] = float(value)
+    if len(ids) < 2 or not thresholds:
+        print("用法: python cli_tools.py breakpoints <角色ID> <音擎ID> 属性=阈值 ... [--level 60] "
+              "[--objective damage] [--sets ID,ID,...] [--fallback 200]")
+        print("示例: python cli_tools.py breakpoints 1091 14109 crit_rate=0.7 anomaly_proficiency=400")
+        return
+
+    from src.optimizers.breakpoint_solver import FALLBACK_LIMIT, BreakpointSolver
+    from src.optimizers.objectives import get_objective
+    from src.optimizers.stat_model import StatModel
+
+    service, base_stats = _character_stats(int(ids[0]), int(ids[1]), int(_option_value(args, "--level", 60)))
+    if not base_stats:
+        print(f"❌ 找不到角色 {ids[0]}")
+        sys.exit(1)
+
+    sets = _option_value(args, "--sets")
+    objective = get_objective(_option_value(args, "--objective", "damage"), getattr(base_stats, "element_type", ""))
+    solver = BreakpointSolver(StatModel(base_stats, service.gear_calculator, service.gear_set_manager))
+    try:
+        result = solver.solve(thresholds, objective, set_ids=[int(set_id) for set_id in sets.split(",")] if sets else None,
+                              fallback_limit=int(_option_value(args, "--fallback", FALLBACK_LIMIT)))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(result.format_summary(_set_names(service)))
+    if not result.feasible:
+        sys.exit(1)
+
+
+def _roster_config_problem(config) -> Optional[str]:
+    """检查 roster 配置，返回第一个问题的说明，没有问题时返回 None"""
+    if not isinstance(config, list) or not config:
+        return "应为非空的 JSON 列表，每项对应一个角色"
+    for position, item in enumerate(config, start=1):
+        if not isinstance(item, dict):
+            return f"第{position}项不是 JSON 对象"
+        for key in ("character_id", "weapon_id"):
+            if not str(item.get(key, "")).strip().isdigit():
+                return f"第{position}项缺少有效的 {key}"
+        weight = item.get("weight")
+        if weight is not None and (isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0):
+            return f"第{position}项的 weight 应为非负数"
+    return None
+
+
+def roster_command(args: List[str]):
+    """多角色驱动盘分配：按配置文件中的角色顺序（优先级）分配同一份库存，每个驱动盘只分给一个角色
+
+    配置文件为 JSON 列表，每项: {"character_id": 1091, "weapon_id": 14109, "objective": "damage",
+    "name": "可选", "level": 60, "weight": 可选}
+    """
+    if not args or args[0].startswith("--"):
+        print("用法: python cli_tools.py roster <配置.json> [--inventory 库存文件] [--passes 3]")
+        return
+
+    try:
+        with open(args[0], "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ 无法读取配置 {args[0]}: {e}")
+        sys.exit(1)
+    problem = _roster_config_problem(config)
+    if problem:
+        print(f"❌ 配置 {args[0]} 无效: {problem}")
+        sys.exit(1)
+
+    from src.config.file import FileConfig
+    from src.inventory.store import DiscInventory
+    from src.optimizers.objectives import get_objective
+    from src.optimizers.roster import RosterAssigner, RosterEntry
+    from src.optimizers.stat_model import StatModel
+
+    inventory = DiscInventory.open(_option_value(args, "--inventory", str(FileConfig().inventory_file)))
+
+    entries = []
+    for item in config:
+        service, base_stats = _character_stats(int(item["character_id"]), int(item["weapon_id"]),
+                                               int(item.get("level", 60)))
+        if not base_stats:
+            print(f"❌ 找不到角色 {item['character_id']}")
+            sys.exit(1)
+        objective = get_objective(item.get("objective", "damage"), getattr(base_stats, "element_type", ""))
+        entries.append(RosterEntry(
+            name=str(item.get("name") or getattr(base_stats, "name", "") or item["character_id"]),
+            model=StatModel(base_stats, service.gear_calculator, service.gear_set_manager),
+            objective=objective,
+            weight=item.get("weight")
+        ))
+
+    print(f"📦 {len(inventory)} 个驱动盘，{len(entries)} 个角色")
+    result = RosterAssigner(inventory, entries, max_passes=int(_option_value(args, "--passes", 3))).run()
+    print(result.format_table())
+    set_names = _set_names(service)
+    for assignment in result.assignments:
+        sets = " + ".join(set_names.get(set_id, str(set_id)) for set_id in assignment.selection.set_ids)
+        rows = ", ".join(str(row) if row >= 0 else "-" for row in assignment.rows.tolist())
+        print(f"  {assignment.name}: {assignment.selection.combination_type} {sets} | 库存行 {rows}")
+
+
+def search_command(args: List[str]):
+    """库存配装搜索：逐行输出 JSON 事件（incumbent 更好的解 / progress 进度 / done 结束），Ctrl+C 提前结束"""
+    import signal
+
+    ids = [arg for index, arg in enumerate(args)
+           if not arg.startswith("--") and (index == 0 or not args[index - 1].startswith("--"))]
+    if len(ids) < 2:
+        print("用法: python cli_tools.py search <角色ID> <音擎ID> [--objective damage] [--inventory 库存文件] "
+              "[--time 60] [--interval 1] [--level 60]")
+        return
+
+    from src.config.file import FileConfig
+    from src.inventory.dominance import DominanceIndex
+    from src.inventory.store import DiscInventory
+    from src.optimizers.anytime import AnytimeRunner
+    from src.optimizers.build_search import BuildSearch
+    from src.optimizers.objectives import get_objective
+    from src.optimizers.stat_model import StatModel
+
+    inventory = DiscInventory.open(_option_value(args, "--inventory", str(FileConfig().inventory_file)))
+    service, base_stats = _character_stats(int(ids[0]), int(ids[1]), int(_option_value(args, "--level", 60)))
+    if not base_stats:
+        print(f"❌ 找不到角色 {ids[0]}", file=sys.stderr)
+        sys.exit(1)
+
+    objective = get_objective(_option_value(args, "--objective", "damage"), getattr(base_stats, "element_type", ""))
+    search = BuildSearch(StatModel(base_stats, service.gear_calculator, service.gear_set_manager), objective,
+                         inventory.columns, dominance=DominanceIndex(inventory))
+    runner = AnytimeRunner(search.anytime(), time_budget=float(_option_value(args, "--time", 60)),
+                           progress_interval=float(_option_value(args, "--interval", 1)))
+    signal.signal(signal.SIGINT, lambda signum, frame: runner.cancel())
+
+    def encode(build) -> dict:
+        selection = build.selection(search.sets)
+        stats = StatModel.to_dict(build.stats)
+        return {
+            "rows": build.rows.tolist(),
+            "combination_type": selection.combination_type,
+            "set_ids": selection.set_ids,
+            "stats": {name: stats[name] for name in objective.fields},
+        }
+
+    for event in runner.events():
+        print(json.dumps(event.to_dict(encode), ensure_ascii=False), flush=True)
+
+
+def weapons_command(args: List[str]):
+    """音擎对比：固定驱动盘配置（库存中的行，不给则不带驱动盘），一次评估全部或已拥有的音擎并按目标排序
+
+    已拥有的音擎文件为 JSON 对象 {"音擎ID": 等级, ...}
+    """
+    if not args or args[0].startswith("--"):
+        print("用法: python cli_tools.py weapons <角色ID> [--rows 行,行,...] [--inventory 库存文件] "
+              "[--owned 音擎.json] [--objective damage] [--level 60] [--weapon-level 60] [--enhance 15] [--top N]")
+        return
+
+    import contextlib
+    import os
+
+    from src.optimizers.weapon_ranking import selection_from_pieces
+
+    level = int(_option_value(args, "--level", 60))
+    pieces = []
+    rows = _option_value(args, "--rows")
+    if rows:
+        from src.config.file import FileConfig
+        from src.inventory.store import DiscInventory, InventoryView
+
+        inventory = DiscInventory.open(_option_value(args, "--inventory", str(FileConfig().inventory_file)))
+        pieces = InventoryView(inventory, [int(row) for row in rows.split(",")]).to_pieces()
+
+    owned = _option_value(args, "--owned")
+    weapon_levels = None
+    if owned:
+        with open(owned, "r", encoding="utf-8") as f:
+            weapon_levels = {int(weapon_id): int(weapon_level) for weapon_id, weapon_level in json.load(f).items()}
+
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            from src.services.calculation_service import calculation_service
+            ranking = calculation_service.evaluate_weapons(
+                int(args[0]), level, calculation_service.get_breakthrough_level(level), 7,
+                pieces, selection_from_pieces(pieces), int(_option_value(args, "--enhance", 15)),
+                _option_value(args, "--objective", "damage"),
+                weapon_levels=weapon_levels, weapon_level=int(_option_value(args, "--weapon-level", 60)))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not ranking:
+        print(f"❌ 找不到角色 {args[0]}")
+        sys.exit(1)
+
+    top = _option_value(args, "--top")
+    print(f"🗡️ {len(ranking.evaluations)} 个音擎，{len(pieces)} 个驱动盘")
+    print(ranking.format_table(int(top) if top else None))
 
 
 def main():
     """命令行主入口"""
     if len(sys.argv) < 2:
-        print("用法: python cli_tools.py [init|status|download|maintenance|cleanup|export]")
-        print("下载子命令: python cli_tools.py download [all|list|missing|retry]")
+        print("用法: python cli_tools.py [init|status|download|maintenance|cleanup|export|import|bench|metrics|profile|importtime|inventory|breakpoints|roster|search|weapons]")
+        print("下载子命令: python cli_tools.py download [all|list|missing|retry|sync [--dry-run] [--prune]]")
+        print("状态: python cli_tools.py status [--probe] [--json]")
+        print("导出/导入: python cli_tools.py export [路径] [--xz] | import <路径> [--verify-only]")
+        print("基准测试: python cli_tools.py bench [--scale small|medium|large|N] [--iterations N] "
+              "[--repeat N] [--only 用例,...] [--output 文件]")
+        print("回归检查: python cli_tools.py bench --compare 基线.json [--threshold 0.1] [--repeat N]")
+        print("计算指标: python cli_tools.py metrics [--limit N] [--json]")
+        print("性能剖析: python cli_tools.py profile <cold_start|load_character|apply_weapon|evaluate_gear|sync> "
+              "[--synthetic N] [--builds N]")
+        print("导入耗时: python cli_tools.py importtime [--only 子命令,...] [--repeat N] [--scale 1.0]")
+        print("驱动盘库存: python cli_tools.py inventory import <文件> [--append] [--rejects 文件] | inventory info")
+        print("属性阈值: python cli_tools.py breakpoints <角色ID> <音擎ID> crit_rate=0.7 ... [--objective damage] [--sets ID,...]")
+        print("多角色分配: python cli_tools.py roster <配置.json> [--inventory 库存文件] [--passes 3]")
+        print("配装搜索: python cli_tools.py search <角色ID> <音擎ID> [--objective damage] [--time 60]（输出 JSON 行）")
+        print("音擎对比: python cli_tools.py weapons <角色ID> [--rows 行,...] [--owned 音擎.json] [--objective damage] [--top N]")
         return
 
     command = sys.argv[1]
@@ -96,15 +555,36 @@ def main():
     if command == "init":
         init_command()
     elif command == "status":
-        status_command()
+        status_command(args)
     elif command == "download":
         download_command(args)
     elif command == "maintenance":
         maintenance_command()
     elif command == "export":
         export_command(args)
+    elif command == "import":
+        import_command(args)
+    elif command == "bench":
+        bench_command(args)
+    elif command == "metrics":
+        metrics_command(args)
+    elif command == "profile":
+        profile_command(args)
+    elif command == "importtime":
+        importtime_command(args)
+    elif command == "inventory":
+        inventory_command(args)
+    elif command == "breakpoints":
+        breakpoints_command(args)
+    elif command == "roster":
+        roster_command(args)
+    elif command == "search":
+        search_command(args)
+    elif command == "weapons":
+        weapons_command(args)
     else:
-        print("未知命令，可用命令: init, status, download, maintenance, cleanup, export")
+        print("未知命令，可用命令: init, status, download, maintenance, cleanup, export, import, bench, metrics, "
+              "profile, importtime, inventory, breakpoints, roster, search, weapons")
 
 
 if __name__ == "__main__":
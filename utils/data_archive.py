@@ -0,0 +1,219 @@
+# src/utils/data_archive.py
+"""数据归档 - 把整个数据目录流式写入压缩包，导入时一次遍历完成校验和解压
+
+归档最后一个成员是 MANIFEST.json，记录每个文件的路径、大小和 SHA-256，
+以及由全部文件哈希计算出的数据版本。导出和导入都按块读写，内存占用与数据量无关。
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+MANIFEST_NAME = "MANIFEST.json"
+ARCHIVE_FORMAT_VERSION = 1
+COMPRESSION_SUFFIXES = {"gz": ".tar.gz", "xz": ".tar.xz"}
+
+# 不进入归档的目录（备份有自己的存储）
+EXCLUDED_DIRS = frozenset({"backups"})
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    """归档格式错误或校验失败"""
+
+
+@dataclass
+class ArchiveResult:
+    """导出/导入结果"""
+    path: Path
+    file_count: int = 0
+    total_bytes: int = 0
+    data_version: str = ""
+    elapsed: float = 0.0
+    mismatches: List[str] = field(default_factory=list)
+
+
+class _HashingReader:
+    """读取时同步计算哈希的文件包装"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._fileobj.read(size)
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+
+def compute_data_version(entries: List[Dict[str, Any]]) -> str:
+    """由各文件路径和哈希计算数据版本（与文件顺序无关）"""
+    digest = hashlib.sha256()
+    for entry in sorted(entries, key=lambda e: e["path"]):
+        digest.update(f"{entry['path']}\0{entry['sha256']}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def iter_data_files(base_dir: Path) -> Iterator[Tuple[str, Path]]:
+    """遍历数据目录，返回 (归档内相对路径, 文件路径)，跳过临时文件和排除目录"""
+    base_dir = Path(base_dir)
+    for root, dirs, files in os.walk(base_dir):
+        if Path(root) == base_dir:
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+
+        for name in sorted(files):
+            if name.startswith(".") or name.endswith(".tmp"):
+                continue
+            file_path = Path(root) / name
+            yield file_path.relative_to(base_dir).as_posix(), file_path
+
+
+def export_archive(base_dir: Path, output_path: Path, compression: str = "gz") -> ArchiveResult:
+    """把数据目录流式写入压缩包"""
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"不支持的压缩格式: {compression}")
+
+    start = time.perf_counter()
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    result = ArchiveResult(path=output_path)
+    entries: List[Dict[str, Any]] = []
+
+    try:
+        # 流式写入时 gz 按字符串检查文件名后缀，传入 Path 会出错
+        with tarfile.open(str(temp_path), f"w|{compression}") as tar:
+            for arcname, file_path in iter_data_files(base_dir):
+                if file_path.resolve() == output_path.resolve():
+                    continue
+
+                tarinfo = tar.gettarinfo(str(file_path), arcname=arcname)
+                with open(file_path, "rb") as f:
+                    reader = _HashingReader(f)
+                    tar.addfile(tarinfo, reader)
+
+                entries.append({"path": arcname, "size": reader.size, "sha256": reader.sha256.hexdigest()})
+                result.total_bytes += reader.size
+
+            result.data_version = compute_data_version(entries)
+            manifest = json.dumps({
+                "format_version": ARCHIVE_FORMAT_VERSION,
+                "data_version": result.data_version,
+                "created_time": datetime.now().isoformat(timespec="seconds"),
+                "file_count": len(entries),
+                "total_bytes": result.total_bytes,
+                "files": entries
+            }, ensure_ascii=False, indent=2).encode("utf-8")
+
+            # 清单作为最后一个成员写入
+            manifest_info = tarfile.TarInfo(MANIFEST_NAME)
+            manifest_info.size = len(manifest)
+            manifest_info.mtime = int(time.time())
+            tar.addfile(manifest_info, io.BytesIO(manifest))
+
+        os.replace(temp_path, output_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+    result.file_count = len(entries)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _safe_member_path(name: str) -> PurePosixPath:
+    """拒绝绝对路径和上级目录引用"""
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        raise ArchiveError(f"归档包含不安全的路径: {name}")
+    return path
+
+
+def import_archive(archive_path: Path, base_dir: Path, verify_only: bool = False) -> ArchiveResult:
+    """一次遍历完成校验和解压
+
+    成员先解压到暂存目录并同时计算哈希；读到末尾的清单后逐一比对，
+    全部一致才替换到数据目录，否则丢弃暂存内容，数据目录保持不变。
+    verify_only 时只计算哈希，不写入任何文件。
+    """
+    start = time.perf_counter()
+    base_dir = Path(base_dir)
+    staging_dir = base_dir / f".import_{os.getpid()}"
+    result = ArchiveResult(path=Path(archive_path))
+    actual: Dict[str, Tuple[int, str]] = {}
+    manifest: Optional[Dict[str, Any]] = None
+
+    try:
+        with tarfile.open(str(archive_path), "r|*") as tar:
+            for member in tar:
+                if manifest is not None:
+                    raise ArchiveError(f"清单之后出现了多余的成员: {member.name}")
+
+                if member.name == MANIFEST_NAME:
+                    manifest = json.load(tar.extractfile(member))
+                    continue
+
+                if not member.isfile():
+                    if member.isdir():
+                        continue
+                    raise ArchiveError(f"不支持的成员类型: {member.name}")
+
+                relative = _safe_member_path(member.name)
+                source = tar.extractfile(member)
+                digest = hashlib.sha256()
+                size = 0
+
+                if verify_only:
+                    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        size += len(chunk)
+                else:
+                    target = staging_dir.joinpath(*relative.parts)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with open(target, "wb") as out:
+                        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                            digest.update(chunk)
+                            size += len(chunk)
+                            out.write(chunk)
+
+                actual[relative.as_posix()] = (size, digest.hexdigest())
+
+        if manifest is None:
+            raise ArchiveError("归档缺少清单，可能已被截断")
+        if manifest.get("format_version") != ARCHIVE_FORMAT_VERSION:
+            raise ArchiveError(f"不支持的归档版本: {manifest.get('format_version')}")
+
+        expected = {entry["path"]: (entry["size"], entry["sha256"]) for entry in manifest["files"]}
+        result.mismatches = sorted(
+            path for path in set(expected) | set(actual) if expected.get(path) != actual.get(path)
+        )
+        if result.mismatches:
+            raise ArchiveError(f"{len(result.mismatches)} 个文件校验失败: {', '.join(result.mismatches[:5])}")
+
+        if not verify_only:
+            for path in expected:
+                target = base_dir.joinpath(*PurePosixPath(path).parts)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staging_dir.joinpath(*PurePosixPath(path).parts), target)
+
+        result.file_count = len(expected)
+        result.total_bytes = sum(size for size, _ in expected.values())
+        result.data_version = manifest["data_version"]
+    except tarfile.TarError as e:
+        raise ArchiveError(f"归档读取失败: {e}") from e
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -1,13 +1,24 @@
 # src/utils/data_downloader.py
 """重构后的数据下载器"""
+import dataclasses
 import json
+import threading
 import time
-import re
+from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from src.config.api import API_BASE_URL, API_ENDPOINTS
+from src.config.file import FileConfig
 from src.config.manager import config_manager
+from src.services.metrics import metrics_registry
+from utils.download_engine import ConcurrentDownloadEngine, DownloadReport
+from utils.download_manifest import DownloadManifest
+from utils.pipeline import HTML_TAG_PATTERN, PipelineError, PipelineItem, build_pipeline
+from utils.retry_policy import CircuitBreaker, FailureRecord, RetryPolicy, parse_retry_after
+from utils.status_report import scan_data_completeness
 
 
 def remove_html_tags(text):
@@ -15,33 +26,45 @@ def remove_html_tags(text):
     if not isinstance(text, str):
         return text
 
-    # 去除颜色标签
-    text = re.sub(r'<color=.*?>', '', text)
-    text = re.sub(r'</color>', '', text)
-    # 去除其他HTML标签
-    text = re.sub(r'<.*?>', '', text)
-
-    return text
+    return HTML_TAG_PATTERN.sub('', text)
 
 
 class DataDownloader:
     """数据下载器 - 单一职责：负责从API下载数据"""
 
-    def __init__(self):
-        self.file_config = config_manager.file
+    def __init__(self, base_url: Optional[str] = None, file_config: Optional[FileConfig] = None):
+        self.file_config = file_config or config_manager.file
+        self.file_config.ensure_directories()
         self.api_config = {
-            "base_url": "https://api.hakush.in/zzz/data",
-            "endpoints": {
-                "character_list": "/character.json",
-                "character_data": "/zh/character/{character_id}.json",
-                "equipment_data": "/equipment.json",
-                "weapon_list": "/weapon.json",
-                "weapon_data": "/zh/weapon/{weapon_id}.json"
-            },
+            "base_url": base_url or API_BASE_URL,
+            "endpoints": dict(API_ENDPOINTS),
             "request_delay": 0.1,
-            "timeout": 10
+            "timeout": 10,
+            "max_workers": 8,
+            "requests_per_second": 10,
+            "max_attempts": 3,
+            "backoff_base": 0.5,
+            "backoff_max": 30.0,
+            "breaker_threshold": 5,
+            "breaker_reset": 30.0
+        }
+        self._session = self._build_session()
+        self.manifest = DownloadManifest(self.file_config.download_manifest_file)
+        self.pipelines = {
+            kind: build_pipeline(kind, self._fetch_item, self.manifest)
+            for kind in ("character", "weapon", "equipment")
         }
-        self._session = requests.Session()
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.api_config["max_attempts"],
+            base_delay=self.api_config["backoff_base"],
+            max_delay=self.api_config["backoff_max"]
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.api_config["breaker_threshold"],
+            reset_timeout=self.api_config["breaker_reset"]
+        )
+        self._failures: Dict[Tuple[str, str], FailureRecord] = {}
+        self._failures_lock = threading.Lock()
 
     def download_character_list(self) -> Optional[Dict[str, Any]]:
         """下载角色列表"""
@@ -51,11 +74,20 @@ class DataDownloader:
         print(f"🔗 请求URL: {url}")
 
         try:
-            response = self._session.get(url, timeout=self.api_config["timeout"])
+            response = self._conditional_get("character_list")
+            if response.status_code == 304:
+                data = self._load_cached_list(self.file_config.character_ids_file,
+                                              self.file_config.character_id_name_mapping_file)
+                if data:
+                    print(f"✅ 角色列表未变化: {len(data)} 个角色")
+                    return data
+                response = self._session.get(url, timeout=self.api_config["timeout"])
+
             response.raise_for_status()
 
             data = response.json()
             self._save_character_mapping(data)
+            self._record_response("character_list", response)
 
             print(f"✅ 角色列表下载成功: {len(data)} 个角色")
             return data
@@ -66,25 +98,13 @@ class DataDownloader:
 
     def download_character_data(self, character_id: str) -> bool:
         """下载单个角色数据"""
-        url = self._build_url("character_data", character_id=character_id)
-
-        try:
-            response = self._session.get(url, timeout=self.api_config["timeout"])
-
-            if response.status_code == 200:
-                data = response.json()
-                self._save_character_file(character_id, data)
-
-                character_name = data.get('Name', '未知角色')
-                print(f"   ✅ 下载成功: {character_name}")
-                return True
-            else:
-                print(f"   ❌ 下载失败: HTTP {response.status_code}")
-                return False
-
-        except Exception as e:
-            print(f"   ❌ 下载失败: {e}")
-            return False
+        item = PipelineItem(
+            kind="character",
+            item_id=character_id,
+            file_path=self.file_config.get_character_file_path(character_id),
+            manifest_key=self._endpoint_path("character_data", character_id=character_id)
+        )
+        return self._run_item_pipeline(item)
 
     def download_weapon_list(self) -> Optional[Dict[str, Any]]:
         """下载音擎列表"""
@@ -94,11 +114,20 @@ class DataDownloader:
         print(f"🔗 请求URL: {url}")
 
         try:
-            response = self._session.get(url, timeout=self.api_config["timeout"])
+            response = self._conditional_get("weapon_list")
+            if response.status_code == 304:
+                data = self._load_cached_list(self.file_config.weapon_ids_file,
+                                              self.file_config.weapon_id_name_mapping_file)
+                if data:
+                    print(f"✅ 音擎列表未变化: {len(data)} 个音擎")
+                    return data
+                response = self._session.get(url, timeout=self.api_config["timeout"])
+
             response.raise_for_status()
 
             data = response.json()
             self._save_weapon_mapping(data)
+            self._record_response("weapon_list", response)
 
             print(f"✅ 音擎列表下载成功: {len(data)} 个音擎")
             return data
@@ -109,47 +138,13 @@ class DataDownloader:
 
     def download_weapon_data(self, weapon_id: str) -> bool:
         """下载单个音擎数据"""
-        d = {}
-        url = self._build_url("weapon_data", weapon_id=weapon_id)
-
-        try:
-            response = self._session.get(url, timeout=self.api_config["timeout"])
-
-            if response.status_code == 200:
-                data = response.json()
-                key_l = ["Id", "Name", "Rarity", "WeaponType", "BaseProperty", "RandProperty", "Stars"]
-                for k, v in data.items():
-                    if k in key_l:
-                        d[k] = v
-                    elif k == "Level":
-                        d[k] = {}
-                        for k1, v1 in v.items():
-                            d[k][k1] = {}
-                            for k2, v2 in v1.items():
-                                if k2 != "Exp":
-                                    d[k][k1][k2] = v2
-                    elif k == "Talents":
-                        d[k] = {}
-                        for k1, v1 in v.items():
-                            d[k][k1] = {}
-                            for k2, v2 in v1.items():
-                                d[k][k1][k2] = {}
-                                if k2 == "Desc":
-                                    d[k][k1][k2] = remove_html_tags(v2)
-                                else:
-                                    d[k][k1][k2] = v2
-                self._save_weapon_file(weapon_id, d)
-
-                weapon_name = data.get('Name', '未知音擎')
-                print(f"   ✅ 下载成功: {weapon_name}")
-                return True
-            else:
-                print(f"   ❌ 下载失败: HTTP {response.status_code}")
-                return False
-
-        except Exception as e:
-            print(f"   ❌ 下载失败: {e}")
-            return False
+        item = PipelineItem(
+            kind="weapon",
+            item_id=weapon_id,
+            file_path=self.file_config.get_weapon_file_path(weapon_id),
+            manifest_key=self._endpoint_path("weapon_data", weapon_id=weapon_id)
+        )
+        return self._run_item_pipeline(item)
 
     def download_equipment_data(self) -> Optional[List[str]]:
         """下载并保存驱动盘数据"""
@@ -159,41 +154,118 @@ class DataDownloader:
         print(f"🔗 请求URL: {url}")
 
         try:
-            response = self._session.get(url, timeout=self.api_config["timeout"])
+            response = self._conditional_get("equipment_data")
+            if response.status_code == 304:
+                equipment_ids = self.load_json_list(self.file_config.equipment_ids_file)
+                if equipment_ids and self.file_config.equipment_file.exists():
+                    print(f"✅ 驱动盘数据未变化: {len(equipment_ids)} 个装备")
+                    return equipment_ids
+                response = self._session.get(url, timeout=self.api_config["timeout"])
+
             response.raise_for_status()
 
-            data = response.json()
+            return self.save_equipment_data(response.json(), response)
 
-            # 提取所有驱动盘ID
-            equipment_ids = list(data.keys())
+        except Exception as e:
+            print(f"❌ 驱动盘数据下载失败: {e}")
+            return None
 
-            # 清理数据中的HTML标签
-            equipment_data = {}
-            for equipment_id in equipment_ids:
-                equipment_data[equipment_id] = data[equipment_id]["CHS"]
-                for k, v in equipment_data[equipment_id].items():
-                    equipment_data[equipment_id][k] = remove_html_tags(v)
+    def save_equipment_data(self, data: Dict[str, Any], response: requests.Response) -> List[str]:
+        """清理并保存已下载的驱动盘数据，返回装备ID列表"""
+        item = PipelineItem(
+            kind="equipment",
+            data=data,
+            response=response,
+            file_path=self.file_config.equipment_file,
+            manifest_key=self._endpoint_path("equipment_data")
+        )
+        # 已有响应数据，流水线跳过获取阶段，内容未变化时不重写
+        equipment_data = self.pipelines["equipment"].run(item).data
+        equipment_ids = list(equipment_data.keys())
+
+        # 保存装备ID列表
+        with open(self.file_config.equipment_ids_file, "w", encoding="utf-8") as f:
+            json.dump(equipment_ids, f, ensure_ascii=False, indent=2)
+        self.manifest.save()
+
+        # 在控制台显示ID列表
+        print("🎮 驱动盘ID列表:")
+        for equip_id in equipment_ids:
+            equip_name = equipment_data[equip_id].get("name", "未知装备")
+            print(f"  - {equip_id}: {equip_name}")
+
+        print(f"✅ 驱动盘数据下载成功: {len(equipment_ids)} 个装备")
+        return equipment_ids
+
+    def fetch_remote_list(self, endpoint_key: str,
+                          conditional: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[requests.Response]]:
+        """获取远程列表，不写入任何文件
+
+        返回 (data, response)。列表未变化（304）时 data 为 None；请求失败时两者均为 None。
+        """
+        try:
+            if conditional:
+                response = self._conditional_get(endpoint_key)
+            else:
+                response = self._session.get(self._build_url(endpoint_key), timeout=self.api_config["timeout"])
 
-            # 保存清理后的装备数据
-            with open(self.file_config.equipment_file, "w", encoding="utf-8") as f:
-                json.dump(equipment_data, f, ensure_ascii=False, indent=2)
+            if response.status_code == 304:
+                return None, response
 
-            # 保存装备ID列表
-            with open(self.file_config.equipment_ids_file, "w", encoding="utf-8") as f:
-                json.dump(equipment_ids, f, ensure_ascii=False, indent=2)
+            response.raise_for_status()
+            return response.json(), response
 
-            # 在控制台显示ID列表
-            print("🎮 驱动盘ID列表:")
-            for equip_id in equipment_ids:
-                equip_name = equipment_data[equip_id].get("name", "未知装备")
-                print(f"  - {equip_id}: {equip_name}")
+        except Exception as e:
+            print(f"❌ 获取远程列表失败 ({endpoint_key}): {e}")
+            return None, None
 
-            print(f"✅ 驱动盘数据下载成功: {len(equipment_ids)} 个装备")
-            return equipment_ids
+    def save_list(self, kind: str, data: Dict[str, Any]):
+        """保存角色/音擎列表的ID列表和名称映射"""
+        if kind == "character":
+            self._save_character_mapping(data)
+        elif kind == "weapon":
+            self._save_weapon_mapping(data)
+        else:
+            raise ValueError(f"未知的列表类型: {kind}")
+
+    def record_list_response(self, kind: str, response: requests.Response):
+        """记录角色/音擎列表端点的缓存校验头（下次列表请求据此发送条件请求）"""
+        self._record_response(f"{kind}_list", response)
+
+    def has_download_record(self, kind: str, item_id: Optional[str] = None) -> bool:
+        """下载清单中是否有该实体的记录（驱动盘为整个数据端点）"""
+        return self.manifest.has(self._item_key(kind, item_id))
+
+    def verify_unchanged(self, kind: str, item_ids: List[str]) -> List[str]:
+        """对清单中有 ETag / Last-Modified 的角色/音擎逐项发送条件请求，返回远程已变化或无法确认的ID
+
+        只读取响应头（304 即未变化），不下载内容、不写入文件；没有校验头的条目无法低成本确认，原样视为未变化。
+        """
+        endpoint_key = f"{kind}_data"
+        candidates = [item_id for item_id in item_ids
+                      if self.manifest.conditional_headers(self._item_key(kind, item_id))]
+        if not candidates:
+            return []
 
-        except Exception as e:
-            print(f"❌ 驱动盘数据下载失败: {e}")
-            return None
+        def not_modified(item_id: str) -> bool:
+            response = self._conditional_get(endpoint_key, stream=True, **{f"{kind}_id": item_id})
+            response.close()
+            return response.status_code == 304
+
+        engine = ConcurrentDownloadEngine(
+            max_workers=self.api_config["max_workers"],
+            requests_per_second=self.api_config["requests_per_second"]
+        )
+        return engine.run(candidates, not_modified).failed_ids
+
+    @staticmethod
+    def load_json_list(file_path: Path) -> List[str]:
+        """读取本地JSON列表文件（ID列表等），文件缺失或损坏时返回空列表"""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
 
     def batch_download_characters(self, character_ids: List[str] = None) -> Tuple[int, List[str]]:
         """批量下载角色数据"""
@@ -205,25 +277,12 @@ class DataDownloader:
 
         print(f"📥 开始批量下载 {len(character_ids)} 个角色数据...")
 
-        success_count = 0
-        failed_ids = []
-
-        for index, char_id in enumerate(character_ids, 1):
-            print(f"🔍 正在下载 ({index}/{len(character_ids)}): {char_id}")
-
-            success = self.download_character_data(char_id)
-
-            if success:
-                success_count += 1
-            else:
-                failed_ids.append(char_id)
-
-            time.sleep(self.api_config["request_delay"])
+        report = self._run_batch(character_ids, self.download_character_data)
 
-        self._save_failed_downloads(failed_ids)
-        self._print_download_summary(success_count, failed_ids, len(character_ids))
+        self._save_failed_downloads("character", self._collect_failures("character", report.failed_ids))
+        self._print_download_summary(report.success_count, report.failed_ids, len(character_ids), report)
 
-        return success_count, failed_ids
+        return report.success_count, report.failed_ids
 
     def batch_download_weapons(self, weapon_ids: List[str] = None) -> Tuple[int, List[str]]:
         """批量下载音擎数据"""
@@ -235,71 +294,75 @@ class DataDownloader:
 
         print(f"📥 开始批量下载 {len(weapon_ids)} 个音擎数据...")
 
-        success_count = 0
-        failed_ids = []
-
-        for index, _id in enumerate(weapon_ids, 1):
-            print(f"🔍 正在下载 ({index}/{len(weapon_ids)}): {_id}")
-
-            success = self.download_weapon_data(_id)
-
-            if success:
-                success_count += 1
-            else:
-                failed_ids.append(_id)
-
-            time.sleep(self.api_config["request_delay"])
+        report = self._run_batch(weapon_ids, self.download_weapon_data)
 
-        self._save_failed_downloads(failed_ids)
-        self._print_download_summary(success_count, failed_ids, len(weapon_ids))
+        self._save_failed_downloads("weapon", self._collect_failures("weapon", report.failed_ids))
+        self._print_download_summary(report.success_count, report.failed_ids, len(weapon_ids), report)
 
-        return success_count, failed_ids
+        return report.success_count, report.failed_ids
 
     def retry_failed_downloads(self, max_retries: int = 3) -> Tuple[int, List[str]]:
-        """重试失败的下载"""
-        failed_ids = self._load_failed_downloads()
+        """重试失败的下载（角色和音擎）
 
-        if not failed_ids:
+        每轮通过并发引擎重新下载，单个实体内部仍按退避策略重试；
+        仍然失败的记录累加尝试次数后写回失败列表。
+        """
+        records = self._load_failed_downloads()
+
+        if not records:
             print("✅ 没有需要重试的下载")
             return 0, []
 
-        print(f"🔄 开始重试 {len(failed_ids)} 个失败的下载...")
+        print(f"🔄 开始重试 {len(records)} 个失败的下载...")
+
+        download_funcs = {
+            "character": self.download_character_data,
+            "weapon": self.download_weapon_data
+        }
+        pending = [record for record in records if record.kind in download_funcs]
+        skipped = [record for record in records if record.kind not in download_funcs]
+        total = len(pending)
 
         for retry_count in range(1, max_retries + 1):
-            print(f"\n🔄 重试第 {retry_count} 次...")
+            if not pending:
+                break
 
-            still_failed = []
+            print(f"\n🔄 重试第 {retry_count} 次...")
+            still_failed: List[FailureRecord] = []
 
-            for char_id in failed_ids:
-                print(f"   🔄 重试: {char_id}")
-                success = self.download_character_data(char_id)
+            for kind, download_func in download_funcs.items():
+                kind_records = {record.item_id: record for record in pending if record.kind == kind}
+                if not kind_records:
+                    continue
 
-                if not success:
-                    still_failed.append(char_id)
+                report = self._run_batch(list(kind_records), download_func)
+                for record in self._collect_failures(kind, report.failed_ids):
+                    record.attempts += kind_records[record.item_id].attempts
+                    still_failed.append(record)
 
-                time.sleep(self.api_config["request_delay"])
+            pending = still_failed
 
-            failed_ids = still_failed
+        if not pending:
+            print("✅ 所有重试都成功了!")
 
-            if not failed_ids:
-                print("✅ 所有重试都成功了!")
-                break
+        remaining = pending + skipped
+        for kind in download_funcs:
+            self._save_failed_downloads(kind, [record for record in remaining if record.kind == kind])
 
-        self._save_failed_downloads(failed_ids)
-        success_count = len(failed_ids) - len(still_failed)
+        success_count = total - len(pending)
+        still_failed_ids = [record.item_id for record in pending]
 
-        print(f"📊 重试完成: 成功 {success_count} 个, 仍然失败 {len(still_failed)} 个")
-        return success_count, still_failed
+        print(f"📊 重试完成: 成功 {success_count} 个, 仍然失败 {len(pending)} 个")
+        return success_count, still_failed_ids
 
     def test_connection(self) -> bool:
         """测试API连接"""
         print("🔗 测试API连接...")
 
-        test_url = self._build_url("character_list")
-
         try:
-            response = self._session.get(test_url, timeout=10)
-            if response.status_code == 200:
+            # 条件请求：列表未变化时只传输响应头
+            response = self._conditional_get("character_list")
+            if response.status_code in (200, 304):
                 print("✅ API连接正常")
                 return True
             else:
@@ -309,6 +372,148 @@ class DataDownloader:
             print(f"❌ API连接失败: {e}")
             return False
 
+    def _build_session(self) -> requests.Session:
+        """创建带连接池的共享会话，连接池大小与并发数一致"""
+        session = requests.Session()
+        pool_size = self.api_config["max_workers"]
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _run_batch(self, item_ids: List[str], download_func) -> DownloadReport:
+        """使用并发引擎执行批量下载"""
+        engine = ConcurrentDownloadEngine(
+            max_workers=self.api_config["max_workers"],
+            requests_per_second=self.api_config["requests_per_second"]
+        )
+        total = len(item_ids)
+
+        def on_done(item_id: str, success: bool, completed: int):
+            mark = "✅" if success else "❌"
+            print(f"🔍 已完成 ({completed}/{total}): {item_id} {mark}")
+
+        try:
+            return engine.run(item_ids, download_func, on_done)
+        finally:
+            self.manifest.save()
+
+    def _endpoint_path(self, endpoint_key: str, **kwargs) -> str:
+        """获取端点路径（作为下载清单的键）"""
+        endpoint = self.api_config["endpoints"][endpoint_key]
+        return endpoint.format(**kwargs) if kwargs else endpoint
+
+    def _item_key(self, kind: str, item_id: Optional[str] = None) -> str:
+        """实体在下载清单中的键"""
+        if kind == "equipment":
+            return self._endpoint_path("equipment_data")
+        return self._endpoint_path(f"{kind}_data", **{f"{kind}_id": item_id})
+
+    def _conditional_get(self, endpoint_key: str, local_file: Optional[Path] = None, stream: bool = False,
+                         **kwargs) -> requests.Response:
+        """发送条件请求，附带清单中记录的 ETag / Last-Modified
+
+        指定 local_file 时，本地文件缺失则发送普通请求，避免收到304却没有可用的本地数据。
+        stream=True 时不读取响应体，只需要状态码和响应头的调用方读完后关闭响应即可。
+        """
+        url = self._build_url(endpoint_key, **kwargs)
+        headers = {}
+        if local_file is None or local_file.exists():
+            headers = self.manifest.conditional_headers(self._endpoint_path(endpoint_key, **kwargs))
+        response = self._session.get(url, headers=headers, timeout=self.api_config["timeout"], stream=stream)
+        # 服务端确认本地副本仍然有效（304）即为一次清单缓存命中
+        metrics_registry.record_cache("download_manifest", response.status_code == 304)
+        return response
+
+    def _record_response(self, endpoint_key: str, response: requests.Response, **kwargs):
+        """记录列表类端点的缓存校验头"""
+        self.manifest.record(self._endpoint_path(endpoint_key, **kwargs), response.headers, response.content)
+        self.manifest.save()
+
+    def _fetch_item(self, item: PipelineItem) -> requests.Response:
+        """流水线的获取阶段：对单个实体发送条件请求"""
+        endpoint_key = f"{item.kind}_data"
+        id_key = f"{item.kind}_id"
+        return self._conditional_get(endpoint_key, local_file=item.file_path, **{id_key: item.item_id})
+
+    def _run_item_pipeline(self, item: PipelineItem) -> bool:
+        """执行单个实体的下载流水线
+
+        可重试的失败（连接错误、超时、限流、5xx）按指数退避重试，优先遵循 Retry-After；
+        同一端点连续失败过多时熔断，后续请求直接记为失败，不再占用超时时间。
+        """
+        endpoint = f"{item.kind}_data"
+        record = FailureRecord(kind=item.kind, item_id=item.item_id)
+
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            if not self.circuit_breaker.allow(endpoint):
+                record.error = "端点已熔断"
+                break
+
+            record.attempts = attempt
+            retry_after = None
+            try:
+                # 每次尝试使用新的数据项，避免上次失败留下的中间状态
+                result = self.pipelines[item.kind].run(dataclasses.replace(item))
+            except PipelineError as e:
+                record.status, record.error = e.status, str(e)
+                retry_after = parse_retry_after(e.retry_after)
+            except requests.RequestException as e:
+                record.status, record.error = None, str(e)
+            except Exception as e:
+                # 解析或写入错误，重试无意义；不能说明端点状态，只结束可能进行中的试探
+                record.status, record.error = None, str(e)
+                self.circuit_breaker.release(endpoint)
+                break
+            else:
+                self.circuit_breaker.record_success(endpoint)
+                self._clear_failure(item.kind, item.item_id)
+                if result.not_modified:
+                    print(f"   ✅ 未变化: {item.item_id}")
+                else:
+                    print(f"   ✅ 下载成功: {result.data.get('Name', item.item_id)}")
+                return True
+
+            if not self.retry_policy.is_retryable(record.status):
+                # 端点给出了明确应答（如 404），端点本身是正常的
+                self.circuit_breaker.record_success(endpoint)
+                break
+
+            self.circuit_breaker.record_failure(endpoint)
+            if attempt < self.retry_policy.max_attempts:
+                delay = self.retry_policy.compute_delay(attempt, retry_after)
+                print(f"   ⚠️ {item.item_id} 第 {attempt} 次失败 ({record.error})，{delay:.1f}s 后重试")
+                time.sleep(delay)
+
+        print(f"   ❌ 下载失败: {item.item_id} ({record.error})")
+        with self._failures_lock:
+            self._failures[(item.kind, item.item_id)] = record
+        return False
+
+    def _clear_failure(self, kind: str, item_id: str):
+        with self._failures_lock:
+            self._failures.pop((kind, item_id), None)
+
+    def _collect_failures(self, kind: str, failed_ids: List[str]) -> List[FailureRecord]:
+        """取出本批次失败ID对应的失败记录"""
+        with self._failures_lock:
+            return [self._failures.pop((kind, item_id), None) or FailureRecord(kind=kind, item_id=item_id)
+                    for item_id in failed_ids]
+
+    def _load_cached_list(self, ids_file: Path, mapping_file: Path) -> Optional[Dict[str, Any]]:
+        """列表未变化时，从本地ID列表和名称映射还原列表数据"""
+        ids = self.load_json_list(ids_file)
+        if not ids:
+            return None
+
+        try:
+            with open(mapping_file, "r", encoding="utf-8") as f:
+                mapping = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            mapping = {}
+
+        return {item_id: {"CHS": mapping.get(item_id)} for item_id in ids}
+
     def _build_url(self, endpoint_key: str, **kwargs) -> str:
         """构建完整的URL"""
         endpoint = self.api_config["endpoints"][endpoint_key]
@@ -338,12 +543,6 @@ class DataDownloader:
 
         print(f"💾 角色映射已保存: {len(id_name_mapping)} 个角色")
 
-    def _save_character_file(self, character_id: str, data: Dict[str, Any]):
-        """保存角色数据文件"""
-        file_path = self.file_config.get_character_file_path(character_id)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
     def _save_weapon_mapping(self, data: Dict[str, Any]):
         """保存音擎ID-名称映射"""
         id_name_mapping = {}
@@ -366,12 +565,6 @@ class DataDownloader:
 
         print(f"💾 音擎映射已保存: {len(id_name_mapping)} 个音擎")
 
-    def _save_weapon_file(self, character_id: str, data: Dict[str, Any]):
-        """保存音擎数据文件"""
-        file_path = self.file_config.get_weapon_file_path(character_id)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
     def _load_character_ids(self) -> List[str]:
         """加载角色ID列表"""
         try:
@@ -396,23 +589,25 @@ class DataDownloader:
             print(f"❌ 加载音擎ID失败: {e}")
             return []
 
-    def _save_failed_downloads(self, failed_ids: List[str]):
-        """保存失败下载列表"""
+    def _save_failed_downloads(self, kind: str, records: List[FailureRecord]):
+        """保存某类实体的失败记录（保留其他类型的记录）"""
+        others = [record for record in self._load_failed_downloads() if record.kind != kind]
         with open(self.file_config.failed_downloads_file, "w", encoding="utf-8") as f:
-            json.dump(failed_ids, f, ensure_ascii=False, indent=2)
+            json.dump([record.to_dict() for record in others + records], f, ensure_ascii=False, indent=2)
 
-    def _load_failed_downloads(self) -> List[str]:
-        """加载失败下载列表"""
+    def _load_failed_downloads(self) -> List[FailureRecord]:
+        """加载失败下载记录"""
         try:
             with open(self.file_config.failed_downloads_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                return [FailureRecord.from_dict(entry) for entry in json.load(f)]
         except FileNotFoundError:
             return []
         except Exception as e:
             print(f"❌ 加载失败下载列表失败: {e}")
             return []
 
-    def _print_download_summary(self, success_count: int, failed_ids: List[str], total_count: int):
+    def _print_download_summary(self, success_count: int, failed_ids: List[str], total_count: int,
+                                report: Optional[DownloadReport] = None):
         """打印下载总结"""
         print("\n" + "=" * 60)
         print("📊 下载完成!")
@@ -423,8 +618,11 @@ class DataDownloader:
             success_rate = success_count / total_count * 100
             print(f"📈 成功率: {success_rate:.1f}%")
 
+        if report is not None:
+            print(f"⏱️ 耗时: {report.elapsed:.2f}s, 速率: {report.requests_per_second:.1f} 请求/秒")
+
         if failed_ids:
-            print(f"\n失败的角色ID:")
+            print(f"\n失败的ID:")
             for failed_id in failed_ids:
                 print(f"  - {failed_id}")
 
@@ -491,50 +689,11 @@ class DownloadService:
 
 
     def check_data_completeness(self) -> Dict[str, Any]:
-        """检查数据完整性"""
+        """检查数据完整性（对照ID列表，每个数据目录只扫描一次）"""
         try:
-            character_ids = self.downloader._load_character_ids()
-            equipment_ids = self._load_equipment_ids()
-
-            character_stats = {
-                "total": len(character_ids) if character_ids else 0,
-                "existing": 0,
-                "missing": []
-            }
-
-            equipment_stats = {
-                "total": len(equipment_ids) if equipment_ids else 0,
-                "existing": 0,
-                "missing": []
-            }
-
-            # 检查角色数据完整性
-            if character_ids:
-                for char_id in character_ids:
-                    if self.downloader.file_config.character_file_exists(char_id):
-                        character_stats["existing"] += 1
-                    else:
-                        character_stats["missing"].append(char_id)
-
-            # 检查装备数据完整性
-            if equipment_ids:
-                equipment_stats["existing"] = 1 if self.downloader.file_config.equipment_mapping_file.exists() else 0
-
-            character_completion = character_stats["existing"] / character_stats["total"] * 100 if character_stats["total"] > 0 else 0
-            equipment_completion = equipment_stats["existing"] / equipment_stats["total"] * 100 if equipment_stats["total"] > 0 else 0
-            overall_completion = (character_completion + equipment_completion) / 2 if character_stats["total"] > 0 and equipment_stats["total"] > 0 else 0
-
-            return {
-                "status": "complete" if overall_completion == 100 else "incomplete",
-                "overall_completion_rate": overall_completion,
-                "characters": character_stats,
-                "equipment": equipment_stats,
-                "character_completion_rate": character_completion,
-                "equipment_completion_rate": equipment_completion
-            }
-
+            return scan_data_completeness(self.downloader.file_config)
         except Exception as e:
-            return {"status": "error", "error": str(e), "overall_completion_rate": 0}
+            return {"status": "error", "error": str(e), "completion_rate": 0, "overall_completion_rate": 0}
 
     def _load_equipment_ids(self) -> List[str]:
         """加载装备ID列表"""
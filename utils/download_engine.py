@@ -0,0 +1,132 @@
+# src/utils/download_engine.py
+"""并发下载引擎 - 令牌桶限速 + 有界并发"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+
+class TokenBucket:
+    """令牌桶限速器（线程安全）"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate 必须为正数: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """阻塞直到获得指定数量的令牌"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait_time = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+
+
+@dataclass
+class DownloadReport:
+    """批量下载结果"""
+    total: int = 0
+    success_ids: List[str] = field(default_factory=list)
+    failed_ids: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def success_count(self) -> int:
+        return len(self.success_ids)
+
+    @property
+    def requests_per_second(self) -> float:
+        """实际达到的请求速率"""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ConcurrentDownloadEngine:
+    """并发下载引擎
+
+    使用线程池执行下载任务，令牌桶控制请求速率，
+    同时在途的任务数不超过 max_in_flight（小于 max_workers 时线程数随之减少）。
+    """
+
+    def __init__(self, max_workers: int = 8, requests_per_second: float = 10.0,
+                 burst: Optional[int] = None, max_in_flight: Optional[int] = None):
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f"max_in_flight 必须为正整数: {max_in_flight}")
+        self.max_workers = max(1, max_workers)
+        self.max_in_flight = max_in_flight or self.max_workers
+        self.max_workers = min(self.max_workers, self.max_in_flight)
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+
+    def run(self, item_ids: Iterable[str], download_func: Callable[[str], bool],
+            on_done: Callable[[str, bool, int], None] = None) -> DownloadReport:
+        """并发执行下载任务
+
+        :param item_ids: 待下载的ID
+        :param download_func: 单个下载函数，返回是否成功
+        :param on_done: 每个任务完成后的回调 (item_id, success, completed_count)
+        """
+        item_ids = list(item_ids)
+        report = DownloadReport(total=len(item_ids))
+        results = {}
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            id_iter = iter(item_ids)
+            completed = 0
+
+            def submit_next() -> bool:
+                item_id = next(id_iter, None)
+                if item_id is None:
+                    return False
+                pending[executor.submit(self._rate_limited, download_func, item_id)] = item_id
+                return True
+
+            while len(pending) < self.max_in_flight and submit_next():
+                pass
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item_id = pending.pop(future)
+                    try:
+                        success = bool(future.result())
+                    except Exception as e:
+                        print(f"   ❌ 下载异常 {item_id}: {e}")
+                        success = False
+
+                    results[item_id] = success
+                    completed += 1
+                    if on_done:
+                        on_done(item_id, success, completed)
+
+                    submit_next()
+
+        report.elapsed = time.perf_counter() - start_time
+
+        # 保持输入顺序，便于与串行版本的结果比对
+        for item_id in item_ids:
+            if results.get(item_id):
+                report.success_ids.append(item_id)
+            else:
+                report.failed_ids.append(item_id)
+
+        return report
+
+    def _rate_limited(self, download_func: Callable[[str], bool], item_id: str) -> bool:
+        """获取令牌后执行下载"""
+        self.rate_limiter.acquire()
+        return download_func(item_id)
@@ -0,0 +1,117 @@
+# src/utils/download_manifest.py
+"""下载清单 - 记录每个端点的 ETag / Last-Modified / 内容哈希，用于条件请求"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+def content_hash(content: bytes) -> str:
+    """计算内容哈希"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class DownloadManifest:
+    """本地下载清单（线程安全）
+
+    endpoints 以端点路径为键，记录：
+    - etag / last_modified: 服务器返回的缓存校验头，用于下次发送条件请求
+    - sha256 / size: 最终写入磁盘的内容哈希和大小，用于判断内容是否真正变化
+
+    list_fingerprints 按实体类型记录上次同步时远程列表中每个条目的指纹，
+    供同步计划判断条目是否变化。
+    """
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """从磁盘加载清单"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("endpoints", {})
+            self._fingerprints = data.get("list_fingerprints", {})
+        except FileNotFoundError:
+            self._entries, self._fingerprints = {}, {}
+        except Exception as e:
+            print(f"⚠️ 下载清单损坏，将重新建立: {e}")
+            self._entries, self._fingerprints = {}, {}
+
+    def save(self):
+        """保存清单（仅在有变化时写入，原子替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps({"endpoints": self._entries, "list_fingerprints": self._fingerprints},
+                                  ensure_ascii=False, indent=2, sort_keys=True)
+            self._dirty = False
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(temp_path, self.manifest_path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """获取端点记录"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry else None
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """生成条件请求头"""
+        entry = self.get(key)
+        headers = {}
+        if not entry:
+            return headers
+
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_changed(self, key: str, content: bytes) -> bool:
+        """判断内容相对清单记录是否发生变化"""
+        entry = self.get(key)
+        if not entry:
+            return True
+        return entry.get("size") != len(content) or entry.get("sha256") != content_hash(content)
+
+    def record(self, key: str, headers: Mapping[str, str], content: bytes):
+        """记录一次成功下载"""
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": content_hash(content),
+            "size": len(content)
+        }
+        with self._lock:
+            if self._entries.get(key) != entry:
+                self._entries[key] = entry
+                self._dirty = True
+
+    def has(self, key: str) -> bool:
+        """端点是否有下载记录"""
+        with self._lock:
+            return key in self._entries
+
+    def get_fingerprints(self, kind: str) -> Dict[str, str]:
+        """获取某类实体上次同步时的列表指纹"""
+        with self._lock:
+            return dict(self._fingerprints.get(kind, {}))
+
+    def set_fingerprints(self, kind: str, fingerprints: Dict[str, str]):
+        """更新某类实体的列表指纹"""
+        with self._lock:
+            if self._fingerprints.get(kind) != fingerprints:
+                self._fingerprints[kind] = dict(fingerprints)
+                self._dirty = True
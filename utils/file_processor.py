@@ -1,13 +1,20 @@
 # src/utils/file_processor.py
 """重构后的文件处理器"""
-import json
-import shutil
-from typing import Dict, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from src.config.api import API_BASE_URL, API_ENDPOINTS
 from src.config.manager import config_manager
-from utils.data_downloader import DownloadService
+from utils.backup_store import BackupStore
+from utils.data_archive import COMPRESSION_SUFFIXES, ArchiveError, export_archive, import_archive
+from utils.maintenance_engine import MaintenanceEngine, MaintenanceReport, process_file
+from utils.pipeline import clean_character_fields
+from utils.status_report import NetworkProbe, collect_system_status
+from utils.sync_planner import SyncPlanner
+
+if TYPE_CHECKING:
+    from utils.data_downloader import DownloadService
 
 
 class FileProcessor:
@@ -15,6 +22,9 @@ class FileProcessor:
 
     def __init__(self):
         self.file_config = config_manager.file
+        self.maintenance_engine = MaintenanceEngine()
+        self.backup_store = BackupStore(self.file_config.backup_objects_dir,
+                                        self.file_config.backup_manifests_dir)
 
     def clean_character_files(self) -> Dict[str, Any]:
         """清理角色文件中的冗余字段"""
@@ -28,31 +38,23 @@ class FileProcessor:
         # 创建备份
         backup_path = self._create_backup(character_files)
 
-        processed_count = 0
-        error_files = []
-
-        for file_path in character_files:
-            try:
-                success = self._clean_single_file(file_path)
-                if success:
-                    processed_count += 1
-                else:
-                    error_files.append(str(file_path))
-            except Exception as e:
-                print(f"❌ 清理失败 {file_path}: {e}")
-                error_files.append(str(file_path))
+        report = self.maintenance_engine.run({"character": character_files})
+        error_files = [result.path for result in report.invalid]
+        for result in report.invalid:
+            print(f"❌ 清理失败 {result.path}: {'; '.join(result.errors)}")
 
-        self._print_processing_summary(processed_count, error_files, backup_path)
+        self._print_processing_summary(len(report.valid), error_files, backup_path)
 
         return {
-            "processed": processed_count,
+            "processed": len(report.valid),
+            "rewritten": len(report.written),
             "errors": error_files,
             "backup_created": backup_path is not None,
             "backup_path": str(backup_path) if backup_path else None
         }
 
     def validate_character_files(self) -> Dict[str, Any]:
-        """验证角色文件有效性"""
+        """验证角色文件有效性（只读）"""
         character_files = self.file_config.list_character_files()
 
         if not character_files:
@@ -60,77 +62,97 @@ class FileProcessor:
 
         print(f"🔍 验证 {len(character_files)} 个角色文件...")
 
-        valid_files = []
-        invalid_files = []
-        error_details = []
+        report = self.maintenance_engine.run({"character": character_files}, write=False)
+        result = self._validation_summary(report)
 
-        for file_path in character_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        print(f"📊 验证完成: 有效 {result['valid']} 个, 无效 {result['invalid']} 个")
+        return result
 
-                # 检查必需字段
-                required_fields = ["Id", "Name", "Stats"]
-                if all(field in data for field in required_fields):
-                    valid_files.append(str(file_path))
-                else:
-                    invalid_files.append(str(file_path))
-                    missing = [field for field in required_fields if field not in data]
-                    error_details.append(f"{file_path.name}: 缺少字段 {missing}")
+    def run_maintenance(self, kinds: List[str] = None, clean: bool = True) -> Dict[str, Any]:
+        """单次遍历完成角色、音擎、驱动盘文件的验证和清理
 
-            except Exception as e:
-                invalid_files.append(str(file_path))
-                error_details.append(f"{file_path.name}: 解析错误 {e}")
+        每个文件只读取一次；清理后内容有变化才写回。
+        """
+        files = self.list_data_files(kinds)
+        total = sum(len(paths) for paths in files.values())
+        if total == 0:
+            return {"total": 0}
 
-        print(f"📊 验证完成: 有效 {len(valid_files)} 个, 无效 {len(invalid_files)} 个")
+        print(f"🔧 维护 {total} 个数据文件...")
 
-        return {
-            "valid": len(valid_files),
-            "invalid": len(invalid_files),
-            "valid_files": valid_files,
-            "invalid_files": invalid_files,
-            "error_details": error_details
+        backup_path = None
+        if clean and files.get("character"):
+            backup_path = self._create_backup(files["character"])
+
+        report = self.maintenance_engine.run(files, write=clean)
+
+        result = {
+            "total": report.total,
+            "validation": self._validation_summary(report),
+            "rewritten": [result.path for result in report.written],
+            "backup_path": str(backup_path) if backup_path else None,
+            "per_kind": {
+                kind: {
+                    "files": len(report.by_kind(kind)),
+                    "invalid": sum(1 for r in report.by_kind(kind) if not r.valid),
+                    "rewritten": sum(1 for r in report.by_kind(kind) if r.written)
+                }
+                for kind in files
+            },
+            "throughput": {
+                "elapsed": report.elapsed,
+                "workers": report.workers,
+                "files_per_second": report.files_per_second,
+                "mb_per_second": report.megabytes_per_second,
+                "slowest_files": [
+                    {"path": r.path, "ms": r.elapsed * 1000}
+                    for r in sorted(report.results, key=lambda r: r.elapsed, reverse=True)[:5]
+                ]
+            }
         }
 
+        self._print_maintenance_summary(result)
+        return result
+
+    def list_data_files(self, kinds: List[str] = None) -> Dict[str, List[Path]]:
+        """按实体类型列出需要维护的数据文件"""
+        kinds = kinds or ["character", "weapon", "equipment"]
+        files: Dict[str, List[Path]] = {}
+
+        if "character" in kinds:
+            files["character"] = self.file_config.list_character_files()
+        if "weapon" in kinds:
+            files["weapon"] = self.file_config.list_weapon_files()
+        if "equipment" in kinds:
+            files["equipment"] = [self.file_config.equipment_file] if self.file_config.equipment_file.exists() else []
+
+        return files
+
     def create_backup(self, backup_name: str = None) -> str:
-        """创建备份"""
+        """创建备份（内容未变化的文件只引用已有内容块，不复制）"""
         if backup_name is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"characters_backup_{timestamp}"
 
-        backup_path = self.file_config.get_backup_path(backup_name)
         character_files = self.file_config.list_character_files()
+        result = self.backup_store.create(backup_name, character_files, source="characters")
 
-        backup_path.mkdir(parents=True, exist_ok=True)
-
-        for file_path in character_files:
-            backup_file = backup_path / file_path.name
-            shutil.copy2(file_path, backup_file)
-
-        print(f"💾 备份创建成功: {backup_path}")
-        return str(backup_path)
+        print(f"💾 备份创建成功: {result.manifest_path} "
+              f"({result.file_count} 个文件, 新增内容 {result.new_objects} 个, 复用 {result.reused_objects} 个)")
+        return str(result.manifest_path)
 
     def restore_backup(self, backup_name: str) -> bool:
         """从备份恢复"""
-        backup_path = self.file_config.get_backup_path(backup_name)
-
-        if not backup_path.exists():
-            print(f"❌ 备份不存在: {backup_path}")
+        if self.backup_store.load_manifest(backup_name) is None:
+            print(f"❌ 备份不存在: {self.file_config.get_backup_path(backup_name)}")
             return False
 
-        print(f"🔄 从备份恢复: {backup_path}")
+        print(f"🔄 从备份恢复: {backup_name}")
 
         try:
-            # 清空当前角色目录
-            for file_path in self.file_config.list_character_files():
-                file_path.unlink()
-
-            # 从备份复制文件
-            for backup_file in backup_path.glob("*.json"):
-                target_path = self.file_config.characters_dir / backup_file.name
-                shutil.copy2(backup_file, target_path)
-
-            print(f"✅ 恢复完成: 从 {backup_path} 恢复了所有文件")
+            result = self.backup_store.restore(backup_name, self.file_config.characters_dir)
+            print(f"✅ 恢复完成: 恢复 {len(result.restored)} 个, 未变化 {len(result.unchanged)} 个, "
+                  f"删除 {len(result.removed)} 个")
             return True
 
         except Exception as e:
@@ -139,27 +161,7 @@ class FileProcessor:
 
     def list_backups(self) -> List[Dict[str, Any]]:
         """列出所有备份"""
-        backups = []
-
-        if not self.file_config.backup_dir.exists():
-            return backups
-
-        for backup_path in self.file_config.backup_dir.iterdir():
-            if backup_path.is_dir():
-                backup_files = list(backup_path.glob("*.json"))
-                created_time = datetime.fromtimestamp(backup_path.stat().st_ctime)
-
-                backups.append({
-                    "name": backup_path.name,
-                    "path": str(backup_path),
-                    "file_count": len(backup_files),
-                    "created_time": created_time,
-                    "size_mb": sum(f.stat().st_size for f in backup_files) / 1024 / 1024
-                })
-
-        # 按创建时间排序
-        backups.sort(key=lambda x: x["created_time"], reverse=True)
-        return backups
+        return self.backup_store.list_backups()
 
     def get_file_statistics(self) -> Dict[str, Any]:
         """获取文件统计信息"""
@@ -178,82 +180,49 @@ class FileProcessor:
 
     def clean_icon_fields(self, file_path: Path) -> bool:
         """清理单个文件的Icon字段"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # 清理Icon字段
-            cleaned_data = self._remove_redundant_fields(data)
+        result = process_file(("character", str(file_path), True))
 
-            # 写回文件
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
-
-            print(f"✅ 清理成功: {file_path}")
-            return True
-
-        except Exception as e:
-            print(f"❌ 清理失败 {file_path}: {e}")
+        if not result.valid:
+            print(f"❌ 清理失败 {file_path}: {'; '.join(result.errors)}")
             return False
 
+        print(f"✅ 清理成功: {file_path}")
+        return True
+
     def _clean_single_file(self, file_path: Path) -> bool:
         """清理单个文件"""
         return self.clean_icon_fields(file_path)
 
     def _remove_redundant_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """移除冗余字段 - 使用ss.py的有效逻辑"""
-
-        # 使用ss.py的排除字段列表
-        exclude_fields = {"Icon", "PartnerInfo", "Skin", "LevelEXP", "Skill",
-                          "SkillList", "Talent", "Potential", "PotentialDetail",
-                          "Image", "Thumbnail"}
-        exclude_parts = {"Part4", "Part5", "Part6", "PartSub"}
-
-        def clean_recursive(obj):
-            if isinstance(obj, dict):
-                cleaned = {}
-                for key, value in obj.items():
-                    # 排除指定字段
-                    if key in exclude_fields:
-                        continue
-
-                    # 特殊处理SpecialElementType
-                    elif key == "SpecialElementType":
-                        if isinstance(value, dict):
-                            cleaned[key] = {}
-                            for sub_key, sub_value in value.items():
-                                if sub_key != "Icon":
-                                    cleaned[key][sub_key] = sub_value
-                        else:
-                            cleaned[key] = value
-
-                    # 特殊处理FairyRecommend
-                    elif key == "FairyRecommend":
-                        if isinstance(value, dict):
-                            cleaned[key] = {}
-                            for part_key, part_value in value.items():
-                                if part_key not in exclude_parts:
-                                    cleaned[key][part_key] = clean_recursive(part_value)
-                                else:
-                                    if isinstance(part_value, dict):
-                                        cleaned[key][part_key] = {}
-                                        for attr_key, attr_value in part_value.items():
-                                            if attr_key != "Icon":
-                                                cleaned[key][part_key][attr_key] = attr_value
-                                    else:
-                                        cleaned[key][part_key] = part_value
-                        else:
-                            cleaned[key] = value
-
-                    else:
-                        cleaned[key] = clean_recursive(value)
-                return cleaned
-            elif isinstance(obj, list):
-                return [clean_recursive(item) for item in obj]
-            else:
-                return obj
-
-        return clean_recursive(data)
+        """移除冗余字段 - 与下载流水线共用同一套规则"""
+        return clean_character_fields(data)
+
+    @staticmethod
+    def _validation_summary(report: MaintenanceReport) -> Dict[str, Any]:
+        """把维护报告转换为验证结果"""
+        return {
+            "valid": len(report.valid),
+            "invalid": len(report.invalid),
+            "valid_files": [result.path for result in report.valid],
+            "invalid_files": [result.path for result in report.invalid],
+            "error_details": [f"{Path(result.path).name}: {'; '.join(result.errors)}" for result in report.invalid]
+        }
+
+    def _print_maintenance_summary(self, result: Dict[str, Any]):
+        """打印维护总结"""
+        throughput = result["throughput"]
+        print("\n" + "=" * 60)
+        print("📊 维护完成!")
+        for kind, counts in result["per_kind"].items():
+            print(f"  {kind}: {counts['files']} 个文件, 无效 {counts['invalid']} 个, 重写 {counts['rewritten']} 个")
+        print(f"⏱️ 耗时: {throughput['elapsed']:.2f}s ({throughput['workers']} 个进程), "
+              f"{throughput['files_per_second']:.1f} 文件/秒, {throughput['mb_per_second']:.2f} MB/秒")
+
+        for slow in throughput["slowest_files"][:3]:
+            print(f"  🐢 {Path(slow['path']).name}: {slow['ms']:.1f}ms")
+
+        for detail in result["validation"]["error_details"]:
+            print(f"  ❌ {detail}")
 
     def _create_backup(self, files: List[Path]) -> Path:
         """创建备份"""
@@ -282,7 +251,16 @@ class FileManagementService:
 
     def __init__(self):
         self.processor = FileProcessor()
-        self.download_service = DownloadService()
+        self._download_service: Optional['DownloadService'] = None
+        self.network_probe = NetworkProbe(self.processor.file_config.status_cache_file)
+
+    @property
+    def download_service(self) -> 'DownloadService':
+        """下载服务（首次使用时创建，只读命令不导入网络库）"""
+        if self._download_service is None:
+            from utils.data_downloader import DownloadService
+            self._download_service = DownloadService()
+        return self._download_service
 
     def initialize_data_directory(self) -> Dict[str, Any]:
         """初始化数据目录 - 返回更详细的结果"""
@@ -362,22 +340,44 @@ class FileManagementService:
         """下载缺失的角色数据"""
         print("🔍 检查缺失的角色数据...")
 
-        completeness = self.download_service.check_data_completeness()
+        planner = SyncPlanner(self.download_service.downloader)
+        # 只关心缺失的角色，不需要逐项校验已有文件
+        plan = planner.build_plan(["character"], verify=False)
+        character_plan = plan.entities.get("character")
+
+        if character_plan is None:
+            print("❌ 无法获取角色列表")
+            return 0, []
 
-        if completeness["completion_rate"] == 100:
+        if not character_plan.new:
             print("✅ 没有缺失的角色数据")
             return 0, []
 
-        print(f"📥 开始下载 {len(completeness['missing_files'])} 个缺失的角色...")
+        print(f"📥 开始下载 {len(character_plan.new)} 个缺失的角色...")
 
         success_count, failed_ids = self.download_service.downloader.batch_download_characters(
-            completeness["missing_files"]
+            character_plan.new
         )
 
         print(f"📊 下载完成: 成功 {success_count} 个, 失败 {len(failed_ids)} 个")
 
         return success_count, failed_ids
 
+    def sync_data(self, dry_run: bool = False, prune: bool = False) -> Dict[str, Any]:
+        """增量同步角色、音擎和驱动盘数据"""
+        print("🔍 对比远程列表与本地数据...")
+
+        planner = SyncPlanner(self.download_service.downloader)
+        plan = planner.build_plan()
+        planner.print_plan(plan)
+
+        if dry_run or not plan.has_work:
+            return {"plan": plan.to_dict(), "executed": False}
+
+        result = planner.execute(plan, prune=prune)
+        print("✅ 同步完成")
+        return {"plan": plan.to_dict(), "executed": True, "result": result}
+
     def retry_failed_downloads(self, max_retries: int = 3) -> Tuple[int, List[str]]:
         """重试失败的下载"""
         print("🔄 重试失败的下载...")
@@ -402,108 +402,58 @@ class FileManagementService:
         return success
 
     def perform_maintenance(self) -> Dict[str, Any]:
-        """执行维护任务"""
-        result = {}
-
+        """执行维护任务（验证和清理在同一次遍历中完成）"""
         print("🔧 执行系统维护...")
 
-        # 验证文件
-        validation_result = self.processor.validate_character_files()
-        result["validation"] = validation_result
-
-        print(f"📋 文件验证: {validation_result['valid']} 个有效, {validation_result['invalid']} 个无效")
-
-        # 清理文件
-        clean_result = self.processor.clean_character_files()
-        result["cleaning"] = clean_result
-
-        # 文件统计
-        stats = self.processor.get_file_statistics()
-        result["statistics"] = stats
+        maintenance = self.processor.run_maintenance()
+        result = {
+            "validation": maintenance.get("validation", {"valid": 0, "invalid": 0}),
+            "maintenance": maintenance,
+            "statistics": self.processor.get_file_statistics()
+        }
 
+        print(f"📋 文件验证: {result['validation']['valid']} 个有效, {result['validation']['invalid']} 个无效")
         print("✅ 系统维护完成")
 
         return result
 
-    def get_system_status(self) -> Dict[str, Any]:
-        """获取系统状态"""
-        status = {
-            "file_system": {},
-            "data_status": {},
-            "network_status": "unknown",
-            "recommendations": []
-        }
-
-        # 文件系统状态
-        structure = self.processor.file_config.validate_data_structure()
-        status["file_system"] = {
-            "valid": structure["valid"],
-            "details": structure["details"]
-        }
-
-        # 数据状态
-        completeness = self.download_service.check_data_completeness()
-        status["data_status"] = completeness
-
-        # 网络状态
-        try:
-            network_ok = self.test_network_connection()
-            status["network_status"] = "connected" if network_ok else "disconnected"
-        except:
-            status["network_status"] = "unknown"
-
-        # 生成建议
-        if not structure["valid"]:
-            status["recommendations"].append("修复数据目录结构")
-
-        if completeness["completion_rate"] < 100:
-            if status["network_status"] == "connected":
-                status["recommendations"].append("下载缺失的角色数据")
-            else:
-                status["recommendations"].append("检查网络连接后下载缺失数据")
-
-        if completeness["completion_rate"] == 0:
-            status["recommendations"].append("运行完整的数据下载流程")
-
-        # 检查是否有失败的下载需要重试
-        failed_downloads_file = self.processor.file_config.failed_downloads_file
-        if failed_downloads_file.exists():
-            try:
-                import json
-                with open(failed_downloads_file, 'r', encoding='utf-8') as f:
-                    failed_ids = json.load(f)
-                if failed_ids:
-                    status["recommendations"].append(f"重试 {len(failed_ids)} 个失败的下载")
-            except:
-                pass
-
-        return status
-
-    def export_data(self, export_path: str = None) -> str:
-        """导出数据"""
-        import shutil
-        from datetime import datetime
+    def get_system_status(self, probe_network: bool = False) -> Dict[str, Any]:
+        """获取系统状态
+
+        默认只读本地文件（单次目录扫描 + 缓存的网络探测结果），毫秒级返回；
+        probe_network 为真时在缓存过期后以短超时探测一次网络。
+        """
+        return collect_system_status(
+            self.processor.file_config,
+            self.network_probe,
+            API_BASE_URL + API_ENDPOINTS["character_list"],
+            probe_network=probe_network
+        )
 
+    def export_data(self, export_path: str = None, compression: str = "gz") -> str:
+        """把完整数据目录导出为一个压缩归档（附带文件清单）"""
+        suffix = COMPRESSION_SUFFIXES[compression]
         if export_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_path = f"zzz_calculator_export_{timestamp}"
+            export_path = f"zzz_calculator_export_{timestamp}{suffix}"
+        elif not export_path.endswith(suffix):
+            export_path += suffix
 
-        export_dir = Path(export_path)
-        export_dir.mkdir(parents=True, exist_ok=True)
+        result = export_archive(self.processor.file_config.base_dir, Path(export_path), compression)
 
-        # 复制角色数据
-        characters_dir = export_dir / "characters"
-        shutil.copytree(self.processor.file_config.characters_dir, characters_dir)
+        print(f"✅ 数据已导出到: {result.path}")
+        print(f"📦 {result.file_count} 个文件, {result.total_bytes / 1024 / 1024:.2f} MB, "
+              f"数据版本 {result.data_version}, 耗时 {result.elapsed:.2f}s")
+        return str(result.path)
 
-        # 复制配置文件
-        config_files = [
-            self.processor.file_config.character_ids_file,
-            self.processor.file_config.character_id_name_mapping_file
-        ]
-
-        for config_file in config_files:
-            if config_file.exists():
-                shutil.copy2(config_file, export_dir / config_file.name)
+    def import_data(self, archive_path: str, verify_only: bool = False) -> bool:
+        """校验并导入数据归档"""
+        try:
+            result = import_archive(Path(archive_path), self.processor.file_config.base_dir, verify_only)
+        except (ArchiveError, OSError) as e:
+            print(f"❌ 导入失败: {e}")
+            return False
 
-        print(f"✅ 数据已导出到: {export_path}")
-        return str(export_dir)
\ No newline at end of file
+        action = "校验通过" if verify_only else "导入完成"
+        print(f"✅ {action}: {result.file_count} 个文件, 数据版本 {result.data_version}, 耗时 {result.elapsed:.2f}s")
+        return True
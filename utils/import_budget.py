@@ -0,0 +1,153 @@
+# utils/import_budget.py
+"""导入耗时预算 - 用 python -X importtime 测量各子命令的模块导入开销
+
+每个子命令在独立的解释器中真实运行 cli.py（按 COMMAND_ARGS 选取不访问网络、工作量最小但会走到全部
+延迟导入的参数），累计耗时减去空解释器的启动导入，取多次测量的最小值与预算比较。
+命令在沙盒目录中运行：源码目录以符号链接接入，数据目录为空的临时目录，不会改动本地数据。
+"""
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 各子命令的测量参数，{sandbox} 替换为沙盒目录
+COMMAND_ARGS: Dict[str, List[str]] = {
+    "help": [],
+    "status": ["status", "--json"],
+    "init": ["init"],
+    "maintenance": ["maintenance"],
+    "export": ["export", "{sandbox}/export.tar.gz"],
+    "import": ["import", "{sandbox}/missing.tar.gz", "--verify-only"],
+    "download": ["download", "retry"],
+    "metrics": ["metrics", "--limit", "1"],
+    "profile": ["profile", "--help"],
+    "bench": ["bench", "--scale", "1", "--only", "-", "--repeat", "1"],
+    "inventory": ["inventory", "info", "--output", "{sandbox}/inventory.bin"],
+    "breakpoints": ["breakpoints", "1", "1", "crit_rate=0.7"],
+    "roster": ["roster", "{sandbox}/roster.json", "--inventory", "{sandbox}/inventory.bin"],
+    "search": ["search", "1", "1", "--inventory", "{sandbox}/inventory.bin", "--time", "0"],
+    "weapons": ["weapons", "1"],
+}
+
+# 导入耗时预算（毫秒）：约为实测最小值的两倍，留出机器负载波动的余量，
+# 同时足以发现轻量命令意外导入 numpy / requests 等重型依赖（各自约 150ms 以上）
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "help": 25,
+    "status": 200,
+    "init": 200,
+    "maintenance": 200,
+    "export": 200,
+    "import": 200,
+    "download": 500,
+    "metrics": 150,
+    "profile": 150,
+    "bench": 250,
+    "inventory": 450,
+    "breakpoints": 500,
+    "roster": 500,
+    "search": 500,
+    "weapons": 500,
+}
+
+
+@dataclass
+class ImportMeasurement:
+    """单个子命令的测量结果"""
+    command: str
+    import_ms: float
+    budget_ms: float
+    slowest: List[str]
+
+    @property
+    def passed(self) -> bool:
+        return self.import_ms <= self.budget_ms
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """解析 -X importtime 输出，返回顶层模块的累计耗时（微秒）"""
+    totals: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # 名称字段以一个空格开头，每嵌套一层多缩进两个空格
+        name = fields[2][1:]
+        if not name.startswith(" "):
+            totals[name.strip()] = totals.get(name.strip(), 0) + int(fields[1])
+    return totals
+
+
+@contextlib.contextmanager
+def command_sandbox() -> Iterator[Path]:
+    """创建沙盒目录：复制 cli.py，链接源码目录，准备空库存和角色配置"""
+    from src.inventory.store import DiscInventory
+
+    with tempfile.TemporaryDirectory(prefix="zzz_importtime_") as temp_dir:
+        sandbox = Path(temp_dir)
+        # cli.py 必须是真实文件：解释器会解析脚本路径的符号链接来确定 sys.path[0]
+        shutil.copy2(PROJECT_ROOT / "cli.py", sandbox / "cli.py")
+        for name in ("src", "utils", "test"):
+            try:
+                os.symlink(PROJECT_ROOT / name, sandbox / name, target_is_directory=True)
+            except OSError:
+                shutil.copytree(PROJECT_ROOT / name, sandbox / name,
+                                ignore=shutil.ignore_patterns("__pycache__"))
+        DiscInventory().save(sandbox / "inventory.bin")
+        with open(sandbox / "roster.json", "w", encoding="utf-8") as f:
+            json.dump([{"character_id": 1, "weapon_id": 1}], f)
+        yield sandbox
+
+
+def _run_importtime(sandbox: Path, args: Optional[List[str]]) -> Dict[str, int]:
+    """args 为 None 时测量空解释器的启动导入"""
+    if args is None:
+        command = [sys.executable, "-X", "importtime", "-c", "pass"]
+    else:
+        command = [sys.executable, "-X", "importtime", "cli.py"] + [arg.format(sandbox=sandbox) for arg in args]
+    completed = subprocess.run(command, cwd=str(sandbox), capture_output=True, text=True, encoding="utf-8",
+                               errors="replace", stdin=subprocess.DEVNULL)
+    # 测量参数可能让命令以“找不到角色”等提示退出，只有未捕获的异常才算失败
+    if "Traceback (most recent call last)" in completed.stderr:
+        raise RuntimeError(f"命令运行失败: {' '.join(command[3:])}\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def measure_command(command: str, sandbox: Path, repeats: int = 5,
+                    startup: Optional[Dict[str, int]] = None) -> ImportMeasurement:
+    """测量子命令实际运行时的导入耗时（扣除解释器启动导入，取多次最小值）"""
+    startup = _run_importtime(sandbox, None) if startup is None else startup
+    best_ms, best_totals = float("inf"), {}
+
+    for _ in range(max(1, repeats)):
+        totals = _run_importtime(sandbox, COMMAND_ARGS[command])
+        extra = {name: value for name, value in totals.items() if name not in startup}
+        elapsed_ms = sum(extra.values()) / 1000
+        if elapsed_ms < best_ms:
+            best_ms, best_totals = elapsed_ms, extra
+
+    slowest = [f"{name} {value / 1000:.1f}ms"
+               for name, value in sorted(best_totals.items(), key=lambda item: item[1], reverse=True)[:3]]
+    return ImportMeasurement(command, best_ms, IMPORT_BUDGETS_MS[command], slowest)
+
+
+def check_import_budgets(commands: Optional[List[str]] = None, repeats: int = 5,
+                         scale: float = 1.0) -> List[ImportMeasurement]:
+    """测量全部（或指定）子命令，scale 按比例放宽预算（用于较慢的机器）"""
+    measurements = []
+    with command_sandbox() as sandbox:
+        startup = min((_run_importtime(sandbox, None) for _ in range(3)), key=lambda totals: sum(totals.values()))
+        for command in commands or list(COMMAND_ARGS):
+            measurement = measure_command(command, sandbox, repeats, startup)
+            measurement.budget_ms *= scale
+            measurements.append(measurement)
+    return measurements
@@ -0,0 +1,159 @@
+# src/utils/maintenance_engine.py
+"""并行维护引擎 - 单次读取完成验证和清理，多进程并行处理数据文件"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.pipeline import (
+    atomic_write_bytes, clean_character_fields, normalize_weapon, serialize_json, strip_html
+)
+
+
+def _validate_required(required_fields: Tuple[str, ...]) -> Callable[[Any], List[str]]:
+    def validate(data: Any) -> List[str]:
+        if not isinstance(data, dict):
+            return ["顶层不是对象"]
+        missing = [name for name in required_fields if name not in data]
+        return [f"缺少字段 {missing}"] if missing else []
+    return validate
+
+
+def _validate_equipment(data: Any) -> List[str]:
+    if not isinstance(data, dict):
+        return ["顶层不是对象"]
+    missing = [equipment_id for equipment_id, entry in data.items()
+               if not isinstance(entry, dict) or "name" not in entry]
+    return [f"套装缺少名称 {missing}"] if missing else []
+
+
+# 各类文件的验证规则和清理步骤（清理步骤与下载流水线一致，对已清理的数据是幂等的）
+MAINTENANCE_RULES: Dict[str, Tuple[Callable[[Any], List[str]], Tuple[Callable[[Any], Any], ...]]] = {
+    "character": (_validate_required(("Id", "Name", "Stats")), (strip_html, clean_character_fields)),
+    "weapon": (_validate_required(("Id", "Name", "BaseProperty", "Level")), (strip_html, normalize_weapon)),
+    "equipment": (_validate_equipment, (strip_html,)),
+}
+
+
+@dataclass
+class FileResult:
+    """单个文件的处理结果"""
+    kind: str
+    path: str
+    valid: bool = True
+    errors: List[str] = field(default_factory=list)
+    changed: bool = False
+    written: bool = False
+    size: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class MaintenanceReport:
+    """一次维护的汇总结果"""
+    results: List[FileResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def valid(self) -> List[FileResult]:
+        return [result for result in self.results if result.valid]
+
+    @property
+    def invalid(self) -> List[FileResult]:
+        return [result for result in self.results if not result.valid]
+
+    @property
+    def written(self) -> List[FileResult]:
+        return [result for result in self.results if result.written]
+
+    @property
+    def files_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        total_bytes = sum(result.size for result in self.results)
+        return total_bytes / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def by_kind(self, kind: str) -> List[FileResult]:
+        return [result for result in self.results if result.kind == kind]
+
+
+def process_file(task: Tuple[str, str, bool]) -> FileResult:
+    """处理单个文件：读取一次，验证，清理，仅在内容变化时原子写回
+
+    task 为 (实体类型, 文件路径, 是否写回)，需要可被子进程序列化。
+    """
+    kind, path, write = task
+    start = time.perf_counter()
+    result = FileResult(kind=kind, path=path)
+    validate, transforms = MAINTENANCE_RULES[kind]
+
+    try:
+        original = Path(path).read_bytes()
+        result.size = len(original)
+        data = json.loads(original)
+
+        result.errors = validate(data)
+        result.valid = not result.errors
+
+        if result.valid:
+            for transform in transforms:
+                data = transform(data)
+            content = serialize_json(data)
+            result.changed = content != original
+
+            if result.changed and write:
+                atomic_write_bytes(Path(path), content)
+                result.written = True
+
+    except Exception as e:
+        result.valid = False
+        result.errors.append(f"解析错误 {e}")
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+class MaintenanceEngine:
+    """并行维护引擎
+
+    文件较少时顺序处理，避免进程池启动开销超过收益；
+    否则按块分发给进程池，JSON 解析和清理在各子进程中并行进行。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_parallel_files: int = 64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_files = min_parallel_files
+
+    def run(self, files: Dict[str, List[Path]], write: bool = True) -> MaintenanceReport:
+        """处理各类文件，files 以实体类型为键"""
+        tasks = [(kind, str(path), write) for kind, paths in files.items() for path in paths]
+        workers = self._worker_count(len(tasks))
+        report = MaintenanceReport(workers=workers)
+
+        start = time.perf_counter()
+        if workers <= 1:
+            report.results = [process_file(task) for task in tasks]
+        else:
+            # 进程池只在并行时导入（multiprocessing 导入开销较大）
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                report.results = list(executor.map(process_file, tasks, chunksize=chunksize))
+        report.elapsed = time.perf_counter() - start
+
+        return report
+
+    def _worker_count(self, task_count: int) -> int:
+        if task_count < self.min_parallel_files:
+            return 1
+        return max(1, min(self.max_workers, task_count))
@@ -0,0 +1,224 @@
+# src/utils/pipeline.py
+"""下载数据处理流水线 - 获取 → 去除HTML → 剔除冗余字段 → 规范化 → 原子写入
+
+每个响应到达后依次经过各阶段处理，文件只以最终形态写入一次。
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.download_manifest import DownloadManifest
+
+# 一次扫描去除所有标签（包括 <color=...> 和 </color>）
+HTML_TAG_PATTERN = re.compile(r'<.*?>')
+
+# 角色文件中需要剔除的字段
+CHARACTER_EXCLUDE_FIELDS = frozenset({
+    "Icon", "PartnerInfo", "Skin", "LevelEXP", "Skill",
+    "SkillList", "Talent", "Potential", "PotentialDetail",
+    "Image", "Thumbnail"
+})
+CHARACTER_EXCLUDE_PARTS = frozenset({"Part4", "Part5", "Part6", "PartSub"})
+
+# 音擎文件保留的字段
+WEAPON_KEEP_FIELDS = ("Id", "Name", "Rarity", "WeaponType", "BaseProperty", "RandProperty",
+                      "Stars", "Level", "Talents")
+
+
+class PipelineError(Exception):
+    """流水线处理失败"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class PipelineItem:
+    """流水线中流转的单个数据项"""
+    kind: str
+    item_id: Optional[str] = None
+    data: Any = None
+    response: Any = None
+    file_path: Optional[Path] = None
+    manifest_key: Optional[str] = None
+    not_modified: bool = False
+    written: bool = False
+
+
+Stage = Callable[[PipelineItem], PipelineItem]
+
+
+class DataPipeline:
+    """按顺序执行各处理阶段"""
+
+    def __init__(self, kind: str, stages: List[Stage]):
+        self.kind = kind
+        self.stages = stages
+
+    def run(self, item: PipelineItem) -> PipelineItem:
+        for stage in self.stages:
+            item = stage(item)
+            if item.not_modified:
+                break
+        return item
+
+
+def strip_html(value: Any) -> Any:
+    """递归去除字符串中的HTML标签"""
+    if isinstance(value, str):
+        return HTML_TAG_PATTERN.sub('', value) if '<' in value else value
+    if isinstance(value, dict):
+        return {k: strip_html(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [strip_html(v) for v in value]
+    return value
+
+
+def clean_character_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """移除角色数据中的冗余字段"""
+
+    def drop_icon(value):
+        if isinstance(value, dict):
+            return {k: v for k, v in value.items() if k != "Icon"}
+        return value
+
+    def clean_recursive(obj):
+        if isinstance(obj, dict):
+            cleaned = {}
+            for key, value in obj.items():
+                # 排除指定字段
+                if key in CHARACTER_EXCLUDE_FIELDS:
+                    continue
+
+                # 特殊处理SpecialElementType：只去掉图标
+                elif key == "SpecialElementType":
+                    cleaned[key] = drop_icon(value)
+
+                # 特殊处理FairyRecommend：排除的部位只去掉图标
+                elif key == "FairyRecommend" and isinstance(value, dict):
+                    cleaned[key] = {
+                        part_key: drop_icon(part_value) if part_key in CHARACTER_EXCLUDE_PARTS
+                        else clean_recursive(part_value)
+                        for part_key, part_value in value.items()
+                    }
+
+                else:
+                    cleaned[key] = clean_recursive(value)
+            return cleaned
+        elif isinstance(obj, list):
+            return [clean_recursive(item) for item in obj]
+        else:
+            return obj
+
+    return clean_recursive(data)
+
+
+def normalize_weapon(data: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留音擎计算需要的字段，并去掉等级数据中的经验值"""
+    normalized = {}
+    for key in WEAPON_KEEP_FIELDS:
+        if key not in data:
+            continue
+        value = data[key]
+        if key == "Level" and isinstance(value, dict):
+            value = {level: {k: v for k, v in level_info.items() if k != "Exp"}
+                     for level, level_info in value.items()}
+        normalized[key] = value
+    return normalized
+
+
+def normalize_equipment(data: Dict[str, Any]) -> Dict[str, Any]:
+    """驱动盘数据只保留中文文本"""
+    return {equipment_id: dict(entry["CHS"]) for equipment_id, entry in data.items()}
+
+
+def serialize_json(data: Any) -> bytes:
+    """数据文件统一的序列化格式"""
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def atomic_write_bytes(file_path: Path, content: bytes):
+    """先写临时文件再替换，避免中断时留下半个文件"""
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+class FetchStage:
+    """获取数据：调用 fetch_func 取得响应；304时标记未变化并终止流水线"""
+
+    def __init__(self, fetch_func: Callable[[PipelineItem], Any]):
+        self.fetch_func = fetch_func
+
+    def __call__(self, item: PipelineItem) -> PipelineItem:
+        if item.data is not None:
+            return item
+
+        response = self.fetch_func(item)
+        item.response = response
+
+        if response.status_code == 304:
+            item.not_modified = True
+        elif response.status_code == 200:
+            item.data = response.json()
+        else:
+            raise PipelineError(f"HTTP {response.status_code}", status=response.status_code,
+                                retry_after=response.headers.get("Retry-After"))
+        return item
+
+
+class TransformStage:
+    """对数据应用一个转换函数"""
+
+    def __init__(self, transform: Callable[[Any], Any]):
+        self.transform = transform
+
+    def __call__(self, item: PipelineItem) -> PipelineItem:
+        item.data = self.transform(item.data)
+        return item
+
+
+class AtomicWriteStage:
+    """序列化并与下载清单比对，内容变化或文件缺失时原子写入"""
+
+    def __init__(self, manifest: DownloadManifest):
+        self.manifest = manifest
+
+    def __call__(self, item: PipelineItem) -> PipelineItem:
+        content = serialize_json(item.data)
+
+        if self.manifest.is_changed(item.manifest_key, content) or not item.file_path.exists():
+            atomic_write_bytes(item.file_path, content)
+            item.written = True
+
+        headers = item.response.headers if item.response is not None else {}
+        self.manifest.record(item.manifest_key, headers, content)
+        return item
+
+
+def build_pipeline(kind: str, fetch_func: Callable[[PipelineItem], Any],
+                   manifest: DownloadManifest) -> DataPipeline:
+    """构建指定实体类型的流水线"""
+    stages: List[Stage] = [FetchStage(fetch_func), TransformStage(strip_html)]
+
+    if kind == "character":
+        stages.append(TransformStage(clean_character_fields))
+    elif kind == "weapon":
+        stages.append(TransformStage(normalize_weapon))
+    elif kind == "equipment":
+        stages.append(TransformStage(normalize_equipment))
+    else:
+        raise ValueError(f"未知的实体类型: {kind}")
+
+    stages.append(AtomicWriteStage(manifest))
+    return DataPipeline(kind, stages)
@@ -0,0 +1,395 @@
+# utils/profiler.py
+"""性能剖析 - 在 cProfile / 调用栈采集 / tracemalloc 下运行命名场景
+
+每个场景基于实际运行的服务（DataManager、CalculationService、DataDownloader）构建，
+分三次独立运行（每次重新准备场景，互不干扰）：
+1. cProfile：按累计耗时和自身耗时排序的函数报告
+2. 调用栈采集：输出折叠栈文件（每行 "栈;帧 微秒数"），可直接交给 flamegraph.pl / speedscope
+3. tracemalloc：峰值内存和主要分配位置
+"""
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from src.config.file import FileConfig
+
+
+@dataclass
+class ProfileContext:
+    """场景参数"""
+    file_config: FileConfig
+    builds: int = 1000
+    seed: int = 0
+
+
+@dataclass
+class ProfileResult:
+    """剖析结果"""
+    scenario: str
+    wall_seconds: float = 0.0
+    peak_memory_kb: float = 0.0
+    report_path: Optional[Path] = None
+    collapsed_path: Optional[Path] = None
+    stats_path: Optional[Path] = None
+    top_functions: List[Tuple[str, float]] = field(default_factory=list)
+
+
+class StackCollector:
+    """确定性调用栈采集器
+
+    通过 sys.setprofile / threading.setprofile 记录每个调用栈路径的自身耗时，
+    工作线程的栈以线程名作为根帧。
+    """
+
+    def __init__(self):
+        self.samples: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _frame_name(frame, event: str, arg) -> str:
+        if event.startswith("c_"):
+            module = getattr(arg, "__module__", None) or "builtins"
+            return f"{module}.{getattr(arg, '__qualname__', getattr(arg, '__name__', repr(arg)))}"
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter()
+        state = getattr(self._local, "stack", None)
+        if state is None:
+            thread = threading.current_thread()
+            root = () if thread is threading.main_thread() else (f"thread:{thread.name}",)
+            state = self._local.stack = [(root, now, 0.0)]
+
+        if event in ("call", "c_call"):
+            path = state[-1][0] + (self._frame_name(frame, event, arg),)
+            state.append((path, now, 0.0))
+        elif event in ("return", "c_return", "c_exception"):
+            # 采集开始前就已进入的帧没有入栈，忽略其返回事件
+            if len(state) <= 1:
+                return
+            path, start, child = state.pop()
+            elapsed = now - start
+            with self._lock:
+                self.samples[path] += elapsed - child
+            parent_path, parent_start, parent_child = state[-1]
+            state[-1] = (parent_path, parent_start, parent_child + elapsed)
+
+    def start(self):
+        threading.setprofile(self._callback)
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        sys.setprofile(None)
+        threading.setprofile(None)
+
+    def write_collapsed(self, output_path: Path, min_microseconds: int = 1) -> int:
+        """写入折叠栈文件，返回行数"""
+        lines = []
+        for path, seconds in self.samples.items():
+            microseconds = int(seconds * 1_000_000)
+            if path and microseconds >= min_microseconds:
+                lines.append(f"{';'.join(frame.replace(';', ':') for frame in path)} {microseconds}")
+        lines.sort()
+        output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return len(lines)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """屏蔽场景中服务的控制台输出"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# ---- 场景定义：每个场景是一个上下文管理器，准备好数据后产出待剖析的函数 ----
+
+@contextlib.contextmanager
+def _cold_start(ctx: ProfileContext):
+    """冷启动：加载全部数据并构建计算服务"""
+    from src.data.manager import DataManager
+    from src.services.calculation_service import CalculationService
+
+    def run():
+        CalculationService(DataManager(ctx.file_config))
+
+    yield run
+
+
+def _service(ctx: ProfileContext):
+    from src.data.manager import DataManager
+    from src.services.calculation_service import CalculationService
+
+    return CalculationService(DataManager(ctx.file_config))
+
+
+@contextlib.contextmanager
+def _load_character(ctx: ProfileContext):
+    """加载角色：对每个角色在1级和60级计算基础属性"""
+    service = _service(ctx)
+    characters = service.data_manager.get_all_characters()
+
+    def run():
+        for character in characters:
+            for level in (1, 60):
+                service.calculate_character_base_stats(
+                    character.id, level, service.get_breakthrough_level(level), 7)
+
+    yield run
+
+
+@contextlib.contextmanager
+def _apply_weapon(ctx: ProfileContext):
+    """应用音擎：每个角色搭配一把音擎计算属性"""
+    service = _service(ctx)
+    characters = service.data_manager.get_all_characters()
+    weapons = service.data_manager.get_all_weapons()
+    if not weapons:
+        raise ValueError("没有可用的音擎数据")
+
+    def run():
+        for index, character in enumerate(characters):
+            service.calculate_character_with_weapon(
+                character.id, 60, 6, 7, weapons[index % len(weapons)].id, 60)
+
+    yield run
+
+
+def random_gear_builds(count: int, seed: int = 0):
+    """生成 count 套随机驱动盘（6个满级驱动盘，主属性按槽位可选范围，副属性4条共强化5次）"""
+    from src.config.slot_config import SlotConfig
+    from src.models.gear_attributes import GearSubAttributes
+    from src.models.gear_models import GearPiece
+
+    rng = random.Random(seed)
+    slot_config = SlotConfig()
+
+    builds = []
+    for _ in range(count):
+        pieces = []
+        for slot_index in range(6):
+            main_attribute = rng.choice(slot_config.slot_main_attributes[slot_index])
+            candidates = [attribute for attribute in GearSubAttributes.get_all_sub_attributes()
+                          if attribute.name != main_attribute.name]
+            sub_attributes = rng.sample(candidates, 4) if len(candidates) >= 4 else candidates
+            for _ in range(5):
+                rng.choice(sub_attributes).enhancement_level += 1
+            pieces.append(GearPiece(slot_index=slot_index, level=15, main_attribute=main_attribute,
+                                    sub_attributes=sub_attributes))
+        builds.append(pieces)
+    return builds
+
+
+@contextlib.contextmanager
+def _evaluate_gear(ctx: ProfileContext):
+    """评估驱动盘：对同一角色计算 builds 套驱动盘的最终属性"""
+    from src.models.gear_models import GearSetSelection
+
+    service = _service(ctx)
+    characters = service.data_manager.get_all_characters()
+    if not characters:
+        raise ValueError("没有可用的角色数据")
+
+    base_stats = service.calculate_character_base_stats(characters[0].id, 60, 6, 7)
+    set_ids = [gear_set.id for gear_set in service.data_manager.get_all_gear_sets()] or [0]
+    selections = [GearSetSelection("4+2", [set_ids[i % len(set_ids)], set_ids[(i + 1) % len(set_ids)]])
+                  for i in range(len(set_ids))]
+    builds = random_gear_builds(ctx.builds, ctx.seed)
+
+    def run():
+        for index, pieces in enumerate(builds):
+            service.calculate_final_stats(base_stats, pieces, selections[index % len(selections)], 15)
+
+    yield run
+
+
+def _stub_routes(file_config: FileConfig) -> Dict[str, object]:
+    """把本地数据还原为API响应格式，作为替身服务器的路由"""
+    def load(path: Path, default):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    characters = load(file_config.character_id_name_mapping_file, {})
+    weapons = load(file_config.weapon_id_name_mapping_file, {})
+    equipment = load(file_config.equipment_file, {})
+
+    routes = {
+        "/character.json": {item_id: {"CHS": name} for item_id, name in characters.items()},
+        "/weapon.json": {item_id: {"CHS": name} for item_id, name in weapons.items()},
+        "/equipment.json": {item_id: {"CHS": entry} for item_id, entry in equipment.items()},
+    }
+    for item_id in characters:
+        routes[f"/zh/character/{item_id}.json"] = load(file_config.get_character_file_path(item_id), {})
+    for item_id in weapons:
+        routes[f"/zh/weapon/{item_id}.json"] = load(file_config.get_weapon_file_path(item_id), {})
+    return routes
+
+
+def _serve_stub(routes: Dict[str, object], port_queue, stop_event):
+    """子进程入口：运行替身服务器直到收到停止信号"""
+    from utils.stub_server import StubApiServer
+
+    with StubApiServer(routes) as server:
+        port_queue.put(server.base_url)
+        stop_event.wait()
+
+
+@contextlib.contextmanager
+def _full_sync(ctx: ProfileContext):
+    """完整同步：从本地替身服务器把全部数据同步到空目录
+
+    替身服务器运行在子进程中，剖析结果只包含下载端的耗时。
+    """
+    import multiprocessing
+
+    from utils.data_downloader import DataDownloader
+    from utils.sync_planner import SyncPlanner
+
+    port_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve_stub, args=(_stub_routes(ctx.file_config), port_queue, stop_event),
+                                     daemon=True)
+    server.start()
+
+    try:
+        base_url = port_queue.get(timeout=30)
+        with tempfile.TemporaryDirectory(prefix="zzz_profile_sync_") as target_dir:
+            downloader = DataDownloader(base_url=base_url, file_config=FileConfig(target_dir))
+            # 本地替身无需限速
+            downloader.api_config["requests_per_second"] = 10000
+
+            def run():
+                planner = SyncPlanner(downloader)
+                planner.execute(planner.build_plan())
+
+            yield run
+    finally:
+        stop_event.set()
+        server.join(timeout=10)
+
+
+SCENARIOS: Dict[str, Callable[[ProfileContext], ContextManager[Callable[[], None]]]] = {
+    "cold_start": _cold_start,
+    "load_character": _load_character,
+    "apply_weapon": _apply_weapon,
+    "evaluate_gear": _evaluate_gear,
+    "sync": _full_sync,
+}
+
+
+class ScenarioProfiler:
+    """场景剖析器"""
+
+    def __init__(self, context: ProfileContext, output_dir: Path, top: int = 40):
+        self.context = context
+        self.output_dir = Path(output_dir)
+        self.top = top
+
+    def _run_pass(self, scenario: str, before: Callable[[], None], after: Callable[[], None]) -> float:
+        with _quiet(), SCENARIOS[scenario](self.context) as run:
+            start = time.perf_counter()
+            before()
+            try:
+                run()
+            finally:
+                after()
+            return time.perf_counter() - start
+
+    def profile(self, scenario: str) -> ProfileResult:
+        if scenario not in SCENARIOS:
+            raise ValueError(f"未知场景: {scenario}，可用场景: {', '.join(SCENARIOS)}")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        result = ProfileResult(scenario=scenario)
+
+        # 1. cProfile（工作线程各自挂一个分析器，结束后合并）
+        profilers: List[cProfile.Profile] = []
+
+        def thread_bootstrap(frame, event, arg):
+            profiler = cProfile.Profile()
+            profilers.append(profiler)
+            profiler.enable()
+
+        main_profiler = cProfile.Profile()
+
+        def start_profiling():
+            threading.setprofile(thread_bootstrap)
+            main_profiler.enable()
+
+        def stop_profiling():
+            main_profiler.disable()
+            threading.setprofile(None)
+
+        result.wall_seconds = self._run_pass(scenario, start_profiling, stop_profiling)
+        stats = pstats.Stats(main_profiler)
+        for profiler in profilers:
+            stats.add(profiler)
+
+        result.stats_path = self.output_dir / f"{stem}.prof"
+        stats.dump_stats(str(result.stats_path))
+
+        # 2. 调用栈采集
+        collector = StackCollector()
+        self._run_pass(scenario, collector.start, collector.stop)
+        result.collapsed_path = self.output_dir / f"{stem}.collapsed"
+        collector.write_collapsed(result.collapsed_path)
+
+        # 3. tracemalloc
+        snapshot_holder = []
+
+        def stop_tracing():
+            snapshot_holder.append(tracemalloc.take_snapshot())
+            snapshot_holder.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        self._run_pass(scenario, tracemalloc.start, stop_tracing)
+        snapshot, peak = snapshot_holder
+        result.peak_memory_kb = peak / 1024
+
+        result.report_path = self.output_dir / f"{stem}.txt"
+        result.report_path.write_text(self._format_report(result, stats, snapshot), encoding="utf-8")
+        result.top_functions = self._top_functions(stats, 10)
+        return result
+
+    @staticmethod
+    def _top_functions(stats: pstats.Stats, limit: int) -> List[Tuple[str, float]]:
+        """按累计耗时排序的前 limit 个函数"""
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [(f"{os.path.basename(filename)}:{line}({name})", cumulative)
+                for (filename, line, name), (_, _, _, cumulative, _) in entries[:limit]]
+
+    def _format_report(self, result: ProfileResult, stats: pstats.Stats, snapshot) -> str:
+        buffer = io.StringIO()
+        buffer.write(f"场景: {result.scenario}\n")
+        buffer.write(f"数据目录: {self.context.file_config.base_dir}\n")
+        buffer.write(f"耗时(cProfile下): {result.wall_seconds:.3f}s\n")
+        buffer.write(f"峰值内存: {result.peak_memory_kb:.1f}KB\n\n")
+
+        for title, key in (("按累计耗时排序", "cumulative"), ("按自身耗时排序", "tottime")):
+            buffer.write(f"==== {title} ====\n")
+            stats.stream = buffer
+            stats.sort_stats(key).print_stats(self.top)
+
+        buffer.write("==== 内存分配位置（前20） ====\n")
+        for statistic in snapshot.statistics("lineno")[:20]:
+            buffer.write(f"{statistic}\n")
+        return buffer.getvalue()
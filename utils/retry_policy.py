@@ -0,0 +1,140 @@
+# src/utils/retry_policy.py
+"""下载重试策略 - 失败记录、指数退避和端点熔断"""
+import random
+import threading
+import time
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Union
+
+# 可重试的HTTP状态码：限流和服务端错误
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class FailureRecord:
+    """单个下载失败记录"""
+    kind: str
+    item_id: str
+    status: Optional[int] = None
+    attempts: int = 0
+    error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Union[Dict[str, Any], str]) -> 'FailureRecord':
+        """从JSON数据创建记录，兼容旧版只保存角色ID字符串的格式"""
+        if isinstance(data, str):
+            return cls(kind="character", item_id=data)
+        return cls(
+            kind=data.get("kind", "character"),
+            item_id=str(data["item_id"]),
+            status=data.get("status"),
+            attempts=data.get("attempts", 0),
+            error=data.get("error", "")
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（秒数或HTTP日期），返回需要等待的秒数"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_time = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_time.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """带抖动的指数退避"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 30.0, jitter: bool = True):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """计算第 attempt 次失败后的等待时间
+
+        指数退避采用 full jitter：在 [0, base * 2^(attempt-1)] 内随机取值，
+        服务器给出 Retry-After 时至少等待该时长。
+        """
+        backoff = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        delay = random.uniform(0, backoff) if self.jitter else backoff
+
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+
+        return delay
+
+    @staticmethod
+    def is_retryable(status: Optional[int]) -> bool:
+        """状态码为空表示连接错误或超时，同样可重试"""
+        return status is None or status in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """按端点统计连续失败次数的熔断器（线程安全）
+
+    连续失败达到阈值后熔断，reset_timeout 秒内直接拒绝该端点的请求；
+    超时后放行一个试探请求，成功则恢复，失败则继续熔断。
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, endpoint: str) -> bool:
+        """是否允许向该端点发送请求"""
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return True
+
+            if time.monotonic() - opened_at < self.reset_timeout or self._probing.get(endpoint):
+                return False
+
+            # 半开状态：只放行一个试探请求
+            self._probing[endpoint] = True
+            return True
+
+    def record_success(self, endpoint: str):
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+            self._probing.pop(endpoint, None)
+
+    def release(self, endpoint: str):
+        """试探请求没有给出端点健康与否的结论（如解析或写入出错）时结束试探，下次再放行一个"""
+        with self._lock:
+            self._probing.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str):
+        with self._lock:
+            count = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = count
+            self._probing.pop(endpoint, None)
+
+            if count >= self.failure_threshold:
+                if endpoint not in self._opened_at:
+                    print(f"⛔ 端点连续失败 {count} 次，暂停请求 {self.reset_timeout:.0f} 秒: {endpoint}")
+                self._opened_at[endpoint] = time.monotonic()
+
+    def is_open(self, endpoint: str) -> bool:
+        with self._lock:
+            return endpoint in self._opened_at
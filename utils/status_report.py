@@ -0,0 +1,165 @@
+# src/utils/status_report.py
+"""系统状态 - 单次目录扫描统计数据完整度，网络探测结果带TTL缓存"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from src.config.file import FileConfig
+from src.services.metrics import metrics_registry
+
+
+def _load_json(file_path: Path, default: Any) -> Any:
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _scan_ids(directory: Path) -> Set[str]:
+    """单次扫描目录，返回已有的实体ID"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name[:-5] for entry in entries if entry.name.endswith(".json")}
+    except FileNotFoundError:
+        return set()
+
+
+def _kind_completeness(expected_ids: List[str], present_ids: Set[str]) -> Dict[str, Any]:
+    expected = [str(item_id) for item_id in expected_ids]
+    missing = [item_id for item_id in expected if item_id not in present_ids]
+    return {
+        "total": len(expected),
+        "existing": len(expected) - len(missing),
+        "missing": missing,
+        "orphans": sorted(present_ids - set(expected))
+    }
+
+
+def scan_data_completeness(file_config: FileConfig) -> Dict[str, Any]:
+    """对照ID列表统计角色、音擎、驱动盘数据的完整度（每个目录只扫描一次）"""
+    characters = _kind_completeness(_load_json(file_config.character_ids_file, []),
+                                    _scan_ids(file_config.characters_dir))
+    weapons = _kind_completeness(_load_json(file_config.weapon_ids_file, []),
+                                 _scan_ids(file_config.weapons_dir))
+
+    equipment_ids = _load_json(file_config.equipment_ids_file, [])
+    equipment = {
+        "total": len(equipment_ids),
+        "existing": len(equipment_ids) if file_config.equipment_file.exists() else 0,
+        "missing": [] if file_config.equipment_file.exists() else [str(i) for i in equipment_ids]
+    }
+
+    def rate(stats: Dict[str, Any]) -> float:
+        return stats["existing"] / stats["total"] * 100 if stats["total"] else 0.0
+
+    total = characters["total"] + weapons["total"] + equipment["total"]
+    existing = characters["existing"] + weapons["existing"] + equipment["existing"]
+    completion_rate = existing / total * 100 if total else 0.0
+
+    return {
+        "status": "complete" if total and existing == total else "incomplete",
+        "completion_rate": completion_rate,
+        "overall_completion_rate": completion_rate,
+        "total_characters": characters["total"],
+        "existing_count": characters["existing"],
+        "characters": characters,
+        "weapons": weapons,
+        "equipment": equipment,
+        "character_completion_rate": rate(characters),
+        "weapon_completion_rate": rate(weapons),
+        "equipment_completion_rate": rate(equipment)
+    }
+
+
+class NetworkProbe:
+    """网络探测（结果缓存到文件，TTL内直接复用）"""
+
+    def __init__(self, cache_file: Path, ttl: float = 300.0, timeout: float = 2.0):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self.timeout = timeout
+
+    def cached(self) -> Optional[Dict[str, Any]]:
+        """TTL内的缓存结果，没有或已过期时返回 None"""
+        entry = _load_json(self.cache_file, None)
+        if not isinstance(entry, dict) or time.time() - entry.get("checked_at", 0) > self.ttl:
+            metrics_registry.record_cache("network_probe", False)
+            return None
+        metrics_registry.record_cache("network_probe", True)
+        return dict(entry, cached=True)
+
+    def probe(self, url: str, force: bool = False) -> Dict[str, Any]:
+        """探测URL是否可达（短超时，只读取响应头）"""
+        if not force:
+            entry = self.cached()
+            if entry is not None:
+                return entry
+
+        import requests
+
+        start = time.perf_counter()
+        try:
+            with requests.get(url, timeout=self.timeout, stream=True) as response:
+                connected = response.status_code < 500
+            error = None if connected else f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            connected, error = False, type(e).__name__
+
+        entry = {
+            "status": "connected" if connected else "disconnected",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "checked_at": time.time(),
+            "error": error
+        }
+
+        try:
+            self.cache_file.write_text(json.dumps(entry), encoding="utf-8")
+        except OSError:
+            pass
+
+        return dict(entry, cached=False)
+
+
+def collect_system_status(file_config: FileConfig, probe: NetworkProbe, probe_url: str,
+                          probe_network: bool = False) -> Dict[str, Any]:
+    """汇总系统状态
+
+    默认不发起网络请求，只报告TTL内缓存的探测结果；probe_network 为真时缓存过期才实际探测。
+    """
+    start = time.perf_counter()
+    structure = file_config.validate_data_structure()
+    completeness = scan_data_completeness(file_config)
+
+    network = probe.probe(probe_url) if probe_network else probe.cached()
+    network_status = network["status"] if network else "unknown"
+
+    failed_downloads = _load_json(file_config.failed_downloads_file, [])
+
+    recommendations = []
+    if not structure["valid"]:
+        recommendations.append("修复数据目录结构")
+
+    if completeness["completion_rate"] < 100:
+        if network_status == "connected":
+            recommendations.append("下载缺失的数据")
+        else:
+            recommendations.append("检查网络连接后下载缺失数据")
+
+    if completeness["completion_rate"] == 0:
+        recommendations.append("运行完整的数据下载流程")
+
+    if failed_downloads:
+        recommendations.append(f"重试 {len(failed_downloads)} 个失败的下载")
+
+    return {
+        "file_system": {"valid": structure["valid"], "details": structure["details"]},
+        "data_status": completeness,
+        "network_status": network_status,
+        "network": network,
+        "failed_downloads": len(failed_downloads),
+        "recommendations": recommendations,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
@@ -0,0 +1,117 @@
+# src/utils/stub_server.py
+"""本地API替身服务器 - 用于在不访问真实API的情况下验证下载流程"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+class StubApiServer:
+    """本地HTTP替身服务器
+
+    routes 以URL路径为键（如 "/character.json"），值为返回的JSON对象。
+    可选的 latency 模拟网络延迟，status_overrides 为指定路径返回错误状态码，
+    retry_after 不为空时错误响应附带该 Retry-After 头。
+    每个响应附带基于内容哈希的 ETag，请求携带匹配的 If-None-Match 时返回304。
+    """
+
+    def __init__(self, routes: Dict[str, Any], latency: float = 0.0,
+                 status_overrides: Optional[Dict[str, int]] = None,
+                 retry_after: Optional[str] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.routes: Dict[str, bytes] = {}
+        for path, data in routes.items():
+            self.set_route(path, data)
+        self.latency = latency
+        self.status_overrides = dict(status_overrides or {})
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubApiServer':
+        """在后台线程启动服务器"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def set_route(self, path: str, data: Any):
+        """设置或更新某个路径的返回内容"""
+        self.routes[path] = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                status = stub.status_overrides.get(self.path)
+                body = stub.routes.get(self.path)
+                if status is None:
+                    status = 200 if body is not None else 404
+
+                if status != 200:
+                    body = json.dumps({"error": status}).encode("utf-8")
+                    etag = None
+                else:
+                    etag = stub._etag(body)
+                    if self.headers.get("If-None-Match") == etag:
+                        with stub._lock:
+                            stub.not_modified_count += 1
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                elif stub.retry_after:
+                    self.send_header("Retry-After", stub.retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
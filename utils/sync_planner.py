@@ -0,0 +1,264 @@
+# src/utils/sync_planner.py
+"""增量同步计划 - 对比远程列表与本地数据，生成并执行同步计划"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from utils.data_downloader import DataDownloader
+
+
+def entry_fingerprint(entry: Any) -> str:
+    """计算远程列表条目的指纹"""
+    content = json.dumps(entry, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class EntityPlan:
+    """单类实体的同步计划"""
+    kind: str
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    list_not_modified: bool = False
+    verified: int = 0               # 逐项条件请求校验过的条目数
+    remote_fingerprints: Dict[str, str] = field(default_factory=dict)
+    remote_data: Optional[Dict[str, Any]] = None
+    response: Any = None
+
+    @property
+    def to_download(self) -> List[str]:
+        return self.new + self.changed
+
+    @property
+    def has_work(self) -> bool:
+        return bool(self.new or self.changed or self.removed)
+
+
+@dataclass
+class SyncPlan:
+    """完整同步计划"""
+    entities: Dict[str, EntityPlan] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def has_work(self) -> bool:
+        return any(plan.has_work for plan in self.entities.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            kind: {
+                "new": plan.new,
+                "changed": plan.changed,
+                "removed": plan.removed,
+                "unchanged": len(plan.unchanged),
+                "list_not_modified": plan.list_not_modified,
+                "verified": plan.verified
+            }
+            for kind, plan in self.entities.items()
+        }
+
+
+class SyncPlanner:
+    """同步计划器
+
+    对每类实体（角色、音擎、驱动盘）：
+    1. 条件请求远程列表（未变化时只传输响应头，沿用上次记录的条目指纹）
+    2. 单次扫描本地目录得到已有ID集合
+    3. 以条目指纹对比，归类为 新增 / 变化 / 删除 / 未变化
+    4. 列表条目不变不代表详情文件不变：verify=True 时对“未变化”的角色/音擎逐项发送条件请求，
+       远程返回200（或无法确认）的归为变化
+    """
+
+    KIND_NAMES = {"character": "角色", "weapon": "音擎", "equipment": "驱动盘"}
+    LIST_ENDPOINTS = {"character": "character_list", "weapon": "weapon_list", "equipment": "equipment_data"}
+    DATA_ENDPOINTS = {"character": "character_data", "weapon": "weapon_data"}
+
+    def __init__(self, downloader: 'DataDownloader' = None):
+        if downloader is None:
+            from utils.data_downloader import DataDownloader
+            downloader = DataDownloader()
+        self.downloader = downloader
+        self.file_config = self.downloader.file_config
+        self.manifest = self.downloader.manifest
+
+    def build_plan(self, kinds: List[str] = None, verify: bool = True) -> SyncPlan:
+        """生成同步计划（只读取远程列表和详情的响应头，不下载实体数据，不写入文件）"""
+        plan = SyncPlan()
+
+        for kind in kinds or list(self.LIST_ENDPOINTS):
+            entity_plan = self._plan_entity(kind, verify)
+            if entity_plan is None:
+                plan.errors.append(f"{self.KIND_NAMES[kind]}列表获取失败")
+                continue
+            plan.entities[kind] = entity_plan
+
+        return plan
+
+    def execute(self, plan: SyncPlan, prune: bool = False) -> Dict[str, Any]:
+        """执行同步计划"""
+        result = {}
+
+        for kind, entity_plan in plan.entities.items():
+            if kind == "equipment":
+                result[kind] = self._execute_equipment(entity_plan)
+            else:
+                result[kind] = self._execute_entity(entity_plan, prune)
+
+        self.manifest.save()
+        return result
+
+    def print_plan(self, plan: SyncPlan, limit: int = 10):
+        """打印同步计划"""
+        print("📋 同步计划:")
+        for kind, entity_plan in plan.entities.items():
+            name = self.KIND_NAMES[kind]
+            list_state = "（列表未变化）" if entity_plan.list_not_modified else ""
+            if entity_plan.verified:
+                list_state += f"（逐项校验 {entity_plan.verified} 个）"
+            print(f"  {name}{list_state}: 新增 {len(entity_plan.new)}, 变化 {len(entity_plan.changed)}, "
+                  f"删除 {len(entity_plan.removed)}, 未变化 {len(entity_plan.unchanged)}")
+
+            for label, ids in (("新增", entity_plan.new), ("变化", entity_plan.changed),
+                               ("删除", entity_plan.removed)):
+                if ids:
+                    shown = ", ".join(ids[:limit])
+                    more = f" ... 共 {len(ids)} 个" if len(ids) > limit else ""
+                    print(f"    {label}: {shown}{more}")
+
+        for error in plan.errors:
+            print(f"  ❌ {error}")
+
+        if not plan.has_work and not plan.errors:
+            print("✅ 本地数据已是最新")
+
+    def _plan_entity(self, kind: str, verify: bool = True) -> Optional[EntityPlan]:
+        """生成单类实体的计划"""
+        entity_plan = EntityPlan(kind=kind)
+        stored_fingerprints = self.manifest.get_fingerprints(kind)
+        local_ids = self._scan_local_ids(kind)
+
+        # 有上次失败的条目（空指纹）时需要完整列表来补全指纹，不发送条件请求
+        conditional = bool(stored_fingerprints) and all(stored_fingerprints.values())
+        data, response = self.downloader.fetch_remote_list(self.LIST_ENDPOINTS[kind], conditional=conditional)
+        if response is None:
+            return None
+
+        if response.status_code == 304:
+            entity_plan.list_not_modified = True
+            remote_fingerprints = stored_fingerprints
+        else:
+            remote_fingerprints = {item_id: entry_fingerprint(entry) for item_id, entry in data.items()}
+            entity_plan.remote_data = data
+
+        entity_plan.response = response
+        entity_plan.remote_fingerprints = remote_fingerprints
+
+        for item_id, fingerprint in remote_fingerprints.items():
+            if item_id not in local_ids:
+                entity_plan.new.append(item_id)
+            elif fingerprint and stored_fingerprints.get(item_id) == fingerprint:
+                entity_plan.unchanged.append(item_id)
+            elif item_id not in stored_fingerprints and self.downloader.has_download_record(kind, item_id):
+                # 旧版本下载过但尚未记录指纹：以下载清单为准视为未变化
+                entity_plan.unchanged.append(item_id)
+            else:
+                entity_plan.changed.append(item_id)
+
+        if verify and kind in self.DATA_ENDPOINTS and entity_plan.unchanged:
+            modified = set(self.downloader.verify_unchanged(kind, entity_plan.unchanged))
+            entity_plan.verified = len(entity_plan.unchanged)
+            entity_plan.changed += [item_id for item_id in entity_plan.unchanged if item_id in modified]
+            entity_plan.unchanged = [item_id for item_id in entity_plan.unchanged if item_id not in modified]
+
+        entity_plan.removed = sorted(local_ids - set(remote_fingerprints))
+        return entity_plan
+
+    def _scan_local_ids(self, kind: str) -> Set[str]:
+        """单次扫描本地目录，获取已有的实体ID"""
+        if kind == "equipment":
+            if not self.file_config.equipment_file.exists():
+                return set()
+            return set(self.downloader.load_json_list(self.file_config.equipment_ids_file))
+
+        directory = self.file_config.characters_dir if kind == "character" else self.file_config.weapons_dir
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name[:-5] for entry in entries
+                        if entry.name.endswith(".json") and entry.is_file()}
+        except FileNotFoundError:
+            return set()
+
+    def _execute_entity(self, entity_plan: EntityPlan, prune: bool) -> Dict[str, Any]:
+        """执行角色/音擎的同步"""
+        kind = entity_plan.kind
+        failed_ids: List[str] = []
+        success_count = 0
+
+        # 列表有更新时先保存ID列表和名称映射
+        if entity_plan.remote_data is not None:
+            self.downloader.save_list(kind, entity_plan.remote_data)
+
+        if entity_plan.to_download:
+            if kind == "character":
+                success_count, failed_ids = self.downloader.batch_download_characters(entity_plan.to_download)
+            else:
+                success_count, failed_ids = self.downloader.batch_download_weapons(entity_plan.to_download)
+
+        removed_count = 0
+        if prune:
+            removed_count = self._remove_local_files(kind, entity_plan.removed)
+
+        self._commit_list_state(entity_plan, set(failed_ids))
+
+        return {
+            "downloaded": success_count,
+            "failed": failed_ids,
+            "removed": removed_count,
+            "unchanged": len(entity_plan.unchanged)
+        }
+
+    def _execute_equipment(self, entity_plan: EntityPlan) -> Dict[str, Any]:
+        """执行驱动盘的同步（列表即数据，直接复用已获取的内容）"""
+        if entity_plan.remote_data is None or not entity_plan.has_work:
+            self._commit_list_state(entity_plan, set())
+            return {"updated": False}
+
+        self.downloader.save_equipment_data(entity_plan.remote_data, entity_plan.response)
+        self._commit_list_state(entity_plan, set())
+        return {"updated": True}
+
+    def _commit_list_state(self, entity_plan: EntityPlan, failed_ids: Set[str]):
+        """记录列表响应和已成功同步的条目指纹（失败的条目下次仍会被计划）
+
+        驱动盘的端点记录由 save_equipment_data 写入文件时完成。
+        """
+        if entity_plan.remote_data is not None and entity_plan.kind != "equipment":
+            self.downloader.record_list_response(entity_plan.kind, entity_plan.response)
+
+        # 失败的条目记录空指纹：列表304时仍保留完整的远程ID集合，同时保证下次被重新计划
+        fingerprints = {item_id: ("" if item_id in failed_ids else fingerprint)
+                        for item_id, fingerprint in entity_plan.remote_fingerprints.items()}
+        self.manifest.set_fingerprints(entity_plan.kind, fingerprints)
+
+    def _remove_local_files(self, kind: str, item_ids: List[str]) -> int:
+        """删除远程已不存在的本地文件"""
+        removed = 0
+        for item_id in item_ids:
+            if kind == "character":
+                file_path: Path = self.file_config.get_character_file_path(item_id)
+            else:
+                file_path = self.file_config.get_weapon_file_path(item_id)
+
+            try:
+                file_path.unlink()
+                removed += 1
+                print(f"🗑️ 已删除: {file_path.name}")
+            except FileNotFoundError:
+                pass
+        return removed